@@ -0,0 +1,122 @@
+# bench/bench_cli_startup.py
+"""
+CLI startup cost of `python -m src.main <command>` (cron runs basis:alert every minute).
+
+Cases (fresh interpreter each run, best of --runs):
+    version         `src.main version`: stdlib only, no logging / DB init
+    env             `src.main env`: settings from env + .env
+    alert_parse     `src.main basis:alert --help`: startup up to argument parsing
+    eager_imports   the modules the CLI used to import at the top (BybitRest, persistence,
+                    report, ws.health, loguru, requests, telegram formatters, core.alerts)
+
+Per case: wall time and the `-X importtime` cumulative total, plus the slowest
+top-level imports. Results are in the bench JSON format (ops = interpreter runs),
+so `python -m bench.compare` can flag a startup regression.
+
+Run:
+    python -m bench.bench_cli_startup [--runs 5] [--top 8] [--out startup.json]
+(English-only comments per project rules)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+
+EAGER = (
+    "import src.main as m; "
+    "[m._lazy(n) for n in ('BybitRest', 'format_report', 'init_db', 'setup_logging', 'MetricsRegistry', "
+    "'_core_alerts', '_tg_formatters')]; "
+    "import loguru, requests"
+)
+
+CASES: dict[str, list[str]] = {
+    "version": ["-m", "src.main", "version"],
+    "env": ["-m", "src.main", "env"],
+    "alert_parse": ["-m", "src.main", "basis:alert", "--help"],
+    "eager_imports": ["-c", EAGER],
+}
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """{module: cumulative_us} for top-level imports (nesting depth 0) from `-X importtime` output."""
+    out: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        if name.startswith("  "):  # nested import: already counted in its parent's cumulative time
+            continue
+        out[name.strip()] = int(parts[1])
+    return out
+
+
+def imported_modules(args: list[str], env: dict[str, str] | None = None) -> set[str]:
+    """All module names a `python -X importtime <args>` run imports (for import guards)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], cwd=ROOT, env=env, capture_output=True, text=True, check=False
+    )
+    names = set()
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and line.count("|") == 2:
+            names.add(line.rsplit("|", 1)[1].strip())
+    return names
+
+
+def measure(args: list[str], runs: int) -> dict[str, Any]:
+    best_wall, best_imports, top = float("inf"), 0, {}
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", *args], cwd=ROOT, capture_output=True, text=True, check=False
+        )
+        wall = time.perf_counter() - t0
+        imports = parse_importtime(proc.stderr)
+        if wall < best_wall:
+            best_wall, best_imports, top = wall, sum(imports.values()), imports
+    return {"wall_s": best_wall, "imports_us": best_imports, "top": top}
+
+
+def run(*, runs: int, top_n: int) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    slowest: dict[str, Any] = {}
+    for name, args in CASES.items():
+        m = measure(args, runs)
+        results[name] = {
+            "ops_per_sec": round(1.0 / m["wall_s"], 2),
+            "ns_per_op": round(m["wall_s"] * 1e9, 1),
+            "n": runs,
+            "unit": "run",
+            "imports_ms": round(m["imports_us"] / 1000, 2),
+        }
+        top = sorted(m["top"].items(), key=lambda kv: kv[1], reverse=True)[:top_n]
+        slowest[name] = {mod: round(us / 1000, 2) for mod, us in top}
+    return {"meta": {"python": sys.version.split()[0], "runs": runs, "slowest_imports_ms": slowest}, "results": results}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=8, help="slowest top-level imports to list per case")
+    ap.add_argument("--out", help="also write the JSON here (for bench.compare)")
+    args = ap.parse_args()
+    res = run(runs=max(1, args.runs), top_n=args.top)
+    text = json.dumps(res, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
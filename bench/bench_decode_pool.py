@@ -0,0 +1,88 @@
+# bench/bench_decode_pool.py
+"""
+Decode + normalize on the event loop vs in DecodePool worker processes.
+
+For each mode reports end-to-end frames/sec and the event-loop thread CPU per
+frame (time.thread_time of the loop thread): the pool pays pickling/IPC on the
+loop but frees the JSON decode, so it wins only when frames are large enough.
+
+Run:
+    python -m bench.bench_decode_pool [--frames 50000] [--workers 1 2 4] [--recorded DIR]
+(English-only comments per project rules)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from itertools import cycle, islice
+from typing import Any
+
+from bench.bench_pipeline import recorded_frames, synthetic_frames
+from src.ws.decode_pool import DecodePool, decode_frame
+
+
+def _raw_frames(n: int, symbols: int, recorded: list[str] | None) -> list[str]:
+    base = recorded_frames(recorded) if recorded else synthetic_frames(symbols)
+    return [json.dumps(m) for _, m in islice(cycle(base), n)]
+
+
+def _result(frames: int, wall_ns: int, cpu_ns: int) -> dict[str, Any]:
+    return {
+        "frames_per_sec": round(frames / (wall_ns / 1e9), 1),
+        "loop_cpu_ns_per_frame": round(cpu_ns / frames, 1),
+    }
+
+
+def bench_inline(raws: list[str]) -> dict[str, Any]:
+    w0, c0 = time.perf_counter_ns(), time.thread_time_ns()
+    for raw in raws:
+        decode_frame(raw)
+    return _result(len(raws), time.perf_counter_ns() - w0, time.thread_time_ns() - c0)
+
+
+async def bench_pool(raws: list[str], workers: int, batch: int) -> dict[str, Any]:
+    pool = DecodePool(workers, batch=batch).start()
+    try:
+        await asyncio.gather(*(pool.submit(r) for r in raws[:1000]))  # warm-up: worker imports
+        w0, c0 = time.perf_counter_ns(), time.thread_time_ns()
+        futs = [pool.submit(r) for r in raws]
+        for f in futs:
+            await f
+        return _result(len(raws), time.perf_counter_ns() - w0, time.thread_time_ns() - c0)
+    finally:
+        pool.close()
+
+
+def run(*, frames: int, symbols: int, workers: list[int], batch: int, recorded: list[str] | None) -> dict[str, Any]:
+    raws = _raw_frames(frames, symbols, recorded)
+    results: dict[str, Any] = {"inline": bench_inline(raws)}
+    for n in workers:
+        results[f"pool_w{n}"] = asyncio.run(bench_pool(raws, n, batch))
+    return {
+        "meta": {
+            "frames": len(raws),
+            "avg_frame_bytes": round(sum(map(len, raws)) / len(raws), 1),
+            "batch": batch,
+            "payloads": "recorded" if recorded else "synthetic",
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--frames", type=int, default=50_000)
+    ap.add_argument("--symbols", type=int, default=300)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--batch", type=int, default=64)
+    ap.add_argument("--recorded", nargs="+", help="recorder files/dirs instead of synthetic payloads")
+    args = ap.parse_args()
+    res = run(frames=args.frames, symbols=args.symbols, workers=args.workers, batch=args.batch, recorded=args.recorded)
+    print(json.dumps(res, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# bench/bench_depth.py
+"""
+Depth-within-±X% queries: pure-Python calc_window_depth_usd vs the numpy DepthProfile.
+
+Per book size (levels per side) and symbol count, for W windows at once:
+    python_dict        calc_window_depth_usd(dict) once per window
+    numpy_dict         DepthProfile.from_orderbook(dict) + one vectorized query
+    python_l2book      calc_window_depth_usd(L2Book) once per window
+    numpy_l2book       profile_for_book(L2Book) (cached until the book changes) + query
+    numpy_l2book_cold  same, but the book changes before every query (profile rebuilt)
+    exec_basis_l2book  executable_basis() walk for a --size-usd trade on cached L2Book profiles
+
+ops = symbols evaluated (all W windows for one symbol = one op).
+
+Run:
+    python -m bench.bench_depth [--levels 50 200 500] [--symbols 300] [--windows 0.1 0.5 1 2 5] [--size-usd 10000]
+(English-only comments per project rules)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from src.core.exec_basis import executable_basis
+from src.core.filters.depth import DepthProfile, calc_window_depth_usd, profile_for_book
+from src.core.orderbook import L2Book
+
+
+def _books(symbols: int, levels: int, seed: int = 7) -> list[tuple[dict[str, Any], L2Book, float]]:
+    rnd = random.Random(seed)
+    out = []
+    for i in range(symbols):
+        mid = rnd.uniform(0.05, 50_000)
+        tick = mid * 0.0002
+        bids = [[f"{mid - tick * (k + 1):.8g}", f"{rnd.uniform(0.01, 100):.4f}"] for k in range(levels)]
+        asks = [[f"{mid + tick * (k + 1):.8g}", f"{rnd.uniform(0.01, 100):.4f}"] for k in range(levels)]
+        book = L2Book("linear", f"S{i}", levels)
+        book.load_snapshot(bids, asks, u=1)
+        out.append(({"s": f"S{i}", "b": bids, "a": asks}, book, mid))
+    return out
+
+
+def _timeit(fn: Callable[[], Any], n_ops: int, min_time: float = 0.3) -> dict[str, Any]:
+    fn()  # warm-up
+    loops, t0 = 0, time.perf_counter()
+    while True:
+        fn()
+        loops += 1
+        dt = time.perf_counter() - t0
+        if dt >= min_time:
+            break
+    ops = loops * n_ops
+    return {"ops_per_sec": round(ops / dt, 1), "ns_per_op": round(dt / ops * 1e9, 1), "n": ops, "unit": "symbol"}
+
+
+def _cases(
+    data: list[tuple[dict[str, Any], L2Book, float]], windows: list[float], size_usd: float
+) -> dict[str, Callable[[], None]]:
+    def python_dict() -> None:
+        for ob, _, mid in data:
+            for w in windows:
+                calc_window_depth_usd(ob, mid, w)
+
+    def numpy_dict() -> None:
+        for ob, _, mid in data:
+            DepthProfile.from_orderbook(ob).window_depth_usd(mid, windows)
+
+    def python_l2book() -> None:
+        for _, book, mid in data:
+            for w in windows:
+                calc_window_depth_usd(book, mid, w)
+
+    def numpy_l2book() -> None:
+        for _, book, mid in data:
+            profile_for_book(book).window_depth_usd(mid, windows)
+
+    def numpy_l2book_cold() -> None:
+        for _, book, mid in data:
+            book.version += 1
+            profile_for_book(book).window_depth_usd(mid, windows)
+
+    def exec_basis_l2book() -> None:
+        for _, book, _ in data:
+            executable_basis(book, book, size_usd)  # same book on both legs: timing only
+
+    return {
+        "python_dict": python_dict,
+        "numpy_dict": numpy_dict,
+        "python_l2book": python_l2book,
+        "numpy_l2book": numpy_l2book,
+        "numpy_l2book_cold": numpy_l2book_cold,
+        "exec_basis_l2book": exec_basis_l2book,
+    }
+
+
+def run(*, levels: list[int], symbols: int, windows: list[float], size_usd: float = 10_000.0) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for lv in levels:
+        data = _books(symbols, lv)
+        for name, fn in _cases(data, windows, size_usd).items():
+            results[f"{name}_L{lv}"] = _timeit(fn, len(data))
+    meta = {"symbols": symbols, "levels": levels, "windows": windows, "size_usd": size_usd}
+    return {"meta": meta, "results": results}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--levels", type=int, nargs="+", default=[50, 200, 500])
+    ap.add_argument("--symbols", type=int, default=300)
+    ap.add_argument("--windows", type=float, nargs="+", default=[0.1, 0.5, 1.0, 2.0, 5.0])
+    ap.add_argument("--size-usd", type=float, default=10_000.0)
+    ap.add_argument("--out", help="also write the JSON here (for bench.compare)")
+    args = ap.parse_args()
+    res = run(levels=args.levels, symbols=args.symbols, windows=args.windows, size_usd=args.size_usd)
+    text = json.dumps(res, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
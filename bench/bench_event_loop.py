@@ -0,0 +1,151 @@
+# bench/bench_event_loop.py
+"""
+WS ingest throughput on the stdlib asyncio loop vs uvloop.
+
+Modes:
+    standin   - scripts.fake_bybit_server in a child process pushes tickers and
+                orderbook deltas as fast as the client drains them; the client
+                (BybitWSPool + normalize + WSMultiplexer + QuoteCache, as in
+                ws:run) counts messages handled per second
+    replay    - `--recorded DIR`: ws:replay at max speed over recorder files
+
+Results use the bench JSON layout ({"results": {name: {"ops_per_sec": ...}}}),
+so bench.compare works on them; "gain" is uvloop / asyncio throughput.
+
+Run:
+    python -m bench.bench_event_loop [--symbols 100] [--rate 200] [--seconds 5] [--recorded DIR]
+(English-only comments per project rules)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from typing import Any
+
+from src.ws.eventloop import resolve_loop, run
+
+KINDS = ("asyncio", "uvloop")
+
+
+def _start_server(symbols: int, rate: float) -> tuple[subprocess.Popen[str], str]:
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "scripts.fake_bybit_server",
+            "--port",
+            "0",
+            "--symbols",
+            str(symbols),
+            "--rate",
+            str(rate),
+            "--stats-every",
+            "3600",
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        if line.startswith("WS_PUBLIC_URL_LINEAR="):
+            return proc, line.split("=", 1)[1].strip()
+    proc.kill()
+    raise RuntimeError("fake server did not start")
+
+
+async def _standin_client(url: str, symbols: int, seconds: float, warmup: float) -> dict[str, Any]:
+    from src.core.cache import QuoteCache
+    from src.exchanges.bybit.ws import iter_ticker_entries
+    from src.exchanges.bybit.ws_pool import BybitWSPool
+    from src.ws.multiplexer import WsEvent, WSMultiplexer
+    from src.ws.normalizers.bybit_v5 import normalize
+
+    names = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT", "DOGEUSDT", "ADAUSDT", "LINKUSDT", "TONUSDT"][:symbols]
+    names += [f"FK{i:04d}USDT" for i in range(max(0, symbols - len(names)))]
+    topics = [f"tickers.{s}" for s in names] + [f"orderbook.50.{s}" for s in names[:10]]
+    mux = WSMultiplexer(name="bench")
+    mux.subscribe(lambda e: None)
+    cache = QuoteCache()
+    pool = BybitWSPool(url, topics, source="LINEAR", shards=2)
+    count = 0
+
+    async def on_message(msg: dict) -> None:
+        nonlocal count
+        if not msg.get("topic"):
+            return
+        ev = normalize(msg)
+        mux.publish(WsEvent(source="LINEAR", channel=ev["channel"], symbol=ev["symbol"], payload=ev["data"], ts=0))
+        for row in iter_ticker_entries(msg) if ev["channel"] == "ticker" else ():
+            if row["mark"] is not None:
+                await cache.update(row["symbol"], linear_mark=row["mark"])
+        count += 1
+
+    task = asyncio.create_task(pool.run(on_message))
+    await asyncio.sleep(warmup)
+    c0, t0 = count, time.perf_counter()
+    await asyncio.sleep(seconds)
+    n, dt = count - c0, time.perf_counter() - t0
+    await pool.stop()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    return {"ops_per_sec": round(n / dt, 1), "n": n, "unit": "message"}
+
+
+async def _replay(paths: list[str]) -> dict[str, Any]:
+    from src.ws.recorder import iter_frames
+    from src.ws.replay import replay
+
+    stats = await replay(iter_frames(paths))
+    out = stats.to_dict()
+    return {"ops_per_sec": out["frames_per_sec"], "n": out["frames"], "unit": "frame"}
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--symbols", type=int, default=100)
+    ap.add_argument("--rate", type=float, default=200.0, help="server pushes per second per topic")
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--warmup", type=float, default=1.0)
+    ap.add_argument("--recorded", nargs="+", help="also replay recorder files/dirs at max speed")
+    args = ap.parse_args(argv)
+
+    available = [k for k in KINDS if resolve_loop(k) == k]
+    results: dict[str, Any] = {}
+    proc, url = _start_server(args.symbols, args.rate)
+    try:
+        for kind in available:
+            results[f"standin_{kind}"] = run(_standin_client(url, args.symbols, args.seconds, args.warmup), kind=kind)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=5)
+    if args.recorded:
+        for kind in available:
+            results[f"replay_{kind}"] = run(_replay(args.recorded), kind=kind)
+
+    gain: dict[str, float | None] = {}
+    for mode in ("standin", "replay"):
+        base, fast = results.get(f"{mode}_asyncio"), results.get(f"{mode}_uvloop")
+        if base and fast and base["ops_per_sec"] > 0:
+            gain[mode] = round(fast["ops_per_sec"] / base["ops_per_sec"], 3)
+    doc = {
+        "meta": {
+            "loops": available,
+            "uvloop": "uvloop" in available,
+            "symbols": args.symbols,
+            "rate": args.rate,
+            "seconds": args.seconds,
+        },
+        "results": results,
+        "gain": gain,
+    }
+    print(json.dumps(doc, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# bench/bench_metrics_registry.py
+"""
+Per-event overhead of MetricsRegistry hot-path calls.
+
+Compares the sharded lock-free registry against the previous design
+(class-lock get() per message + instance lock + time.time() under the lock),
+single-threaded and with N writer threads.
+
+Run:
+    python -m bench.bench_metrics_registry [--events 200000] [--threads 4]
+(English-only comments per project rules)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+
+from src.ws.health import MetricsRegistry
+
+
+class _LockedRegistry:
+    """Reference copy of the pre-sharding hot path."""
+
+    _instance: _LockedRegistry | None = None
+    _lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._lock_local = threading.Lock()
+        self.spot = 0
+        self.last_spot_ts = 0.0
+        self.last_event_ts = 0.0
+
+    @classmethod
+    def get(cls) -> _LockedRegistry:
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = _LockedRegistry()
+            return cls._instance
+
+    def inc_spot(self, n: int = 1) -> None:
+        with self._lock_local:
+            self.spot += int(n)
+            now = time.time()
+            self.last_spot_ts = now
+            self.last_event_ts = now
+
+
+def _per_event_ns(fn, events: int, threads: int) -> float:
+    per_thread = max(1, events // threads)
+
+    def work() -> None:
+        for _ in range(per_thread):
+            fn()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    t0 = time.perf_counter_ns()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return (time.perf_counter_ns() - t0) / (per_thread * threads)
+
+
+def run(events: int, threads: int) -> dict[str, float]:
+    reg = MetricsRegistry.get()
+    old = _LockedRegistry.get()
+    cases = {
+        # what BybitPublicWS.run used to do per frame: get() + inc
+        "old_get_and_inc": lambda: _LockedRegistry.get().inc_spot(1),
+        "old_cached_inc": lambda: old.inc_spot(1),
+        "new_get_and_inc": lambda: MetricsRegistry.get().inc_spot(1),
+        "new_cached_inc": lambda: reg.inc_spot(1),
+    }
+    out: dict[str, float] = {}
+    for name, fn in cases.items():
+        for n_threads in sorted({1, threads}):
+            out[f"{name}_t{n_threads}_ns"] = round(_per_event_ns(fn, events, n_threads), 1)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--events", type=int, default=200_000)
+    ap.add_argument("--threads", type=int, default=4)
+    args = ap.parse_args()
+    print(json.dumps(run(args.events, args.threads), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+# bench/bench_pipeline.py
+"""
+Throughput of the WS ingest path, stage by stage.
+
+Stages (ops = frames, ticker rows or calls, see "unit" in the output):
+    iter_ticker_entries        Bybit v5 tickers frame -> rows
+    normalize                  frame -> internal event dict
+    mux_publish_s{N}           WSMultiplexer.publish with N subscribers (half filtered)
+    cache_update               QuoteCache.update (spot / linear_mark alternating)
+    cache_candidates           QuoteCache.candidates over the whole universe
+    alert_gate_should_send     AlertGate.should_send (first / cooldown / Δbasis paths)
+    persistence_save_quote     save_quote into a throwaway SQLite file
+
+Payloads are synthetic Bybit v5 frames; `--recorded DIR` (files written by
+src/ws/recorder.py) replaces them with real captured frames.
+
+Run:
+    python -m bench.bench_pipeline [--events 20000] [--symbols 300] [--out bench.json]
+    python -m bench.bench_pipeline --baseline bench.json --tolerance 0.2   # exit 1 on regression
+(English-only comments per project rules)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from itertools import cycle, islice
+from typing import Any
+
+from src.core.alerts_gate import AlertGate
+from src.core.cache import QuoteCache
+from src.exchanges.bybit.ws import iter_ticker_entries
+from src.ws.multiplexer import WsEvent, WSMultiplexer
+from src.ws.normalizers.bybit_v5 import normalize
+
+SUBSCRIBER_COUNTS = (1, 8, 32)
+
+
+# ---- payloads ---------------------------------------------------------
+def synthetic_frames(symbols: int) -> list[tuple[str, dict[str, Any]]]:
+    """(source, frame) pairs shaped like Bybit v5 spot/linear tickers and orderbook pushes."""
+    ts = 1_700_000_000_000
+    out: list[tuple[str, dict[str, Any]]] = []
+    for i in range(symbols):
+        sym = f"C{i:04d}USDT"
+        px = 1.0 + i * 0.37
+        out.append(
+            (
+                "SPOT",
+                {
+                    "topic": f"tickers.{sym}",
+                    "ts": ts + i,
+                    "type": "snapshot",
+                    "cs": 1000 + i,
+                    "data": {
+                        "symbol": sym,
+                        "lastPrice": f"{px:.4f}",
+                        "highPrice24h": f"{px * 1.02:.4f}",
+                        "lowPrice24h": f"{px * 0.98:.4f}",
+                        "prevPrice24h": f"{px:.4f}",
+                        "volume24h": "123456.7",
+                        "turnover24h": "9876543.21",
+                        "price24hPcnt": "0.0123",
+                    },
+                },
+            )
+        )
+        out.append(
+            (
+                "LINEAR",
+                {
+                    "topic": f"tickers.{sym}",
+                    "ts": ts + i,
+                    "type": "delta",
+                    "cs": 2000 + i,
+                    "data": {
+                        "symbol": sym,
+                        "markPrice": f"{px * 1.003:.4f}",
+                        "indexPrice": f"{px:.4f}",
+                        "lastPrice": f"{px * 1.003:.4f}",
+                        "fundingRate": "0.0001",
+                        "openInterest": "5000",
+                    },
+                },
+            )
+        )
+        if i % 10 == 0:
+            out.append(
+                (
+                    "LINEAR",
+                    {
+                        "topic": f"orderbook.50.{sym}",
+                        "ts": ts + i,
+                        "type": "delta",
+                        "data": {
+                            "s": sym,
+                            "b": [[f"{px - k * 0.01:.4f}", "10"] for k in range(5)],
+                            "a": [[f"{px + k * 0.01:.4f}", "10"] for k in range(5)],
+                            "u": i,
+                            "seq": i,
+                        },
+                    },
+                )
+            )
+    return out
+
+
+def recorded_frames(paths: list[str], limit: int | None = None) -> list[tuple[str, dict[str, Any]]]:
+    """Data frames (with a topic) from recorder files, in receive order."""
+    from src.ws.recorder import iter_frames
+
+    out: list[tuple[str, dict[str, Any]]] = []
+    for _, source, raw in iter_frames(paths):
+        try:
+            msg = json.loads(raw)
+        except ValueError:
+            continue
+        if isinstance(msg, dict) and msg.get("topic"):
+            out.append((source, msg))
+            if limit is not None and len(out) >= limit:
+                break
+    return out
+
+
+# ---- timing -----------------------------------------------------------
+def _best(samples_ns: list[int], n: int, unit: str) -> dict[str, Any]:
+    ns = min(samples_ns)
+    per_op = ns / n
+    return {
+        "ops_per_sec": round(1e9 / per_op, 1) if per_op > 0 else 0.0,
+        "ns_per_op": round(per_op, 1),
+        "n": n,
+        "unit": unit,
+    }
+
+
+def _time_sync(fn: Callable[[Any], Any], items: list[Any], repeat: int, unit: str) -> dict[str, Any]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        for it in items:
+            fn(it)
+        samples.append(time.perf_counter_ns() - t0)
+    return _best(samples, len(items), unit)
+
+
+async def _time_async(fn: Callable[[Any], Any], items: list[Any], repeat: int, unit: str) -> dict[str, Any]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        for it in items:
+            await fn(it)
+        samples.append(time.perf_counter_ns() - t0)
+    return _best(samples, len(items), unit)
+
+
+# ---- stages -----------------------------------------------------------
+def _bench_parse(frames: list[tuple[str, dict[str, Any]]], repeat: int) -> dict[str, dict[str, Any]]:
+    msgs = [m for _, m in frames]
+    tickers = [m for m in msgs if str(m.get("topic", "")).startswith("tickers")]
+    out = {"normalize": _time_sync(normalize, msgs, repeat, "frame")}
+    if tickers:
+        out["iter_ticker_entries"] = _time_sync(lambda m: list(iter_ticker_entries(m)), tickers, repeat, "frame")
+    return out
+
+
+def _bench_mux(frames: list[tuple[str, dict[str, Any]]], repeat: int) -> dict[str, dict[str, Any]]:
+    events = []
+    for source, msg in frames:
+        ev = normalize(msg)
+        events.append(WsEvent(source=source, channel=ev["channel"], symbol=ev["symbol"], payload=ev["data"], ts=0))
+    out = {}
+    for n_subs in SUBSCRIBER_COUNTS:
+        mux = WSMultiplexer(name="bench")
+        for k in range(n_subs):
+            # mix of catch-all and filtered subscribers, like bridge + alerts + recorders
+            mux.subscribe(lambda e: None, source=None if k % 2 == 0 else "LINEAR")
+        out[f"mux_publish_s{n_subs}"] = _time_sync(mux.publish, events, repeat, "event")
+    return out
+
+
+async def _bench_cache(frames: list[tuple[str, dict[str, Any]]], repeat: int) -> dict[str, dict[str, Any]]:
+    cache = QuoteCache()
+    updates: list[tuple[str, dict[str, float]]] = []
+    for source, msg in frames:
+        for row in iter_ticker_entries(msg):
+            if source == "SPOT" and row["last"] is not None:
+                updates.append((row["symbol"], {"spot": row["last"]}))
+            elif source == "LINEAR" and row["mark"] is not None:
+                updates.append((row["symbol"], {"linear_mark": row["mark"]}))
+    out: dict[str, dict[str, Any]] = {}
+    if not updates:
+        return out
+
+    async def _update(u: tuple[str, dict[str, float]]) -> None:
+        await cache.update(u[0], **u[1])
+
+    out["cache_update"] = await _time_async(_update, updates, repeat, "row")
+
+    calls = list(range(max(10, len(updates) // 100)))
+
+    async def _candidates(_: int) -> None:
+        await cache.candidates(threshold_pct=0.1)
+
+    out["cache_candidates"] = await _time_async(_candidates, calls, repeat, "call")
+    out["cache_candidates"]["symbols"] = len(await cache.snapshot())
+    return out
+
+
+def _bench_gate(symbols: list[str], events: int, repeat: int) -> dict[str, dict[str, Any]]:
+    t0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    calls = [
+        (sym, 1.0 + (i % 7) * 0.1, t0 + timedelta(seconds=i % 600))
+        for i, sym in enumerate(islice(cycle(symbols), events))
+    ]
+    samples = []
+    for _ in range(repeat):
+        gate = AlertGate(cooldown_sec=300, suppress_eps_pct=0.2, suppress_window_min=15)
+        for sym in symbols[::2]:
+            gate.commit(sym, 1.0, t0)
+        should_send = gate.should_send
+        s = time.perf_counter_ns()
+        for sym, basis, ts in calls:
+            should_send(sym, basis_pct=basis, ts=ts)
+        samples.append(time.perf_counter_ns() - s)
+    return {"alert_gate_should_send": _best(samples, len(calls), "call")}
+
+
+def _bench_persistence(symbols: list[str], n: int, repeat: int) -> dict[str, dict[str, Any]]:
+    from src.storage import persistence
+
+    prev = os.environ.get("DB_PATH")
+    samples = []
+    with tempfile.TemporaryDirectory(prefix="bench-db-") as tmp:
+        os.environ["DB_PATH"] = os.path.join(tmp, "bench.db")
+        try:
+            persistence.init_db()
+            base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+            for r in range(repeat):
+                rows = [(sym, base + timedelta(seconds=r * n + i)) for i, sym in enumerate(islice(cycle(symbols), n))]
+                s = time.perf_counter_ns()
+                for sym, ts in rows:
+                    persistence.save_quote(sym, 1.0, 1.003, 0.3, 1e6, ts=ts)
+                samples.append(time.perf_counter_ns() - s)
+        finally:
+            if prev is None:
+                os.environ.pop("DB_PATH", None)
+            else:
+                os.environ["DB_PATH"] = prev
+    return {"persistence_save_quote": _best(samples, n, "row")}
+
+
+def run(
+    *,
+    events: int = 20_000,
+    symbols: int = 300,
+    repeat: int = 3,
+    recorded: list[str] | None = None,
+    db_writes: int = 500,
+) -> dict[str, Any]:
+    """Run all stages; returns {"meta": ..., "results": {stage: {...}}}."""
+    base = recorded_frames(recorded, limit=events) if recorded else synthetic_frames(symbols)
+    if not base:
+        raise SystemExit("no data frames to benchmark")
+    frames = list(islice(cycle(base), events))
+    syms = sorted({str(normalize(m)["symbol"]) for _, m in base} - {""}) or ["BTCUSDT"]
+
+    results: dict[str, dict[str, Any]] = {}
+    results.update(_bench_parse(frames, repeat))
+    results.update(_bench_mux(frames, repeat))
+    results.update(asyncio.run(_bench_cache(frames, repeat)))
+    results.update(_bench_gate(syms, events, repeat))
+    if db_writes > 0:
+        results.update(_bench_persistence(syms, db_writes, repeat))
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "payloads": "recorded" if recorded else "synthetic",
+            "frames": len(frames),
+            "symbols": len(syms),
+            "repeat": repeat,
+            "ts": int(time.time()),
+        },
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--events", type=int, default=20_000, help="frames per stage")
+    ap.add_argument("--symbols", type=int, default=300, help="synthetic universe size")
+    ap.add_argument("--repeat", type=int, default=3, help="best-of-N runs per stage")
+    ap.add_argument("--db-writes", type=int, default=500, help="save_quote calls (0 skips persistence)")
+    ap.add_argument("--recorded", nargs="+", help="recorder files/dirs instead of synthetic payloads")
+    ap.add_argument("--out", help="write JSON results to this file")
+    ap.add_argument("--baseline", help="compare against a previous --out file")
+    ap.add_argument("--tolerance", type=float, default=0.20, help="allowed throughput drop (fraction)")
+    args = ap.parse_args(argv)
+
+    res = run(
+        events=args.events,
+        symbols=args.symbols,
+        repeat=args.repeat,
+        recorded=args.recorded,
+        db_writes=args.db_writes,
+    )
+    text = json.dumps(res, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    print(text)
+
+    if args.baseline:
+        from bench.compare import compare, format_report, load_results
+
+        rows = compare(load_results(args.baseline), res, tolerance=args.tolerance)
+        print(format_report(rows, args.tolerance), file=sys.stderr)
+        return 1 if any(r["status"] == "regression" for r in rows) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
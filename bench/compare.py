@@ -0,0 +1,87 @@
+# bench/compare.py
+"""
+Regression comparator for bench JSON results.
+
+Input files are `python -m bench.bench_pipeline --out ...` results
+({"results": {stage: {"ops_per_sec": ...}}}). A stage regresses when its
+throughput drops by more than `tolerance` (fraction) against the baseline.
+
+Run:
+    python -m bench.compare baseline.json current.json [--tolerance 0.2]
+Exit code 1 when any stage regressed, 0 otherwise.
+(English-only comments per project rules)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any
+
+
+def load_results(path: str) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _ops(doc: dict[str, Any]) -> dict[str, float]:
+    res = doc.get("results", doc)
+    out: dict[str, float] = {}
+    for name, row in res.items():
+        if isinstance(row, dict) and isinstance(row.get("ops_per_sec"), (int, float)):
+            out[name] = float(row["ops_per_sec"])
+    return out
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], *, tolerance: float = 0.20) -> list[dict[str, Any]]:
+    """
+    Per-stage rows {name, baseline, current, change, status}; change is the
+    relative throughput delta (-0.3 = 30% slower). Status is one of
+    ok | improved | regression | missing | new.
+    """
+    base, cur = _ops(baseline), _ops(current)
+    rows: list[dict[str, Any]] = []
+    for name in sorted(base.keys() | cur.keys()):
+        b, c = base.get(name), cur.get(name)
+        if b is None:
+            rows.append({"name": name, "baseline": None, "current": c, "change": None, "status": "new"})
+            continue
+        if c is None:
+            rows.append({"name": name, "baseline": b, "current": None, "change": None, "status": "missing"})
+            continue
+        change = (c - b) / b if b > 0 else 0.0
+        if change < -tolerance:
+            status = "regression"
+        elif change > tolerance:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "baseline": b, "current": c, "change": round(change, 4), "status": status})
+    return rows
+
+
+def format_report(rows: list[dict[str, Any]], tolerance: float) -> str:
+    lines = [f"{'stage':<28} {'baseline/s':>14} {'current/s':>14} {'change':>8}  status (tolerance {tolerance:.0%})"]
+    for r in rows:
+        b = f"{r['baseline']:,.0f}" if r["baseline"] is not None else "-"
+        c = f"{r['current']:,.0f}" if r["current"] is not None else "-"
+        ch = f"{r['change']:+.1%}" if r["change"] is not None else "-"
+        lines.append(f"{r['name']:<28} {b:>14} {c:>14} {ch:>8}  {r['status']}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("baseline")
+    ap.add_argument("current")
+    ap.add_argument("--tolerance", type=float, default=0.20, help="allowed throughput drop (fraction)")
+    args = ap.parse_args(argv)
+
+    rows = compare(load_results(args.baseline), load_results(args.current), tolerance=args.tolerance)
+    print(format_report(rows, args.tolerance))
+    return 1 if any(r["status"] == "regression" for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
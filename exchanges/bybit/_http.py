@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import time
 from typing import Any, Callable, Protocol
 
@@ -12,27 +13,41 @@ except Exception:  # noqa: BLE001
 
 from .auth import canonical_json, canonical_query, sign_v5
 from .errors import map_error
+from .rate_limiter import LimiterRegistry, parse_limit_headers
 
 
 class _RateLimiterProto(Protocol):
     async def acquire(self, tokens: int = 1) -> None: ...
 
 
+_CacheKey = tuple[str, str]
+
+
 class HTTPClient:
     """
     Обгортка над httpx.AsyncClient з експоненційними ретраями та опціональним rate-лімітером.
     - ретраї по 429/5xx/мережевих помилках
     - ретраї по BYBIT retCode, що відповідають rate-limit
+    - single-flight для публічних GET: одночасні виклики з тим самим (path, params)
+      чекають один HTTP-запит (coalesce=True)
+    - опційний micro-TTL кеш відповідей GET (cache_ttl > 0, секунди)
+
+    Спільна відповідь (coalesce/кеш) віддається кожному викликачу як власна deepcopy,
+    тож викликач може її мутувати, не зачіпаючи інших.
+    GET із власними headers (підписані запити) завжди йдуть окремо.
     """
 
     def __init__(
         self,
         base_url: str,
         timeout: float = 10.0,
-        limiter: _RateLimiterProto | None = None,
+        limiter: _RateLimiterProto | LimiterRegistry | None = None,
         max_retries: int = 3,
         backoff_factor: float = 0.5,
         client: Any = None,  # для тестів можна передати фейковий клієнт із методом .request()
+        coalesce: bool = True,
+        cache_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
     ):
         if httpx is None and client is None:
             raise ImportError("httpx не встановлено. Додай пакет 'httpx' у requirements.")
@@ -40,6 +55,36 @@ class HTTPClient:
         self._limiter = limiter
         self._max_retries = max_retries
         self._backoff_factor = backoff_factor
+        self._coalesce = coalesce
+        self._cache_ttl = float(cache_ttl)
+        self._clock = clock
+        self._inflight: dict[_CacheKey, asyncio.Task[dict[str, Any]]] = {}
+        self._cache: dict[_CacheKey, tuple[float, dict[str, Any]]] = {}
+
+    async def _acquire(self, path: str) -> None:
+        lim = self._limiter
+        if lim is None:
+            return
+        # LimiterRegistry: бакет групи ліміту + вага ендпоінта; інакше — один бакет
+        for_path = getattr(lim, "for_path", None)
+        if callable(for_path):
+            await for_path(path).acquire(lim.cost_for(path))  # type: ignore[attr-defined]
+        else:
+            await lim.acquire(1)
+
+    def _observe_limits(self, path: str, resp: Any) -> None:
+        lim = self._limiter
+        headers = getattr(resp, "headers", None)
+        if lim is None or not headers:
+            return
+        observe = getattr(lim, "observe", None)
+        if callable(observe):
+            observe(path, headers)
+            return
+        sync = getattr(lim, "sync_remaining", None)
+        info = parse_limit_headers(headers)
+        if callable(sync) and info is not None:
+            sync(*info)
 
     async def _sleep_backoff(self, attempt: int) -> None:
         delay = self._backoff_factor * (2**attempt)
@@ -63,8 +108,7 @@ class HTTPClient:
     ) -> dict[str, Any]:
         last_exc: Exception | None = None
         for attempt in range(self._max_retries + 1):
-            if self._limiter is not None:
-                await self._limiter.acquire(1)
+            await self._acquire(path)
             try:
                 req_kwargs: dict[str, Any] = {"params": params, "json": json}
                 # 👇 передаємо headers тільки якщо він заданий
@@ -72,6 +116,7 @@ class HTTPClient:
                     req_kwargs["headers"] = headers
 
                 resp = await self._client.request(method, path, **req_kwargs)
+                self._observe_limits(path, resp)
                 status = getattr(resp, "status_code", 200)
                 # 429/5xx — повтор
                 if self._should_retry_status(status):
@@ -110,7 +155,38 @@ class HTTPClient:
         params: dict[str, Any] | None = None,
         headers: dict[str, str] | None = None,
     ) -> dict[str, Any]:
-        return await self._request("GET", path, params=params, json=None, headers=headers)
+        if headers is not None or not (self._coalesce or self._cache_ttl > 0):
+            return await self._request("GET", path, params=params, json=None, headers=headers)
+
+        key: _CacheKey = (path, canonical_query(params))
+        if self._cache_ttl > 0:
+            hit = self._cache.get(key)
+            if hit is not None:
+                if hit[0] > self._clock():
+                    return copy.deepcopy(hit[1])
+                del self._cache[key]
+
+        task = self._inflight.get(key) if self._coalesce else None
+        if task is None:
+            task = asyncio.ensure_future(self._request("GET", path, params=params, json=None, headers=None))
+            task.add_done_callback(lambda t, k=key: self._on_get_done(k, t))
+            if self._coalesce:
+                self._inflight[key] = task
+        # shield: скасування одного викликача не скасовує спільний запит для інших
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _on_get_done(self, key: _CacheKey, task: asyncio.Task[dict[str, Any]]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        exc = task.exception()  # позначаємо виняток як отриманий, навіть якщо всі викликачі пішли
+        if exc is None and self._cache_ttl > 0:
+            self._cache[key] = (self._clock() + self._cache_ttl, task.result())
+
+    def invalidate_cache(self) -> None:
+        """Скидає micro-TTL кеш GET-відповідей."""
+        self._cache.clear()
 
     async def post(
         self,
@@ -121,6 +197,7 @@ class HTTPClient:
         return await self._request("POST", path, params=None, json=json, headers=headers)
 
     async def close(self) -> None:
+        self._cache.clear()
         close = getattr(self._client, "aclose", None)
         if callable(close):
             await close()
@@ -140,7 +217,7 @@ class SignedHTTPClient(HTTPClient):
         api_secret: str,
         recv_window_ms: int = 5000,
         timeout: float = 10.0,
-        limiter: _RateLimiterProto | None = None,
+        limiter: _RateLimiterProto | LimiterRegistry | None = None,
         max_retries: int = 3,
         backoff_factor: float = 0.5,
         client: Any = None,
@@ -8,6 +8,7 @@ from typing import Any
 from exchanges.contracts import Balance, IAccountClient
 
 from ._http import SignedHTTPClient
+from .rate_limiter import default_registry
 from .types import BybitConfig
 
 
@@ -25,6 +26,7 @@ class BybitAccountClient(IAccountClient):
                 api_key=api_key,
                 api_secret=api_secret,
                 recv_window_ms=cfg.recv_window_ms,
+                limiter=default_registry(),
             )
 
     async def _ensure_http(self) -> SignedHTTPClient:
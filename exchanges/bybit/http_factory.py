@@ -13,11 +13,12 @@ def _flag(name: str, default: str = "0") -> bool:
     return str(val).lower() not in ("", "0", "false", "no", "off")
 
 
-def build_async_client() -> httpx.AsyncClient:
+def build_async_client(base_url: str | None = None) -> httpx.AsyncClient:
     """
     Створює httpx.AsyncClient.
     Якщо BYBIT_DEBUG_HTTP=1 — підключає безпечні event_hooks з маскуванням секретів.
     Додатково: BYBIT_DEBUG_BODY=1 — логувати SANITIZED body.
+    base_url — опційно, щоб клієнт можна було передати в HTTPClient(client=...).
     """
     debug_http = _flag("BYBIT_DEBUG_HTTP")
     debug_body = _flag("BYBIT_DEBUG_BODY")
@@ -34,4 +35,7 @@ def build_async_client() -> httpx.AsyncClient:
     )
 
     # Примітка: verify=True за замовч., HTTP/2 не вимагаємо.
-    return httpx.AsyncClient(timeout=timeout, limits=limits, event_hooks=event_hooks)
+    kwargs: dict = {"timeout": timeout, "limits": limits, "event_hooks": event_hooks}
+    if base_url:
+        kwargs["base_url"] = base_url
+    return httpx.AsyncClient(**kwargs)
@@ -14,7 +14,7 @@ from exchanges.contracts import (
 
 from ._http import HTTPClient
 from .errors import map_error
-from .rate_limiter import AsyncTokenBucket
+from .rate_limiter import AsyncTokenBucket, LimiterRegistry, default_registry
 from .symbol_mapper import normalize_symbol, to_bybit_symbol
 from .types import BybitConfig, Interval
 
@@ -101,11 +101,12 @@ class BybitPublicClient(IExchangePublic):
     def __init__(
         self,
         cfg: BybitConfig,
-        limiter: AsyncTokenBucket | None = None,
+        limiter: AsyncTokenBucket | LimiterRegistry | None = None,
         http_client: HTTPClient | None = None,  # тестовий інжект
     ):
         self.cfg = cfg
-        self.limiter = limiter or AsyncTokenBucket(rate_per_sec=10, burst=20)
+        # За замовчуванням — спільний реєстр лімітів (група "market" для /v5/market/*)
+        self.limiter = limiter or default_registry()
         self.http = http_client or HTTPClient(cfg.base_url_public, limiter=self.limiter)
 
     @property
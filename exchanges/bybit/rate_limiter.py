@@ -2,12 +2,31 @@
 from __future__ import annotations
 
 import asyncio
+import os
 import threading
 import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+__all__ = [
+    "TokenBucket",
+    "AsyncTokenBucket",
+    "LimiterRegistry",
+    "DEFAULT_GROUP_LIMITS",
+    "DEFAULT_PATH_COSTS",
+    "group_for_path",
+    "parse_limit_headers",
+    "default_registry",
+]
 
 
 class TokenBucket:
-    """Синхронний токен-бакет (може застосовуватись у не-async ділянках)."""
+    """
+    Синхронний токен-бакет (може застосовуватись у не-async ділянках).
+
+    Токени резервуються під локом (баланс може піти в мінус), а очікування
+    відбувається вже без локу — потоки не серіалізуються на sleep().
+    """
 
     def __init__(self, rate_per_sec: float, burst: int):
         self.rate = rate_per_sec
@@ -19,36 +38,207 @@ class TokenBucket:
     def acquire(self, tokens: int = 1) -> None:
         with self._lock:
             now = time.monotonic()
-            elapsed = now - self._ts
+            self._tokens = min(self.capacity, self._tokens + (now - self._ts) * self.rate)
             self._ts = now
-            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
-            if self._tokens < tokens:
-                wait = (tokens - self._tokens) / self.rate
-                time.sleep(max(0.0, wait))
-                self._tokens = 0.0
-            else:
-                self._tokens -= tokens
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
 
 
 class AsyncTokenBucket:
-    """Async варіант токен-бакету для використання з async HTTP."""
+    """
+    Async варіант токен-бакету для використання з async HTTP.
 
-    def __init__(self, rate_per_sec: float, burst: int):
+    Резервування токенів синхронне (без await) і йде під threading.Lock, як у TokenBucket:
+    кожен викликач одразу отримує свою чергу в часі й спить незалежно від інших
+    (asyncio.Lock не потрібен). Лок робить бакет безпечним і між event loop-ами в
+    різних потоках — default_registry() спільний на процес.
+
+    sync_remaining() підлаштовує локальний баланс під серверний
+    `X-Bapi-Limit-Status` / `X-Bapi-Limit-Reset-Timestamp`.
+    """
+
+    def __init__(
+        self,
+        rate_per_sec: float,
+        burst: int,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ):
         self.rate = rate_per_sec
         self.capacity = float(burst)
         self._tokens = float(burst)
-        self._ts = time.monotonic()
-        self._lock = asyncio.Lock()
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._ts = clock()
+        self._paused_until = 0.0  # monotonic; сервер повідомив, що квота вичерпана
+        self._lock = threading.Lock()  # лише на час арифметики, ніколи через await
+
+    def _refill(self) -> float:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._ts) * self.rate)
+        self._ts = now
+        return now
+
+    def reserve(self, tokens: int = 1) -> float:
+        """Резервує `tokens` і повертає, скільки секунд треба зачекати перед запитом."""
+        with self._lock:
+            now = self._refill()
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now, 0.0)
 
     async def acquire(self, tokens: int = 1) -> None:
-        async with self._lock:
-            now = time.monotonic()
-            elapsed = now - self._ts
-            self._ts = now
-            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
-            if self._tokens < tokens:
-                wait = (tokens - self._tokens) / self.rate
-                await asyncio.sleep(max(0.0, wait))
-                self._tokens = 0.0
-            else:
-                self._tokens -= tokens
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def sync_remaining(self, remaining: float, reset_at: float | None = None) -> None:
+        """
+        Серверна квота важливіша за локальну оцінку:
+          - баланс не може бути більшим за `remaining`;
+          - при `remaining <= 0` нові запити чекають до `reset_at` (epoch, секунди).
+        """
+        with self._lock:
+            now = self._refill()
+            self._tokens = min(self._tokens, float(remaining))
+            if remaining <= 0 and reset_at is not None:
+                delay = reset_at - self._wall_clock()
+                if delay > 0:
+                    self._paused_until = max(self._paused_until, now + delay)
+
+
+# Bybit v5 limit groups: (rate_per_sec, burst).
+# market — IP-ліміт публічних даних (600 запитів / 5 с), з запасом;
+# order/account — ліміти на UID для create/amend/cancel та wallet/position.
+DEFAULT_GROUP_LIMITS: dict[str, tuple[float, int]] = {
+    "market": (50.0, 100),
+    "order": (10.0, 10),
+    "account": (10.0, 10),
+}
+
+# Вага запиту за шляхом (за замовчуванням 1). Batch-ендпоінти рахуються
+# за кількістю ордерів — беремо верхню межу пакета.
+DEFAULT_PATH_COSTS: dict[str, int] = {
+    "/v5/order/create-batch": 10,
+    "/v5/order/amend-batch": 10,
+    "/v5/order/cancel-batch": 10,
+}
+
+_GROUP_PREFIXES: tuple[tuple[str, str], ...] = (
+    ("/v5/market/", "market"),
+    ("/v5/order/", "order"),
+    ("/v5/account/", "account"),
+    ("/v5/asset/", "account"),
+    ("/v5/position/", "account"),
+)
+
+
+def group_for_path(path: str) -> str:
+    """Група ліміту Bybit для шляху; невідомі шляхи — у "market"."""
+    for prefix, group in _GROUP_PREFIXES:
+        if path.startswith(prefix):
+            return group
+    return "market"
+
+
+def parse_limit_headers(headers: Any) -> tuple[float, float | None] | None:
+    """
+    (remaining, reset_at_epoch_sec) з `X-Bapi-Limit-Status` / `X-Bapi-Limit-Reset-Timestamp`,
+    або None, якщо заголовків немає. Регістр ключів не важливий.
+    """
+    if not headers:
+        return None
+    try:
+        items = {str(k).lower(): v for k, v in headers.items()}
+    except Exception:
+        return None
+    status = items.get("x-bapi-limit-status")
+    if status is None:
+        return None
+    try:
+        remaining = float(status)
+    except (TypeError, ValueError):
+        return None
+    reset_at: float | None = None
+    raw_reset = items.get("x-bapi-limit-reset-timestamp")
+    if raw_reset is not None:
+        try:
+            reset_at = float(raw_reset) / 1000.0
+        except (TypeError, ValueError):
+            reset_at = None
+    return remaining, reset_at
+
+
+class LimiterRegistry:
+    """
+    Набір AsyncTokenBucket за групами лімітів Bybit (market / order / account)
+    з вагами запитів за шляхом. HTTPClient приймає реєстр замість одного бакета:
+    for_path() + cost_for() для acquire, observe() — для заголовків відповіді.
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, tuple[float, int]] | None = None,
+        *,
+        costs: Mapping[str, int] | None = None,
+    ) -> None:
+        self._buckets: dict[str, AsyncTokenBucket] = {
+            group: AsyncTokenBucket(rate_per_sec=rate, burst=burst)
+            for group, (rate, burst) in (limits or DEFAULT_GROUP_LIMITS).items()
+        }
+        self._costs = dict(DEFAULT_PATH_COSTS if costs is None else costs)
+
+    @classmethod
+    def from_env(cls) -> LimiterRegistry:
+        """
+        BYBIT_RATE_LIMIT_<GROUP>_RPS / BYBIT_RATE_LIMIT_<GROUP>_BURST перекривають
+        DEFAULT_GROUP_LIMITS (наприклад, BYBIT_RATE_LIMIT_MARKET_RPS=80).
+        """
+        limits: dict[str, tuple[float, int]] = {}
+        for group, (rate, burst) in DEFAULT_GROUP_LIMITS.items():
+            key = group.upper()
+            try:
+                rate = float(os.getenv(f"BYBIT_RATE_LIMIT_{key}_RPS", str(rate)))
+                burst = int(os.getenv(f"BYBIT_RATE_LIMIT_{key}_BURST", str(burst)))
+            except ValueError:
+                pass
+            limits[group] = (rate, burst)
+        return cls(limits)
+
+    def bucket(self, group: str) -> AsyncTokenBucket:
+        try:
+            return self._buckets[group]
+        except KeyError:
+            raise KeyError(f"unknown rate-limit group: {group!r}") from None
+
+    def for_path(self, path: str) -> AsyncTokenBucket:
+        group = group_for_path(path)
+        return self._buckets.get(group) or self._buckets["market"]
+
+    def cost_for(self, path: str) -> int:
+        return self._costs.get(path, 1)
+
+    async def acquire(self, group: str = "market", cost: int = 1) -> None:
+        """Зважений acquire для групи (для викликачів поза HTTPClient)."""
+        await self.bucket(group).acquire(cost)
+
+    def observe(self, path: str, headers: Any) -> None:
+        info = parse_limit_headers(headers)
+        if info is not None:
+            self.for_path(path).sync_remaining(*info)
+
+
+_default_registry: LimiterRegistry | None = None
+_default_registry_lock = threading.Lock()
+
+
+def default_registry() -> LimiterRegistry:
+    """Спільний на процес реєстр (ліміти Bybit рахуються на IP/UID, а не на клієнт)."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = LimiterRegistry.from_env()
+        return _default_registry
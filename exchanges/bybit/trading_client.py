@@ -7,6 +7,7 @@ from typing import Any
 from exchanges.contracts import ITradingClient  # ✅ наслідуємо контракт
 
 from ._http import SignedHTTPClient
+from .rate_limiter import default_registry
 from .symbol_mapper import to_bybit_symbol
 from .types import BybitConfig
 
@@ -77,6 +78,7 @@ class BybitTradingClient(ITradingClient):
                     api_key=api_key,
                     api_secret=api_secret,
                     recv_window_ms=cfg.recv_window_ms,
+                    limiter=default_registry(),
                 )
 
     async def _ensure_http(self) -> SignedHTTPClient:
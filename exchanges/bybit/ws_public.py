@@ -149,17 +149,20 @@ class _WsPublic:
         retry_backoff_s: float = 5.0,
         ping_interval_s: float = 20.0,
         use_orderbook_top: bool | None = None,
+        url: str | None = None,
     ) -> None:
         self.symbol = symbol
         self.on_ticker = on_ticker
         self.category = (category or os.getenv("BYBIT_DEFAULT_CATEGORY", "spot") or "spot").lower()
 
-        # Визначаємо testnet/mainnet за REST-URL з env
-        public_url = os.getenv("BYBIT_PUBLIC_URL", "https://api.bybit.com")
-        is_testnet = "testnet" in public_url.lower()
-
-        host = "wss://stream-testnet.bybit.com" if is_testnet else "wss://stream.bybit.com"
-        self._url = f"{host}/v5/public/{self.category}"
+        # Хост: явний url > BYBIT_WS_PUBLIC_URL (напр. локальний фейковий сервер) >
+        # testnet/mainnet за REST-URL з env
+        host = os.getenv("BYBIT_WS_PUBLIC_URL", "").strip().rstrip("/")
+        if not host:
+            public_url = os.getenv("BYBIT_PUBLIC_URL", "https://api.bybit.com")
+            is_testnet = "testnet" in public_url.lower()
+            host = "wss://stream-testnet.bybit.com" if is_testnet else "wss://stream.bybit.com"
+        self._url = url or f"{host}/v5/public/{self.category}"
 
         self._read_timeout_s = read_timeout_s
         self._retry_backoff_s = retry_backoff_s
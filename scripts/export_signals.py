@@ -1,16 +1,77 @@
+"""
+Export signals (or quote snapshots) from SQLite to CSV / CSV.gz / CSV.zst / Parquet / Arrow.
+
+Rows are streamed: the cursor is read in fetchmany() chunks (--chunk-size, EXPORT_CHUNK_SIZE)
+and each chunk is written before the next one is fetched, so months of data export in
+constant memory. Format and compression follow the --out suffix unless given explicitly:
+    .csv  .csv.gz  .csv.zst  -> CSV (zstd needs `zstandard`)
+    .parquet                 -> Parquet, one row group per chunk (needs `pyarrow`)
+    .arrow / .feather        -> Arrow IPC file, one record batch per chunk (needs `pyarrow`)
+
+--table quotes also reads the daily/weekly quote partition files next to the DB
+(QUOTES_PARTITION_DIR, see src/storage/partitions.py), merged newest first.
+"""
+
 from __future__ import annotations
 
 import argparse
 import csv
+import gzip
+import io
+import itertools
 import os
 import sqlite3
+import sys
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import IO
+
+try:
+    import zstandard  # type: ignore
+except Exception:  # noqa: BLE001
+    zstandard = None  # optional dependency: only .csv.zst output needs it
+
+try:
+    import pyarrow  # type: ignore
+    import pyarrow.ipc  # type: ignore
+    import pyarrow.parquet  # type: ignore
+except Exception:  # noqa: BLE001
+    pyarrow = None  # optional dependency: only Parquet / Arrow output needs it
+
+if not __package__:  # run as a file (launcher_export.cmd): make `src` importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.storage.partitions import (  # noqa: E402 (stdlib-only, no settings load)
+    iter_partition_rows,
+    list_partitions,
+    merge_newest_first,
+    partition_dir,
+)
 
 DEFAULT_DB = "data/signals.db"
 
 ISO_FMT = "%Y-%m-%dT%H:%M:%S.%f"
 
+TABLES = ("signals", "quotes")
+
+FORMATS = ("csv", "parquet", "arrow")
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Column order of the output (CSV header, Parquet/Arrow schema) and of the SELECT
+SELECT_COLUMNS = ("timestamp", "symbol", "spot_price", "futures_price", "basis_pct", "volume_24h_usd")
+
+_SUFFIXES = {
+    ("csv", "none"): ".csv",
+    ("csv", "gzip"): ".csv.gz",
+    ("csv", "zstd"): ".csv.zst",
+    ("parquet", "none"): ".parquet",
+    ("arrow", "none"): ".arrow",
+}
+
 
 def _ensure_parent_dir(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -24,20 +85,18 @@ def _parse_iso(s: str) -> datetime:
         return datetime.fromisoformat(s).replace(tzinfo=timezone.utc)
 
 
-def _select_rows(
-    con: sqlite3.Connection,
+def _select_sql(
+    table: str,
     last_hours: int | None,
     since: str | None,
     until: str | None,
     limit: int | None,
-) -> list[tuple]:
-    base_sql = """
-
-      SELECT symbol, spot_price, futures_price, basis_pct, volume_24h_usd, timestamp
-
-      FROM signals
+) -> tuple[str, list[object]]:
+    if table not in TABLES:
+        raise ValueError(f"--table must be one of: {', '.join(TABLES)}")
 
-    """
+    # Same columns in signals and quotes (quotes prices may be NULL)
+    base_sql = f"SELECT {', '.join(SELECT_COLUMNS)} FROM {table}"
 
     where = []
 
@@ -63,6 +122,7 @@ def _select_rows(
 
     where_sql = (" WHERE " + " AND ".join(where)) if where else ""
 
+    # Walks idx_<table>_ts backwards: no temp B-tree sort, rows come out as they are read
     order_sql = " ORDER BY timestamp DESC"
 
     limit_sql = " LIMIT ?" if (limit is not None and int(limit) > 0) else ""
@@ -70,13 +130,31 @@ def _select_rows(
     if limit_sql:
         params.append(int(limit))
 
-    sql = base_sql + where_sql + order_sql + limit_sql
+    return base_sql + where_sql + order_sql + limit_sql, params
+
 
+def _iter_rows(con: sqlite3.Connection, sql: str, params: list[object], chunk_size: int) -> Iterator[list[tuple]]:
+    """Cursor-iterated chunks of at most chunk_size rows (fetchmany), so memory does not grow with the export."""
     cur = con.cursor()
 
+    cur.arraysize = chunk_size
+
     cur.execute(sql, params)
 
-    return cur.fetchall()
+    while True:
+        chunk = cur.fetchmany(chunk_size)
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def _chunked(rows: Iterable[tuple], chunk_size: int) -> Iterator[list[tuple]]:
+    it = iter(rows)
+
+    while chunk := list(itertools.islice(it, chunk_size)):
+        yield chunk
 
 
 def _localize_ts(ts: str, tz_name: str | None) -> str:
@@ -113,6 +191,79 @@ def _localize_ts(ts: str, tz_name: str | None) -> str:
         return ts
 
 
+def _detect_format(path: Path) -> tuple[str, str | None]:
+    """(format, compression) from the file name; compression None = format default."""
+    name = path.name.lower()
+
+    if name.endswith(".parquet"):
+        return "parquet", None
+
+    if name.endswith((".arrow", ".feather")):
+        return "arrow", None
+
+    if name.endswith(".gz"):
+        return "csv", "gzip"
+
+    if name.endswith(".zst"):
+        return "csv", "zstd"
+
+    return "csv", "none"
+
+
+def _open_csv(path: Path, compression: str) -> IO[str]:
+    if compression == "gzip":
+        return gzip.open(path, "wt", newline="", encoding="utf-8", compresslevel=6)
+
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd output requires the 'zstandard' package (pip install zstandard)")
+
+        raw = open(path, "wb")  # noqa: SIM115 (closed via the zstd writer)
+
+        writer = zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+
+        return io.TextIOWrapper(writer, encoding="utf-8", newline="")
+
+    return path.open("w", newline="", encoding="utf-8")
+
+
+def _write_csv(path: Path, chunks: Iterable[list[tuple]], tz: str | None, compression: str) -> None:
+    with _open_csv(path, compression) as f:
+        w = csv.writer(f)
+
+        w.writerow(SELECT_COLUMNS)
+
+        for chunk in chunks:
+            w.writerows((_localize_ts(ts, tz), *rest) for ts, *rest in chunk)
+
+
+def _write_columnar(path: Path, chunks: Iterable[list[tuple]], tz: str | None, fmt: str, compression: str) -> None:
+    """Parquet (one row group per chunk) or Arrow IPC file (one record batch per chunk)."""
+    if pyarrow is None:
+        raise RuntimeError(f"{fmt} output requires the 'pyarrow' package (pip install pyarrow)")
+
+    pa = pyarrow
+
+    schema = pa.schema(
+        [("timestamp", pa.string()), ("symbol", pa.string())] + [(c, pa.float64()) for c in SELECT_COLUMNS[2:]]
+    )
+
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(str(path), schema, compression=compression)
+    else:
+        writer = pa.ipc.new_file(str(path), schema)
+
+    with writer:
+        for chunk in chunks:
+            cols = list(zip(*chunk, strict=True))
+
+            arrays = [pa.array([_localize_ts(ts, tz) for ts in cols[0]], pa.string()), pa.array(cols[1], pa.string())]
+
+            arrays += [pa.array(c, pa.float64()) for c in cols[2:]]
+
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+
 def export_signals(
     out_path: Path,
     last_hours: int | None = None,
@@ -122,7 +273,18 @@ def export_signals(
     tz: str | None = None,
     keep: int | None = None,
     db_path: str | None = None,
+    *,
+    table: str = "signals",
+    fmt: str | None = None,
+    compression: str | None = None,
+    chunk_size: int | None = None,
 ) -> Path:
+    """
+    Stream `table` rows (newest first) into out_path.
+
+    fmt / compression default to the out_path suffix (see module docstring);
+    chunk_size defaults to EXPORT_CHUNK_SIZE or 10000 rows.
+    """
     if last_hours is not None and (since or until):
         raise ValueError("Use either --last-hours OR (--since/--until), not both.")
 
@@ -132,47 +294,74 @@ def export_signals(
     if limit is not None and limit <= 0:
         raise ValueError("--limit must be > 0")
 
+    if chunk_size is None:
+        chunk_size = int(os.getenv("EXPORT_CHUNK_SIZE", "") or DEFAULT_CHUNK_SIZE)
+
+    if chunk_size <= 0:
+        raise ValueError("--chunk-size must be > 0")
+
+    detected_fmt, detected_comp = _detect_format(out_path)
+
+    fmt = fmt or detected_fmt
+
+    if fmt not in FORMATS:
+        raise ValueError(f"--format must be one of: {', '.join(FORMATS)}")
+
+    compression = compression or (detected_comp if fmt == detected_fmt else None)
+
+    compression = compression or ("none" if fmt == "csv" else "zstd")
+
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"--compression must be one of: {', '.join(COMPRESSIONS)}")
+
+    sql, params = _select_sql(table, last_hours=last_hours, since=since, until=until, limit=limit)
+
     db = db_path or os.getenv("DB_PATH", DEFAULT_DB)
 
+    _ensure_parent_dir(out_path)
+
     con = sqlite3.connect(db)
 
-    rows = _select_rows(con, last_hours=last_hours, since=since, until=until, limit=limit)
+    try:
+        chunks = _iter_rows(con, sql, params, chunk_size)
 
-    con.close()
+        directory = partition_dir(db)
 
-    _ensure_parent_dir(out_path)
+        if table == "quotes" and list_partitions(directory):
+            # Partition files (QUOTES_PARTITION) merged with the legacy table, still chunk by chunk
+            lo = since
 
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
+            if not (since or until) and last_hours is not None:
+                lo = str(params[0])  # the --last-hours cutoff computed by _select_sql
 
-        w.writerow(
-            [
-                "timestamp",
-                "symbol",
-                "spot_price",
-                "futures_price",
-                "basis_pct",
-                "volume_24h_usd",
-            ]
-        )
+            parted = iter_partition_rows(directory, since=lo, until=until, limit=limit, chunk_size=chunk_size)
 
-        for symbol, spot, fut, basis, vol, ts in rows:
-            ts_out = _localize_ts(ts, tz)
+            rows = merge_newest_first(parted, itertools.chain.from_iterable(chunks))
 
-            w.writerow([ts_out, symbol, spot, fut, basis, vol])
+            chunks = _chunked(itertools.islice(rows, limit) if limit else rows, chunk_size)
+
+        if fmt == "csv":
+            _write_csv(out_path, chunks, tz, compression)
+        else:
+            _write_columnar(out_path, chunks, tz, fmt, compression)
+
+    finally:
+        con.close()
 
     if keep is not None and keep > 0:
-        stem = out_path.stem
+        name = out_path.name
 
-        prefix = stem.split("_")[0]
+        suffix = max((x for x in _SUFFIXES.values() if name.endswith(x)), key=len, default=out_path.suffix)
 
-        all_csv = sorted(
-            out_path.parent.glob(f"{prefix}_*.csv"),
+        prefix = name[: len(name) - len(suffix)].split("_")[0]
+
+        all_files = sorted(
+            out_path.parent.glob(f"{prefix}_*{suffix}"),
             key=lambda p: p.stat().st_mtime,
             reverse=True,
         )
 
-        for old in all_csv[keep:]:
+        for old in all_files[keep:]:
             try:
                 old.unlink()
 
@@ -182,20 +371,40 @@ def export_signals(
     return out_path
 
 
-def _default_out_name(prefix: str = "signals") -> str:
+def _default_out_name(prefix: str = "signals", suffix: str = ".csv") -> str:
     now = datetime.now(timezone.utc)
 
-    return f"{prefix}_{now.strftime('%Y-%m-%d_%H%M')}.csv"
+    return f"{prefix}_{now.strftime('%Y-%m-%d_%H%M')}{suffix}"
 
 
 def main() -> None:
-    p = argparse.ArgumentParser(description="Export arbitrage signals from SQLite to CSV (Windows-friendly).")
+    p = argparse.ArgumentParser(
+        description="Export arbitrage signals or quotes from SQLite to CSV / Parquet / Arrow (Windows-friendly)."
+    )
 
     p.add_argument(
         "--out",
         type=str,
         default=None,
-        help="Output CSV path (e.g., exports/signals_YYYY-MM-DD_HHMM.csv)",
+        help="Output path; the suffix picks the format (.csv, .csv.gz, .csv.zst, .parquet, .arrow)",
+    )
+
+    p.add_argument("--table", choices=TABLES, default="signals", help="Table to export (default: signals)")
+
+    p.add_argument("--format", choices=FORMATS, default=None, help="Output format (default: from --out suffix)")
+
+    p.add_argument(
+        "--compression",
+        choices=COMPRESSIONS,
+        default=None,
+        help="CSV stream compression or Parquet codec (default: from --out suffix; Parquet: zstd)",
+    )
+
+    p.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help=f"Rows per fetchmany() chunk / Parquet row group (default: EXPORT_CHUNK_SIZE or {DEFAULT_CHUNK_SIZE})",
     )
 
     p.add_argument(
@@ -227,24 +436,38 @@ def main() -> None:
         "--keep",
         type=int,
         default=None,
-        help="Keep only last N CSV files with the same prefix",
+        help="Keep only last N export files with the same prefix and suffix",
     )
 
     args = p.parse_args()
 
-    out = Path(args.out) if args.out else Path("exports") / _default_out_name("signals")
+    if args.out:
+        out = Path(args.out)
+    else:
+        fmt = args.format or "csv"
 
-    path = export_signals(
-        out_path=out,
-        last_hours=(args.last_hours if (args.since is None and args.until is None) else None),
-        since=args.since,
-        until=args.until,
-        limit=args.limit,
-        tz=args.tz,
-        keep=args.keep,
-    )
+        suffix = _SUFFIXES.get((fmt, args.compression or "none"), _SUFFIXES[(fmt, "none")])
+
+        out = Path("exports") / _default_out_name(args.table, suffix)
+
+    try:
+        path = export_signals(
+            out_path=out,
+            last_hours=(args.last_hours if (args.since is None and args.until is None) else None),
+            since=args.since,
+            until=args.until,
+            limit=args.limit,
+            tz=args.tz,
+            keep=args.keep,
+            table=args.table,
+            fmt=args.format,
+            compression=args.compression,
+            chunk_size=args.chunk_size,
+        )
+    except RuntimeError as e:  # optional dependency missing
+        raise SystemExit(str(e)) from e
 
-    print(f"CSV saved to: {path}")
+    print(f"{(args.format or _detect_format(path)[0]).upper()} saved to: {path}")
 
 
 if __name__ == "__main__":
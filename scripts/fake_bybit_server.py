@@ -0,0 +1,512 @@
+# scripts/fake_bybit_server.py
+"""
+Local Bybit v5 stand-in (public market data only) for soak and throughput tests.
+
+WebSocket  /v5/public/{spot,linear}
+    - {"op": "subscribe"|"unsubscribe", "args": [...], "req_id": ...} -> ack
+      (spot rejects more than `spot_max_args` args per request, like Bybit)
+    - {"op": "ping"} -> pong
+    - tickers.<SYM>            spot: snapshots; linear: snapshot, then deltas
+    - orderbook.<N>.<SYM>      snapshot, then deltas (N=1 always snapshots)
+    Every subscribed topic is pushed `rate_hz` times per second.
+
+REST
+    GET /v5/market/time
+    GET /v5/market/tickers          ?category&symbol
+    GET /v5/market/instruments-info ?category&symbol&limit&cursor  (paginated)
+    GET /v5/market/orderbook        ?category&symbol&limit
+    GET /v5/market/funding/history  ?category=linear&symbol&limit
+
+Prices follow a seeded random walk; linear marks carry a fixed per-symbol basis
+so the selector/alerts path has something to find.
+
+Run:
+    python -m scripts.fake_bybit_server --symbols 300 --rate 10 --port 8765
+then point the bot at it:
+    BYBIT_REST_BASE_URL=http://127.0.0.1:8765
+    BYBIT_WS_PUBLIC_URL=ws://127.0.0.1:8765
+    WS_PUBLIC_URL_SPOT=ws://127.0.0.1:8765/v5/public/spot
+    WS_PUBLIC_URL_LINEAR=ws://127.0.0.1:8765/v5/public/linear
+(English-only comments per project rules)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import WSMsgType, web
+
+__all__ = ["FakeBybitServer", "FakeMarket"]
+
+CATEGORIES = ("spot", "linear")
+MAJORS = {
+    "BTCUSDT": 65000.0,
+    "ETHUSDT": 3200.0,
+    "SOLUSDT": 150.0,
+    "XRPUSDT": 0.52,
+    "DOGEUSDT": 0.12,
+    "ADAUSDT": 0.45,
+    "LINKUSDT": 14.0,
+    "TONUSDT": 6.5,
+}
+ORDERBOOK_DEPTHS = {"spot": (1, 50, 200), "linear": (1, 50, 200, 500)}
+FUNDING_INTERVAL_MS = 8 * 3600 * 1000
+
+
+def _fmt(x: float) -> str:
+    return f"{x:.8f}".rstrip("0").rstrip(".") or "0"
+
+
+def _ms() -> int:
+    return int(time.time() * 1000)
+
+
+@dataclass
+class _Book:
+    u: int = 0
+    seq: int = 0
+
+
+@dataclass
+class FakeMarket:
+    """Deterministic synthetic universe shared by the WS and REST sides."""
+
+    symbols: int = 50
+    seed: int = 7
+    prices: dict[str, float] = field(default_factory=dict, init=False)
+    basis: dict[str, float] = field(default_factory=dict, init=False)
+    turnover: dict[str, float] = field(default_factory=dict, init=False)
+    books: dict[tuple[str, str], _Book] = field(default_factory=dict, init=False)
+
+    def __post_init__(self) -> None:
+        self._rnd = random.Random(self.seed)
+        names = list(MAJORS)[: self.symbols]
+        names += [f"FK{i:04d}USDT" for i in range(max(0, self.symbols - len(names)))]
+        for sym in names:
+            self.prices[sym] = MAJORS.get(sym) or round(self._rnd.uniform(0.01, 250.0), 4)
+            self.basis[sym] = self._rnd.uniform(-0.012, 0.012)
+            self.turnover[sym] = round(self._rnd.uniform(1e6, 5e7))
+
+    def has(self, symbol: str) -> bool:
+        return symbol in self.prices
+
+    def step(self, symbol: str) -> float:
+        px = self.prices[symbol] * (1.0 + self._rnd.gauss(0.0, 0.0005))
+        self.prices[symbol] = px
+        return px
+
+    def mark(self, symbol: str) -> float:
+        return self.prices[symbol] * (1.0 + self.basis[symbol])
+
+    def tick_size(self, category: str, symbol: str) -> float:
+        px = self.prices[symbol] if category == "spot" else self.mark(symbol)
+        return max(px * 0.0001, 1e-8)
+
+    # --- payloads
+    def ticker(self, category: str, symbol: str, *, delta: bool = False) -> dict[str, Any]:
+        spot = self.prices[symbol]
+        px = spot if category == "spot" else self.mark(symbol)
+        tick = self.tick_size(category, symbol)
+        row: dict[str, Any] = {
+            "symbol": symbol,
+            "lastPrice": _fmt(px),
+            "bid1Price": _fmt(px - tick),
+            "bid1Size": _fmt(self._rnd.uniform(1, 500)),
+            "ask1Price": _fmt(px + tick),
+            "ask1Size": _fmt(self._rnd.uniform(1, 500)),
+        }
+        if category == "linear":
+            row.update(markPrice=_fmt(px), indexPrice=_fmt(spot))
+            if delta:
+                return row
+            row.update(
+                fundingRate=_fmt(self.basis[symbol] / 100),
+                nextFundingTime=str((_ms() // FUNDING_INTERVAL_MS + 1) * FUNDING_INTERVAL_MS),
+                openInterest=_fmt(50_000 + self._rnd.uniform(0, 1000)),
+            )
+        turnover = self.turnover[symbol]
+        row.update(
+            prevPrice24h=_fmt(px * 0.99),
+            price24hPcnt="0.0101",
+            highPrice24h=_fmt(px * 1.02),
+            lowPrice24h=_fmt(px * 0.98),
+            turnover24h=_fmt(turnover),
+            volume24h=_fmt(turnover / px),
+        )
+        return row
+
+    def levels(self, category: str, symbol: str, depth: int) -> tuple[list[list[str]], list[list[str]]]:
+        px = self.prices[symbol] if category == "spot" else self.mark(symbol)
+        tick = self.tick_size(category, symbol)
+        bids = [[_fmt(px - tick * (k + 1)), _fmt(self._rnd.uniform(0.1, 50))] for k in range(depth)]
+        asks = [[_fmt(px + tick * (k + 1)), _fmt(self._rnd.uniform(0.1, 50))] for k in range(depth)]
+        return bids, asks
+
+    def orderbook(self, category: str, symbol: str, depth: int, *, snapshot: bool) -> dict[str, Any]:
+        book = self.books.setdefault((category, symbol), _Book())
+        book.u += 1
+        book.seq += 1
+        if snapshot:
+            bids, asks = self.levels(category, symbol, depth)
+        else:
+            bids, asks = self.levels(category, symbol, min(depth, 3))
+        return {"s": symbol, "b": bids, "a": asks, "u": book.u, "seq": book.seq}
+
+
+class FakeBybitServer:
+    """aiohttp app serving FakeMarket; use as `async with FakeBybitServer(...) as srv:`."""
+
+    def __init__(
+        self,
+        *,
+        symbols: int = 50,
+        rate_hz: float = 10.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 7,
+        spot_max_args: int = 10,
+        page_limit: int = 500,
+        rest_latency_ms: float = 0.0,
+        rest_limit_per_sec: int = 0,
+    ) -> None:
+        self.market = FakeMarket(symbols=symbols, seed=seed)
+        self.rate_hz = max(0.1, float(rate_hz))
+        self.host = host
+        self.port = port
+        self.spot_max_args = spot_max_args
+        self.page_limit = page_limit
+        self.rest_latency_ms = rest_latency_ms
+        self.rest_limit_per_sec = rest_limit_per_sec
+        self.stats: dict[str, int] = {
+            "ws_connections": 0,
+            "ws_active": 0,
+            "ws_messages_out": 0,
+            "ws_subscribe_errors": 0,
+            "rest_requests": 0,
+            "rest_throttled": 0,
+        }
+        self._sockets: set[web.WebSocketResponse] = set()
+        self._runner: web.AppRunner | None = None
+        self._window = (0, 0)  # (epoch second, requests in it)
+
+        self.app = web.Application()
+        self.app.router.add_get("/v5/public/{category}", self._ws_handler)
+        self.app.router.add_get("/v5/market/time", self._rest_time)
+        self.app.router.add_get("/v5/market/tickers", self._rest_tickers)
+        self.app.router.add_get("/v5/market/instruments-info", self._rest_instruments)
+        self.app.router.add_get("/v5/market/orderbook", self._rest_orderbook)
+        self.app.router.add_get("/v5/market/funding/history", self._rest_funding)
+
+    # --- lifecycle
+    async def start(self) -> FakeBybitServer:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        server = getattr(site, "_server", None)
+        if server is not None and server.sockets:
+            self.port = server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        await self.drop_connections()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> FakeBybitServer:
+        return await self.start()
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        await self.stop()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def ws_url(self, category: str) -> str:
+        return f"ws://{self.host}:{self.port}/v5/public/{category}"
+
+    async def drop_connections(self) -> int:
+        """Close every WS connection (reconnect tests); returns how many were closed."""
+        socks = list(self._sockets)
+        for ws in socks:
+            with contextlib.suppress(Exception):
+                await ws.close()
+        return len(socks)
+
+    # --- WebSocket
+    def _valid_topic(self, category: str, topic: str) -> bool:
+        parts = topic.split(".")
+        if len(parts) == 2 and parts[0] == "tickers":
+            return self.market.has(parts[1])
+        if len(parts) == 3 and parts[0] == "orderbook" and parts[1].isdigit():
+            return int(parts[1]) in ORDERBOOK_DEPTHS[category] and self.market.has(parts[2])
+        return False
+
+    def _frame(self, category: str, topic: str, *, first: bool) -> dict[str, Any]:
+        parts = topic.split(".")
+        sym = parts[-1]
+        if not first:
+            self.market.step(sym)
+        now = _ms()
+        if parts[0] == "tickers":
+            snapshot = first or category == "spot"
+            data = self.market.ticker(category, sym, delta=not snapshot)
+            return {"topic": topic, "ts": now, "type": "snapshot" if snapshot else "delta", "cs": now, "data": data}
+        depth = int(parts[1])
+        snapshot = first or depth == 1
+        data = self.market.orderbook(category, sym, depth, snapshot=snapshot)
+        return {"topic": topic, "ts": now, "type": "snapshot" if snapshot else "delta", "data": data, "cts": now}
+
+    async def _send(self, ws: web.WebSocketResponse, obj: dict[str, Any]) -> None:
+        await ws.send_str(json.dumps(obj, separators=(",", ":")))
+        self.stats["ws_messages_out"] += 1
+
+    async def _pusher(self, ws: web.WebSocketResponse, category: str, topics: dict[str, None]) -> None:
+        interval = 1.0 / self.rate_hz
+        next_at = time.monotonic()
+        while not ws.closed:
+            next_at += interval
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                next_at = time.monotonic()  # fell behind: do not burst to catch up
+            for topic in list(topics):
+                if ws.closed:
+                    return
+                await self._send(ws, self._frame(category, topic, first=False))
+
+    async def _ws_handler(self, request: web.Request) -> web.WebSocketResponse:
+        category = request.match_info["category"]
+        if category not in CATEGORIES:
+            raise web.HTTPNotFound()
+        ws = web.WebSocketResponse(autoping=True)
+        await ws.prepare(request)
+        conn_id = uuid.uuid4().hex[:12]
+        topics: dict[str, None] = {}  # insertion-ordered set
+        self._sockets.add(ws)
+        self.stats["ws_connections"] += 1
+        self.stats["ws_active"] += 1
+        pusher = asyncio.create_task(self._pusher(ws, category, topics))
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    req = json.loads(msg.data)
+                except ValueError:
+                    await self._send(ws, {"success": False, "ret_msg": "invalid json", "conn_id": conn_id})
+                    continue
+                await self._handle_op(ws, category, conn_id, topics, req)
+        finally:
+            pusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await pusher
+            self._sockets.discard(ws)
+            self.stats["ws_active"] -= 1
+        return ws
+
+    async def _handle_op(
+        self,
+        ws: web.WebSocketResponse,
+        category: str,
+        conn_id: str,
+        topics: dict[str, None],
+        req: dict[str, Any],
+    ) -> None:
+        op = str(req.get("op") or "")
+        ack: dict[str, Any] = {"success": True, "ret_msg": "", "conn_id": conn_id, "op": op}
+        if "req_id" in req:
+            ack["req_id"] = req["req_id"]
+        if op == "ping":
+            ack["ret_msg"] = "pong"
+            await self._send(ws, ack)
+            return
+        args = [str(a) for a in (req.get("args") or [])]
+        if op == "subscribe":
+            bad = [a for a in args if not self._valid_topic(category, a)]
+            if category == "spot" and len(args) > self.spot_max_args:
+                ack.update(success=False, ret_msg=f"args size >{self.spot_max_args}")
+            elif bad:
+                ack.update(success=False, ret_msg=f"error:handler not found,topic:{bad[0]}")
+            elif dup := [a for a in args if a in topics]:
+                ack.update(success=False, ret_msg=f"error:already subscribed,topic:{dup[0]}")
+            if not ack["success"]:
+                self.stats["ws_subscribe_errors"] += 1
+                await self._send(ws, ack)
+                return
+            await self._send(ws, ack)
+            for a in args:
+                topics[a] = None
+                await self._send(ws, self._frame(category, a, first=True))
+            return
+        if op == "unsubscribe":
+            for a in args:
+                topics.pop(a, None)
+            await self._send(ws, ack)
+            return
+        ack.update(success=False, ret_msg=f"error:unknown op {op!r}")
+        await self._send(ws, ack)
+
+    # --- REST
+    async def _rest_prologue(self) -> web.Response | None:
+        self.stats["rest_requests"] += 1
+        if self.rest_latency_ms > 0:
+            await asyncio.sleep(self.rest_latency_ms / 1000.0)
+        if self.rest_limit_per_sec > 0:
+            sec = int(time.time())
+            start, n = self._window
+            n = n + 1 if start == sec else 1
+            self._window = (sec, n)
+            if n > self.rest_limit_per_sec:
+                self.stats["rest_throttled"] += 1
+                return self._json({}, ret_code=10006, ret_msg="Too many visits!")
+        return None
+
+    def _json(self, result: Any, *, ret_code: int = 0, ret_msg: str = "OK") -> web.Response:
+        body = {"retCode": ret_code, "retMsg": ret_msg, "result": result, "retExtInfo": {}, "time": _ms()}
+        headers = {}
+        if self.rest_limit_per_sec > 0:
+            sec, n = self._window
+            headers = {
+                "X-Bapi-Limit": str(self.rest_limit_per_sec),
+                "X-Bapi-Limit-Status": str(max(0, self.rest_limit_per_sec - n)),
+                "X-Bapi-Limit-Reset-Timestamp": str((sec + 1) * 1000),
+            }
+        return web.json_response(body, headers=headers)
+
+    def _params(self, request: web.Request) -> tuple[str, str | None] | web.Response:
+        category = request.query.get("category", "")
+        if category not in CATEGORIES:
+            return self._json({}, ret_code=10001, ret_msg="params error: category invalid")
+        symbol = request.query.get("symbol") or None
+        if symbol is not None and not self.market.has(symbol):
+            return self._json({}, ret_code=10001, ret_msg="params error: symbol invalid")
+        return category, symbol
+
+    async def _rest_time(self, request: web.Request) -> web.Response:
+        if (err := await self._rest_prologue()) is not None:
+            return err
+        now_ns = time.time_ns()
+        return self._json({"timeSecond": str(now_ns // 10**9), "timeNano": str(now_ns)})
+
+    async def _rest_tickers(self, request: web.Request) -> web.Response:
+        if (err := await self._rest_prologue()) is not None:
+            return err
+        p = self._params(request)
+        if isinstance(p, web.Response):
+            return p
+        category, symbol = p
+        names = [symbol] if symbol else list(self.market.prices)
+        return self._json({"category": category, "list": [self.market.ticker(category, s) for s in names]})
+
+    async def _rest_instruments(self, request: web.Request) -> web.Response:
+        if (err := await self._rest_prologue()) is not None:
+            return err
+        p = self._params(request)
+        if isinstance(p, web.Response):
+            return p
+        category, symbol = p
+        names = [symbol] if symbol else list(self.market.prices)
+        limit = max(1, min(int(request.query.get("limit") or self.page_limit), 1000))
+        start = int(request.query.get("cursor") or 0)
+        page = names[start : start + limit]
+        rows = []
+        for s in page:
+            tick = self.market.tick_size(category, s)
+            rows.append(
+                {
+                    "symbol": s,
+                    "baseCoin": s[: -len("USDT")],
+                    "quoteCoin": "USDT",
+                    "status": "Trading",
+                    "priceFilter": {"tickSize": _fmt(tick)},
+                    "lotSizeFilter": {"minOrderQty": "0.001", "basePrecision": "0.000001"},
+                }
+            )
+        nxt = str(start + limit) if start + limit < len(names) else ""
+        return self._json({"category": category, "list": rows, "nextPageCursor": nxt})
+
+    async def _rest_orderbook(self, request: web.Request) -> web.Response:
+        if (err := await self._rest_prologue()) is not None:
+            return err
+        p = self._params(request)
+        if isinstance(p, web.Response):
+            return p
+        category, symbol = p
+        if symbol is None:
+            return self._json({}, ret_code=10001, ret_msg="params error: symbol required")
+        depth = max(1, min(int(request.query.get("limit") or 25), 200 if category == "spot" else 500))
+        bids, asks = self.market.levels(category, symbol, depth)
+        book = self.market.books.setdefault((category, symbol), _Book())
+        return self._json({"s": symbol, "b": bids, "a": asks, "ts": _ms(), "u": book.u, "seq": book.seq})
+
+    async def _rest_funding(self, request: web.Request) -> web.Response:
+        if (err := await self._rest_prologue()) is not None:
+            return err
+        p = self._params(request)
+        if isinstance(p, web.Response):
+            return p
+        category, symbol = p
+        if category != "linear" or symbol is None:
+            return self._json({}, ret_code=10001, ret_msg="params error: linear symbol required")
+        limit = max(1, min(int(request.query.get("limit") or 200), 200))
+        last = _ms() // FUNDING_INTERVAL_MS * FUNDING_INTERVAL_MS
+        rate = self.market.basis[symbol] / 100
+        rows = [
+            {"symbol": symbol, "fundingRate": _fmt(rate), "fundingRateTimestamp": str(last - k * FUNDING_INTERVAL_MS)}
+            for k in range(limit)
+        ]
+        return self._json({"category": category, "list": rows})
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    srv = FakeBybitServer(
+        symbols=args.symbols,
+        rate_hz=args.rate,
+        host=args.host,
+        port=args.port,
+        seed=args.seed,
+        rest_latency_ms=args.rest_latency_ms,
+        rest_limit_per_sec=args.rest_limit,
+    )
+    async with srv:
+        print(f"BYBIT_REST_BASE_URL={srv.base_url}")
+        print(f"BYBIT_WS_PUBLIC_URL=ws://{srv.host}:{srv.port}")
+        print(f"WS_PUBLIC_URL_SPOT={srv.ws_url('spot')}")
+        print(f"WS_PUBLIC_URL_LINEAR={srv.ws_url('linear')}", flush=True)
+        try:
+            while True:
+                await asyncio.sleep(args.stats_every)
+                print(json.dumps(srv.stats), flush=True)
+        except asyncio.CancelledError:
+            pass
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Local Bybit v5 public market-data stand-in")
+    ap.add_argument("--symbols", type=int, default=50)
+    ap.add_argument("--rate", type=float, default=10.0, help="pushes per second per subscribed topic")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--rest-latency-ms", type=float, default=0.0)
+    ap.add_argument("--rest-limit", type=int, default=0, help="REST requests/sec before retCode 10006 (0 = off)")
+    ap.add_argument("--stats-every", type=float, default=10.0, help="print counters every N seconds")
+    args = ap.parse_args(argv)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args))
+
+
+if __name__ == "__main__":
+    main()
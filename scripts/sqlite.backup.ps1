@@ -0,0 +1,25 @@
+# scripts/sqlite.backup.ps1
+# Purpose: Windows-friendly wrapper for the online SQLite backup (signals.db + alerts.db)
+# Notes: No secrets printed. Run from repo root. Uses current venv if active. Safe while the bot is running.
+
+param(
+    [string]$OutDir = $env:SQLITE_BACKUP_DIR,
+    [string]$Compression = $env:SQLITE_BACKUP_COMPRESSION,
+    [string]$Keep = $env:SQLITE_BACKUP_KEEP
+)
+
+if (-not $OutDir -or $OutDir -eq "") { $OutDir = "data/backups" }
+if (-not $Compression -or $Compression -eq "") { $Compression = "gzip" }
+if (-not $Keep -or $Keep -eq "") { $Keep = "7" }
+
+Write-Host "SQLite backup: out=$OutDir, compression=$Compression, keep=$Keep"
+
+# Use python from venv if available
+$python = "$PSScriptRoot\..\.\.venv\Scripts\python.exe"
+if (-not (Test-Path $python)) { $python = "python" }
+
+& $python -m scripts.sqlite_backup --out-dir "$OutDir" --compression $Compression --keep $Keep
+if ($LASTEXITCODE -ne 0) {
+    Write-Error "sqlite_backup ended with exit code $LASTEXITCODE"
+    exit $LASTEXITCODE
+}
@@ -0,0 +1,266 @@
+# scripts/sqlite_backup.py
+# Purpose: online (hot) backup of signals.db and alerts.db via the SQLite backup API
+# Comments: ASCII-only console output for Windows cp1251 consoles.
+#
+# Pages are copied in steps of --pages with a --sleep-ms pause after each step, so the bot's
+# WAL writer keeps committing while the snapshot is taken (a copied file of a live WAL DB may
+# miss committed pages or be torn; the backup API yields a consistent snapshot).
+# If another connection writes during the copy, SQLite restarts the backup from page 0; after
+# MAX_RESTARTS restarts the remaining pages are copied in one step, which on a WAL source holds
+# only a read transaction and therefore still does not block the writer.
+#
+# Output: <out-dir>/<db stem>-YYYYmmdd-HHMMSS.db[.gz|.zst], written to a .part file first and
+# renamed when complete; the newest --keep snapshots per DB are kept.
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import dataclasses
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import zstandard  # type: ignore
+except Exception:  # noqa: BLE001
+    zstandard = None  # optional dependency: only --compression zstd needs it
+
+# ---------- Defaults (env overrides) ----------
+SIGNALS_DB_PATH = os.getenv("SQLITE_DB_PATH") or os.getenv("DB_PATH") or "data/signals.db"
+# Same resolution as SqliteAlertGateRepo.from_settings()
+ALERTS_DB_PATH = os.getenv("ALERTS__DB_PATH") or os.getenv("ALERTS_DB_PATH") or "data/alerts.db"
+BACKUP_DIR = os.getenv("SQLITE_BACKUP_DIR", "data/backups")
+STEP_PAGES = int(
+    os.getenv("SQLITE_BACKUP_STEP_PAGES", "256")
+)  # pages per step (4 KiB each by default); 0 = all at once
+STEP_SLEEP_MS = float(os.getenv("SQLITE_BACKUP_SLEEP_MS", "10"))  # pause after each step
+COMPRESSION = os.getenv("SQLITE_BACKUP_COMPRESSION", "none")  # none|gzip|zstd
+KEEP = int(os.getenv("SQLITE_BACKUP_KEEP", "7"))  # snapshots kept per DB (0 = keep all)
+MAX_RESTARTS = 3
+
+BUSY_TIMEOUT_MS = 4000
+COMPRESSIONS = ("none", "gzip", "zstd")
+_SUFFIXES = {"none": ".db", "gzip": ".db.gz", "zstd": ".db.zst"}
+
+
+@dataclasses.dataclass
+class BackupResult:
+    """One snapshot (also passed to the progress callback while copying)."""
+
+    source: str = ""
+    dest: str = ""
+    pages_total: int = 0
+    pages_done: int = 0
+    steps: int = 0
+    restarts: int = 0
+    one_step_finish: bool = False  # True: finished with a single step after MAX_RESTARTS
+    size: int = 0  # bytes of the final file
+    elapsed_ms: int = 0
+    rotated: list[str] = dataclasses.field(default_factory=list)
+
+    def as_dict(self) -> dict[str, object]:
+        return dataclasses.asdict(self)
+
+
+class _RestartLimit(Exception):
+    """Raised from the progress callback to switch to a one-step finish."""
+
+
+def _snapshot_name(source: Path, compression: str, now: datetime) -> str:
+    return f"{source.stem}-{now:%Y%m%d-%H%M%S}{_SUFFIXES[compression]}"
+
+
+def _compress(src: Path, dest: Path, compression: str) -> None:
+    if compression == "gzip":
+        with src.open("rb") as fin, gzip.open(dest, "wb", compresslevel=6) as fout:
+            shutil.copyfileobj(fin, fout, 1 << 20)
+        return
+    if zstandard is None:
+        raise RuntimeError("zstd output requires the 'zstandard' package (pip install zstandard)")
+    with src.open("rb") as fin, dest.open("wb") as fout:
+        zstandard.ZstdCompressor(level=3).copy_stream(fin, fout)
+
+
+def rotate(out_dir: Path, source: Path, keep: int) -> list[str]:
+    """Delete all but the `keep` newest snapshots of `source` (names sort by time)."""
+    if keep <= 0:
+        return []
+    pattern = f"{source.stem}-????????-??????.db*"
+    snaps = sorted((p for p in out_dir.glob(pattern) if not p.name.endswith(".part")), reverse=True)
+    removed = []
+    for old in snaps[keep:]:
+        with contextlib.suppress(OSError):
+            old.unlink()
+            removed.append(old.name)
+    return removed
+
+
+def backup_db(
+    source: str | Path,
+    out_dir: str | Path = BACKUP_DIR,
+    *,
+    pages: int = STEP_PAGES,
+    sleep_ms: float = STEP_SLEEP_MS,
+    compression: str = COMPRESSION,
+    keep: int = KEEP,
+    max_restarts: int = MAX_RESTARTS,
+    progress: Callable[[BackupResult], None] | None = None,
+    now: datetime | None = None,
+) -> BackupResult:
+    """Snapshot `source` into out_dir with the online backup API (see module header).
+
+    The copy is a self-contained rollback-journal DB (no -wal needed), checked with
+    PRAGMA quick_check before compression and the final rename.
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"compression must be one of: {', '.join(COMPRESSIONS)}")
+    if compression == "zstd" and zstandard is None:
+        raise RuntimeError("zstd output requires the 'zstandard' package (pip install zstandard)")
+    src_path = Path(source)
+    if not src_path.is_file():  # do not let sqlite3.connect() create an empty DB
+        raise FileNotFoundError(f"database not found: {src_path}")
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    now = now or datetime.now(timezone.utc)
+    final = out / _snapshot_name(src_path, compression, now)
+    raw = out / (final.name + ".raw.part")
+    part = out / (final.name + ".part")
+    result = BackupResult(source=str(src_path), dest=str(final))
+    start = time.perf_counter()
+    last_remaining: int | None = None
+
+    def on_step(status: int, remaining: int, total: int) -> None:  # noqa: ARG001 (status unused)
+        nonlocal last_remaining
+        if last_remaining is not None and remaining > last_remaining:
+            result.restarts += 1  # source changed by another connection: SQLite started over
+            if result.restarts > max_restarts:
+                raise _RestartLimit
+        last_remaining = remaining
+        result.steps += 1
+        result.pages_total = total
+        result.pages_done = total - remaining
+        if progress is not None:
+            progress(result)
+        if remaining and sleep_ms > 0:
+            time.sleep(sleep_ms / 1000.0)  # let the live writer take the lock between steps
+
+    src = sqlite3.connect(src_path, timeout=BUSY_TIMEOUT_MS / 1000)
+    try:
+        raw.unlink(missing_ok=True)
+        dst = sqlite3.connect(raw)
+        try:
+            try:
+                src.backup(dst, pages=int(pages) if pages > 0 else -1, progress=on_step)
+            except _RestartLimit:
+                result.one_step_finish = True
+                src.backup(dst, pages=-1)
+                result.steps += 1
+                result.pages_done = result.pages_total
+            dst.execute("PRAGMA journal_mode=DELETE")  # single-file snapshot (source may be WAL)
+            check = dst.execute("PRAGMA quick_check").fetchone()[0]
+            if check != "ok":
+                raise sqlite3.DatabaseError(f"backup of {src_path} failed quick_check: {check}")
+        finally:
+            dst.close()
+    except BaseException:
+        raw.unlink(missing_ok=True)
+        raise
+    finally:
+        src.close()
+
+    try:
+        if compression == "none":
+            raw.replace(part)
+        else:
+            _compress(raw, part, compression)
+        part.replace(final)
+    finally:
+        raw.unlink(missing_ok=True)
+        part.unlink(missing_ok=True)
+
+    result.size = final.stat().st_size
+    result.elapsed_ms = int((time.perf_counter() - start) * 1000)
+    result.rotated = rotate(out, src_path, keep)
+    return result
+
+
+def print_progress(result: BackupResult) -> None:
+    """ASCII progress line per step on stderr (stdout keeps the summary + JSON line)."""
+    print(
+        f"  {Path(result.source).name}: {result.pages_done}/{result.pages_total} pages, step {result.steps}, "
+        f"restarts {result.restarts}",
+        file=sys.stderr,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Online SQLite backup (signals.db + alerts.db)")
+    parser.add_argument(
+        "--db",
+        action="append",
+        default=None,
+        help=f"DB to back up; repeatable (default: {SIGNALS_DB_PATH} and {ALERTS_DB_PATH})",
+    )
+    parser.add_argument("--out-dir", default=BACKUP_DIR, help=f"Snapshot directory (default: {BACKUP_DIR})")
+    parser.add_argument(
+        "--pages", type=int, default=STEP_PAGES, help=f"Pages per step, 0 = all at once (default: {STEP_PAGES})"
+    )
+    parser.add_argument(
+        "--sleep-ms", type=float, default=STEP_SLEEP_MS, help=f"Pause after each step (default: {STEP_SLEEP_MS:g})"
+    )
+    parser.add_argument(
+        "--compression",
+        choices=COMPRESSIONS,
+        default=COMPRESSION,
+        help=f"Snapshot compression (default: {COMPRESSION})",
+    )
+    parser.add_argument("--keep", type=int, default=KEEP, help=f"Snapshots kept per DB, 0 = all (default: {KEEP})")
+    parser.add_argument("--progress", action="store_true", help="Print a progress line per step to stderr")
+    args = parser.parse_args(argv)
+
+    sources = args.db or [SIGNALS_DB_PATH, ALERTS_DB_PATH]
+    results: list[dict[str, object]] = []
+    rc = 0
+    print(f"SQLite backup -> {args.out_dir} (pages={args.pages}, sleep_ms={args.sleep_ms:g}, {args.compression})")
+    for db in sources:
+        if not Path(db).is_file():
+            print(f"  - {db}: not found, skipped")
+            results.append({"source": db, "skipped": "not found"})
+            continue
+        try:
+            r = backup_db(
+                db,
+                args.out_dir,
+                pages=args.pages,
+                sleep_ms=args.sleep_ms,
+                compression=args.compression,
+                keep=args.keep,
+                progress=print_progress if args.progress else None,
+            )
+        except (sqlite3.Error, OSError, RuntimeError) as e:
+            print(f"  - {db}: FAILED {type(e).__name__}: {e}", file=sys.stderr)
+            results.append({"source": db, "error": f"{type(e).__name__}: {e}"})
+            rc = 1
+            continue
+        tail = " (one-step finish after restarts)" if r.one_step_finish else ""
+        print(
+            f"  - {db} -> {r.dest}: {r.pages_total} pages in {r.steps} step(s), {r.size} bytes, "
+            f"{r.elapsed_ms} ms, rotated {len(r.rotated)}{tail}"
+        )
+        results.append(r.as_dict())
+
+    print(json.dumps({"out_dir": args.out_dir, "backups": results, "ts": int(time.time())}, ensure_ascii=True))
+    return rc
+
+
+if __name__ == "__main__":
+    sys.exit(main())
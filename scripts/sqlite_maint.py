@@ -1,4 +1,3 @@
-
 # scripts/sqlite_maint.py
 # Purpose: SQLite maintenance CLI (retention & compaction)
 # Comments: ASCII-only console output for Windows cp1251 consoles.
@@ -10,12 +9,18 @@ import contextlib
 import dataclasses
 import json
 import os
-import signal
 import sqlite3
 import sys
 import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+if not __package__:  # run as a file (sqlite.maint.daily.ps1): make `src` importable
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.storage.partitions import drop_partitions, partition_dir  # noqa: E402 (stdlib-only)
+
 # ---------- Defaults (safe, non-breaking) ----------
 DEF_DB_PATH = os.getenv("SQLITE_DB_PATH", "data/signals.db")
 RET_SIGNALS_DAYS = int(os.getenv("SQLITE_RETENTION_SIGNALS_DAYS", "14"))
@@ -24,16 +29,24 @@ RET_ALERTS_DAYS = int(os.getenv("SQLITE_RETENTION_ALERTS_DAYS", "30"))
 MAINT_ENABLE = os.getenv("SQLITE_MAINT_ENABLE", "0") == "1"
 VACUUM_STRATEGY = os.getenv("SQLITE_MAINT_VACUUM_STRATEGY", "incremental")  # full|incremental|none
 MAX_DURATION_SEC = int(os.getenv("SQLITE_MAINT_MAX_DURATION_SEC", "60"))
+# Chunked retention: each DELETE chunk is its own short write transaction
+LOCK_BUDGET_MS = float(os.getenv("SQLITE_MAINT_LOCK_BUDGET_MS", "50"))  # target write-lock hold per chunk
+CHUNK_ROWS = int(os.getenv("SQLITE_MAINT_CHUNK_ROWS", "2000"))  # first chunk; later ones sized to the budget
+CHUNK_SLEEP_MS = float(os.getenv("SQLITE_MAINT_CHUNK_SLEEP_MS", "25"))  # pause so live writers get the lock
+MIN_CHUNK_ROWS = 50
+MAX_CHUNK_ROWS = 100_000
 
 BUSY_TIMEOUT_MS = 4000
 INCREMENTAL_PAGES = 4000  # can be tuned later
 
 # ---------- Tables & timestamp columns ----------
-TABLE_TS_MAP: dict[str, tuple[str, int]] = {
-    "signals": ("ts", RET_SIGNALS_DAYS),
-    "alerts_log": ("created_at", RET_ALERTS_DAYS),
-    # Add quotes table if present in schema
-    "quotes": ("ts", RET_QUOTES_DAYS),
+# table -> (timestamp column, retention days, "iso" | "epoch")
+#   signals/quotes (src/storage/persistence.py): ISO-8601 UTC text in `timestamp`
+#   alerts_log (src/infra/alerts_repo.py): epoch seconds (REAL) in `ts`
+TABLE_TS_MAP: dict[str, tuple[str, int, str]] = {
+    "signals": ("timestamp", RET_SIGNALS_DAYS, "iso"),
+    "alerts_log": ("ts", RET_ALERTS_DAYS, "epoch"),
+    "quotes": ("timestamp", RET_QUOTES_DAYS, "iso"),
 }
 
 
@@ -44,10 +57,34 @@ class Metrics:
     counts_before: dict[str, int] = dataclasses.field(default_factory=dict)
     counts_after: dict[str, int] = dataclasses.field(default_factory=dict)
     deleted: dict[str, int] = dataclasses.field(default_factory=dict)
+    retention: dict[str, dict[str, object]] = dataclasses.field(default_factory=dict)
     elapsed_ms: int = 0
     strategy: str = VACUUM_STRATEGY
 
 
+@dataclasses.dataclass
+class RetentionStats:
+    """Progress of one table's chunked retention (also passed to the progress callback)."""
+
+    table: str = ""
+    deleted: int = 0
+    chunks: int = 0
+    chunk_rows: int = 0  # size of the next (or last) chunk
+    lock_ms_max: float = 0.0
+    lock_ms_total: float = 0.0
+    complete: bool = True  # False: stopped at the deadline; the next run continues
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "deleted": self.deleted,
+            "chunks": self.chunks,
+            "chunk_rows": self.chunk_rows,
+            "lock_ms_max": round(self.lock_ms_max, 1),
+            "lock_ms_avg": round(self.lock_ms_total / self.chunks, 1) if self.chunks else 0.0,
+            "complete": self.complete,
+        }
+
+
 def file_size(path: Path) -> int:
     try:
         return path.stat().st_size
@@ -59,28 +96,28 @@ def utc_now_seconds() -> int:
     return int(time.time())
 
 
-def ensure_indexes(conn: sqlite3.Connection) -> None:
-    """Idempotent index creation for timestamp-based retention.
-    Creates indexes only if the table exists.
-    """
-    cur = conn.cursor()
+def table_columns(conn: sqlite3.Connection, table: str) -> list[str]:
+    """Column names of `table` ([] when the table does not exist)."""
+    return [r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()]
 
-    def table_exists(name: str) -> bool:
-        cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,))
-        return cur.fetchone() is not None
 
-    # signals(ts)
-    if table_exists("signals"):
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_signals_ts ON signals(ts)")
+def has_leading_index(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    """True if some index of `table` starts with `column` (usable for range scans on it)."""
+    for idx in conn.execute(f"PRAGMA index_list({table})").fetchall():
+        info = conn.execute(f"PRAGMA index_info({idx[1]})").fetchall()
+        if info and min(info)[2] == column:
+            return True
+    return False
 
-    # alerts_log(created_at)
-    if table_exists("alerts_log"):
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_alerts_log_created_at ON alerts_log(created_at)")
-
-    # quotes(ts)
-    if table_exists("quotes"):
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_quotes_ts ON quotes(ts)")
 
+def ensure_indexes(conn: sqlite3.Connection) -> None:
+    """Idempotent index creation for timestamp-based retention.
+    Creates an index only if the table and column exist and no index already starts with the column
+    (the app schemas already have idx_signals_ts / idx_quotes_ts / idx_alerts_log_ts).
+    """
+    for table, (ts_col, _days, _kind) in TABLE_TS_MAP.items():
+        if ts_col in table_columns(conn, table) and not has_leading_index(conn, table, ts_col):
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{ts_col} ON {table}({ts_col})")
     conn.commit()
 
 
@@ -93,31 +130,78 @@ def count_table(conn: sqlite3.Connection, table: str) -> int:
     return 0
 
 
-def retention_delete(conn: sqlite3.Connection, table: str, ts_col: str, days: int, dry_run: bool) -> int:
-    """Delete rows older than now - X days. Assumes ts_col is epoch seconds or comparable."""
-    cutoff = utc_now_seconds() - days * 86400
-    cur = conn.cursor()
-
-    # Fast path: check if table exists
-    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table,))
-    if not cur.fetchone():
-        return 0
+def retention_cutoff(kind: str, days: int, now: float | None = None) -> float | str:
+    """now - days in the column's own representation (epoch seconds or ISO-8601 UTC text)."""
+    cutoff = (time.time() if now is None else now) - days * 86400
+    if kind == "epoch":
+        return cutoff
+    return datetime.fromtimestamp(cutoff, timezone.utc).isoformat(timespec="microseconds")
+
+
+def next_chunk_rows(rows: int, lock_ms: float, budget_ms: float) -> int:
+    """Scale the chunk towards the lock budget (at most x2 / half per step, within MIN/MAX_CHUNK_ROWS)."""
+    factor = 2.0 if lock_ms <= 0 else min(2.0, max(0.5, budget_ms / lock_ms))
+    return int(min(MAX_CHUNK_ROWS, max(MIN_CHUNK_ROWS, rows * factor)))
+
+
+def retention_delete(
+    conn: sqlite3.Connection,
+    table: str,
+    ts_col: str,
+    days: int,
+    dry_run: bool,
+    *,
+    kind: str = "iso",
+    budget_ms: float = LOCK_BUDGET_MS,
+    chunk_rows: int = CHUNK_ROWS,
+    sleep_ms: float = CHUNK_SLEEP_MS,
+    deadline: float | None = None,
+    progress: Callable[[RetentionStats], None] | None = None,
+) -> RetentionStats:
+    """Delete rows older than now - `days` in bounded chunks (oldest first).
+
+    Each chunk is `DELETE ... WHERE rowid IN (oldest N rowids below the cutoff)`: one short
+    autocommit write transaction walking the timestamp index. The chunk size adapts so a chunk
+    holds the write lock for about `budget_ms`; between chunks we sleep `sleep_ms` so the live
+    writer is not starved. Every chunk is committed, so a run stopped at `deadline`
+    (time.monotonic()) or killed keeps its progress and the next run simply continues.
+    dry_run only counts the rows that would go.
+    """
+    stats = RetentionStats(table=table, chunk_rows=max(MIN_CHUNK_ROWS, int(chunk_rows)))
+    if ts_col not in table_columns(conn, table):  # missing table or column
+        return stats
 
-    # Guard: ensure ts_col exists
-    cur.execute(f"PRAGMA table_info({table})")
-    cols = [r[1] for r in cur.fetchall()]
-    if ts_col not in cols:
-        return 0
+    cutoff = retention_cutoff(kind, days)
+    cur = conn.cursor()
 
     if dry_run:
         cur.execute(f"SELECT COUNT(*) FROM {table} WHERE {ts_col} < ?", (cutoff,))
         row = cur.fetchone()
-        return int(row[0]) if row else 0
-
-    cur.execute(f"DELETE FROM {table} WHERE {ts_col} < ?", (cutoff,))
-    deleted = cur.rowcount if cur.rowcount is not None else 0
-    conn.commit()
-    return deleted
+        stats.deleted = int(row[0]) if row else 0
+        return stats
+
+    sql = f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} WHERE {ts_col} < ? ORDER BY {ts_col} LIMIT ?)"
+    while True:
+        if deadline is not None and time.monotonic() >= deadline:
+            stats.complete = False
+            break
+        rows = stats.chunk_rows
+        t0 = time.perf_counter()
+        with conn:  # commit per chunk (also under isolation_level=None)
+            n = conn.execute(sql, (cutoff, rows)).rowcount
+        lock_ms = (time.perf_counter() - t0) * 1000.0
+        stats.chunks += 1
+        stats.deleted += max(0, n)
+        stats.lock_ms_total += lock_ms
+        stats.lock_ms_max = max(stats.lock_ms_max, lock_ms)
+        stats.chunk_rows = next_chunk_rows(rows, lock_ms, budget_ms)
+        if progress is not None:
+            progress(stats)
+        if n < rows:
+            break
+        if sleep_ms > 0:
+            time.sleep(sleep_ms / 1000.0)
+    return stats
 
 
 def compact_db(conn: sqlite3.Connection, strategy: str, dry_run: bool) -> None:
@@ -153,12 +237,34 @@ def busy_connection(db_path: str) -> sqlite3.Connection:
     return conn
 
 
-def run_maintenance(db_path: str, do_retention: bool, do_compact: bool, dry_run: bool) -> Metrics:
+def print_progress(stats: RetentionStats) -> None:
+    """ASCII progress line per chunk on stderr (stdout keeps the summary + JSON line)."""
+    print(
+        f"  retention {stats.table}: deleted={stats.deleted} chunks={stats.chunks} "
+        f"next_chunk={stats.chunk_rows} lock_ms_max={stats.lock_ms_max:.1f}",
+        file=sys.stderr,
+    )
+
+
+def run_maintenance(
+    db_path: str,
+    do_retention: bool,
+    do_compact: bool,
+    dry_run: bool,
+    *,
+    budget_ms: float = LOCK_BUDGET_MS,
+    chunk_rows: int = CHUNK_ROWS,
+    sleep_ms: float = CHUNK_SLEEP_MS,
+    max_duration_sec: float = MAX_DURATION_SEC,
+    progress: Callable[[RetentionStats], None] | None = None,
+) -> Metrics:
     metrics = Metrics(strategy=VACUUM_STRATEGY)
     p = Path(db_path)
     metrics.size_before = file_size(p)
 
     start = time.perf_counter()
+    # Retention stops between chunks once the run budget is spent; the next run resumes
+    deadline = time.monotonic() + max_duration_sec if max_duration_sec > 0 else None
 
     with contextlib.ExitStack() as stack:
         conn = stack.enter_context(busy_connection(db_path))
@@ -169,9 +275,28 @@ def run_maintenance(db_path: str, do_retention: bool, do_compact: bool, dry_run:
             metrics.counts_before[tbl] = count_table(conn, tbl)
 
         if do_retention:
-            for tbl, (ts_col, days) in TABLE_TS_MAP.items():
-                deleted = retention_delete(conn, tbl, ts_col, days, dry_run)
-                metrics.deleted[tbl] = deleted
+            for tbl, (ts_col, days, kind) in TABLE_TS_MAP.items():
+                stats = retention_delete(
+                    conn,
+                    tbl,
+                    ts_col,
+                    days,
+                    dry_run,
+                    kind=kind,
+                    budget_ms=budget_ms,
+                    chunk_rows=chunk_rows,
+                    sleep_ms=sleep_ms,
+                    deadline=deadline,
+                    progress=progress,
+                )
+                metrics.deleted[tbl] = stats.deleted
+                metrics.retention[tbl] = stats.as_dict()
+
+            # Partitioned quotes (QUOTES_PARTITION): expired day/week files are unlinked, no DELETE
+            cutoff = datetime.now(timezone.utc) - timedelta(days=RET_QUOTES_DAYS)
+            dropped = drop_partitions(partition_dir(db_path), cutoff, dry_run=dry_run)
+            metrics.deleted["quotes"] = metrics.deleted.get("quotes", 0) + sum(n for _, n in dropped)
+            metrics.retention.setdefault("quotes", {})["partitions_dropped"] = [p.name for p, _ in dropped]
 
         if do_compact:
             compact_db(conn, VACUUM_STRATEGY, dry_run)
@@ -191,19 +316,6 @@ def guard_enable() -> None:
         sys.exit(2)
 
 
-def install_time_guard(seconds: int) -> None:
-    if seconds <= 0:
-        return
-
-    def _handler(signum, frame):  # noqa: ARG001 (frame unused)
-        print(f"Time limit exceeded ({seconds}s). Aborting.", file=sys.stderr)
-        sys.exit(3)
-
-    # SIGALRM is not available on Windows; best-effort only on POSIX.
-    if hasattr(signal, "SIGALRM"):
-        signal.signal(signal.SIGALRM, _handler)
-
-
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="SQLite maintenance CLI (retention & compaction)")
     parser.add_argument("--db", default=DEF_DB_PATH, help=f"Path to SQLite DB (default: {DEF_DB_PATH})")
@@ -211,6 +323,22 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--execute", action="store_true", help="Apply changes")
     parser.add_argument("--retention-only", action="store_true", help="Run only retention")
     parser.add_argument("--compact-only", action="store_true", help="Run only compaction")
+    parser.add_argument(
+        "--lock-budget-ms",
+        type=float,
+        default=LOCK_BUDGET_MS,
+        help=f"Target write-lock hold per retention chunk (default: {LOCK_BUDGET_MS:g})",
+    )
+    parser.add_argument(
+        "--chunk-rows", type=int, default=CHUNK_ROWS, help=f"First retention chunk size (default: {CHUNK_ROWS})"
+    )
+    parser.add_argument(
+        "--sleep-ms",
+        type=float,
+        default=CHUNK_SLEEP_MS,
+        help=f"Pause between retention chunks (default: {CHUNK_SLEEP_MS:g})",
+    )
+    parser.add_argument("--progress", action="store_true", help="Print a progress line per chunk to stderr")
     args = parser.parse_args(argv)
 
     if not (args.dry_run or args.execute):
@@ -224,10 +352,17 @@ def main(argv: list[str] | None = None) -> int:
     do_ret = not args.compact_only
     do_cmp = not args.retention_only
 
-    install_time_guard(MAX_DURATION_SEC)
-
     try:
-        metrics = run_maintenance(args.db, do_ret, do_cmp, args.dry_run)
+        metrics = run_maintenance(
+            args.db,
+            do_ret,
+            do_cmp,
+            args.dry_run,
+            budget_ms=args.lock_budget_ms,
+            chunk_rows=args.chunk_rows,
+            sleep_ms=args.sleep_ms,
+            progress=print_progress if args.progress else None,
+        )
     except sqlite3.OperationalError as e:
         print(f"OperationalError: {e}", file=sys.stderr)
         return 1
@@ -240,7 +375,11 @@ def main(argv: list[str] | None = None) -> int:
     print(f"  Elapsed: {metrics.elapsed_ms} ms")
     print("  Deleted per table:")
     for tbl, n in metrics.deleted.items():
-        print(f"    - {tbl}: {n}")
+        r = metrics.retention.get(tbl, {})
+        tail = "" if r.get("complete", True) else " (time budget reached; next run continues)"
+        print(f"    - {tbl}: {n} in {r.get('chunks', 0)} chunk(s), max lock {r.get('lock_ms_max', 0.0)} ms{tail}")
+        if r.get("partitions_dropped"):
+            print(f"      partition files dropped: {', '.join(r['partitions_dropped'])}")
 
     # JSON line (ASCII-safe)
     payload = {
@@ -252,6 +391,7 @@ def main(argv: list[str] | None = None) -> int:
         "counts_before": metrics.counts_before,
         "counts_after": metrics.counts_after,
         "deleted": metrics.deleted,
+        "retention": metrics.retention,
         "elapsed_ms": metrics.elapsed_ms,
         "ts": utc_now_seconds(),
     }
@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import asyncio
 import os
+import time
 from pathlib import Path
 from typing import Any
 
@@ -19,7 +20,12 @@ from loguru import logger
 
 from src.infra.logging import setup_logging
 from src.main import load_settings  # reuse settings loader
-from src.ws.health import MetricsRegistry
+from src.ws.eventloop import run as run_loop
+from src.ws.health import MetricsRegistry, format_status
+from src.ws.health_export import start_health_export_from_env
+from src.ws.loop_monitor import LoopMonitor
+from src.ws.metrics_http import start_metrics_server_from_env
+from src.ws.recorder import FrameRecorder
 
 # Load .env once at import time (non-fatal if missing)
 load_dotenv(override=False)
@@ -106,7 +112,9 @@ async def main() -> None:
 
     try:
         from src.core.cache import QuoteCache
-        from src.exchanges.bybit.ws import BybitWS, iter_ticker_entries
+        from src.core.orderbook import OrderBookStore
+        from src.exchanges.bybit.ws import iter_ticker_entries
+        from src.exchanges.bybit.ws_pool import BybitWSPool
         from src.ws.bridge import publish_bybit_ticker
         from src.ws.multiplexer import WsEvent, WSMultiplexer
         from src.ws.normalizers.bybit_v5 import normalize
@@ -128,13 +136,30 @@ async def main() -> None:
     if ws_available and ws_enabled:
         cache = QuoteCache()
         ws_linear = (
-            BybitWS(ws_cfg["url_linear"], ws_cfg["topics_linear"] or ["tickers"]) if ws_cfg["url_linear"] else None
+            BybitWSPool.from_env(
+                ws_cfg["url_linear"],
+                ws_cfg["topics_linear"] or ["tickers"],
+                source="LINEAR",
+                recorder=FrameRecorder.from_env("LINEAR"),
+            )
+            if ws_cfg["url_linear"]
+            else None
+        )
+        ws_spot = (
+            BybitWSPool.from_env(
+                ws_cfg["url_spot"],
+                ws_cfg["topics_spot"] or ["tickers"],
+                source="SPOT",
+                recorder=FrameRecorder.from_env("SPOT"),
+            )
+            if ws_cfg["url_spot"]
+            else None
         )
-        ws_spot = BybitWS(ws_cfg["url_spot"], ws_cfg["topics_spot"] or ["tickers"]) if ws_cfg["url_spot"] else None
         if not ws_linear and not ws_spot:
             logger.warning("WS config has neither LINEAR nor SPOT endpoints/topics configured.")
         mux = WSMultiplexer(name="core")
-        alerts_sub = AlertsSubscriber(mux)
+        books = OrderBookStore()  # local L2 books from orderbook.N topics; REST resync set in refresh_meta_task
+        alerts_sub = AlertsSubscriber(mux, books=books)
         alerts_sub.start()
 
         def _debug_log_normalized(source: str, evt_norm: dict) -> None:
@@ -163,59 +188,100 @@ async def main() -> None:
             logger.bind(tag="WS").debug(f"{source} normalized: channel={channel} symbol={symbol} items={items}")
 
         async def on_message_spot(msg: dict):
+            t0 = time.perf_counter()
+            channel, ts_ms, publish_ms = "other", 0, None
             try:
                 evt_norm = normalize(msg)
                 _debug_log_normalized("SPOT", evt_norm)
+                channel = str(evt_norm.get("channel") or "other")
+                ts_ms = evt_norm.get("ts_ms") or 0
+                t_pub = time.perf_counter()
                 mux.publish(
                     WsEvent(
                         source="SPOT",
-                        channel=str(evt_norm.get("channel") or "other"),
+                        channel=channel,
                         symbol=str(evt_norm.get("symbol") or ""),
                         payload=evt_norm.get("data") or {},
-                        ts=evt_norm.get("ts_ms") or 0,
+                        ts=ts_ms,
                     )
                 )
+                publish_ms = (time.perf_counter() - t_pub) * 1000.0
                 metrics.inc_spot()
             except Exception as e:
                 logger.debug(f"normalize(msg) failed (SPOT): {e!r}")
+            if channel == "orderbook":
+                books.apply(msg, "spot")
             for item in iter_ticker_entries(msg):
                 sym = item.get("symbol")
                 last = item.get("last")
                 if sym and last is not None:
                     _ = await cache.update(sym, spot=last)
-                    publish_bybit_ticker(mux, "SPOT", item)
+                    publish_bybit_ticker(mux, "SPOT", item, ts=ts_ms / 1000.0 if ts_ms else None)
+
+            metrics.observe_ws(
+                "SPOT",
+                channel,
+                exchange_ts=ts_ms,
+                handler_ms=(time.perf_counter() - t0) * 1000.0,
+                publish_ms=publish_ms,
+            )
 
         async def on_message_linear(msg: dict):
+            t0 = time.perf_counter()
+            channel, ts_ms, publish_ms = "other", 0, None
             try:
                 evt_norm = normalize(msg)
                 _debug_log_normalized("LINEAR", evt_norm)
+                channel = str(evt_norm.get("channel") or "other")
+                ts_ms = evt_norm.get("ts_ms") or 0
+                t_pub = time.perf_counter()
                 mux.publish(
                     WsEvent(
                         source="LINEAR",
-                        channel=str(evt_norm.get("channel") or "other"),
+                        channel=channel,
                         symbol=str(evt_norm.get("symbol") or ""),
                         payload=evt_norm.get("data") or {},
-                        ts=evt_norm.get("ts_ms") or 0,
+                        ts=ts_ms,
                     )
                 )
+                publish_ms = (time.perf_counter() - t_pub) * 1000.0
                 metrics.inc_linear()
             except Exception as e:
                 logger.debug(f"normalize(msg) failed (LINEAR): {e!r}")
+            if channel == "orderbook":
+                books.apply(msg, "linear")
             for item in iter_ticker_entries(msg):
                 sym = item.get("symbol")
                 mark = item.get("mark")
                 if sym and mark is not None:
                     _ = await cache.update(sym, linear_mark=mark)
-                    publish_bybit_ticker(mux, "LINEAR", item)
+                    publish_bybit_ticker(mux, "LINEAR", item, ts=ts_ms / 1000.0 if ts_ms else None)
+
+            metrics.observe_ws(
+                "LINEAR",
+                channel,
+                exchange_ts=ts_ms,
+                handler_ms=(time.perf_counter() - t0) * 1000.0,
+                publish_ms=publish_ms,
+            )
 
         async def refresh_meta_task():
-            from src.exchanges.bybit.rest import BybitRest
+            from src.exchanges.bybit.rest_async import AsyncBybitRest
+
+            async with AsyncBybitRest() as client:
+
+                async def _resync_book(category: str, symbol: str, depth: int) -> dict:
+                    return await client.get_orderbook(category, symbol, limit=depth or 50)
+
+                books.resync = _resync_book
+                await _refresh_meta_forever(client)
 
-            client = BybitRest()
+        async def _refresh_meta_forever(client):
             while True:
                 try:
-                    spot_rows = client.get_tickers("spot") or []
-                    lin_rows = client.get_tickers("linear") or []
+                    rows = await client.get_tickers_many(("spot", "linear"))
+                    spot_rows = rows.get("spot") or []
+                    lin_rows = rows.get("linear") or []
 
                     def _vol_map(rows: list[dict[str, Any]]) -> dict[str, float]:
                         m: dict[str, float] = {}
@@ -267,7 +333,7 @@ async def main() -> None:
                 await msg.answer(
                     "Hi! I'm the WS status bot running in the *same process* as the WS stream.\n"
                     "Commands:\n"
-                    "• /status — show current WS metrics (uptime & counters)\n"
+                    "• /status — show current WS metrics (uptime, counters & latency)\n"
                 )
 
             @dp.message(Command("status"))
@@ -275,16 +341,7 @@ async def main() -> None:
                 if allow_chat is not None and msg.chat.id != allow_chat:
                     await msg.answer("Access denied: this chat is not allowlisted.")
                     return
-                m = metrics.snapshot()
-                lines = [
-                    "🔎 *WS Status*",
-                    f"• Uptime: `{m['uptime_ms']} ms`",
-                    f"• Counters: `spot={m['counters']['spot']}`, `linear={m['counters']['linear']}`",
-                    f"• Last Event (UTC): `{m['last_event_at_utc'] or 'n/a'}`",
-                    f"• Last Spot (UTC): `{m['last_spot_at_utc'] or 'n/a'}`",
-                    f"• Last Linear (UTC): `{m['last_linear_at_utc'] or 'n/a'}`",
-                ]
-                await msg.answer("\n".join(lines))
+                await msg.answer(format_status(metrics.snapshot()))
 
             tasks.append(asyncio.create_task(dp.start_polling(bot), name="tg_polling"))
 
@@ -292,6 +349,11 @@ async def main() -> None:
         logger.error("Nothing to run: WS disabled/unavailable and no Telegram token provided.")
         return
 
+    start_metrics_server_from_env(metrics)
+    health_export = start_health_export_from_env(metrics)  # ws:health / ws_health_cli read this
+    loop_monitor = LoopMonitor.from_env(metrics)
+    if loop_monitor is not None:
+        loop_monitor.start()
     logger.success("Runner started: {} task(s). Ctrl+C to stop.", len(tasks))
     try:
         await asyncio.gather(*tasks)
@@ -306,7 +368,11 @@ async def main() -> None:
             if not t.done():
                 t.cancel()
         await asyncio.gather(*tasks, return_exceptions=True)
+        if loop_monitor is not None:
+            await loop_monitor.stop()
+        if health_export is not None:
+            health_export.stop()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_loop(main())  # WS_EVENT_LOOP=asyncio|uvloop|auto
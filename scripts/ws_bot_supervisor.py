@@ -21,7 +21,12 @@ from loguru import logger
 from src.infra.logging import setup_logging
 from src.main import load_settings
 from src.ws.backoff import ExponentialBackoff
-from src.ws.health import MetricsRegistry
+from src.ws.eventloop import run as run_loop
+from src.ws.health import MetricsRegistry, format_status
+from src.ws.health_export import start_health_export_from_env
+from src.ws.loop_monitor import LoopMonitor
+from src.ws.metrics_http import start_metrics_server_from_env
+from src.ws.recorder import FrameRecorder
 
 # Load .env once (non-fatal if missing)
 load_dotenv(override=False)
@@ -93,9 +98,11 @@ async def ws_spot_loop(ws_url: str, topics: list[str], shared, metrics, debug):
     bo = ExponentialBackoff(base=1.0, factor=2.0, cap=30.0)
     while True:
         try:
-            from src.exchanges.bybit.ws import BybitWS
+            from src.exchanges.bybit.ws_pool import BybitWSPool
 
-            ws = BybitWS(ws_url, topics or ["tickers"])
+            ws = BybitWSPool.from_env(
+                ws_url, topics or ["tickers"], source="SPOT", recorder=shared["recorders"].get("SPOT")
+            )
 
             def _dbg(evt_norm: dict):
                 if not debug["enabled"]:
@@ -119,27 +126,45 @@ async def ws_spot_loop(ws_url: str, topics: list[str], shared, metrics, debug):
                 logger.bind(tag="WS").debug(f"SPOT normalized: channel={channel} symbol={symbol} items={items}")
 
             async def on_message_spot(msg: dict):
+                t0 = time.perf_counter()
+                channel, ts_ms, publish_ms = "other", 0, None
                 try:
                     evt_norm = shared["normalize"](msg)
                     _dbg(evt_norm)
+                    channel = str(evt_norm.get("channel") or "other")
+                    ts_ms = evt_norm.get("ts_ms") or 0
+                    t_pub = time.perf_counter()
                     shared["mux"].publish(
                         shared["WsEvent"](
                             source="SPOT",
-                            channel=str(evt_norm.get("channel") or "other"),
+                            channel=channel,
                             symbol=str(evt_norm.get("symbol") or ""),
                             payload=evt_norm.get("data") or {},
-                            ts=evt_norm.get("ts_ms") or 0,
+                            ts=ts_ms,
                         )
                     )
+                    publish_ms = (time.perf_counter() - t_pub) * 1000.0
                     metrics.inc_spot()
                 except Exception as e:
                     logger.debug(f"normalize(msg) failed (SPOT): {e!r}")
+                if channel == "orderbook":
+                    shared["books"].apply(msg, "spot")
                 for item in shared["iter_ticker_entries"](msg):
                     sym = item.get("symbol")
                     last = item.get("last")
                     if sym and last is not None:
                         _ = await shared["cache"].update(sym, spot=last)
-                        shared["publish_bybit_ticker"](shared["mux"], "SPOT", item)
+                        shared["publish_bybit_ticker"](
+                            shared["mux"], "SPOT", item, ts=ts_ms / 1000.0 if ts_ms else None
+                        )
+
+                metrics.observe_ws(
+                    "SPOT",
+                    channel,
+                    exchange_ts=ts_ms,
+                    handler_ms=(time.perf_counter() - t0) * 1000.0,
+                    publish_ms=publish_ms,
+                )
 
             logger.info("SPOT loop: connecting to {}", ws_url)
             bo.reset()
@@ -155,9 +180,11 @@ async def ws_linear_loop(ws_url: str, topics: list[str], shared, metrics, debug)
     bo = ExponentialBackoff(base=1.0, factor=2.0, cap=30.0)
     while True:
         try:
-            from src.exchanges.bybit.ws import BybitWS
+            from src.exchanges.bybit.ws_pool import BybitWSPool
 
-            ws = BybitWS(ws_url, topics or ["tickers"])
+            ws = BybitWSPool.from_env(
+                ws_url, topics or ["tickers"], source="LINEAR", recorder=shared["recorders"].get("LINEAR")
+            )
 
             def _dbg(evt_norm: dict):
                 if not debug["enabled"]:
@@ -181,27 +208,45 @@ async def ws_linear_loop(ws_url: str, topics: list[str], shared, metrics, debug)
                 logger.bind(tag="WS").debug(f"LINEAR normalized: channel={channel} symbol={symbol} items={items}")
 
             async def on_message_linear(msg: dict):
+                t0 = time.perf_counter()
+                channel, ts_ms, publish_ms = "other", 0, None
                 try:
                     evt_norm = shared["normalize"](msg)
                     _dbg(evt_norm)
+                    channel = str(evt_norm.get("channel") or "other")
+                    ts_ms = evt_norm.get("ts_ms") or 0
+                    t_pub = time.perf_counter()
                     shared["mux"].publish(
                         shared["WsEvent"](
                             source="LINEAR",
-                            channel=str(evt_norm.get("channel") or "other"),
+                            channel=channel,
                             symbol=str(evt_norm.get("symbol") or ""),
                             payload=evt_norm.get("data") or {},
-                            ts=evt_norm.get("ts_ms") or 0,
+                            ts=ts_ms,
                         )
                     )
+                    publish_ms = (time.perf_counter() - t_pub) * 1000.0
                     metrics.inc_linear()
                 except Exception as e:
                     logger.debug(f"normalize(msg) failed (LINEAR): {e!r}")
+                if channel == "orderbook":
+                    shared["books"].apply(msg, "linear")
                 for item in shared["iter_ticker_entries"](msg):
                     sym = item.get("symbol")
                     mark = item.get("mark")
                     if sym and mark is not None:
                         _ = await shared["cache"].update(sym, linear_mark=mark)
-                        shared["publish_bybit_ticker"](shared["mux"], "LINEAR", item)
+                        shared["publish_bybit_ticker"](
+                            shared["mux"], "LINEAR", item, ts=ts_ms / 1000.0 if ts_ms else None
+                        )
+
+                metrics.observe_ws(
+                    "LINEAR",
+                    channel,
+                    exchange_ts=ts_ms,
+                    handler_ms=(time.perf_counter() - t0) * 1000.0,
+                    publish_ms=publish_ms,
+                )
 
             logger.info("LINEAR loop: connecting to {}", ws_url)
             bo.reset()
@@ -217,41 +262,52 @@ async def meta_refresh_loop(shared, refresh_sec: int):
     bo = ExponentialBackoff(base=1.0, factor=2.0, cap=30.0)
     while True:
         try:
-            from src.exchanges.bybit.rest import BybitRest
+            from src.exchanges.bybit.rest_async import AsyncBybitRest
 
-            client = BybitRest()
-            while True:
-                try:
-                    spot_rows = client.get_tickers("spot") or []
-                    lin_rows = client.get_tickers("linear") or []
-
-                    def _vol_map(rows: list[dict[str, Any]]) -> dict[str, float]:
-                        m: dict[str, float] = {}
-                        for r in rows:
-                            sym = r.get("symbol")
-                            if not sym:
-                                continue
-                            v = r.get("turnover24h") or r.get("turnoverUsd")
-                            try:
-                                m[sym] = float(v) if v is not None else 0.0
-                            except Exception:
-                                m[sym] = 0.0
-                        return m
-
-                    spot_vol = _vol_map(spot_rows)
-                    lin_vol = _vol_map(lin_rows)
-                    combined = {sym: min(spot_vol[sym], lin_vol[sym]) for sym in (set(spot_vol) & set(lin_vol))}
-                    await shared["cache"].update_vol24h_bulk(combined)
-                    logger.bind(tag="RTMETA").info(f"Refreshed vol24h for {len(combined)} symbols")
-                except Exception as e:
-                    logger.bind(tag="RTMETA").warning(f"Meta refresh failed: {e!r}")
-                await asyncio.sleep(max(30, int(refresh_sec)))
+            async with AsyncBybitRest() as client:
+
+                async def _resync_book(category: str, symbol: str, depth: int) -> dict:
+                    return await client.get_orderbook(category, symbol, limit=depth or 50)
+
+                shared["books"].resync = _resync_book
+                await _meta_refresh_forever(client, shared, refresh_sec)
         except Exception as e:
             delay = bo.next_delay()
             logger.exception("Meta loop crashed: {}. Restart in {:.1f}s", e, delay)
             await asyncio.sleep(delay)
 
 
+async def _meta_refresh_forever(client, shared, refresh_sec: int):
+    """Refresh vol24h via the async REST client (spot+linear concurrently, loop never blocked)."""
+    while True:
+        try:
+            rows = await client.get_tickers_many(("spot", "linear"))
+            spot_rows = rows.get("spot") or []
+            lin_rows = rows.get("linear") or []
+
+            def _vol_map(rows: list[dict[str, Any]]) -> dict[str, float]:
+                m: dict[str, float] = {}
+                for r in rows:
+                    sym = r.get("symbol")
+                    if not sym:
+                        continue
+                    v = r.get("turnover24h") or r.get("turnoverUsd")
+                    try:
+                        m[sym] = float(v) if v is not None else 0.0
+                    except Exception:
+                        m[sym] = 0.0
+                return m
+
+            spot_vol = _vol_map(spot_rows)
+            lin_vol = _vol_map(lin_rows)
+            combined = {sym: min(spot_vol[sym], lin_vol[sym]) for sym in (set(spot_vol) & set(lin_vol))}
+            await shared["cache"].update_vol24h_bulk(combined)
+            logger.bind(tag="RTMETA").info(f"Refreshed vol24h for {len(combined)} symbols")
+        except Exception as e:
+            logger.bind(tag="RTMETA").warning(f"Meta refresh failed: {e!r}")
+        await asyncio.sleep(max(30, int(refresh_sec)))
+
+
 async def bot_polling_loop(metrics, allow_chat: int | None):
     bo = ExponentialBackoff(base=1.0, factor=2.0, cap=30.0)
     token = _get_token()
@@ -278,7 +334,7 @@ async def bot_polling_loop(metrics, allow_chat: int | None):
                 await msg.answer(
                     "Hi! I'm the WS status bot running in the *same process* as the supervised WS stream.\n"
                     "Commands:\n"
-                    "• /status — show current WS metrics (uptime & counters)\n"
+                    "• /status — show current WS metrics (uptime, counters & latency)\n"
                 )
 
             @dp.message(Command("status"))
@@ -286,16 +342,7 @@ async def bot_polling_loop(metrics, allow_chat: int | None):
                 if allow_chat is not None and msg.chat.id != allow_chat:
                     await msg.answer("Access denied: this chat is not allowlisted.")
                     return
-                m = metrics.snapshot()
-                lines = [
-                    "🔎 *WS Status*",
-                    f"• Uptime: `{m['uptime_ms']} ms`",
-                    f"• Counters: `spot={m['counters']['spot']}`, `linear={m['counters']['linear']}`",
-                    f"• Last Event (UTC): `{m['last_event_at_utc'] or 'n/a'}`",
-                    f"• Last Spot (UTC): `{m['last_spot_at_utc'] or 'n/a'}`",
-                    f"• Last Linear (UTC): `{m['last_linear_at_utc'] or 'n/a'}`",
-                ]
-                await msg.answer("\n".join(lines))
+                await msg.answer(format_status(metrics.snapshot()))
 
             bo.reset()
             logger.info("Telegram bot polling: start")
@@ -316,6 +363,7 @@ async def main() -> None:
     allow_chat = _allowed_chat_id()
 
     from src.core.cache import QuoteCache
+    from src.core.orderbook import OrderBookStore
     from src.exchanges.bybit.ws import iter_ticker_entries
     from src.ws.bridge import publish_bybit_ticker
     from src.ws.multiplexer import WsEvent, WSMultiplexer
@@ -324,7 +372,8 @@ async def main() -> None:
 
     cache = QuoteCache()
     mux = WSMultiplexer(name="core")
-    alerts_sub = AlertsSubscriber(mux)
+    books = OrderBookStore()  # local L2 books from orderbook.N topics; REST resync set by meta_refresh_loop
+    alerts_sub = AlertsSubscriber(mux, books=books)
     alerts_sub.start()
 
     metrics = MetricsRegistry.get()
@@ -344,6 +393,9 @@ async def main() -> None:
         "publish_bybit_ticker": publish_bybit_ticker,
         "normalize": normalize,
         "iter_ticker_entries": iter_ticker_entries,
+        "books": books,
+        # one recorder per stream for the whole process (files rotate across reconnects)
+        "recorders": {src: rec for src in ("SPOT", "LINEAR") if (rec := FrameRecorder.from_env(src)) is not None},
     }
 
     tasks: list[asyncio.Task] = []
@@ -389,6 +441,11 @@ async def main() -> None:
         logger.error("Nothing to run: WS disabled/unavailable and no Telegram token provided.")
         return
 
+    start_metrics_server_from_env(metrics)
+    health_export = start_health_export_from_env(metrics)  # ws:health / ws_health_cli read this
+    loop_monitor = LoopMonitor.from_env(metrics)
+    if loop_monitor is not None:
+        loop_monitor.start()
     logger.success("Supervisor started: {} task(s). Ctrl+C to stop.", len(tasks))
     try:
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -402,7 +459,11 @@ async def main() -> None:
             if not t.done():
                 t.cancel()
         await asyncio.gather(*tasks, return_exceptions=True)
+        if loop_monitor is not None:
+            await loop_monitor.stop()
+        if health_export is not None:
+            health_export.stop()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_loop(main())  # WS_EVENT_LOOP=asyncio|uvloop|auto
@@ -1,5 +1,7 @@
 """
 Temporary CLI to print WS health metrics as JSON.
+Reads the running WS process's export (WS_HEALTH_FILE) when there is one,
+otherwise this process's (empty) registry; "source" says which.
 Run:
     python -m scripts.ws_health_cli
 (English-only comments per project rules)
@@ -9,12 +11,12 @@ from __future__ import annotations
 
 import json
 
-from src.ws.health import MetricsRegistry
+from src.ws.health_export import live_snapshot
 
 
 def main() -> None:
-    reg = MetricsRegistry.get()
-    data = reg.snapshot()
+    data, source = live_snapshot()
+    data["source"] = source
     print(json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True))
 
 
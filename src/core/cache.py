@@ -129,6 +129,29 @@ class QuoteCache:
                 )
             return out
 
+    def quote_maps(self) -> tuple[dict[str, dict[str, float]], dict[str, dict[str, float]]]:
+        """
+        Синхронний знімок у форматі get_spot_map()/get_linear_map():
+        ({symbol: {"price", "turnover_usd", "ts"}} для spot, те саме для linear mark).
+
+        Без lock: викликається з інших потоків (HTTP /quotes, selector), а asyncio.Lock
+        між потоками не працює; dict.copy() атомарний під GIL. Символи без ціни пропускаються,
+        turnover_usd — останній відомий 24h turnover (0.0, якщо ще невідомий).
+        """
+        data = self._data.copy()
+        vols = self._vol24h.copy()
+        spot: dict[str, dict[str, float]] = {}
+        linear: dict[str, dict[str, float]] = {}
+        for sym, row in data.items():
+            vol = float(vols.get(sym, 0.0))
+            px, ts = row.get("spot", math.nan), row.get("ts_spot", 0.0)
+            if not math.isnan(px):
+                spot[sym] = {"price": px, "turnover_usd": vol, "ts": ts}
+            px, ts = row.get("linear_mark", math.nan), row.get("ts_linear", 0.0)
+            if not math.isnan(px):
+                linear[sym] = {"price": px, "turnover_usd": vol, "ts": ts}
+        return spot, linear
+
     async def candidates(
         self,
         *,
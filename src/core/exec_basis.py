@@ -0,0 +1,202 @@
+"""
+Виконуваний (executable) basis: що реально отримає угода заданого розміру, а не last/mark.
+
+Позитивний basis (ф'ючерс дорожчий) — купуємо spot (йдемо по asks) і продаємо linear (по bids);
+негативний — навпаки: продаємо spot (bids), купуємо linear (asks). Обидві ноги мають однакову
+кількість базового активу (хедж), розмір задається нотіоналом spot-ноги у $.
+
+Прохід по книзі — це searchsorted по кумулятивних масивах DepthProfile (cum_usd / cum_qty)
+плюс часткове заповнення останнього рівня, тож VWAP не потребує Python-циклу по рівнях,
+а для локальних L2Book профіль кешується до зміни книги (profile_for_book).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from src.core.filters.depth import DepthProfile, profile_for_book
+from src.core.orderbook import L2Book, OrderBookStore
+
+__all__ = [
+    "LONG_SPOT",
+    "SHORT_SPOT",
+    "ExecBasis",
+    "executable_basis",
+    "executable_basis_many",
+]
+
+LONG_SPOT = "long_spot"  # buy spot / sell linear (basis > 0)
+SHORT_SPOT = "short_spot"  # sell spot / buy linear (basis < 0)
+
+
+@dataclass(frozen=True)
+class ExecBasis:
+    """
+    Результат проходу по книгах для одного символу.
+
+      basis_pct   — (linear_vwap - spot_vwap) / spot_vwap * 100 для фактично заповненої кількості;
+      mid_basis_pct — той самий basis по mid обох книг (для порівняння);
+      slippage_pct — наскільки прохід по книзі гірший за mid-basis у напрямку угоди (>= 0 зазвичай);
+      complete    — чи вистачило глибини обох ніг на весь size_usd.
+    """
+
+    symbol: str
+    direction: str
+    size_usd: float
+    qty: float
+    spot_usd: float
+    linear_usd: float
+    spot_vwap: float
+    linear_vwap: float
+    basis_pct: float
+    mid_basis_pct: float
+    slippage_pct: float
+    complete: bool
+
+    @property
+    def edge_pct(self) -> float:
+        """Basis у напрямку угоди: > 0 — угода заробляє на конвергенції, <= 0 — прослизання з'їло basis."""
+        return self.basis_pct if self.direction == LONG_SPOT else -self.basis_pct
+
+    @property
+    def fill_ratio(self) -> float:
+        return self.spot_usd / self.size_usd if self.size_usd > 0 else 0.0
+
+
+def _profile(ob: dict | L2Book | DepthProfile) -> DepthProfile:
+    if isinstance(ob, DepthProfile):
+        return ob
+    if isinstance(ob, L2Book):
+        return profile_for_book(ob)
+    return DepthProfile.from_orderbook(ob)
+
+
+def _side(prof: DepthProfile, take_asks: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(ціни від найкращої, cum_qty, cum_usd) сторони, по якій іде тейкер."""
+    if take_asks:
+        return prof.ask_px, prof.ask_cum_qty, prof.ask_cum_usd
+    return prof.bid_px, prof.bid_cum_qty, prof.bid_cum_usd
+
+
+def _qty_for_usd(px: np.ndarray, cum_qty: np.ndarray, cum_usd: np.ndarray, usd: float) -> float:
+    """Скільки базового активу дає нотіонал usd (обрізається глибиною книги)."""
+    n = len(px)
+    if n == 0 or usd <= 0:
+        return 0.0
+    if usd >= cum_usd[n]:
+        return float(cum_qty[n])
+    k = int(np.searchsorted(cum_usd, usd, side="left"))  # cum_usd[k-1] < usd <= cum_usd[k]
+    return float(cum_qty[k - 1] + (usd - cum_usd[k - 1]) / px[k - 1])
+
+
+def _usd_for_qty(px: np.ndarray, cum_qty: np.ndarray, cum_usd: np.ndarray, qty: float) -> float:
+    """Нотіонал заповнення qty від найкращого рівня (qty <= глибини книги)."""
+    if qty <= 0:
+        return 0.0
+    k = int(np.searchsorted(cum_qty, qty, side="left"))
+    k = min(max(k, 1), len(px))
+    return float(cum_usd[k - 1] + (qty - cum_qty[k - 1]) * px[k - 1])
+
+
+def _mid(prof: DepthProfile) -> float:
+    if len(prof.bid_px) and len(prof.ask_px):
+        return float(prof.bid_px[0] + prof.ask_px[0]) / 2.0
+    if len(prof.bid_px):
+        return float(prof.bid_px[0])
+    if len(prof.ask_px):
+        return float(prof.ask_px[0])
+    return 0.0
+
+
+def executable_basis(
+    spot_ob: dict | L2Book | DepthProfile,
+    linear_ob: dict | L2Book | DepthProfile,
+    size_usd: float,
+    *,
+    direction: str | None = None,
+    symbol: str = "",
+) -> ExecBasis | None:
+    """
+    VWAP-basis для угоди на size_usd (нотіонал spot-ноги).
+
+    direction: LONG_SPOT | SHORT_SPOT; None — за знаком mid-basis книг.
+    Повертає None, якщо потрібна сторона будь-якої книги порожня.
+    Якщо глибини не вистачає, заповнюється максимально можлива однакова кількість на обох ногах
+    (complete=False, fill_ratio < 1).
+    """
+    sp, ln = _profile(spot_ob), _profile(linear_ob)
+    sp_mid, ln_mid = _mid(sp), _mid(ln)
+    if sp_mid <= 0 or ln_mid <= 0:
+        return None
+    mid_basis = (ln_mid - sp_mid) / sp_mid * 100.0
+    if direction is None:
+        direction = LONG_SPOT if mid_basis >= 0 else SHORT_SPOT
+    elif direction not in (LONG_SPOT, SHORT_SPOT):
+        raise ValueError(f"unknown direction: {direction!r}")
+    long_spot = direction == LONG_SPOT
+
+    s_px, s_qty, s_usd = _side(sp, take_asks=long_spot)
+    l_px, l_qty, l_usd = _side(ln, take_asks=not long_spot)
+    if not len(s_px) or not len(l_px):
+        return None
+
+    size = max(0.0, float(size_usd))
+    target = _qty_for_usd(s_px, s_qty, s_usd, size)
+    qty = min(target, float(l_qty[-1]))
+    if qty <= 0:
+        return None
+    spot_usd = _usd_for_qty(s_px, s_qty, s_usd, qty)
+    linear_usd = _usd_for_qty(l_px, l_qty, l_usd, qty)
+    spot_vwap, linear_vwap = spot_usd / qty, linear_usd / qty
+    basis = (linear_vwap - spot_vwap) / spot_vwap * 100.0
+    return ExecBasis(
+        symbol=symbol,
+        direction=direction,
+        size_usd=size,
+        qty=qty,
+        spot_usd=spot_usd,
+        linear_usd=linear_usd,
+        spot_vwap=spot_vwap,
+        linear_vwap=linear_vwap,
+        basis_pct=basis,
+        mid_basis_pct=mid_basis,
+        slippage_pct=(mid_basis - basis) if long_spot else (basis - mid_basis),
+        complete=spot_usd >= size * (1.0 - 1e-9),
+    )
+
+
+def executable_basis_many(
+    books: OrderBookStore | Mapping[str, tuple[Any, Any]],
+    symbols: list[str] | None,
+    size_usd: float,
+    *,
+    directions: Mapping[str, str] | None = None,
+    max_age_sec: float | None = None,
+) -> dict[str, ExecBasis]:
+    """
+    executable_basis для багатьох символів.
+
+    books — OrderBookStore (беруться готові spot/linear L2Book; профілі кешуються)
+    або {symbol: (spot_ob, linear_ob)}. symbols=None — усі символи мапи
+    (для OrderBookStore символи обов'язкові). Символи без обох книг пропускаються.
+    """
+    out: dict[str, ExecBasis] = {}
+    if isinstance(books, OrderBookStore):
+        pairs = (
+            (sym, books.get("spot", sym, max_age_sec=max_age_sec), books.get("linear", sym, max_age_sec=max_age_sec))
+            for sym in (symbols or [])
+        )
+    else:
+        keys = symbols if symbols is not None else list(books)
+        pairs = ((sym, *books[sym]) for sym in keys if sym in books)
+    for sym, spot_ob, linear_ob in pairs:
+        if spot_ob is None or linear_ob is None:
+            continue
+        res = executable_basis(spot_ob, linear_ob, size_usd, direction=(directions or {}).get(sym), symbol=sym)
+        if res is not None:
+            out[sym] = res
+    return out
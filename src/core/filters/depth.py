@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+import weakref
+from collections.abc import Iterable, Mapping, Sequence
+from itertools import chain
+from typing import Any
+
+import numpy as np
+
+from src.core.orderbook import L2Book
 
 
 def _to_float(x, default: float = 0.0) -> float:
@@ -36,7 +43,10 @@ def _normalize_ob(
     Підтримує варіанти:
       - Bybit REST/WS: {"b": [["price","qty"], ...], "a": [["price","qty"], ...]}
       - Узагальнено:  {"bids": [[p,q],...], "asks": [[p,q],...]}
+      - Сира відповідь REST: {"retCode": 0, "result": {"b": [...], "a": [...]}}
     """
+    if isinstance(orderbook.get("result"), dict):
+        orderbook = orderbook["result"]
     bids_raw = orderbook.get("b") or orderbook.get("bids") or []
     asks_raw = orderbook.get("a") or orderbook.get("asks") or []
     bids = [(_to_float(r[0]), _to_float(r[1])) for r in bids_raw if isinstance(r, (list, tuple)) and len(r) >= 2]
@@ -44,14 +54,17 @@ def _normalize_ob(
     return bids, asks
 
 
-def calc_window_depth_usd(orderbook: dict, mid_price: float, window_pct: float) -> tuple[float, float, int]:
+def calc_window_depth_usd(orderbook: dict | L2Book, mid_price: float, window_pct: float) -> tuple[float, float, int]:
     """
     Розраховує сумарний нотіонал у межах ±window_pct від mid_price.
+    orderbook — dict-знімок (REST/WS) або локальна L2Book (читання без HTTP).
     Повертає: (bid_usd, ask_usd, levels_in_window_total).
     """
     mp = _to_float(mid_price)
     if mp <= 0:
         return 0.0, 0.0, 0
+    if isinstance(orderbook, L2Book):
+        return orderbook.window_depth_usd(mp, _to_float(window_pct))
 
     bids, asks = _normalize_ob(orderbook)
 
@@ -71,7 +84,7 @@ def calc_window_depth_usd(orderbook: dict, mid_price: float, window_pct: float)
 
 
 def has_enough_depth(
-    orderbook: dict,
+    orderbook: dict | L2Book,
     mid_price: float,
     *,
     min_depth_usd: float,
@@ -91,3 +104,144 @@ def has_enough_depth(
     if levels < int(min_levels):
         return False
     return True
+
+
+# ---- Векторизований варіант (numpy) ------------------------------------
+
+
+def _side_array(raw: Any) -> np.ndarray:
+    """[[price, qty], ...] (рядки або числа) -> float64 масив форми (n, 2); биті рядки відкидаються."""
+    if not raw:
+        return np.empty((0, 2))
+    try:
+        # швидкий шлях для рівнів [p, q]: float() по пласкому потоку без проміжних кортежів
+        flat = np.fromiter(map(float, chain.from_iterable(raw)), np.float64)
+        if flat.size == 2 * len(raw):
+            return flat.reshape(-1, 2)
+    except (TypeError, ValueError):
+        pass
+    rows = [(_to_float(r[0]), _to_float(r[1])) for r in raw if isinstance(r, (list, tuple)) and len(r) >= 2]
+    return np.asarray(rows, dtype=np.float64).reshape(-1, 2)
+
+
+class DepthProfile:
+    """
+    Книга у вигляді відсортованих масивів + кумулятивних сум для швидких запитів глибини.
+
+      bid_px — ціни bids від найкращої (спадання), ask_px — asks від найкращої (зростання);
+      *_cum_usd / *_cum_qty — префіксні суми нотіоналу/кількості з 0 на початку
+      (cum[i] = сума перших i рівнів від найкращого).
+
+    Вікно ±X% = два searchsorted по кожній стороні + різниця префіксних сум, тож
+    кілька вікон (і багато символів) рахуються без Python-циклів по рівнях.
+    Семантика та сама, що в calc_window_depth_usd: bids у [mid*(1-X%), mid], asks у [mid, mid*(1+X%)].
+    """
+
+    __slots__ = ("bid_px", "ask_px", "bid_cum_usd", "ask_cum_usd", "bid_cum_qty", "ask_cum_qty", "_neg_bid_px")
+
+    def __init__(self, bids: np.ndarray, asks: np.ndarray) -> None:
+        bids = bids[np.argsort(-bids[:, 0], kind="stable")] if len(bids) else bids
+        asks = asks[np.argsort(asks[:, 0], kind="stable")] if len(asks) else asks
+        self.bid_px = bids[:, 0]
+        self.ask_px = asks[:, 0]
+        self._neg_bid_px = -self.bid_px  # зростаючий ключ для searchsorted
+        self.bid_cum_qty = np.concatenate(([0.0], np.cumsum(bids[:, 1])))
+        self.ask_cum_qty = np.concatenate(([0.0], np.cumsum(asks[:, 1])))
+        self.bid_cum_usd = np.concatenate(([0.0], np.cumsum(bids[:, 0] * bids[:, 1])))
+        self.ask_cum_usd = np.concatenate(([0.0], np.cumsum(asks[:, 0] * asks[:, 1])))
+
+    @classmethod
+    def from_orderbook(cls, orderbook: dict | L2Book) -> DepthProfile:
+        """dict-знімок (формати як у _normalize_ob) або L2Book (див. profile_for_book — з кешем)."""
+        if isinstance(orderbook, L2Book):
+            return cls(
+                np.asarray(orderbook.bids(), dtype=np.float64).reshape(-1, 2),
+                np.asarray(orderbook.asks(), dtype=np.float64).reshape(-1, 2),
+            )
+        if isinstance(orderbook.get("result"), dict):
+            orderbook = orderbook["result"]
+        return cls(
+            _side_array(orderbook.get("b") or orderbook.get("bids")),
+            _side_array(orderbook.get("a") or orderbook.get("asks")),
+        )
+
+    def window_depth_usd(self, mid_price: float, windows_pct: Sequence[float] | np.ndarray) -> np.ndarray:
+        """
+        Масив форми (len(windows), 3): для кожного вікна [bid_usd, ask_usd, levels].
+        mid_price <= 0 -> нулі.
+        """
+        w = np.asarray(windows_pct, dtype=np.float64).reshape(-1)
+        out = np.zeros((len(w), 3))
+        mp = float(mid_price)
+        if mp <= 0:
+            return out
+        lo = mp * (1.0 - w / 100.0)
+        hi = mp * (1.0 + w / 100.0)
+        # bids: ціна >= lo (ключ -p <= -lo) і ціна <= mid (ключ -p >= -mid)
+        b_end = np.searchsorted(self._neg_bid_px, -lo, side="right")
+        b_start = np.searchsorted(self._neg_bid_px, -mp, side="left")
+        b_end = np.maximum(b_end, b_start)
+        a_start = np.searchsorted(self.ask_px, mp, side="left")
+        a_end = np.maximum(np.searchsorted(self.ask_px, hi, side="right"), a_start)
+        out[:, 0] = self.bid_cum_usd[b_end] - self.bid_cum_usd[b_start]
+        out[:, 1] = self.ask_cum_usd[a_end] - self.ask_cum_usd[a_start]
+        out[:, 2] = (b_end - b_start) + (a_end - a_start)
+        return out
+
+    def has_enough_depth(self, mid_price: float, *, min_depth_usd: float, window_pct: float, min_levels: int) -> bool:
+        bid_usd, ask_usd, levels = self.window_depth_usd(mid_price, (window_pct,))[0]
+        return bool(
+            bid_usd > 0 and ask_usd > 0 and min(bid_usd, ask_usd) >= float(min_depth_usd) and levels >= min_levels
+        )
+
+
+_book_profiles: weakref.WeakKeyDictionary[L2Book, tuple[int, DepthProfile]] = weakref.WeakKeyDictionary()
+
+
+def profile_for_book(book: L2Book) -> DepthProfile:
+    """DepthProfile локальної книги; перебудовується лише після зміни рівнів (L2Book.version)."""
+    cached = _book_profiles.get(book)
+    if cached is not None and cached[0] == book.version:
+        return cached[1]
+    prof = DepthProfile.from_orderbook(book)
+    _book_profiles[book] = (book.version, prof)
+    return prof
+
+
+def window_depths_usd(
+    orderbook: dict | L2Book | DepthProfile, mid_price: float, windows_pct: Sequence[float]
+) -> list[tuple[float, float, int]]:
+    """calc_window_depth_usd для кількох вікон за один прохід: [(bid_usd, ask_usd, levels), ...]."""
+    if isinstance(orderbook, DepthProfile):
+        prof = orderbook
+    elif isinstance(orderbook, L2Book):
+        prof = profile_for_book(orderbook)
+    else:
+        prof = DepthProfile.from_orderbook(orderbook)
+    res = prof.window_depth_usd(_to_float(mid_price), windows_pct)
+    return [(float(b), float(a), int(n)) for b, a, n in res]
+
+
+def depth_table(
+    books: Mapping[str, dict | L2Book | DepthProfile],
+    mids: Mapping[str, float],
+    windows_pct: Sequence[float],
+) -> dict[str, np.ndarray]:
+    """
+    Глибина для багатьох символів: {symbol: масив (len(windows), 3)} — як DepthProfile.window_depth_usd.
+    Символи без mid пропускаються.
+    """
+    w = np.asarray(windows_pct, dtype=np.float64)
+    out: dict[str, np.ndarray] = {}
+    for sym, ob in books.items():
+        mid = mids.get(sym)
+        if mid is None:
+            continue
+        if isinstance(ob, DepthProfile):
+            prof = ob
+        elif isinstance(ob, L2Book):
+            prof = profile_for_book(ob)
+        else:
+            prof = DepthProfile.from_orderbook(ob)
+        out[sym] = prof.window_depth_usd(_to_float(mid), w)
+    return out
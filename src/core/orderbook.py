@@ -0,0 +1,408 @@
+# src/core/orderbook.py
+from __future__ import annotations
+
+import asyncio
+import time
+from bisect import bisect_left, insort
+from collections.abc import Awaitable, Iterable
+from typing import Any, Callable
+
+from loguru import logger
+
+__all__ = ["L2Book", "OrderBookStore"]
+
+# Результат OrderBookStore.apply()
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+GAP = "gap"
+STALE = "stale"
+BUFFERED = "buffered"
+IGNORED = "ignored"
+
+RESYNC_MIN_INTERVAL_SEC = 5.0
+RESYNC_BUFFER_MAX = 1000
+
+# Глибина WS-потоку, з яким REST /v5/market/orderbook ділить послідовність u (документація Bybit v5:
+# spot — 200-level, linear/inverse — 500-level). Для інших orderbook.N u знімка з іншої послідовності.
+REST_SEQUENCE_DEPTHS: dict[str, int] = {"spot": 200, "linear": 500, "inverse": 500}
+
+ResyncFn = Callable[[str, str, int], Awaitable[dict[str, Any] | None]]
+ResubscribeFn = Callable[[str, str, int], Awaitable[bool | None]]
+
+
+def _rows(raw: Any) -> Iterable[tuple[float, float]]:
+    for r in raw or ():
+        if isinstance(r, (list, tuple)) and len(r) >= 2:
+            try:
+                yield float(r[0]), float(r[1])
+            except (TypeError, ValueError):
+                continue
+
+
+def _int(x: Any) -> int:
+    try:
+        return int(x)
+    except (TypeError, ValueError):
+        return 0
+
+
+class _Side:
+    """
+    Одна сторона книги: {price: qty} + відсортований масив ключів.
+    Для bids ключ = -price, тож в обох сторонах keys[0] — найкращий рівень.
+    """
+
+    __slots__ = ("keys", "qty", "sign")
+
+    def __init__(self, sign: float) -> None:
+        self.sign = sign
+        self.keys: list[float] = []
+        self.qty: dict[float, float] = {}
+
+    def clear(self) -> None:
+        self.keys.clear()
+        self.qty.clear()
+
+    def set(self, price: float, qty: float) -> None:
+        if qty <= 0:
+            if self.qty.pop(price, None) is not None:
+                k = self.sign * price
+                i = bisect_left(self.keys, k)
+                if i < len(self.keys) and self.keys[i] == k:
+                    del self.keys[i]
+            return
+        if price not in self.qty:
+            insort(self.keys, self.sign * price)
+        self.qty[price] = qty
+
+    def trim(self, depth: int) -> None:
+        if depth > 0 and len(self.keys) > depth:
+            for k in self.keys[depth:]:
+                self.qty.pop(self.sign * k, None)
+            del self.keys[depth:]
+
+    def levels(self, n: int | None = None) -> list[tuple[float, float]]:
+        keys = self.keys if n is None else self.keys[:n]
+        return [(self.sign * k, self.qty[self.sign * k]) for k in keys]
+
+
+class L2Book:
+    """
+    Локальна L2-книга одного символу/категорії, яку ведуть з WS orderbook.N.<SYMBOL>.
+
+    - load_snapshot() повністю замінює рівні; apply_delta() оновлює/видаляє (qty=0);
+    - u — update id останнього застосованого повідомлення, seq — крос-послідовність Bybit;
+    - ready=False означає, що книга неконсистентна (gap) і чекає snapshot/resync.
+    """
+
+    __slots__ = (
+        "category",
+        "symbol",
+        "depth",
+        "bids_side",
+        "asks_side",
+        "u",
+        "seq",
+        "ts_ms",
+        "updated",
+        "ready",
+        "version",
+        "__weakref__",
+    )
+
+    def __init__(self, category: str, symbol: str, depth: int = 0) -> None:
+        self.category = category
+        self.symbol = symbol
+        self.depth = int(depth)
+        self.bids_side = _Side(-1.0)
+        self.asks_side = _Side(1.0)
+        self.u = 0
+        self.seq = 0
+        self.ts_ms = 0
+        self.updated = 0.0
+        self.ready = False
+        self.version = 0  # +1 на кожну зміну рівнів (ключ кешу похідних структур, напр. DepthProfile)
+
+    def _mark(self, u: int, seq: int, ts_ms: int) -> None:
+        self.u = u
+        if seq:
+            self.seq = seq
+        if ts_ms:
+            self.ts_ms = ts_ms
+        self.updated = time.time()
+
+    def load_snapshot(self, bids: Any, asks: Any, *, u: int = 0, seq: int = 0, ts_ms: int = 0) -> None:
+        self.bids_side.clear()
+        self.asks_side.clear()
+        self.apply_levels(bids, asks)
+        self._mark(u, seq, ts_ms)
+        self.ready = True
+
+    def apply_delta(self, bids: Any, asks: Any, *, u: int = 0, seq: int = 0, ts_ms: int = 0) -> None:
+        self.apply_levels(bids, asks)
+        self._mark(u, seq, ts_ms)
+
+    def apply_levels(self, bids: Any, asks: Any) -> None:
+        self.version += 1
+        for p, q in _rows(bids):
+            self.bids_side.set(p, q)
+        for p, q in _rows(asks):
+            self.asks_side.set(p, q)
+        self.bids_side.trim(self.depth)
+        self.asks_side.trim(self.depth)
+
+    # --- читання
+    def bids(self, n: int | None = None) -> list[tuple[float, float]]:
+        return self.bids_side.levels(n)
+
+    def asks(self, n: int | None = None) -> list[tuple[float, float]]:
+        return self.asks_side.levels(n)
+
+    def best_bid(self) -> tuple[float, float] | None:
+        lv = self.bids_side.levels(1)
+        return lv[0] if lv else None
+
+    def best_ask(self) -> tuple[float, float] | None:
+        lv = self.asks_side.levels(1)
+        return lv[0] if lv else None
+
+    def mid(self) -> float | None:
+        bb, ba = self.best_bid(), self.best_ask()
+        if bb is None or ba is None:
+            return None
+        return (bb[0] + ba[0]) / 2.0
+
+    def window_depth_usd(self, mid_price: float, window_pct: float) -> tuple[float, float, int]:
+        """
+        Те саме, що filters.depth.calc_window_depth_usd, але без копіювання книги:
+        йдемо від найкращого рівня і зупиняємось на межі вікна.
+        """
+        mp = float(mid_price)
+        if mp <= 0:
+            return 0.0, 0.0, 0
+        w = float(window_pct) / 100.0
+        lo, hi = mp * (1.0 - w), mp * (1.0 + w)
+        bid_usd = ask_usd = 0.0
+        levels = 0
+        for k in self.bids_side.keys:
+            p = -k
+            if p < lo:
+                break
+            if p <= mp:
+                bid_usd += p * self.bids_side.qty[p]
+                levels += 1
+        for p in self.asks_side.keys:
+            if p > hi:
+                break
+            if p >= mp:
+                ask_usd += p * self.asks_side.qty[p]
+                levels += 1
+        return bid_usd, ask_usd, levels
+
+    def to_dict(self, n: int | None = None) -> dict[str, Any]:
+        """Формат REST/WS Bybit: {"s","b":[[p,q],..],"a":[[p,q],..],"u","seq","ts"}."""
+        return {
+            "s": self.symbol,
+            "b": [[p, q] for p, q in self.bids(n)],
+            "a": [[p, q] for p, q in self.asks(n)],
+            "u": self.u,
+            "seq": self.seq,
+            "ts": self.ts_ms,
+        }
+
+
+class OrderBookStore:
+    """
+    Набір L2Book по (category, symbol), що живиться сирими WS-повідомленнями Bybit v5
+    orderbook.N.<SYMBOL>.
+
+    Правила послідовності:
+      - type=snapshot (або u == 1 — рестарт сервісу Bybit) замінює книгу;
+      - delta з u <= book.u або seq < book.seq — дубль/запізніле повідомлення, ігнорується;
+      - delta з u != book.u + 1 — gap: книга стає неготовою (ready=False).
+
+    Відновлення після gap (не частіше RESYNC_MIN_INTERVAL_SEC на книгу):
+      - `resync(category, symbol, depth)` (REST /v5/market/orderbook) — лише для глибини з
+        rest_depths (REST_SEQUENCE_DEPTHS): тільки її u продовжує u REST-знімка. Дельти під
+        час запиту буферизуються й доганяються після завантаження знімка;
+      - `resubscribe(category, symbol, depth)` (unsubscribe + subscribe orderbook.N.<SYMBOL>) —
+        для решти глибин, а також коли буферизовані дельти не продовжують REST-знімок:
+        Bybit відповідає свіжим WS snapshot. Якщо після REST-знімка перша жива дельта його не
+        продовжує (зокрема новіша за знімок, але з меншим u), книга далі відновлюється лише resubscribe.
+    Без обох колбеків книга чекає наступного WS snapshot (після реконекту).
+    """
+
+    def __init__(
+        self,
+        *,
+        resync: ResyncFn | None = None,
+        resubscribe: ResubscribeFn | None = None,
+        rest_depths: dict[str, int] | None = None,
+        resync_min_interval: float = RESYNC_MIN_INTERVAL_SEC,
+    ) -> None:
+        self.resync = resync
+        self.resubscribe = resubscribe
+        self.rest_depths = dict(REST_SEQUENCE_DEPTHS if rest_depths is None else rest_depths)
+        self.resync_min_interval = float(resync_min_interval)
+        self._books: dict[tuple[str, str], L2Book] = {}
+        self._buffers: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        self._last_resync: dict[tuple[str, str], float] = {}
+        self._rest_loaded: set[tuple[str, str]] = set()  # книга з REST-знімка, ще без живої дельти
+        self._rest_mismatch: set[tuple[str, str]] = set()  # REST u не продовжується WS u: лише resubscribe
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.stats: dict[str, int] = {
+            "snapshots": 0,
+            "deltas": 0,
+            "gaps": 0,
+            "stale_dropped": 0,
+            "resyncs": 0,
+            "resync_failed": 0,
+            "resubscribes": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    def get(self, category: str, symbol: str, *, max_age_sec: float | None = None) -> L2Book | None:
+        """Готова (консистентна) книга або None; max_age_sec — відсікає книги без свіжих оновлень."""
+        book = self._books.get((category.lower(), symbol.upper()))
+        if book is None or not book.ready:
+            return None
+        if max_age_sec is not None and time.time() - book.updated > max_age_sec:
+            return None
+        return book
+
+    def apply(self, msg: dict[str, Any], category: str) -> str:
+        """Застосовує одне WS-повідомлення; повертає SNAPSHOT | DELTA | GAP | STALE | BUFFERED | IGNORED."""
+        topic = msg.get("topic") or ""
+        data = msg.get("data")
+        if not isinstance(topic, str) or not topic.startswith("orderbook.") or not isinstance(data, dict):
+            return IGNORED
+        parts = topic.split(".")
+        symbol = str(data.get("s") or parts[-1]).upper()
+        key = (category.lower(), symbol)
+        book = self._books.get(key)
+        if book is None:
+            depth = _int(parts[1]) if len(parts) >= 3 else 0
+            book = self._books[key] = L2Book(key[0], symbol, depth)
+
+        u, seq, ts_ms = _int(data.get("u")), _int(data.get("seq")), _int(msg.get("ts"))
+        kind = msg.get("type")
+        if kind == "snapshot" or u == 1:
+            book.load_snapshot(data.get("b"), data.get("a"), u=u, seq=seq, ts_ms=ts_ms)
+            self._rest_loaded.discard(key)
+            self.stats["snapshots"] += 1
+            return SNAPSHOT
+        if kind != "delta":
+            return IGNORED
+
+        if not book.ready:
+            buf = self._buffers.get(key)
+            if buf is not None:
+                if len(buf) < RESYNC_BUFFER_MAX:
+                    buf.append(data)
+                return BUFFERED
+            self.stats["stale_dropped"] += 1
+            self._start_resync(key, book)
+            return STALE
+        behind = u <= book.u or bool(seq and seq < book.seq)
+        if behind and not (key in self._rest_loaded and ts_ms > book.ts_ms):
+            return IGNORED  # дубль або запізніле повідомлення
+        if behind or u != book.u + 1:  # behind тут: дельта новіша за REST-знімок, але з меншим u
+            book.ready = False
+            self.stats["gaps"] += 1
+            if key in self._rest_loaded:  # перша ж дельта не продовжує REST-знімок
+                self._rest_loaded.discard(key)
+                self._rest_mismatch.add(key)
+            logger.bind(tag="BOOK").warning("orderbook gap {}:{} u={} after {}; resync", key[0], symbol, u, book.u)
+            if self._start_resync(key, book):
+                self._buffers[key].append(data)
+            return GAP
+        book.apply_delta(data.get("b"), data.get("a"), u=u, seq=seq, ts_ms=ts_ms)
+        self._rest_loaded.discard(key)
+        self.stats["deltas"] += 1
+        return DELTA
+
+    # --- resync
+    def _rest_resyncable(self, key: tuple[str, str], book: L2Book) -> bool:
+        if self.resync is None or key in self._rest_mismatch:
+            return False
+        return book.depth > 0 and book.depth == self.rest_depths.get(key[0])
+
+    def _start_resync(self, key: tuple[str, str], book: L2Book) -> bool:
+        """Стартує відновлення книги; True — дельти буферизуються до REST-знімка."""
+        use_rest = self._rest_resyncable(key, book)
+        if (not use_rest and self.resubscribe is None) or key in self._buffers:
+            return False
+        now = time.monotonic()
+        if now - self._last_resync.get(key, -1e9) < self.resync_min_interval:
+            return False
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._last_resync[key] = now
+        if use_rest:
+            self._buffers[key] = []
+        task = loop.create_task(self._resync_book(key, book) if use_rest else self._resubscribe_book(key, book))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return use_rest
+
+    async def _resubscribe_book(self, key: tuple[str, str], book: L2Book) -> None:
+        if self.resubscribe is None or book.ready:
+            return
+        try:
+            sent = await self.resubscribe(key[0], key[1], book.depth)
+        except Exception as e:  # noqa: BLE001
+            logger.bind(tag="BOOK").warning("orderbook resubscribe {}:{} failed: {!r}", key[0], key[1], e)
+            return
+        if sent is not False:
+            self.stats["resubscribes"] += 1
+
+    async def _resync_book(self, key: tuple[str, str], book: L2Book) -> None:
+        snap: Any = None
+        try:
+            assert self.resync is not None
+            snap = await self.resync(key[0], key[1], book.depth)
+        except Exception as e:  # noqa: BLE001
+            logger.bind(tag="BOOK").warning("orderbook resync {}:{} failed: {!r}", key[0], key[1], e)
+        buf = self._buffers.pop(key, [])
+        if book.ready:
+            return  # WS snapshot прийшов раніше за REST
+        if isinstance(snap, dict) and isinstance(snap.get("result"), dict):
+            snap = snap["result"]
+        if not isinstance(snap, dict) or not (snap.get("b") or snap.get("a")):
+            self.stats["resync_failed"] += 1
+            await self._resubscribe_book(key, book)
+            return
+        book.load_snapshot(
+            snap.get("b"), snap.get("a"), u=_int(snap.get("u")), seq=_int(snap.get("seq")), ts_ms=_int(snap.get("ts"))
+        )
+        for data in buf:
+            u = _int(data.get("u"))
+            if u <= book.u:
+                continue
+            if u != book.u + 1:
+                # u знімка з іншої послідовності, ніж потік: повторний REST не допоможе
+                book.ready = False
+                self.stats["resync_failed"] += 1
+                self._rest_mismatch.add(key)
+                logger.bind(tag="BOOK").warning(
+                    "orderbook resync {}:{} REST u={} does not continue into WS u={}; resubscribe",
+                    key[0],
+                    key[1],
+                    _int(snap.get("u")),
+                    u,
+                )
+                await self._resubscribe_book(key, book)
+                return
+            book.apply_delta(data.get("b"), data.get("a"), u=u, seq=_int(data.get("seq")))
+        if book.u == _int(snap.get("u")):
+            self._rest_loaded.add(key)  # u ще не перевірений живою дельтою
+        self.stats["resyncs"] += 1
+
+    async def aclose(self) -> None:
+        for t in list(self._tasks):
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
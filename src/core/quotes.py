@@ -0,0 +1,362 @@
+"""
+Джерела котирувань (QuoteSource) для basis:scan, basis:alert, select:save і run_selection.
+
+Кожне джерело віддає те, що вже читають _basis_rows і selector._build_pairs:
+get_maps() -> (spot, linear), де кожна карта {symbol: {"price": float, "turnover_usd": float, ...}};
+get_spot_map() / get_linear_map() — по одній половині (кожен виклик — окремий знімок).
+
+Джерела не тримають стану між викликами: get_maps() бере обидві карти з одного знімка
+(QuoteCache / одна відповідь /quotes / одне рішення auto), тож одне джерело можна безпечно
+ділити між потоками (scheduler:run запускає задачі паралельно). Виняток — кеш REST-універсу
+в auto: лише оптимізація, замінюється цілим кортежем.
+
+  - RestQuoteSource  — /v5/market/tickers (spot lastPrice, linear markPrice), два HTTP-запити на скан;
+  - CacheQuoteSource — QuoteCache цього ж процесу (ws:run), без мережі;
+  - HttpQuoteSource  — маршрут /quotes живого ws:run (metrics-ендпоінт, WS_METRICS_PORT):
+                       один локальний GET замість навантаження на біржу;
+  - AutoQuoteSource  — живий /quotes, якщо він відповідає, має ціни й покриває всі пари REST-універсу
+                       (ws:run може бути підписаний лише на частину символів), інакше REST;
+                       рішення на кожен скан, універс перечитується з REST раз на AUTO_UNIVERSE_TTL_SEC.
+
+Живі джерела відкидають ціни, старші за max_age_sec. Атрибути, яких у джерела немає
+(get_orderbook_spot/linear, get_prev_funding), делегуються REST-клієнту, тож depth-фільтр
+і funding працюють як раніше.
+
+Env (quote_source_from_env):
+    QUOTES_SOURCE       rest | live | auto (default rest)
+    QUOTES_URL          адреса /quotes (default http://127.0.0.1:$WS_METRICS_PORT/quotes, якщо порт задано)
+    QUOTES_MAX_AGE_SEC  максимальний вік живої ціни, с (default 10; 0 — без обмеження)
+    QUOTES_TIMEOUT_SEC  таймаут запиту до /quotes, с (default 0.5)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import urllib.request
+from collections.abc import Callable, Iterable, Mapping
+from typing import TYPE_CHECKING, Any, Protocol
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from src.core.cache import QuoteCache
+
+__all__ = [
+    "QUOTE_SOURCES",
+    "AutoQuoteSource",
+    "BaseQuoteSource",
+    "CacheQuoteSource",
+    "HttpQuoteSource",
+    "QuoteSource",
+    "RestQuoteSource",
+    "live_quotes_url",
+    "map_from_tickers",
+    "quote_maps",
+    "quote_source_from_env",
+    "quotes_payload",
+]
+
+QUOTE_SOURCES = ("rest", "live", "auto")
+DEFAULT_MAX_AGE_SEC = 10.0
+DEFAULT_TIMEOUT_SEC = 0.5
+AUTO_UNIVERSE_TTL_SEC = 300.0
+
+SPOT_PRICE_KEYS = ("lastPrice", "lastPriceLatest")
+LINEAR_PRICE_KEYS = ("markPrice", "lastPrice", "lastPriceLatest")
+
+QuoteMap = dict[str, dict[str, float]]
+QuoteMaps = tuple[Mapping[str, Any], Mapping[str, Any]]
+
+
+class QuoteSource(Protocol):
+    """Мінімальний контракт, який споживають _basis_rows і run_selection."""
+
+    def get_spot_map(self) -> Mapping[str, Mapping[str, Any]]: ...
+
+    def get_linear_map(self) -> Mapping[str, Mapping[str, Any]]: ...
+
+
+def quote_maps(source: Any) -> QuoteMaps:
+    """(spot, linear) з одного знімка: get_maps() джерела або два виклики простого REST-клієнта."""
+    get_maps = getattr(source, "get_maps", None)
+    if callable(get_maps):
+        return get_maps()
+    return source.get_spot_map(), source.get_linear_map()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def map_from_tickers(rows: Iterable[Mapping[str, Any]], price_keys: Iterable[str] = SPOT_PRICE_KEYS) -> QuoteMap:
+    """Рядки /v5/market/tickers -> {symbol: {"price", "turnover_usd"}} (перший непорожній з price_keys)."""
+    keys = tuple(price_keys)
+    out: QuoteMap = {}
+    for r in rows:
+        sym = r.get("symbol")
+        if not sym:
+            continue
+        price = next((r[k] for k in keys if r.get(k) not in (None, "")), None)
+        vol = r.get("turnover24h") or r.get("turnoverUsd")
+        try:
+            price_f = float(price) if price is not None else 0.0
+            vol_f = float(vol) if vol is not None else 0.0
+        except (TypeError, ValueError):
+            price_f, vol_f = 0.0, 0.0
+        out[sym] = {"price": price_f, "turnover_usd": vol_f}
+    return out
+
+
+def _fresh(m: QuoteMap, max_age_sec: float, now: float) -> QuoteMap:
+    """Лише рядки, оновлені не раніше ніж max_age_sec тому (0 — без фільтра)."""
+    if max_age_sec <= 0:
+        return m
+    oldest = now - max_age_sec
+    return {k: v for k, v in m.items() if (v.get("ts") or 0.0) >= oldest}
+
+
+class BaseQuoteSource:
+    """
+    Спільна основа джерел: невідомі атрибути (orderbook, funding) беруться з REST-клієнта.
+    Клієнт створюється ліниво — живі джерела не імпортують requests, поки він не потрібен.
+    """
+
+    name = "base"
+
+    def __init__(self, client: Any | None = None) -> None:
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            from src.exchanges.bybit.rest import BybitRest
+
+            self._client = BybitRest()
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_") or name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    # Підкласи перевизначають або get_maps() (один знімок), або обидві половини (незалежні запити)
+    def get_maps(self) -> QuoteMaps:
+        return self.get_spot_map(), self.get_linear_map()
+
+    def get_spot_map(self) -> Mapping[str, Any]:
+        return self.get_maps()[0]
+
+    def get_linear_map(self) -> Mapping[str, Any]:
+        return self.get_maps()[1]
+
+
+class RestQuoteSource(BaseQuoteSource):
+    """
+    Котирування з REST tickers. Клієнт без get_tickers (тестові двійники) віддає
+    свої get_spot_map()/get_linear_map() як є.
+    """
+
+    name = "rest"
+
+    def _map(self, category: str, price_keys: tuple[str, ...]) -> Mapping[str, Any]:
+        client = self.client
+        if hasattr(client, "get_tickers"):
+            return map_from_tickers(client.get_tickers(category) or [], price_keys)
+        return client.get_spot_map() if category == "spot" else client.get_linear_map()
+
+    def get_spot_map(self) -> Mapping[str, Any]:
+        return self._map("spot", SPOT_PRICE_KEYS)
+
+    def get_linear_map(self) -> Mapping[str, Any]:
+        return self._map("linear", LINEAR_PRICE_KEYS)
+
+
+class CacheQuoteSource(BaseQuoteSource):
+    """
+    Котирування з QuoteCache цього процесу (spot last, linear mark); ціни старші max_age_sec відкидаються.
+    get_maps() — обидві карти з одного QuoteCache.quote_maps().
+    """
+
+    name = "cache"
+
+    def __init__(
+        self,
+        cache: QuoteCache,
+        *,
+        max_age_sec: float = DEFAULT_MAX_AGE_SEC,
+        client: Any | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(client)
+        self._cache = cache
+        self.max_age_sec = float(max_age_sec)
+        self._clock = clock
+
+    def get_maps(self) -> tuple[QuoteMap, QuoteMap]:
+        spot, linear = self._cache.quote_maps()
+        now = self._clock()
+        return _fresh(spot, self.max_age_sec, now), _fresh(linear, self.max_age_sec, now)
+
+
+def quotes_payload(cache: QuoteCache) -> dict[str, Any]:
+    """Тіло відповіді /quotes: {"ts", "spot": {...}, "linear": {...}} з per-symbol "ts" (фільтрує клієнт)."""
+    spot, linear = cache.quote_maps()
+    return {"ts": time.time(), "spot": spot, "linear": linear}
+
+
+class HttpQuoteSource(BaseQuoteSource):
+    """
+    Котирування з /quotes живого ws:run: get_maps() — один GET, обидві карти з однієї відповіді.
+    Помилки мережі/формату — OSError/ValueError (AutoQuoteSource на них падає назад на REST).
+    """
+
+    name = "live"
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        timeout: float = DEFAULT_TIMEOUT_SEC,
+        max_age_sec: float = DEFAULT_MAX_AGE_SEC,
+        client: Any | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(client)
+        self.url = url
+        self.timeout = float(timeout)
+        self.max_age_sec = float(max_age_sec)
+        self._clock = clock
+
+    def fetch(self) -> dict[str, Any]:
+        with urllib.request.urlopen(self.url, timeout=self.timeout) as resp:  # noqa: S310 (local endpoint)
+            payload = json.loads(resp.read().decode("utf-8"))
+        if not isinstance(payload, dict) or not all(isinstance(payload.get(k), dict) for k in ("spot", "linear")):
+            raise ValueError(f"unexpected /quotes payload from {self.url}")
+        return payload
+
+    def get_maps(self) -> tuple[QuoteMap, QuoteMap]:
+        payload = self.fetch()
+        now = self._clock()
+        return _fresh(payload["spot"], self.max_age_sec, now), _fresh(payload["linear"], self.max_age_sec, now)
+
+
+class AutoQuoteSource(BaseQuoteSource):
+    """
+    Живий /quotes, якщо ендпоінт відповідає, має свіжі spot-ціни і покриває всі пари
+    (spot ∩ linear) REST-універсу; інакше REST — скан не звужується мовчки до символів,
+    на які підписаний ws:run. Універс — пари останнього REST-знімка, перечитуються не
+    частіше universe_ttl_sec (перший скан завжди тягне REST).
+    Рішення приймається на кожному get_maps() і стосується обох карт, тож довгоживучий
+    scheduler:run підхоплює ws:run, запущений пізніше. `active` — лише діагностика
+    (ім'я джерела останнього скану); get_maps() його не читає.
+    """
+
+    name = "auto"
+
+    def __init__(
+        self,
+        live: HttpQuoteSource | None,
+        rest: RestQuoteSource,
+        *,
+        universe_ttl_sec: float = AUTO_UNIVERSE_TTL_SEC,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(rest._client)
+        self._live = live
+        self._rest = rest
+        self._last = rest.name
+        self.universe_ttl_sec = float(universe_ttl_sec)
+        self._clock = clock
+        self._universe: tuple[float, frozenset[str]] | None = None  # (коли, пари REST)
+
+    @property
+    def client(self) -> Any:
+        return self._rest.client
+
+    @property
+    def active(self) -> str:
+        return self._last
+
+    def _rest_maps(self) -> QuoteMaps:
+        spot, linear = self._rest.get_maps()
+        self._universe = (self._clock(), frozenset(spot.keys() & linear.keys()))
+        return spot, linear
+
+    def get_maps(self) -> QuoteMaps:
+        if self._live is not None:
+            try:
+                spot, linear = self._live.get_maps()
+            except (OSError, ValueError) as e:
+                logger.bind(tag="QUOTES").debug("live quotes unavailable ({!r}); using REST", e)
+            else:
+                if spot:
+                    universe = self._universe
+                    rest_maps = None
+                    if universe is None or self._clock() - universe[0] >= self.universe_ttl_sec:
+                        rest_maps = self._rest_maps()
+                        universe = self._universe
+                    assert universe is not None
+                    missing = universe[1] - (spot.keys() & linear.keys())
+                    if not missing:
+                        self._last = self._live.name
+                        return spot, linear
+                    logger.bind(tag="QUOTES").info(
+                        "live quotes cover {}/{} REST pairs; using REST",
+                        len(universe[1]) - len(missing),
+                        len(universe[1]),
+                    )
+                    self._last = self._rest.name
+                    return rest_maps if rest_maps is not None else self._rest_maps()
+                logger.bind(tag="QUOTES").debug("live quotes have no fresh prices; using REST")
+        self._last = self._rest.name
+        return self._rest_maps()
+
+
+def live_quotes_url() -> str | None:
+    """QUOTES_URL або /quotes metrics-ендпоінту ws:run на WS_METRICS_PORT; None, якщо не задано."""
+    url = (os.getenv("QUOTES_URL") or "").strip()
+    if url:
+        return url
+    try:
+        port = int(os.getenv("WS_METRICS_PORT", "0") or 0)
+    except ValueError:
+        port = 0
+    if port <= 0:
+        return None
+    host = os.getenv("WS_METRICS_HOST", "127.0.0.1") or "127.0.0.1"
+    if host in ("0.0.0.0", "::"):
+        host = "127.0.0.1"
+    return f"http://{host}:{port}/quotes"
+
+
+def quote_source_from_env(kind: str | None = None, *, client: Any | None = None) -> BaseQuoteSource:
+    """
+    Джерело за kind (або QUOTES_SOURCE): rest | live | auto.
+    client — REST-клієнт для REST-котирувань і делегованих методів (orderbook, funding).
+    ValueError — невідомий kind або live без адреси (QUOTES_URL / WS_METRICS_PORT).
+    """
+    kind = (kind or os.getenv("QUOTES_SOURCE") or "rest").strip().lower()
+    if kind not in QUOTE_SOURCES:
+        raise ValueError(f"unknown quote source {kind!r} (choose from {', '.join(QUOTE_SOURCES)})")
+    rest = RestQuoteSource(client)
+    if kind == "rest":
+        return rest
+    url = live_quotes_url()
+    live = None
+    if url:
+        live = HttpQuoteSource(
+            url,
+            timeout=_env_float("QUOTES_TIMEOUT_SEC", DEFAULT_TIMEOUT_SEC),
+            max_age_sec=_env_float("QUOTES_MAX_AGE_SEC", DEFAULT_MAX_AGE_SEC),
+            client=client,
+        )
+    if kind == "live":
+        if live is None:
+            raise ValueError("live quotes need QUOTES_URL or WS_METRICS_PORT")
+        return live
+    return AutoQuoteSource(live, rest)
@@ -0,0 +1,161 @@
+"""
+Планувальник періодичних задач для довгоживучого процесу (`scheduler:run`) замість cron.
+
+Кожна задача (Job) має інтервал; наступний запуск = час старту + interval + випадковий
+jitter у [0, interval * jitter_pct%], щоб кілька інстансів не били в API синхронно.
+Задачі виконуються у пулі потоків (по одному потоку на задачу), тож довга задача не
+затримує інші; захист від перекриття — новий запуск пропускається, поки попередній
+ще триває (skipped_overlap).
+
+Тривалість кожного запуску пишеться у MetricsRegistry як latency-гістограма
+kind="job", channel=<ім'я задачі> (видно у ws:health / Prometheus), плюс лічильники в stats().
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from src.ws.health import MetricsRegistry
+
+__all__ = ["Job", "Scheduler"]
+
+
+@dataclass
+class Job:
+    """
+    Періодична задача: fn() викликається кожні interval_sec (плюс jitter).
+    delay_first — перший запуск через interval, а не одразу після старту (напр. добовий звіт
+    не повинен відправлятися при кожному рестарті).
+    """
+
+    name: str
+    interval_sec: float
+    fn: Callable[[], Any]
+    delay_first: bool = False
+    runs: int = 0
+    failures: int = 0
+    skipped_overlap: int = 0
+    last_duration_ms: float | None = None
+    last_ok_ts: float | None = None
+    last_error: str | None = None
+    next_run: float = 0.0
+    _future: Future | None = field(default=None, repr=False)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "interval_sec": self.interval_sec,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped_overlap": self.skipped_overlap,
+            "running": self._future is not None and not self._future.done(),
+            "last_duration_ms": None if self.last_duration_ms is None else round(self.last_duration_ms, 3),
+            "last_ok_ts": self.last_ok_ts,
+            "last_error": self.last_error,
+        }
+
+
+class Scheduler:
+    """
+    Запускає Job-и за розкладом до stop().
+
+      jitter_pct — верхня межа випадкової затримки, % від інтервалу (також для першого запуску).
+    """
+
+    def __init__(
+        self,
+        jobs: Iterable[Job],
+        *,
+        jitter_pct: float = 10.0,
+        metrics: MetricsRegistry | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.jobs: list[Job] = [j for j in jobs if j.interval_sec > 0]
+        self.jitter_pct = max(0.0, float(jitter_pct))
+        self._metrics = metrics or MetricsRegistry.get()
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._stop = threading.Event()
+        self._pool: ThreadPoolExecutor | None = None
+
+    # --------------------------- розклад ---------------------------
+
+    def _jitter(self, job: Job) -> float:
+        return self._rng.uniform(0.0, job.interval_sec * self.jitter_pct / 100.0) if self.jitter_pct else 0.0
+
+    def _schedule_next(self, job: Job, started: float) -> None:
+        job.next_run = started + job.interval_sec + self._jitter(job)
+
+    def _execute(self, job: Job) -> None:
+        """Один запуск задачі у поточному потоці: тривалість у метрики, помилки — у лог і stats."""
+        t0 = time.perf_counter()
+        try:
+            job.fn()
+        except Exception as e:  # noqa: BLE001 (одна задача не повинна зупиняти інші)
+            job.failures += 1
+            job.last_error = repr(e)
+            logger.bind(tag="SCHED").exception("job {} failed: {!r}", job.name, e)
+        else:
+            job.last_ok_ts = time.time()
+            job.last_error = None
+        finally:
+            ms = (time.perf_counter() - t0) * 1000.0
+            job.runs += 1
+            job.last_duration_ms = ms
+            self._metrics.observe_latency("job", ms, channel=job.name)
+            logger.bind(tag="SCHED").debug("job {} done in {:.1f} ms", job.name, ms)
+
+    def _launch(self, job: Job, now: float) -> None:
+        self._schedule_next(job, now)
+        if job._future is not None and not job._future.done():
+            job.skipped_overlap += 1
+            logger.bind(tag="SCHED").warning("job {} still running; skipping this run", job.name)
+            return
+        assert self._pool is not None
+        job._future = self._pool.submit(self._execute, job)
+
+    # --------------------------- API ---------------------------
+
+    def run_once(self) -> dict[str, dict[str, Any]]:
+        """Кожна задача один раз, послідовно у поточному потоці (--once, тести)."""
+        for job in self.jobs:
+            self._execute(job)
+        return self.stats()
+
+    def run_forever(self) -> dict[str, dict[str, Any]]:
+        """Блокує до stop(); після зупинки дочікується задач, що виконуються, і повертає stats()."""
+        if not self.jobs:
+            return {}
+        now = self._clock()
+        for job in self.jobs:
+            job.next_run = now + (job.interval_sec if job.delay_first else 0.0) + self._jitter(job)
+        self._pool = ThreadPoolExecutor(max_workers=len(self.jobs), thread_name_prefix="sched")
+        logger.bind(tag="SCHED").info(
+            "scheduler started: {}", ", ".join(f"{j.name}/{j.interval_sec:g}s" for j in self.jobs)
+        )
+        try:
+            while not self._stop.is_set():
+                now = self._clock()
+                for job in self.jobs:
+                    if now >= job.next_run:
+                        self._launch(job, now)
+                wait = min(j.next_run for j in self.jobs) - self._clock()
+                self._stop.wait(min(max(wait, 0.0), 1.0))
+        finally:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        return self.stats()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {j.name: j.stats() for j in self.jobs}
@@ -6,6 +6,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 from src.core.filters.liquidity import enough_liquidity
+from src.core.orderbook import OrderBookStore
 from src.infra.config import load_settings
 
 # Імпорт залишаємо: тести можуть monkeypatch-ити selector.has_enough_depth
@@ -111,6 +112,18 @@ def _allowed(symbol: str, allow: list[str], deny: list[str]) -> bool:
     return True
 
 
+def _orderbook(books: OrderBookStore | None, client: Any | None, category: str, symbol: str) -> Any:
+    """Локальна L2-книга, якщо вона готова; інакше REST-знімок (або None, якщо джерела немає)."""
+    if books is not None:
+        book = books.get(category, symbol)
+        if book is not None:
+            return book
+    if client is None:
+        return None
+    fetch = client.get_orderbook_spot if category == "spot" else client.get_orderbook_linear
+    return fetch(symbol, limit=200)
+
+
 def run_selection(
     *,
     min_vol: float | None = None,
@@ -119,10 +132,19 @@ def run_selection(
     limit: int = 3,
     cooldown_sec: int | None = None,
     client: Any | None = None,
+    books: OrderBookStore | None = None,
+    quotes: Any | None = None,
 ) -> list[dict[str, Any]]:
     """
     Запускає відбір SPOT vs LINEAR, фільтрує за ціною/ліквідністю/порогом,
     застосовує allow/deny та cooldown, опційно — фільтр глибини, зберігає у БД і повертає реально збережені записи.
+
+    books — локальні L2-книги з WS (OrderBookStore): якщо книга готова, depth-фільтр читає її
+    без HTTP; інакше — REST orderbook клієнта (якщо він його вміє).
+
+    quotes — джерело цін (src/core/quotes.py: REST tickers, QuoteCache, живий /quotes ws:run);
+    за замовчуванням ціни дає client, а без нього — RestQuoteSource. Якщо client не задано,
+    orderbook для depth-фільтра береться з quotes (джерела делегують його REST-клієнту).
     """
     s = load_settings()
     min_vol = s.min_vol_24h_usd if min_vol is None else float(min_vol)
@@ -157,14 +179,19 @@ def run_selection(
         raw_deny = getattr(s, "deny_symbols", "")
         deny = raw_deny if isinstance(raw_deny, list) else _parse_symbols_value(raw_deny)
 
-    # відкладений імпорт реального клієнта
-    if client is None:
-        from src.exchanges.bybit.rest import BybitRest
+    # відкладений імпорт реального клієнта (ціни — з tickers: instruments-карти BybitRest їх не мають)
+    if quotes is None:
+        if client is None:
+            from src.core.quotes import RestQuoteSource
+
+            client = RestQuoteSource()
+        quotes = client
+    elif client is None:
+        client = quotes
 
-        client = BybitRest()
+    from src.core.quotes import quote_maps
 
-    spot_map = client.get_spot_map()
-    linear_map = client.get_linear_map()
+    spot_map, linear_map = quote_maps(quotes)  # обидві карти з одного знімка
 
     pairs = _build_pairs(spot_map, linear_map)
 
@@ -181,11 +208,11 @@ def run_selection(
             continue
 
         # --- опційний depth-фільтр ---
-        if depth_enabled and client_has_orderbook:
+        if depth_enabled and (client_has_orderbook or books is not None):
             try:
-                ob_spot = client.get_orderbook_spot(p.symbol, limit=200)
-                ob_linear = client.get_orderbook_linear(p.symbol, limit=200)
-                if not has_enough_depth(
+                ob_spot = _orderbook(books, client if client_has_orderbook else None, "spot", p.symbol)
+                ob_linear = _orderbook(books, client if client_has_orderbook else None, "linear", p.symbol)
+                if ob_spot is not None and not has_enough_depth(
                     ob_spot,
                     p.spot,
                     min_depth_usd=float(min_depth_usd),  # type: ignore[arg-type]
@@ -193,7 +220,7 @@ def run_selection(
                     min_levels=int(min_depth_levels),  # type: ignore[arg-type]
                 ):
                     continue
-                if not has_enough_depth(
+                if ob_linear is not None and not has_enough_depth(
                     ob_linear,
                     p.fut,
                     min_depth_usd=float(min_depth_usd),  # type: ignore[arg-type]
@@ -0,0 +1,215 @@
+# src/exchanges/bybit/instruments_cache.py
+"""TTL cache for Bybit `/v5/market/instruments-info` with an on-disk snapshot.
+
+Instrument metadata (base/quote per symbol) changes rarely, so short-lived CLI
+runs (`select:save`, `basis:*`) can reuse the snapshot written by a previous run
+instead of pulling the whole listing again.
+
+Snapshot format (JSON, or msgpack when the path ends with `.msgpack` and the
+package is installed):
+    {"version": 2, "source": "<REST base_url>",
+     "categories": {"spot": {"fetched_at": <epoch>, "symbols": {...}}}}
+
+Snapshots are keyed by the REST base URL: from_env() picks one file per host
+(bybit_instruments.<host>.json) and a snapshot written for another source is
+ignored, so a testnet or fake-server run never feeds its symbols to mainnet.
+
+English-only comments per project rules.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+try:
+    import msgpack  # type: ignore
+except Exception:  # noqa: BLE001
+    msgpack = None  # optional dependency; JSON is used when it is missing
+
+__all__ = ["InstrumentsCache", "DEFAULT_CACHE_PATH", "DEFAULT_TTL_SEC", "snapshot_path_for"]
+
+DEFAULT_CACHE_PATH = "data/cache/bybit_instruments.json"
+DEFAULT_TTL_SEC = 6 * 3600
+SNAPSHOT_VERSION = 2  # 2: + "source" (v1 snapshots carry no source and are ignored)
+
+_Symbols = dict[str, dict[str, Any]]
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def snapshot_path_for(source: str | None, path: str | os.PathLike[str] = DEFAULT_CACHE_PATH) -> Path:
+    """Per-host snapshot file, e.g. data/cache/bybit_instruments.api.bybit.com.json."""
+    p = Path(path)
+    host = urlsplit(source).netloc if source else ""
+    if not host:
+        return p
+    safe = re.sub(r"[^A-Za-z0-9.-]", "_", host)
+    return p.with_name(f"{p.stem}.{safe}{p.suffix}")
+
+
+class InstrumentsCache:
+    """
+    Per-category symbol map cache:
+      - in-memory entries for repeated calls within one process;
+      - optional on-disk snapshot shared between processes (atomic replace);
+      - `ttl_sec <= 0` disables caching entirely;
+      - `source` (REST base URL) is stored in the snapshot; a snapshot of another source is ignored.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = DEFAULT_CACHE_PATH,
+        *,
+        source: str | None = None,
+        ttl_sec: float = DEFAULT_TTL_SEC,
+        clock: Callable[[], float] = time.time,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.path: Path | None = Path(path) if path else None
+        self.source = source.rstrip("/") if source else None
+        self.ttl_sec = float(ttl_sec)
+        self._clock = clock
+        self.log = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[float, _Symbols]] = {}
+        self._loaded = False
+
+    @classmethod
+    def from_env(cls, source: str | None = None) -> InstrumentsCache:
+        """
+        BYBIT_INSTRUMENTS_CACHE_TTL_SEC  -> TTL in seconds (0 disables, default 6h)
+        BYBIT_INSTRUMENTS_CACHE_PATH     -> snapshot path ("" keeps the cache in memory only;
+                                            default: one file per `source` host, see snapshot_path_for)
+        """
+        env_path = os.getenv("BYBIT_INSTRUMENTS_CACHE_PATH")
+        path = snapshot_path_for(source) if env_path is None else (env_path or None)
+        ttl = _env_float("BYBIT_INSTRUMENTS_CACHE_TTL_SEC", DEFAULT_TTL_SEC)
+        return cls(path, source=source, ttl_sec=ttl)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_sec > 0
+
+    # --- views
+    def age(self, category: str) -> float | None:
+        """Seconds since the category was fetched, or None if unknown."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(category)
+        if entry is None:
+            return None
+        return max(0.0, self._clock() - entry[0])
+
+    def get(self, category: str, *, max_age: float | None = None) -> _Symbols | None:
+        """Return a copy of the symbol map if it is younger than `max_age` (default: TTL)."""
+        limit = self.ttl_sec if max_age is None else float(max_age)
+        age = self.age(category)
+        if age is None or age >= limit:
+            return None
+        return self.get_stale(category)
+
+    def get_stale(self, category: str) -> _Symbols | None:
+        """Return a copy of the symbol map regardless of its age (fallback on fetch errors)."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(category)
+        if entry is None:
+            return None
+        return {sym: dict(meta) for sym, meta in entry[1].items()}
+
+    # --- mutations
+    def put(self, category: str, symbols: Mapping[str, Mapping[str, Any]], *, fetched_at: float | None = None) -> None:
+        if not self.enabled:
+            return
+        ts = self._clock() if fetched_at is None else float(fetched_at)
+        with self._lock:
+            self._ensure_loaded()
+            self._entries[category] = (ts, {sym: dict(meta) for sym, meta in symbols.items()})
+            self._save()
+
+    def invalidate(self, category: str | None = None) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            if category is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(category, None)
+            self._save()
+
+    # --- persistence
+    def _use_msgpack(self) -> bool:
+        return self.path is not None and self.path.suffix == ".msgpack" and msgpack is not None
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None or not self.path.is_file():
+            return
+        try:
+            raw = self.path.read_bytes()
+            doc = msgpack.unpackb(raw, raw=False) if self._use_msgpack() else json.loads(raw.decode("utf-8"))
+        except Exception as exc:  # noqa: BLE001
+            self.log.warning("Instruments snapshot %s is unreadable, ignoring: %s", self.path, exc)
+            return
+        if not isinstance(doc, dict) or doc.get("version") != SNAPSHOT_VERSION:
+            return
+        if doc.get("source") != self.source:
+            self.log.info(
+                "Instruments snapshot %s is for %s, not %s; ignoring", self.path, doc.get("source"), self.source
+            )
+            return
+        cats = doc.get("categories")
+        if not isinstance(cats, dict):
+            return
+        for cat, node in cats.items():
+            if not isinstance(node, dict):
+                continue
+            symbols = node.get("symbols")
+            try:
+                fetched_at = float(node.get("fetched_at"))
+            except Exception:
+                continue
+            if isinstance(symbols, dict):
+                self._entries[str(cat)] = (fetched_at, symbols)
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        doc = {
+            "version": SNAPSHOT_VERSION,
+            "source": self.source,
+            "categories": {cat: {"fetched_at": ts, "symbols": syms} for cat, (ts, syms) in self._entries.items()},
+        }
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self._use_msgpack():
+                tmp.write_bytes(msgpack.packb(doc, use_bin_type=True))
+            else:
+                tmp.write_text(json.dumps(doc, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except Exception as exc:  # noqa: BLE001
+            # A failed snapshot write must never break the REST call that produced the data.
+            self.log.warning("Failed to write instruments snapshot %s: %s", self.path, exc)
+            with contextlib.suppress(OSError):
+                tmp.unlink()
@@ -2,13 +2,53 @@
 from __future__ import annotations
 
 import logging
+import os
 import time
 from collections.abc import Iterable
-from typing import Any, NotRequired, TypedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, NotRequired, TypedDict
 
 import requests
 
-__all__ = ["BybitRest", "SymbolMeta"]
+from .instruments_cache import InstrumentsCache
+
+if TYPE_CHECKING:
+    from exchanges.bybit.rate_limiter import TokenBucket
+
+__all__ = ["BybitRest", "SymbolMeta", "InstrumentsCache"]
+
+# Паралельний get_tickers(symbols=[...]): розмір пулу, поріг переходу на один
+# повний запит категорії та спільний ліміт запитів/с (0 — без ліміту).
+DEFAULT_TICKERS_MAX_WORKERS = 8
+DEFAULT_TICKERS_FULL_SCAN_THRESHOLD = 20
+DEFAULT_RATE_PER_SEC = 20.0
+
+# BYBIT_REST_BASE_URL перевизначає хост (напр. локальний scripts/fake_bybit_server.py)
+DEFAULT_BASE_URL = "https://api.bybit.com"
+
+
+def _env_num(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def _default_limiter(log: logging.Logger) -> TokenBucket | None:
+    """TokenBucket з BYBIT_REST_RATE_PER_SEC (0 — вимкнено).
+
+    Бакет живе у пакеті верхнього рівня exchanges/; якщо src імпортовано без кореня
+    репозиторію на sys.path, клієнт працює без локального ліміту (з попередженням).
+    """
+    rate = _env_num("BYBIT_REST_RATE_PER_SEC", DEFAULT_RATE_PER_SEC)
+    if rate <= 0:
+        return None
+    try:
+        from exchanges.bybit.rate_limiter import TokenBucket
+    except ImportError:
+        log.warning("exchanges.bybit.rate_limiter is not importable; REST requests are not rate-limited")
+        return None
+    return TokenBucket(rate_per_sec=rate, burst=max(1, int(rate)))
 
 
 class SymbolMeta(TypedDict):
@@ -28,13 +68,17 @@ class BybitRest:
     Легкий REST-клієнт Bybit з чіткими типами, достатній для потреб типізації.
 
     Покриті методи:
-      - get_spot_map() -> dict[symbol, {"base": str, "quote": str}]
-      - get_linear_map() -> dict[symbol, {"base": str, "quote": str}]
+      - get_spot_map(refresh=False) -> dict[symbol, {"base": str, "quote": str}]
+      - get_linear_map(refresh=False) -> dict[symbol, {"base": str, "quote": str}]
+      - refresh_instruments(categories, if_older_than=None) -> dict[category, bool]
       - get_orderbook_spot(symbol, *, limit|depth) -> dict
       - get_orderbook_linear(symbol, *, limit|depth) -> dict
       - get_prev_funding(symbol) -> dict | None
       - get_server_time() -> dict[str, Any]  (має ключі timeSecond/timeNow)
       - get_tickers(category="spot"/"linear", symbols=None) -> list[dict]
+
+    Усі запити проходять через спільний TokenBucket (`limiter`), тож паралельний
+    get_tickers(symbols=[...]) не перевищує ліміт Bybit.
     """
 
     def __init__(
@@ -42,23 +86,44 @@ class BybitRest:
         session: requests.Session | None = None,
         api_key: str | None = None,
         api_secret: str | None = None,
-        base_url: str = "https://api.bybit.com",
+        base_url: str | None = None,
         *,
         timeout: float = 10.0,
         logger: logging.Logger | None = None,
+        instruments_cache: InstrumentsCache | None = None,
+        limiter: TokenBucket | None = None,
+        max_workers: int | None = None,
+        full_scan_threshold: int | None = None,
     ) -> None:
-        self.base_url: str = base_url.rstrip("/")
+        self.base_url: str = (base_url or os.getenv("BYBIT_REST_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
         self.session: requests.Session = session or requests.Session()
         self.timeout: float = timeout
         self.api_key: str | None = api_key
         self.api_secret: str | None = api_secret
         self.log: logging.Logger = logger or logging.getLogger(__name__)
+        # Кеш instruments-info (TTL + снапшот на диску окремо для кожного base_url), див. instruments_cache.py
+        self.instruments_cache: InstrumentsCache = instruments_cache or InstrumentsCache.from_env(self.base_url)
+
+        # Спільний токен-бакет для всіх потоків пулу (BYBIT_REST_RATE_PER_SEC=0 — вимкнено)
+        if limiter is None:
+            limiter = _default_limiter(self.log)
+        self.limiter: TokenBucket | None = limiter
+        if max_workers is None:
+            max_workers = int(_env_num("BYBIT_TICKERS_MAX_WORKERS", DEFAULT_TICKERS_MAX_WORKERS))
+        self.max_workers: int = max(1, max_workers)
+        if full_scan_threshold is None:
+            full_scan_threshold = int(
+                _env_num("BYBIT_TICKERS_FULL_SCAN_THRESHOLD", DEFAULT_TICKERS_FULL_SCAN_THRESHOLD)
+            )
+        self.full_scan_threshold: int = max(1, full_scan_threshold)
 
         self.session.headers.update({"User-Agent": "bybit-arb-bot/0.0 (rest.py typesafe client)"})
 
     # -------------------------- внутрішні утиліти --------------------------
 
     def _get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        if self.limiter is not None:
+            self.limiter.acquire(1)
         url = f"{self.base_url}{path}"
         resp = self.session.get(url, params=params or {}, timeout=self.timeout)
         resp.raise_for_status()
@@ -116,46 +181,73 @@ class BybitRest:
 
     # -------------------------- публічні методи ---------------------------
 
-    def get_spot_map(self) -> dict[str, SymbolMeta]:
-        """Карта SPOT-інструментів: symbol -> {"base": baseCoin, "quote": quoteCoin}"""
-        params = {"category": "spot"}
-        data = self._get("/v5/market/instruments-info", params=params)
+    def _fetch_instruments(self, category: str) -> dict[str, SymbolMeta]:
+        """Повний лістинг /v5/market/instruments-info з урахуванням nextPageCursor."""
+        rows = self._get_paged("/v5/market/instruments-info", {"category": category})
 
         symbols: dict[str, SymbolMeta] = {}
-        result = data.get("result")
-        if isinstance(result, dict):
-            lst = result.get("list")
-            if isinstance(lst, list):
-                for row in lst:
-                    if not isinstance(row, dict):
-                        continue
-                    symbol = row.get("symbol")
-                    base = row.get("baseCoin")
-                    quote = row.get("quoteCoin")
-                    if isinstance(symbol, str) and isinstance(base, str) and isinstance(quote, str):
-                        symbols[symbol] = {"base": base, "quote": quote}
+        for row in rows:
+            symbol = row.get("symbol")
+            base = row.get("baseCoin")
+            quote = row.get("quoteCoin")
+            if isinstance(symbol, str) and isinstance(base, str) and isinstance(quote, str):
+                symbols[symbol] = {"base": base, "quote": quote}
         return symbols
 
-    def get_linear_map(self) -> dict[str, SymbolMeta]:
-        """Карта USDT-перпатів (linear): symbol -> {"base": baseCoin, "quote": quoteCoin}"""
-        params = {"category": "linear"}
-        data = self._get("/v5/market/instruments-info", params=params)
+    def _instruments_map(self, category: str, *, refresh: bool = False) -> dict[str, SymbolMeta]:
+        """
+        Карта інструментів із кешу (якщо свіжа), інакше — з API з оновленням кешу.
+        Якщо API недоступний, а в кеші є застарілий снапшот — повертаємо його.
+        """
+        cache = self.instruments_cache
+        if not refresh:
+            hit = cache.get(category)
+            if hit is not None:
+                return hit  # type: ignore[return-value]
 
-        symbols: dict[str, SymbolMeta] = {}
-        result = data.get("result")
-        if isinstance(result, dict):
-            lst = result.get("list")
-            if isinstance(lst, list):
-                for row in lst:
-                    if not isinstance(row, dict):
-                        continue
-                    symbol = row.get("symbol")
-                    base = row.get("baseCoin")
-                    quote = row.get("quoteCoin")
-                    if isinstance(symbol, str) and isinstance(base, str) and isinstance(quote, str):
-                        symbols[symbol] = {"base": base, "quote": quote}
+        try:
+            symbols = self._fetch_instruments(category)
+        except Exception as exc:
+            stale = cache.get_stale(category)
+            if stale is None:
+                raise
+            self.log.warning("instruments-info(%s) refresh failed, using stale snapshot: %s", category, exc)
+            return stale  # type: ignore[return-value]
+
+        cache.put(category, symbols)
         return symbols
 
+    def get_spot_map(self, *, refresh: bool = False) -> dict[str, SymbolMeta]:
+        """Карта SPOT-інструментів: symbol -> {"base": baseCoin, "quote": quoteCoin}"""
+        return self._instruments_map("spot", refresh=refresh)
+
+    def get_linear_map(self, *, refresh: bool = False) -> dict[str, SymbolMeta]:
+        """Карта USDT-перпатів (linear): symbol -> {"base": baseCoin, "quote": quoteCoin}"""
+        return self._instruments_map("linear", refresh=refresh)
+
+    def refresh_instruments(
+        self,
+        categories: Iterable[str] = ("spot", "linear"),
+        *,
+        if_older_than: float | None = None,
+    ) -> dict[str, bool]:
+        """
+        Умовне оновлення кешу: перезавантажує лише ті категорії, чий снапшот
+        відсутній або старший за `if_older_than` секунд (за замовчуванням — TTL кешу).
+        Повертає {category: чи був запит до API}.
+        """
+        cache = self.instruments_cache
+        limit = cache.ttl_sec if if_older_than is None else float(if_older_than)
+        out: dict[str, bool] = {}
+        for cat in categories:
+            age = cache.age(cat)
+            if age is not None and age < limit:
+                out[cat] = False
+                continue
+            self._instruments_map(cat, refresh=True)
+            out[cat] = True
+        return out
+
     def get_orderbook_spot(
         self,
         symbol: str,
@@ -231,6 +323,16 @@ class BybitRest:
 
         return {"timeSecond": now_sec, "timeNow": str(now_sec)}
 
+    def _tickers_one(self, category: str, symbol: str | None) -> list[dict[str, Any]]:
+        p = {"category": category}
+        if symbol:
+            p["symbol"] = symbol
+        data = self._get("/v5/market/tickers", p)
+        result = data.get("result")
+        if isinstance(result, dict) and isinstance(result.get("list"), list):
+            return [it for it in result["list"] if isinstance(it, dict)]
+        return []
+
     def get_tickers(
         self,
         category: str = "linear",
@@ -239,22 +341,25 @@ class BybitRest:
         """
         Обгортка над /v5/market/tickers, яка **повертає список** тікерів.
         Це узгоджується з подальшими викликами: .sort(), зрізи тощо.
-        """
-
-        def _one(sym: str | None) -> list[dict[str, Any]]:
-            p = {"category": category}
-            if sym:
-                p["symbol"] = sym
-            data = self._get("/v5/market/tickers", p)
-            result = data.get("result")
-            if isinstance(result, dict) and isinstance(result.get("list"), list):
-                return [it for it in result["list"] if isinstance(it, dict)]
-            return []
 
+        Зі списком `symbols`:
+          - до `full_scan_threshold` символів — паралельні запити по символу
+            (пул із `max_workers` потоків, спільний `limiter`);
+          - більше — один запит усієї категорії з фільтрацією на клієнті.
+        Порядок результату відповідає порядку `symbols`; дублікати відкидаються.
+        """
         if not symbols:
-            return _one(None)
-
-        out: list[dict[str, Any]] = []
-        for s in symbols:
-            out.extend(_one(s))
-        return out
+            return self._tickers_one(category, None)
+
+        wanted = list(dict.fromkeys(s for s in symbols if s))
+        if len(wanted) > self.full_scan_threshold:
+            by_symbol = {row.get("symbol"): row for row in self._tickers_one(category, None)}
+            return [by_symbol[s] for s in wanted if s in by_symbol]
+
+        workers = min(self.max_workers, len(wanted))
+        if workers <= 1:
+            parts = [self._tickers_one(category, s) for s in wanted]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bybit-tickers") as pool:
+                parts = list(pool.map(lambda s: self._tickers_one(category, s), wanted))
+        return [row for part in parts for row in part]
@@ -0,0 +1,128 @@
+# src/exchanges/bybit/rest_async.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from exchanges.bybit._http import HTTPClient
+    from exchanges.bybit.rate_limiter import AsyncTokenBucket, LimiterRegistry
+
+__all__ = ["AsyncBybitRest"]
+
+DEFAULT_BASE_URL = "https://api.bybit.com"
+
+logger = logging.getLogger(__name__)
+
+
+class _PlainHTTP:
+    """
+    Запасний GET-клієнт на httpx без ретраїв і rate-limit: лише коли пакет верхнього рівня
+    exchanges/ не імпортується (src на sys.path без кореня репозиторію).
+    """
+
+    def __init__(self, base_url: str, *, timeout: float) -> None:
+        import httpx
+
+        self._client = httpx.AsyncClient(base_url=base_url, timeout=timeout)
+
+    async def get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        resp = await self._client.get(path, params=params)
+        resp.raise_for_status()
+        data = resp.json()
+        if int(data.get("retCode", 0) or 0) != 0:
+            raise RuntimeError(f"Bybit retCode={data.get('retCode')}: {data.get('retMsg', 'unknown error')}")
+        return data
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def _build_http(base_url: str, timeout: float, limiter: Any) -> Any:
+    try:
+        from exchanges.bybit._http import HTTPClient
+        from exchanges.bybit.http_factory import build_async_client
+        from exchanges.bybit.rate_limiter import default_registry
+    except ImportError:
+        logger.warning("exchanges.bybit is not importable; AsyncBybitRest runs without retries and rate limits")
+        return _PlainHTTP(base_url, timeout=timeout)
+    return HTTPClient(
+        base_url,
+        timeout=timeout,
+        limiter=limiter or default_registry(),
+        client=build_async_client(base_url=base_url),
+    )
+
+
+class AsyncBybitRest:
+    """
+    Async-двійник BybitRest для коду, що працює в одному event loop з WebSocket-ами.
+
+    - один HTTPClient (httpx.AsyncClient з пулом з'єднань) на весь час життя об'єкта;
+    - ретраї та rate-limit — з exchanges/bybit/_http.HTTPClient (спільний LimiterRegistry),
+      імпорт відкладений: без пакета exchanges/ на sys.path — простий httpx-клієнт (_PlainHTTP);
+    - get_tickers_many() тягне кілька категорій паралельно.
+
+    Створюйте один екземпляр на процес і закривайте через close() / `async with`.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        *,
+        http: HTTPClient | None = None,
+        timeout: float = 10.0,
+        limiter: AsyncTokenBucket | LimiterRegistry | None = None,
+    ) -> None:
+        self.base_url = (base_url or os.getenv("BYBIT_REST_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.http = http if http is not None else _build_http(self.base_url, timeout, limiter)
+
+    async def __aenter__(self) -> AsyncBybitRest:
+        return self
+
+    async def __aexit__(self, *_exc: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.http.close()
+
+    async def _tickers_one(self, category: str, symbol: str | None) -> list[dict[str, Any]]:
+        params: dict[str, Any] = {"category": category}
+        if symbol:
+            params["symbol"] = symbol
+        data = await self.http.get("/v5/market/tickers", params=params)
+        result = data.get("result")
+        if isinstance(result, dict) and isinstance(result.get("list"), list):
+            return [it for it in result["list"] if isinstance(it, dict)]
+        return []
+
+    async def get_tickers(
+        self,
+        category: str = "linear",
+        symbols: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Те саме, що BybitRest.get_tickers(), але без блокування event loop."""
+        if not symbols:
+            return await self._tickers_one(category, None)
+        parts = await asyncio.gather(*(self._tickers_one(category, s) for s in symbols))
+        return [row for part in parts for row in part]
+
+    async def get_tickers_many(
+        self,
+        categories: Iterable[str] = ("spot", "linear"),
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Паралельно тягне /v5/market/tickers для кількох категорій: {category: rows}."""
+        cats = list(dict.fromkeys(categories))
+        results = await asyncio.gather(*(self._tickers_one(c, None) for c in cats))
+        return dict(zip(cats, results))
+
+    async def get_orderbook(self, category: str, symbol: str, *, limit: int = 50) -> dict[str, Any]:
+        """/v5/market/orderbook -> result {"s","b","a","u","seq","ts"} (знімок для resync L2-книги)."""
+        cap = 200 if category == "spot" else 500
+        params = {"category": category, "symbol": symbol, "limit": max(1, min(int(limit or 50), cap))}
+        data = await self.http.get("/v5/market/orderbook", params=params)
+        result = data.get("result")
+        return result if isinstance(result, dict) else {}
@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import json
+import os
+import time
 from collections.abc import Awaitable, Iterable, Iterator
 from typing import Any, Callable, Protocol
 
@@ -21,6 +24,22 @@ try:
 except Exception:  # pragma: no cover
     MetricsRegistry = None  # type: ignore
 
+from src.ws.decode_pool import DecodePool
+from src.ws.recorder import FrameRecorder
+
+# Bybit v5 caps args per subscribe request (10 on spot); larger topic lists are
+# sent as several requests. WS_SUBSCRIBE_BATCH overrides the batch size.
+DEFAULT_SUBSCRIBE_BATCH = 10
+# Frames submitted to a DecodePool but not yet handled (backpressure on the socket reader)
+DECODE_MAX_INFLIGHT = 1024
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
 
 # ---- Logger (loguru if available; falls back to stdlib logging) ----
 class _LoggerLike(Protocol):
@@ -159,6 +178,13 @@ class BybitPublicWS:
     - Calls on_message for every incoming JSON
     - Uses ReconnectPolicy (exponential backoff with jitter) between reconnects
     - Optionally increments WS health metrics (SPOT/LINEAR) on each non-ping payload
+    - Optionally records raw text frames (FrameRecorder) for offline replay
+    - Subscribes in batches of `subscribe_batch` args per request
+    - Optionally tracks per-connection stats (`conn_label`, see BybitWSPool)
+    - Optionally decodes frames in worker processes (`decoder`, see DecodePool);
+      on_message still sees frames in arrival order
+    - resubscribe(topic) re-requests one topic on the live socket (Bybit answers
+      with a fresh snapshot; used to recover an orderbook after a gap)
     """
 
     def __init__(
@@ -167,19 +193,41 @@ class BybitPublicWS:
         topics: Iterable[str],
         *,
         metrics_source: str | None = None,  # "SPOT" | "LINEAR" | None
+        recorder: FrameRecorder | None = None,
+        subscribe_batch: int | None = None,
+        conn_label: str | None = None,
+        decoder: DecodePool | None = None,
     ) -> None:
         self.url = url
         self.topics = list(topics)
         self._stop = asyncio.Event()
         self._session: aiohttp.ClientSession | None = None
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
         self._metrics_source = (metrics_source or "").upper() or None
+        self.recorder = recorder
+        if subscribe_batch is None:
+            subscribe_batch = _env_int("WS_SUBSCRIBE_BATCH", DEFAULT_SUBSCRIBE_BATCH)
+        self.subscribe_batch = max(1, subscribe_batch)
+        self.conn_label = conn_label
+        self.decoder = decoder
 
     async def _subscribe(self, ws: aiohttp.ClientWebSocketResponse) -> None:
-        if not self.topics:
-            return
-        msg = {"op": "subscribe", "args": self.topics}
-        await ws.send_str(json.dumps(msg))
-        logger.debug(f"WS subscribe -> {msg}")
+        step = self.subscribe_batch
+        for i in range(0, len(self.topics), step):
+            msg = {"op": "subscribe", "args": self.topics[i : i + step], "req_id": f"sub-{i // step}"}
+            await ws.send_str(json.dumps(msg))
+            logger.debug(f"WS subscribe -> {msg}")
+
+    async def resubscribe(self, topic: str) -> bool:
+        """Unsubscribe + subscribe `topic` on the current socket; False if not owned or not connected."""
+        ws = self._ws
+        if topic not in self.topics or ws is None or ws.closed:
+            return False
+        for op in ("unsubscribe", "subscribe"):
+            msg = {"op": op, "args": [topic], "req_id": f"re{op}-{topic}"}
+            await ws.send_str(json.dumps(msg))
+            logger.debug(f"WS {op} -> {msg}")
+        return True
 
     async def stop(self) -> None:
         self._stop.set()
@@ -197,6 +245,110 @@ class BybitPublicWS:
         self._stop.clear()
         policy = ReconnectPolicy()  # base=0.5, factor=2.0, max=30.0 by default
 
+        recorder = self.recorder
+
+        # Resolve the metrics increment once; the per-message path is a single call
+        inc_metric: Callable[[int], None] | None = None
+        if MetricsRegistry is not None and self._metrics_source is not None:
+            reg = MetricsRegistry.get()
+            if self._metrics_source == "SPOT":
+                inc_metric = reg.inc_spot
+            elif self._metrics_source == "LINEAR":
+                inc_metric = reg.inc_linear
+
+        conn = None
+        if MetricsRegistry is not None and self.conn_label:
+            conn = MetricsRegistry.get().conn_stats(self.conn_label)
+            conn.topics = len(self.topics)
+
+        async def dispatch(payload: Any) -> None:
+            # Skip pongs/keepalives that some Bybit edges send as JSON
+            if isinstance(payload, dict) and (
+                str(payload.get("op", "")).lower() == "pong" or str(payload.get("event", "")).lower() == "pong"
+            ):
+                return
+
+            if conn is not None:
+                conn.messages += 1
+                conn.last_msg_ts = time.time()
+
+            # Health metrics (optional, must never break loop)
+            if inc_metric is not None:
+                try:
+                    inc_metric(1)
+                except Exception:
+                    pass
+
+            await on_message(payload)
+
+        # Decoder mode: the reader only submits frames; drain() awaits results in order
+        decoder = self.decoder
+        pending: asyncio.Queue[asyncio.Future[Any]] = asyncio.Queue(maxsize=DECODE_MAX_INFLIGHT)
+
+        # on_message error raised in drain(); the reader re-raises it so the connect loop
+        # reconnects with backoff, as in inline mode
+        failure: list[Exception] = []
+
+        async def drain() -> None:
+            while True:
+                fut = await pending.get()
+                try:
+                    payload = await asyncio.shield(fut)
+                except asyncio.CancelledError:
+                    if not fut.cancelled():
+                        raise  # drain() itself was cancelled
+                    payload = None  # future cancelled by pool shutdown
+                except Exception:
+                    payload = None  # decode failed: same as a bad frame
+                if payload is None:
+                    logger.warning("WS non-JSON text frame")
+                    continue
+                if failure:
+                    continue  # the connection is being dropped: skip the rest of its frames
+                policy.reset()
+                try:
+                    await dispatch(payload)
+                except Exception as e:
+                    failure.append(e)
+
+        async def on_text(raw: str) -> None:
+            if failure:
+                while not pending.empty():
+                    pending.get_nowait()
+                raise failure.pop()
+            if recorder is not None:
+                recorder.record(raw)
+            if decoder is not None:
+                await pending.put(decoder.submit(raw))
+                return
+            try:
+                payload = json.loads(raw)
+            except Exception:
+                logger.warning("WS non-JSON text frame")
+                return
+
+            # reset backoff on any valid message
+            policy.reset()
+            await dispatch(payload)
+
+        drainer = asyncio.create_task(drain()) if decoder is not None else None
+        try:
+            await self._connect_loop(on_text, policy, conn, heartbeat)
+        finally:
+            if drainer is not None:
+                drainer.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await drainer
+
+        logger.info("WS stopped")
+
+    async def _connect_loop(
+        self,
+        on_text: Callable[[str], Awaitable[None]],
+        policy: ReconnectPolicy,
+        conn: Any,
+        heartbeat: int,
+    ) -> None:
         async with aiohttp.ClientSession() as session:
             self._session = session
             while not self._stop.is_set():
@@ -204,41 +356,18 @@ class BybitPublicWS:
                     async with session.ws_connect(self.url, heartbeat=heartbeat) as ws:
                         logger.info(f"WS connected: {self.url}")
                         policy.reset()  # successful connect
+                        if conn is not None:
+                            conn.connected = True
+                            conn.connects += 1
                         await self._subscribe(ws)
+                        self._ws = ws
 
                         async for msg in ws:
                             if self._stop.is_set():
                                 break
 
                             if msg.type == aiohttp.WSMsgType.TEXT:
-                                try:
-                                    payload = json.loads(msg.data)
-                                except Exception:
-                                    logger.warning("WS non-JSON text frame")
-                                    continue
-
-                                # reset backoff on any valid message
-                                policy.reset()
-
-                                # Skip pongs/keepalives that some Bybit edges send as JSON
-                                if isinstance(payload, dict) and (
-                                    str(payload.get("op", "")).lower() == "pong"
-                                    or str(payload.get("event", "")).lower() == "pong"
-                                ):
-                                    continue
-
-                                # Health metrics (optional, must never break loop)
-                                try:
-                                    if MetricsRegistry is not None and self._metrics_source is not None:
-                                        reg = MetricsRegistry.get()
-                                        if self._metrics_source == "SPOT":
-                                            reg.inc_spot(1)
-                                        elif self._metrics_source == "LINEAR":
-                                            reg.inc_linear(1)
-                                except Exception:
-                                    pass
-
-                                await on_message(payload)
+                                await on_text(msg.data)
 
                             elif msg.type == aiohttp.WSMsgType.BINARY:
                                 # Bybit public streams are text JSON; ignore binary frames
@@ -257,8 +386,12 @@ class BybitPublicWS:
                     delay = policy.next_delay()
                     logger.warning(f"WS reconnect in {delay:.2f}s after error: {e!r}")
                     await asyncio.sleep(delay)
-
-        logger.info("WS stopped")
+                finally:
+                    self._ws = None
+                    if conn is not None:
+                        conn.connected = False
+                        if not self._stop.is_set():
+                            conn.reconnects += 1
 
 
 # Backward-compatible alias
@@ -0,0 +1,127 @@
+# src/exchanges/bybit/ws_pool.py
+# English-only comments per project rules.
+"""
+Sharded pool of Bybit v5 public WS connections.
+
+Per-symbol topics (tickers.<SYM>, orderbook.N.<SYM>, ...) are split round-robin
+across N sockets, each a BybitPublicWS with its own reconnect loop, so one
+broken socket only stalls its share of symbols. Subscriptions go out in
+batches (Bybit caps args per request). Every shard reports ConnStats into
+MetricsRegistry under "<SOURCE>#<i>".
+
+The pool has the same run()/stop()/resubscribe() surface as BybitPublicWS and can replace it
+wherever a topic list is subscribed. A bare "tickers" wildcard cannot be split
+and stays on one socket.
+
+Env (see BybitWSPool.from_env):
+    WS_SHARDS                 - number of sockets per category (0 = auto, default)
+    WS_MAX_TOPICS_PER_CONN    - auto mode: topics per socket (default 100)
+    WS_SUBSCRIBE_BATCH        - args per subscribe request (default 10)
+    WS_DECODE_WORKERS         - decode/normalize in N worker processes shared by all
+                                shards (0 = on the event loop, default; see DecodePool)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+from collections.abc import Awaitable, Iterable
+from typing import Callable
+
+from src.exchanges.bybit.ws import BybitPublicWS
+from src.ws.decode_pool import DecodePool
+from src.ws.recorder import FrameRecorder
+
+__all__ = ["BybitWSPool", "shard_topics"]
+
+DEFAULT_MAX_TOPICS_PER_CONN = 100
+
+
+def shard_topics(
+    topics: Iterable[str], *, shards: int = 0, max_per_conn: int = DEFAULT_MAX_TOPICS_PER_CONN
+) -> list[list[str]]:
+    """
+    Split topics into shards round-robin (duplicates dropped, order kept within a shard).
+    shards=0 picks ceil(len / max_per_conn); never returns empty shards.
+    """
+    uniq = list(dict.fromkeys(t for t in topics if t))
+    if not uniq:
+        return []
+    n = shards if shards > 0 else math.ceil(len(uniq) / max(1, max_per_conn))
+    n = max(1, min(n, len(uniq)))
+    return [uniq[i::n] for i in range(n)]
+
+
+class BybitWSPool:
+    def __init__(
+        self,
+        url: str,
+        topics: Iterable[str],
+        *,
+        source: str,
+        shards: int = 0,
+        max_topics_per_conn: int = DEFAULT_MAX_TOPICS_PER_CONN,
+        subscribe_batch: int | None = None,
+        recorder: FrameRecorder | None = None,
+        decoder: DecodePool | None = None,
+    ) -> None:
+        self.url = url
+        self.source = str(source).upper()
+        self.recorder = recorder
+        parts = shard_topics(topics, shards=shards, max_per_conn=max_topics_per_conn)
+        self.clients: list[BybitPublicWS] = [
+            BybitPublicWS(
+                url,
+                part,
+                recorder=recorder,
+                subscribe_batch=subscribe_batch,
+                conn_label=f"{self.source}#{i}",
+                decoder=decoder,
+            )
+            for i, part in enumerate(parts)
+        ]
+
+    @classmethod
+    def from_env(
+        cls,
+        url: str,
+        topics: Iterable[str],
+        *,
+        source: str,
+        recorder: FrameRecorder | None = None,
+    ) -> BybitWSPool:
+        def _int(name: str, default: int) -> int:
+            try:
+                return int(os.getenv(name, str(default)))
+            except ValueError:
+                return default
+
+        return cls(
+            url,
+            topics,
+            source=source,
+            shards=_int("WS_SHARDS", 0),
+            max_topics_per_conn=_int("WS_MAX_TOPICS_PER_CONN", DEFAULT_MAX_TOPICS_PER_CONN),
+            recorder=recorder,
+            decoder=DecodePool.shared(),
+        )
+
+    @property
+    def topics(self) -> list[str]:
+        return [t for c in self.clients for t in c.topics]
+
+    async def run(self, on_message: Callable[[dict], Awaitable[None]], *, heartbeat: int = 30) -> None:
+        """Run every shard until stop(); shards reconnect independently."""
+        await asyncio.gather(*(c.run(on_message, heartbeat=heartbeat) for c in self.clients))
+
+    async def resubscribe(self, topic: str) -> bool:
+        """Re-request `topic` on the shard that owns it (see BybitPublicWS.resubscribe)."""
+        for c in self.clients:
+            if topic in c.topics:
+                return await c.resubscribe(topic)
+        return False
+
+    async def stop(self) -> None:
+        for c in self.clients:
+            await c.stop()
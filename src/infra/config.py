@@ -157,6 +157,8 @@ class AppSettings(BaseSettings):
     db_path: str = "data/signals.db"
     top_n_report: int = 10
     enable_alerts: bool = True
+    # розмір угоди ($, spot-нога) для виконуваного basis по книгах; 0 = вимкнено
+    exec_basis_size_usd: float = 0.0
 
     allow_symbols: str | list[str] | None = None
     deny_symbols: str | list[str] | None = None
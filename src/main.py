@@ -2,24 +2,78 @@
 from __future__ import annotations
 
 import argparse
+import importlib
 import json
 import os
 import sys
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from types import ModuleType
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .exchanges.bybit.rest import BybitRest
+
+# Startup cost matters: cron runs `basis:alert` every minute. Only stdlib is imported here;
+# requests/loguru/pydantic/sqlite/asyncio-heavy modules load on first use by the command that
+# needs them (guarded by tests/test_cli_startup.py, measured by bench/bench_cli_startup.py).
+# Lazy names stay plain module attributes, so `monkeypatch.setattr(main, "BybitRest", ...)` works.
+_LAZY_ATTRS: dict[str, tuple[str, str]] = {
+    "BybitRest": (".exchanges.bybit.rest", "BybitRest"),
+    "format_report": (".core.report", "format_report"),
+    "get_top_signals": (".core.report", "get_top_signals"),
+    "init_db": (".storage.persistence", "init_db"),
+    "setup_logging": (".infra.logging", "setup_logging"),
+    "MetricsRegistry": (".ws.health", "MetricsRegistry"),  # WS health metrics (singleton)
+}
+# Optional/back-compat modules (used if present, None otherwise)
+_OPTIONAL_MODULES: dict[str, str] = {
+    "_core_alerts": ".core.alerts",
+    "_tg_formatters": ".telegram.formatters",
+}
+
+# Same values as ws.eventloop.LOOP_CHOICES (not imported here: it pulls in asyncio + loguru)
+LOOP_CHOICES = ("asyncio", "uvloop", "auto")
+# Same values as core.quotes.QUOTE_SOURCES (not imported here: it pulls in loguru)
+QUOTE_SOURCES = ("rest", "live", "auto")
+
+
+def __getattr__(name: str) -> Any:
+    value: Any
+    if name in _LAZY_ATTRS:
+        mod_name, attr = _LAZY_ATTRS[name]
+        value = getattr(importlib.import_module(mod_name, __package__), attr)
+    elif name in _OPTIONAL_MODULES:
+        try:
+            value = importlib.import_module(_OPTIONAL_MODULES[name], __package__)
+        except Exception:  # noqa: BLE001
+            value = None
+    elif name == "METRICS":  # global metrics handle for the running process
+        value = _lazy("MetricsRegistry").get()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def _lazy(name: str) -> Any:
+    """Module attribute for use inside commands: the monkeypatched/cached value or a first-use import."""
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
+
+class _LazyLogger:
+    """loguru.logger, imported on the first log call."""
+
+    def __getattr__(self, name: str) -> Any:
+        from loguru import logger as _logger
+
+        return getattr(_logger, name)
 
-import requests
-from loguru import logger
 
-# ---- internal imports at top (to satisfy linters) ----
-from .core.report import format_report, get_top_signals
-from .exchanges.bybit.rest import BybitRest
-from .infra.logging import setup_logging
-from .storage.persistence import init_db
-from .ws.health import MetricsRegistry  # WS health metrics (singleton)
+logger: Any = _LazyLogger()
 
 # Optional Telegram sender: fall back to direct HTTP if infra.telegram is absent
 try:
@@ -27,31 +81,16 @@ try:
 except Exception:  # noqa: BLE001
 
     def send_telegram_message(token: str, chat_id: str, text: str):
+        import requests
+
         url = f"https://api.telegram.org/bot{token}/sendMessage"
         resp = requests.post(url, data={"chat_id": chat_id, "text": text}, timeout=15)
         resp.raise_for_status()
         return resp.json()
 
 
-# Optional/back-compat modules (used if present)
-_core_alerts: ModuleType | None
-try:
-    from .core import alerts as _core_alerts  # type: ignore[assignment]
-except Exception:  # noqa: BLE001
-    _core_alerts = None
-
-_tg_formatters: ModuleType | None
-try:
-    from .telegram import formatters as _tg_formatters  # type: ignore[assignment]
-except Exception:  # noqa: BLE001
-    _tg_formatters = None
-
-
 APP_VERSION = "0.4.6"
 
-# --- NEW: global metrics handle for the running process ---
-METRICS = MetricsRegistry.get()
-
 
 # --------------------------------------------------------------------------------------
 # Settings loader that is safe at import-time and test-friendly (monkeypatchable)
@@ -95,6 +134,11 @@ def load_settings():
     except Exception:
         pass
 
+    # .env -> os.environ (stdlib loader; used to happen as a side effect of importing src.infra.config)
+    from .infra.dotenv_autoload import autoload_env
+
+    autoload_env()
+
     # Env-based minimal settings
     class _Obj:
         pass
@@ -108,6 +152,7 @@ def load_settings():
     s.db_path = os.getenv("DB_PATH", "data/signals.db")
     s.top_n_report = _env_int("TOP_N_REPORT", 3)
     s.enable_alerts = _env_bool("ENABLE_ALERTS", True)
+    s.exec_basis_size_usd = _env_float("EXEC_BASIS_SIZE_USD", 0.0)
 
     # Allow/deny lists (optional)
     s.allow_symbols = os.getenv("ALLOW_SYMBOLS", "")
@@ -309,7 +354,7 @@ def cmd_healthcheck(_: argparse.Namespace) -> int:
 
 
 def cmd_bybit_ping(_: argparse.Namespace) -> int:
-    client = BybitRest()
+    client = _lazy("BybitRest")()
     data = client.get_server_time()
     result = data.get("result", {})
     print("Bybit time (sec):", result.get("timeSecond"))
@@ -328,7 +373,7 @@ def _turnover_usd(row: dict[str, Any]) -> float:
 
 
 def cmd_bybit_top(args: argparse.Namespace) -> int:
-    client = BybitRest()
+    client = _lazy("BybitRest")()
     rows = client.get_tickers(args.category)
     rows.sort(key=_turnover_usd, reverse=True)
     top = rows[: args.limit]
@@ -342,38 +387,22 @@ def cmd_bybit_top(args: argparse.Namespace) -> int:
 
 
 def _basis_rows(
-    min_vol: float, threshold: float
+    min_vol: float, threshold: float, client: Any | None = None
 ) -> tuple[
     list[tuple[str, float, float, float, float]],
     list[tuple[str, float, float, float, float]],
 ]:
-    client = BybitRest()
-
-    try:
-        spot_map = client.get_spot_map()
-        lin_map = client.get_linear_map()
-    except AttributeError:
-        spot_rows = client.get_tickers("spot") or []
-        lin_rows = client.get_tickers("linear") or []
-
-        def _map_from_tickers(rows: list[dict[str, Any]]):
-            m: dict[str, dict[str, float]] = {}
-            for r in rows:
-                sym = r.get("symbol")
-                if not sym:
-                    continue
-                price = r.get("lastPrice") or r.get("lastPriceLatest")
-                vol = r.get("turnover24h") or r.get("turnoverUsd")
-                try:
-                    price_f = float(price) if price is not None else 0.0
-                    vol_f = float(vol) if vol is not None else 0.0
-                except Exception:
-                    price_f, vol_f = 0.0, 0.0
-                m[sym] = {"price": price_f, "turnover_usd": vol_f}
-            return m
+    """
+    (rows_pass, rows_all) as (symbol, spot, fut, basis_pct, vol_min), sorted by |basis|.
+    client: a QuoteSource (REST / QuoteCache / live /quotes, see core/quotes.py) or a plain REST client.
+    """
+    from .core.quotes import BaseQuoteSource, RestQuoteSource
 
-        spot_map = _map_from_tickers(spot_rows)
-        lin_map = _map_from_tickers(lin_rows)
+    if client is None:
+        client = _quote_source()
+    elif not isinstance(client, BaseQuoteSource):
+        client = RestQuoteSource(client)
+    spot_map, lin_map = client.get_maps()  # one snapshot: the source may be shared by scheduler jobs
 
     rows_all: list[tuple[str, float, float, float, float]] = []
     rows_pass: list[tuple[str, float, float, float, float]] = []
@@ -400,11 +429,19 @@ def _basis_rows(
     return rows_pass, rows_all
 
 
+def _quote_source(kind: str | None = None, client: Any | None = None) -> Any:
+    """Quote source from --source / QUOTES_SOURCE (rest|live|auto); ValueError on a bad choice."""
+    from .core.quotes import quote_source_from_env
+
+    return quote_source_from_env(kind, client=client if client is not None else _lazy("BybitRest")())
+
+
 def _alerts_allowed(s) -> bool:
     return bool(getattr(s, "enable_alerts", False))
 
 
 def _format_alert_text(rows: list[tuple[str, float, float, float, float]], threshold: float, min_vol: float) -> str:
+    _tg_formatters = _lazy("_tg_formatters")
     if rows:
         header = f"Top {len(rows)} basis (≥ {threshold:.2f}%, MinVol ${min_vol:,.0f})"
         if _tg_formatters and hasattr(_tg_formatters, "format_basis_top"):
@@ -458,7 +495,7 @@ def cmd_alerts_preview(args: argparse.Namespace) -> int:
     safe_print(text)
 
     try:
-        client = BybitRest()
+        client = _lazy("BybitRest")()
         f = client.get_prev_funding(symbol)
         if isinstance(f, dict):
             rate = f.get("funding_rate", None)
@@ -500,20 +537,32 @@ def _get_funding_with_cache(client: BybitRest, symbol: str) -> tuple[float | Non
 
 def cmd_basis_alert(args: argparse.Namespace) -> int:
     s = load_settings()
+    min_vol = float(args.min_vol if args.min_vol is not None else s.min_vol_24h_usd)
+    threshold = float(args.threshold if args.threshold is not None else s.alert_threshold_pct)
+    try:
+        quotes = _quote_source(getattr(args, "source", None))
+    except ValueError as e:
+        print(f"Quote source error: {e}")
+        return 2
+    return _run_basis_alert(s, limit=int(args.limit), threshold=threshold, min_vol=min_vol, client=quotes)
+
+
+def _run_basis_alert(s: Any, *, limit: int, threshold: float, min_vol: float, client: Any | None = None) -> int:
+    """basis:alert body; scheduler:run calls it with its warm client."""
+    import requests
+
     if not _alerts_allowed(s):
         print("Alerts are disabled by config (enable_alerts=false).")
         return 0
-
-    min_vol = float(args.min_vol if args.min_vol is not None else s.min_vol_24h_usd)
-    threshold = float(args.threshold if args.threshold is not None else s.alert_threshold_pct)
-    limit = int(args.limit)
     token, chat_id = _tg_fields(s)
     if not token or not chat_id:
         print("Telegram is not configured: set TELEGRAM__BOT_TOKEN and TELEGRAM__ALERT_CHAT_ID in .env")
         return 1
 
-    rows_pass, _ = _basis_rows(min_vol=min_vol, threshold=threshold)
+    rows_pass, _ = _basis_rows(min_vol=min_vol, threshold=threshold, client=client)
 
+    _core_alerts = _lazy("_core_alerts")
+    _tg_formatters = _lazy("_tg_formatters")
     if _core_alerts and hasattr(_core_alerts, "apply_cooldown"):
         cooled = _safe_call(
             getattr(_core_alerts, "apply_cooldown", None),
@@ -528,7 +577,8 @@ def cmd_basis_alert(args: argparse.Namespace) -> int:
 
     used_custom_rows_formatter = bool(_tg_formatters and hasattr(_tg_formatters, "format_basis_top"))
     if rows and not used_custom_rows_formatter:
-        client = BybitRest()
+        if client is None:
+            client = _lazy("BybitRest")()
         lines = []
         for sym, _sp, _fu, _b, _vol in rows:
             rate, next_ts = _get_funding_with_cache(client, sym)
@@ -555,6 +605,8 @@ def cmd_basis_alert(args: argparse.Namespace) -> int:
 
 
 def cmd_tg_send(args: argparse.Namespace) -> int:
+    import requests
+
     s = load_settings()
     if not _alerts_allowed(s):
         print("Alerts are disabled by config (enable_alerts=false).")
@@ -583,13 +635,15 @@ def cmd_report_print(args: argparse.Namespace) -> int:
     s = load_settings()
     hours = int(args.hours)
     limit = int(args.limit) if args.limit is not None else int(s.top_n_report)
-    items = get_top_signals(last_hours=hours, limit=limit)
-    text = format_report(items)
+    items = _lazy("get_top_signals")(last_hours=hours, limit=limit)
+    text = _lazy("format_report")(items)
     print(text)
     return 0
 
 
 def cmd_report_send(args: argparse.Namespace) -> int:
+    import requests
+
     s = load_settings()
     if not _alerts_allowed(s):
         print("Alerts are disabled by config (enable_alerts=false).")
@@ -600,8 +654,8 @@ def cmd_report_send(args: argparse.Namespace) -> int:
         return 1
     hours = int(args.hours)
     limit = int(args.limit) if args.limit is not None else int(s.top_n_report)
-    items = get_top_signals(last_hours=hours, limit=limit)
-    text = format_report(items)
+    items = _lazy("get_top_signals")(last_hours=hours, limit=limit)
+    text = _lazy("format_report")(items)
     try:
         send_telegram_message(token, chat_id, text)
         logger.success("Report sent to Telegram.")
@@ -628,14 +682,23 @@ def cmd_select_save(args: argparse.Namespace) -> int:
 
     from .core.selector import run_selection
 
-    saved = run_selection(
-        min_vol=min_vol,
-        min_price=min_price,
-        threshold=threshold,
-        limit=limit,
-        cooldown_sec=cooldown_sec,
-        client=None,
-    )
+    try:
+        quotes = _quote_source(getattr(args, "source", None))
+    except ValueError as e:
+        print(f"Quote source error: {e}")
+        return 2
+    try:
+        saved = run_selection(
+            min_vol=min_vol,
+            min_price=min_price,
+            threshold=threshold,
+            limit=limit,
+            cooldown_sec=cooldown_sec,
+            quotes=quotes,
+        )
+    except OSError as e:  # live /quotes down with --source live, or REST unreachable
+        print(f"Quotes unavailable ({quotes.name}): {e}")
+        return 2
 
     if not saved:
         print("No new signals saved (maybe cooldown or no pairs above threshold).")
@@ -646,7 +709,7 @@ def cmd_select_save(args: argparse.Namespace) -> int:
 
 
 def create_bybit_client() -> BybitRest:
-    return BybitRest()
+    return _lazy("BybitRest")()
 
 
 def cmd_price_pair(args: argparse.Namespace) -> int:
@@ -707,7 +770,7 @@ def cmd_price_pair(args: argparse.Namespace) -> int:
     return 0
 
 
-def cmd_ws_run(_: argparse.Namespace) -> int:
+def cmd_ws_run(args: argparse.Namespace) -> int:
     s = load_settings()
     if not getattr(s, "ws_enabled", False):
         print("WS is disabled by config (set WS_ENABLED=1 in .env).")
@@ -717,7 +780,10 @@ def cmd_ws_run(_: argparse.Namespace) -> int:
         import asyncio
 
         from .core.cache import QuoteCache
-        from .exchanges.bybit.ws import BybitWS, iter_ticker_entries
+        from .core.orderbook import OrderBookStore
+        from .exchanges.bybit.rest_async import AsyncBybitRest
+        from .exchanges.bybit.ws import iter_ticker_entries
+        from .exchanges.bybit.ws_pool import BybitWSPool
         from .ws.bridge import publish_bybit_ticker
         from .ws.multiplexer import WsEvent, WSMultiplexer
 
@@ -728,6 +794,8 @@ def cmd_ws_run(_: argparse.Namespace) -> int:
         print("WS components are missing. Please add ws.py and cache.py:", str(e))
         return 1
 
+    METRICS = _lazy("METRICS")
+
     ws = _nested_bybit(s)
     url_linear: str | None = ws["url_linear"]
     url_spot: str | None = ws["url_spot"]
@@ -735,8 +803,24 @@ def cmd_ws_run(_: argparse.Namespace) -> int:
     topics_spot: list[str] = ws["topics_spot"]
 
     cache = QuoteCache()
-    ws_linear = BybitWS(url_linear, topics_linear or ["tickers"]) if url_linear else None
-    ws_spot = BybitWS(url_spot, topics_spot or ["tickers"]) if url_spot else None
+    # WS_RECORD_DIR enables raw frame capture for offline replay (ws:replay)
+    from .ws.recorder import FrameRecorder
+
+    # Per-symbol topics are sharded across sockets (WS_SHARDS / WS_MAX_TOPICS_PER_CONN)
+    ws_linear = (
+        BybitWSPool.from_env(
+            url_linear, topics_linear or ["tickers"], source="LINEAR", recorder=FrameRecorder.from_env("LINEAR")
+        )
+        if url_linear
+        else None
+    )
+    ws_spot = (
+        BybitWSPool.from_env(
+            url_spot, topics_spot or ["tickers"], source="SPOT", recorder=FrameRecorder.from_env("SPOT")
+        )
+        if url_spot
+        else None
+    )
 
     if not ws_linear and not ws_spot:
         print("WS config has neither LINEAR nor SPOT endpoints/topics configured.")
@@ -744,7 +828,10 @@ def cmd_ws_run(_: argparse.Namespace) -> int:
 
     mux = WSMultiplexer(name="core")
 
-    alerts_sub = AlertsSubscriber(mux)
+    # Local L2 books fed by orderbook.N.<SYM> topics (snapshot/delta); resync/resubscribe are set in runner()
+    books = OrderBookStore()
+
+    alerts_sub = AlertsSubscriber(mux, books=books)
     alerts_sub.start()
 
     # --- Debug knobs for normalized flow ---
@@ -787,12 +874,12 @@ def cmd_ws_run(_: argparse.Namespace) -> int:
         _last_log[key] = now
         logger.bind(tag="WS").debug(f"{source} normalized: channel={channel} symbol={symbol} items={items}")
 
-    async def refresh_meta_task():
-        client = BybitRest()
+    async def _refresh_meta_forever(client):
         while True:
             try:
-                spot_rows = client.get_tickers("spot") or []
-                lin_rows = client.get_tickers("linear") or []
+                rows = await client.get_tickers_many(("spot", "linear"))
+                spot_rows = rows.get("spot") or []
+                lin_rows = rows.get("linear") or []
 
                 def _vol_map(rows: list[dict[str, Any]]) -> dict[str, float]:
                     m: dict[str, float] = {}
@@ -821,74 +908,137 @@ def cmd_ws_run(_: argparse.Namespace) -> int:
     # on_message handlers
     # ----------------------------
     async def on_message_spot(msg: dict):
+        t0 = time.perf_counter()
+        channel, ts_ms, publish_ms = "other", 0, None
         # 1) Normalized event publish
         try:
             evt_norm = normalize(msg)
             _debug_log_normalized("SPOT", evt_norm)
+            channel = str(evt_norm.get("channel") or "other")
+            ts_ms = evt_norm.get("ts_ms") or 0
+            t_pub = time.perf_counter()
             mux.publish(
                 WsEvent(
                     source="SPOT",
-                    channel=str(evt_norm.get("channel") or "other"),
+                    channel=channel,
                     symbol=str(evt_norm.get("symbol") or ""),
                     payload=evt_norm.get("data") or {},
-                    ts=evt_norm.get("ts_ms") or 0,
+                    ts=ts_ms,
                 )
             )
+            publish_ms = (time.perf_counter() - t_pub) * 1000.0
             # --- NEW: increment SPOT counter after successful normalized publish ---
             METRICS.inc_spot()
         except Exception as e:
             logger.debug(f"normalize(msg) failed (SPOT): {e!r}")
 
+        if channel == "orderbook":
+            books.apply(msg, "spot")
+
         # 2) Compatibility path for existing subscribers
         for item in iter_ticker_entries(msg):
             sym = item.get("symbol")
             last = item.get("last")
             if sym and last is not None:
                 _ = await cache.update(sym, spot=last)
-                publish_bybit_ticker(mux, "SPOT", item)
+                publish_bybit_ticker(mux, "SPOT", item, ts=ts_ms / 1000.0 if ts_ms else None)
+
+        METRICS.observe_ws(
+            "SPOT",
+            channel,
+            exchange_ts=ts_ms,
+            handler_ms=(time.perf_counter() - t0) * 1000.0,
+            publish_ms=publish_ms,
+        )
 
     async def on_message_linear(msg: dict):
+        t0 = time.perf_counter()
+        channel, ts_ms, publish_ms = "other", 0, None
         # 1) Normalized event publish
         try:
             evt_norm = normalize(msg)
             _debug_log_normalized("LINEAR", evt_norm)
+            channel = str(evt_norm.get("channel") or "other")
+            ts_ms = evt_norm.get("ts_ms") or 0
+            t_pub = time.perf_counter()
             mux.publish(
                 WsEvent(
                     source="LINEAR",
-                    channel=str(evt_norm.get("channel") or "other"),
+                    channel=channel,
                     symbol=str(evt_norm.get("symbol") or ""),
                     payload=evt_norm.get("data") or {},
-                    ts=evt_norm.get("ts_ms") or 0,
+                    ts=ts_ms,
                 )
             )
+            publish_ms = (time.perf_counter() - t_pub) * 1000.0
             # --- NEW: increment LINEAR counter after successful normalized publish ---
             METRICS.inc_linear()
         except Exception as e:
             logger.debug(f"normalize(msg) failed (LINEAR): {e!r}")
 
+        if channel == "orderbook":
+            books.apply(msg, "linear")
+
         # 2) Compatibility path for existing subscribers
         for item in iter_ticker_entries(msg):
             sym = item.get("symbol")
             mark = item.get("mark")
             if sym and mark is not None:
                 _ = await cache.update(sym, linear_mark=mark)
-                publish_bybit_ticker(mux, "LINEAR", item)
+                publish_bybit_ticker(mux, "LINEAR", item, ts=ts_ms / 1000.0 if ts_ms else None)
+
+        METRICS.observe_ws(
+            "LINEAR",
+            channel,
+            exchange_ts=ts_ms,
+            handler_ms=(time.perf_counter() - t0) * 1000.0,
+            publish_ms=publish_ms,
+        )
 
     async def runner():
         import asyncio as _asyncio
 
-        tasks = []
-        if ws_spot:
-            tasks.append(ws_spot.run(on_message_spot))
-        if ws_linear:
-            tasks.append(ws_linear.run(on_message_linear))
-        tasks.append(refresh_meta_task())
-        await _asyncio.gather(*tasks)
+        from .ws.loop_monitor import LoopMonitor
+
+        loop_monitor = LoopMonitor.from_env(METRICS)
+        if loop_monitor is not None:
+            loop_monitor.start()
+
+        # Async client on the shared loop: meta refresh fetches both categories concurrently,
+        # orderbook resyncs never block the WS readers.
+        async with AsyncBybitRest() as client:
+            # REST resync only for the depth sharing the REST `u` sequence (books.rest_depths);
+            # other orderbook.N topics recover via unsubscribe/subscribe -> fresh WS snapshot
+            async def _resync_book(category: str, symbol: str, depth: int) -> dict:
+                return await client.get_orderbook(category, symbol, limit=depth)
+
+            async def _resubscribe_book(category: str, symbol: str, depth: int) -> bool:
+                pool = ws_spot if category == "spot" else ws_linear
+                return pool is not None and await pool.resubscribe(f"orderbook.{depth}.{symbol}")
+
+            books.resync = _resync_book
+            books.resubscribe = _resubscribe_book
+            tasks = []
+            if ws_spot:
+                tasks.append(ws_spot.run(on_message_spot))
+            if ws_linear:
+                tasks.append(ws_linear.run(on_message_linear))
+            tasks.append(_refresh_meta_forever(client))
+            await _asyncio.gather(*tasks)
+
+    from .core.quotes import quotes_payload
+    from .ws.health_export import start_health_export_from_env
+    from .ws.metrics_http import start_metrics_server_from_env
+
+    # /quotes next to /metrics: basis:scan / select:save / scheduler:run read this cache (QUOTES_SOURCE=auto|live)
+    start_metrics_server_from_env(METRICS, quotes=lambda: quotes_payload(cache))
+    # Live numbers for ws:health / ws_health_cli / standalone /status (WS_HEALTH_FILE)
+    health_export = start_health_export_from_env(METRICS)
 
     try:
-        import asyncio as _asyncio
+        from .ws.eventloop import run as run_loop
 
-        _asyncio.run(runner())
+        run_loop(runner(), kind=getattr(args, "loop", None))
         return 0
     except KeyboardInterrupt:
         print("WS stopped by user.")
@@ -896,6 +1046,9 @@ def cmd_ws_run(_: argparse.Namespace) -> int:
     except Exception as e:  # noqa: BLE001
         logger.exception("WS run failed: {}", e)
         return 2
+    finally:
+        if health_export is not None:
+            health_export.stop()
 
 
 def cmd_basis_scan(args: argparse.Namespace) -> int:
@@ -904,35 +1057,245 @@ def cmd_basis_scan(args: argparse.Namespace) -> int:
     threshold = float(args.threshold if args.threshold is not None else s.alert_threshold_pct)
     limit = int(args.limit)
 
-    rows_pass, _ = _basis_rows(min_vol=min_vol, threshold=threshold)
+    try:
+        quotes = _quote_source(getattr(args, "source", None))
+    except ValueError as e:
+        print(f"Quote source error: {e}")
+        return 2
+    try:
+        rows_pass, _ = _basis_rows(min_vol=min_vol, threshold=threshold, client=quotes)
+    except OSError as e:  # live /quotes down with --source live, or REST unreachable
+        print(f"Quotes unavailable ({quotes.name}): {e}")
+        return 2
     rows = rows_pass[:limit]
     text = _format_alert_text(rows, threshold=threshold, min_vol=min_vol)
+    size_usd = getattr(args, "size_usd", None)
+    if size_usd is None:
+        size_usd = float(getattr(s, "exec_basis_size_usd", 0.0) or 0.0)
+    if rows and size_usd > 0:
+        text += "\n" + _exec_basis_text(rows, float(size_usd))
     safe_print(text)
     return 0
 
 
+def _exec_basis_text(rows: list[tuple[str, float, float, float, float]], size_usd: float) -> str:
+    """Виконуваний basis (VWAP по REST-книгах) для рядків basis:scan на угоду size_usd."""
+    from .core.exec_basis import LONG_SPOT, SHORT_SPOT, executable_basis
+
+    client = _lazy("BybitRest")()
+    lines = [f"Executable basis for ${size_usd:,.0f} (VWAP over orderbooks):"]
+    for sym, _sp, _fu, basis, _vol in rows:
+        try:
+            ob_spot = client.get_orderbook_spot(sym, limit=200)
+            ob_linear = client.get_orderbook_linear(sym, limit=200)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("orderbook fetch failed for {}: {}", sym, e)
+            lines.append(f"{sym}: n/a")
+            continue
+        direction = LONG_SPOT if basis >= 0 else SHORT_SPOT
+        res = executable_basis(ob_spot, ob_linear, size_usd, direction=direction, symbol=sym)
+        if res is None:
+            lines.append(f"{sym}: n/a (empty book)")
+            continue
+        sign = "+" if res.basis_pct >= 0 else ""
+        fill = "" if res.complete else f"  fill={res.fill_ratio * 100:.0f}%"
+        lines.append(
+            f"{sym}: exec={sign}{res.basis_pct:.2f}% spot_vwap={res.spot_vwap:g} "
+            f"fut_vwap={res.linear_vwap:g} slippage={res.slippage_pct:.2f}%{fill}"
+        )
+    return "\n".join(lines)
+
+
+# --- scheduler:run (long-running replacement for cron-spawned basis:alert / select:save) ---
+SCHEDULER_JOBS = ("scan", "alert", "select", "report")
+_SCHED_DEFAULT_SEC = {"scan": 300, "alert": 60, "select": 300, "report": 86_400}
+
+
+def _scheduler_jobs(s: Any, client: Any, names: list[str]) -> list[Any]:
+    """
+    Jobs for scheduler:run sharing one quote source over one warm BybitRest
+    (HTTP session, instruments cache, funding cache).
+    """
+    from .core.scheduler import Job
+
+    min_vol = float(s.min_vol_24h_usd)
+    threshold = float(s.alert_threshold_pct)
+
+    def scan() -> None:
+        rows_pass, rows_all = _basis_rows(min_vol=min_vol, threshold=threshold, client=client)
+        top = ", ".join(f"{sym} {b:+.2f}%" for sym, _sp, _fu, b, _vol in rows_pass[:5]) or "-"
+        logger.info("scan: {} pairs, {} ≥ {:.2f}%: {}", len(rows_all), len(rows_pass), threshold, top)
+
+    def alert() -> None:
+        limit = _env_int("SCHED_ALERT_LIMIT", 3)
+        rc = _run_basis_alert(s, limit=limit, threshold=threshold, min_vol=min_vol, client=client)
+        if rc:
+            raise RuntimeError(f"basis:alert exited with {rc}")
+
+    def select() -> None:
+        from .core.selector import run_selection
+
+        saved = run_selection(limit=_env_int("SCHED_SELECT_LIMIT", 3), client=client)
+        logger.info("select: saved {} signal(s)", len(saved))
+
+    def report() -> None:
+        rc = cmd_report_send(argparse.Namespace(hours=_env_int("SCHED_REPORT_HOURS", 24), limit=None))
+        if rc:
+            raise RuntimeError(f"report:send exited with {rc}")
+
+    fns = {"scan": scan, "alert": alert, "select": select, "report": report}
+    return [
+        Job(
+            name,
+            _env_float(f"SCHED_{name.upper()}_SEC", float(_SCHED_DEFAULT_SEC[name])),
+            fns[name],
+            delay_first=(name == "report"),  # no report on every restart
+        )
+        for name in names
+    ]
+
+
+def cmd_scheduler_run(args: argparse.Namespace) -> int:
+    """
+    Run scan/alert/select/report jobs in one warm process (shared HTTP client, kept SQLite
+    connections, funding cache) instead of one interpreter per cron tick.
+    Intervals: SCHED_<JOB>_SEC (0 = job off); jitter: SCHED_JITTER_PCT; --once runs each job once.
+    Per-job durations go to the metrics registry (kind "job"), served on WS_METRICS_PORT when set.
+    """
+    import signal
+
+    from .core.scheduler import Scheduler
+    from .storage import persistence
+    from .ws.metrics_http import start_metrics_server_from_env
+
+    names = _csv_list(args.jobs if args.jobs is not None else os.getenv("SCHED_JOBS", "alert,select"))
+    unknown = sorted(set(names) - set(SCHEDULER_JOBS))
+    if unknown or not names:
+        print(f"Unknown or empty job list: {','.join(unknown) or '-'} (choose from {','.join(SCHEDULER_JOBS)})")
+        return 2
+
+    try:
+        client = _quote_source()
+    except ValueError as e:
+        print(f"Quote source error: {e}")
+        return 2
+    s = load_settings()
+    persistence.keep_connections(True)
+    sched = Scheduler(
+        _scheduler_jobs(s, client, names),
+        jitter_pct=_env_float("SCHED_JITTER_PCT", 10.0),
+        metrics=_lazy("METRICS"),
+    )
+    try:
+        if args.once:
+            stats = sched.run_once()
+        else:
+            if not sched.jobs:
+                print("All selected jobs have interval 0 (SCHED_<JOB>_SEC); nothing to run.")
+                return 0
+            metrics_server = start_metrics_server_from_env(_lazy("METRICS"))
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, lambda *_: sched.stop())
+            try:
+                stats = sched.run_forever()
+            finally:
+                if metrics_server is not None:
+                    metrics_server.shutdown()
+    finally:
+        persistence.keep_connections(False)
+    print(json.dumps(stats, ensure_ascii=False, indent=2, sort_keys=True))
+    return 1 if any(j["failures"] for j in stats.values()) else 0
+
+
 # --- ws:health command ---
 def cmd_ws_health(args: argparse.Namespace) -> int:
     """
     Print current WS health metrics as JSON. Optional --reset to zero counters.
+    Latency histograms appear under "latency_ms" (p50/p90/p99/p999 per kind and SOURCE/channel);
+    --prometheus prints the Prometheus text exposition instead.
+    Numbers come from the running WS process (its WS_HEALTH_FILE export) when there is one;
+    "source" says which ("pid <N>" or "local"). --reset of a running process waits for its next
+    export; if that does not arrive in time the output carries "reset": "pending ..." (pre-reset values).
     """
-    reg = MetricsRegistry.get()
+    from .ws.health_export import live_prometheus, live_snapshot, request_reset, wait_for_reset
+
+    reg = _lazy("MetricsRegistry").get()
+    reset_pending = False
     if getattr(args, "reset", False):
-        reg.reset()
-    data = reg.snapshot()
+        requested_ts = time.time()
+        if not request_reset():
+            reg.reset()
+        else:
+            # the running process resets on its next export tick; until then the export is pre-reset
+            reset_pending = not wait_for_reset(requested_ts=requested_ts)
+    if getattr(args, "prometheus", False):
+        if reset_pending:
+            print("# reset requested but not applied yet: values below are from before the reset")
+        print(live_prometheus(reg), end="")
+        return 0
+    data, source = live_snapshot(reg)
+    data["source"] = source
+    if reset_pending:
+        data["reset"] = "pending (values are from before the reset)"
     print(json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True))
     return 0
 
 
+def cmd_ws_replay(args: argparse.Namespace) -> int:
+    """
+    Replay recorded WS frames (WS_RECORD_DIR files) through normalize -> mux -> cache/alerts
+    and print throughput stats as JSON. --speed 0 = max speed, 1 = real time, N = N x faster.
+    """
+    from .ws.recorder import iter_frames, recorded_files
+    from .ws.replay import ReplayPipeline, replay
+
+    files = recorded_files(args.paths)
+    if not files:
+        print("No recorded files found.")
+        return 1
+
+    async def _run() -> dict[str, Any]:
+        pipe = ReplayPipeline(alerts=bool(args.alerts))
+        try:
+            stats = await replay(iter_frames(files), pipe, speed=args.speed, limit=args.limit)
+        finally:
+            pipe.close()
+        out = stats.to_dict()
+        out["files"] = len(files)
+        return out
+
+    from .ws.eventloop import run as run_loop
+
+    print(json.dumps(run_loop(_run(), kind=args.loop), ensure_ascii=False, indent=2, sort_keys=True))
+    return 0
+
+
 # --------------------------------------------------------------------------------------
 # CLI
 # --------------------------------------------------------------------------------------
+def _add_source_arg(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--source",
+        choices=QUOTE_SOURCES,
+        default=None,
+        help="quotes from REST, the live ws:run cache (/quotes), or auto (live if up and covering every "
+        "REST pair, else REST); default QUOTES_SOURCE or rest",
+    )
+
+
 def main() -> None:
+    # .env -> os.environ before anything reads the environment (LOG_LEVEL, WS_*, BYBIT_*);
+    # stdlib-only, so light commands stay light
+    from .infra.dotenv_autoload import autoload_env
+
+    autoload_env()
+
     parser = argparse.ArgumentParser(prog="bybit-arb-bot")
     sub = parser.add_subparsers(dest="command", required=True)
 
-    sub.add_parser("version").set_defaults(func=cmd_version)
-    sub.add_parser("env").set_defaults(func=cmd_env)
+    # needs_db: SQLite init before dispatch; needs_logging=False: plain stdout commands
+    sub.add_parser("version").set_defaults(func=cmd_version, needs_logging=False)
+    sub.add_parser("env").set_defaults(func=cmd_env, needs_logging=False)
     sub.add_parser("logtest").set_defaults(func=cmd_logtest)
     sub.add_parser("healthcheck").set_defaults(func=cmd_healthcheck)
 
@@ -947,12 +1310,17 @@ def main() -> None:
     p_basis.add_argument("--limit", type=int, default=10)
     p_basis.add_argument("--threshold", type=float, default=None)
     p_basis.add_argument("--min-vol", type=float, default=None)
+    p_basis.add_argument(
+        "--size-usd", type=float, default=None, help="also show executable (VWAP) basis for this trade size"
+    )
+    _add_source_arg(p_basis)
     p_basis.set_defaults(func=cmd_basis_scan)
 
     p_alert = sub.add_parser("basis:alert")
     p_alert.add_argument("--limit", type=int, default=3)
     p_alert.add_argument("--threshold", type=float, default=None)
     p_alert.add_argument("--min-vol", type=float, default=None)
+    _add_source_arg(p_alert)
     p_alert.set_defaults(func=cmd_basis_alert)
 
     p_prev = sub.add_parser("alerts:preview")
@@ -980,12 +1348,12 @@ def main() -> None:
     p_rp = sub.add_parser("report:print")
     p_rp.add_argument("--hours", type=int, default=24)
     p_rp.add_argument("--limit", type=int, default=None)
-    p_rp.set_defaults(func=cmd_report_print)
+    p_rp.set_defaults(func=cmd_report_print, needs_db=True)
 
     p_rs = sub.add_parser("report:send")
     p_rs.add_argument("--hours", type=int, default=24)
     p_rs.add_argument("--limit", type=int, default=None)
-    p_rs.set_defaults(func=cmd_report_send)
+    p_rs.set_defaults(func=cmd_report_send, needs_db=True)
 
     p_sel = sub.add_parser("select:save")
     p_sel.add_argument("--limit", type=int, default=3)
@@ -998,7 +1366,8 @@ def main() -> None:
         default=None,
         help="Override ALERT_COOLDOWN_SEC from .env",
     )
-    p_sel.set_defaults(func=cmd_select_save)
+    _add_source_arg(p_sel)
+    p_sel.set_defaults(func=cmd_select_save, needs_db=True)
 
     p_pp = sub.add_parser("price:pair")
     p_pp.add_argument(
@@ -1009,30 +1378,50 @@ def main() -> None:
     )
     p_pp.set_defaults(func=cmd_price_pair)
 
-    sub.add_parser("ws:run").set_defaults(func=cmd_ws_run)
+    p_wsr = sub.add_parser("ws:run")
+    p_wsr.add_argument("--loop", choices=LOOP_CHOICES, default=None, help="Event loop (default: WS_EVENT_LOOP)")
+    p_wsr.set_defaults(func=cmd_ws_run)
 
     # WS health metrics
     p_wh = sub.add_parser("ws:health")
     p_wh.add_argument("--reset", action="store_true", help="Reset counters before print")
+    p_wh.add_argument("--prometheus", action="store_true", help="Print Prometheus text format")
     p_wh.set_defaults(func=cmd_ws_health)
 
+    p_wr = sub.add_parser("ws:replay", help="Replay recorded WS frames through the ingest pipeline")
+    p_wr.add_argument("paths", nargs="+", help="Recorded files or directories (WS_RECORD_DIR)")
+    p_wr.add_argument("--speed", type=float, default=0.0, help="0 = max speed, 1 = real time, N = N x faster")
+    p_wr.add_argument("--limit", type=int, default=None, help="Stop after N frames")
+    p_wr.add_argument("--alerts", action="store_true", help="Run AlertsSubscriber (alerts captured, not sent)")
+    p_wr.add_argument("--loop", choices=LOOP_CHOICES, default=None, help="Event loop (default: WS_EVENT_LOOP)")
+    p_wr.set_defaults(func=cmd_ws_replay)
+
+    p_sch = sub.add_parser("scheduler:run", help="Run scan/alert/select/report jobs on intervals (cron replacement)")
+    p_sch.add_argument(
+        "--jobs", default=None, help=f"CSV of {','.join(SCHEDULER_JOBS)} (default: SCHED_JOBS or alert,select)"
+    )
+    p_sch.add_argument("--once", action="store_true", help="Run each job once and exit")
+    p_sch.set_defaults(func=cmd_scheduler_run, needs_db=True)
+
     # NEW: friendly alias for ws:health
     sub.add_parser("status").set_defaults(func=cmd_ws_health)
 
     args = parser.parse_args()
 
-    log_dir = Path("./logs")
-    log_level = os.getenv("LOG_LEVEL", "INFO")
-    setup_logging(log_dir, level=log_level)
+    if getattr(args, "needs_logging", True):
+        log_dir = Path("./logs")
+        log_level = os.getenv("LOG_LEVEL", "INFO")
+        _lazy("setup_logging")(log_dir, level=log_level)
 
-    try:
-        s = load_settings()
-        Path(s.db_path).parent.mkdir(parents=True, exist_ok=True)
-        init_db()
-        logger.success("SQLite initialized at {}", s.db_path)
-    except Exception as e:  # noqa: BLE001
-        logger.exception("SQLite init failed: {}", e)
-        sys.exit(2)
+    if getattr(args, "needs_db", False):
+        try:
+            s = load_settings()
+            Path(s.db_path).parent.mkdir(parents=True, exist_ok=True)
+            _lazy("init_db")()
+            logger.success("SQLite initialized at {}", s.db_path)
+        except Exception as e:  # noqa: BLE001
+            logger.exception("SQLite init failed: {}", e)
+            sys.exit(2)
 
     sys.exit(args.func(args))
 
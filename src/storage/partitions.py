@@ -0,0 +1,266 @@
+# src/storage/partitions.py
+"""Time-partitioned quote storage: one small SQLite file per day or ISO week.
+
+Notes:
+  - Comments in English (per project guidelines); stdlib only, so the maintenance and
+    export scripts can use it without loading settings.
+  - Layout: <dir>/quotes-YYYY-MM-DD.db (daily) or <dir>/quotes-YYYY-Www.db (weekly), each
+    holding the regular `quotes` table. The writer appends to the partition of the row's
+    timestamp (the small, hot one); readers open only the partitions overlapping the
+    requested range; retention unlinks whole files instead of DELETE + VACUUM.
+  - Readers always span the partition files that exist plus the legacy `quotes` table in
+    the main DB, whatever the current mode, so switching modes loses nothing.
+
+Env:
+    QUOTES_PARTITION      none | daily | weekly (default none: single `quotes` table in the main DB)
+    QUOTES_PARTITION_DIR  partition directory (default: <main DB dir>/quotes)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import heapq
+import itertools
+import os
+import sqlite3
+from collections.abc import Callable, Iterator
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+MODES = ("none", "daily", "weekly")
+PREFIX = "quotes-"
+SUFFIX = ".db"
+
+QUOTES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    symbol TEXT NOT NULL,
+    timestamp DATETIME NOT NULL,
+    spot_price REAL,
+    futures_price REAL,
+    basis_pct REAL,
+    volume_24h_usd REAL,
+    PRIMARY KEY (symbol, timestamp)
+);
+CREATE INDEX IF NOT EXISTS idx_quotes_ts ON quotes(timestamp);
+CREATE INDEX IF NOT EXISTS idx_quotes_symbol_ts ON quotes(symbol, timestamp);
+"""
+
+# Row layout of iter_quote_rows() (same order as scripts/export_signals.py)
+QUOTE_COLUMNS = ("timestamp", "symbol", "spot_price", "futures_price", "basis_pct", "volume_24h_usd")
+
+
+def partition_mode() -> str:
+    mode = (os.getenv("QUOTES_PARTITION", "none") or "none").strip().lower()
+    if mode not in MODES:
+        raise ValueError(f"QUOTES_PARTITION must be one of {', '.join(MODES)}, got {mode!r}")
+    return mode
+
+
+def partition_dir(db_path: str) -> Path:
+    env_dir = os.getenv("QUOTES_PARTITION_DIR", "").strip()
+    return Path(env_dir) if env_dir else Path(db_path).parent / "quotes"
+
+
+def partition_name(ts: datetime, mode: str) -> str:
+    """File name of the partition holding `ts` (UTC)."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc)
+    if mode == "daily":
+        return f"{PREFIX}{ts:%Y-%m-%d}{SUFFIX}"
+    if mode == "weekly":
+        year, week, _ = ts.isocalendar()
+        return f"{PREFIX}{year:04d}-W{week:02d}{SUFFIX}"
+    raise ValueError(f"no partitions in mode {mode!r}")
+
+
+def partition_bounds(path: Path | str) -> tuple[datetime, datetime] | None:
+    """[start, end) in UTC parsed from a partition file name; None for foreign files."""
+    name = Path(path).name
+    if not (name.startswith(PREFIX) and name.endswith(SUFFIX)):
+        return None
+    key = name[len(PREFIX) : -len(SUFFIX)]
+    try:
+        if "-W" in key:
+            year, week = key.split("-W")
+            start_d = date.fromisocalendar(int(year), int(week), 1)
+            span = timedelta(days=7)
+        else:
+            start_d = date.fromisoformat(key)
+            span = timedelta(days=1)
+    except ValueError:
+        return None
+    start = datetime(start_d.year, start_d.month, start_d.day, tzinfo=timezone.utc)
+    return start, start + span
+
+
+def _as_utc(value: datetime | str | None) -> datetime | None:
+    if value is None or isinstance(value, datetime):
+        return value if value is None or value.tzinfo else value.replace(tzinfo=timezone.utc)
+    dt = datetime.fromisoformat(value)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def list_partitions(
+    directory: Path, since: datetime | str | None = None, until: datetime | str | None = None
+) -> list[Path]:
+    """Partition files overlapping [since, until], newest first."""
+    lo, hi = _as_utc(since), _as_utc(until)
+    found: list[tuple[datetime, Path]] = []
+    if not directory.is_dir():
+        return []
+    for p in directory.glob(f"{PREFIX}*{SUFFIX}"):
+        bounds = partition_bounds(p)
+        if bounds is None:
+            continue
+        start, end = bounds
+        if (lo is not None and end <= lo) or (hi is not None and start > hi):
+            continue
+        found.append((start, p))
+    found.sort(reverse=True)
+    return [p for _, p in found]
+
+
+def drop_partitions(
+    directory: Path,
+    before: datetime,
+    *,
+    dry_run: bool = False,
+    on_drop: Callable[[Path], None] | None = None,
+) -> list[tuple[Path, int]]:
+    """Unlink partitions that end at or before `before`; returns (path, rows) per dropped file.
+
+    dry_run only counts. on_drop(path) runs right before the unlink (e.g. to close cached
+    connections to it).
+    """
+    cutoff = _as_utc(before)
+    dropped: list[tuple[Path, int]] = []
+    for p in list_partitions(directory):
+        bounds = partition_bounds(p)
+        if bounds is None or bounds[1] > cutoff:
+            continue
+        try:
+            with sqlite3.connect(p) as con:
+                rows = con.execute("SELECT COUNT(*) FROM quotes").fetchone()[0]
+            con.close()
+        except sqlite3.Error:
+            rows = 0
+        if dry_run:
+            dropped.append((p, int(rows)))
+            continue
+        if on_drop is not None:
+            on_drop(p)
+        try:
+            p.unlink(missing_ok=True)
+        except OSError:  # still open elsewhere (Windows); retried on the next sweep
+            continue
+        for extra in (p.with_name(p.name + "-wal"), p.with_name(p.name + "-shm")):
+            with contextlib.suppress(OSError):
+                extra.unlink(missing_ok=True)
+        dropped.append((p, int(rows)))
+    return dropped
+
+
+def _select(
+    con: sqlite3.Connection,
+    since: str | None,
+    until: str | None,
+    symbol: str | None,
+    limit: int | None,
+    chunk_size: int,
+) -> Iterator[tuple]:
+    where, params = [], []
+    if since is not None:
+        where.append("timestamp >= ?")
+        params.append(since)
+    if until is not None:
+        where.append("timestamp <= ?")
+        params.append(until)
+    if symbol is not None:
+        where.append("symbol = ?")
+        params.append(symbol)
+    sql = f"SELECT {', '.join(QUOTE_COLUMNS)} FROM quotes"
+    sql += (" WHERE " + " AND ".join(where)) if where else ""
+    sql += " ORDER BY timestamp DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    cur = con.execute(sql, params)
+    while True:
+        chunk = cur.fetchmany(chunk_size)
+        if not chunk:
+            return
+        yield from chunk
+
+
+def _iter_db(
+    path: Path | str,
+    since: str | None,
+    until: str | None,
+    symbol: str | None,
+    limit: int | None,
+    chunk_size: int,
+    *,
+    readonly: bool,
+) -> Iterator[tuple]:
+    """Rows of one DB file, newest first; the connection is opened on first use and closed when exhausted."""
+    try:
+        con = sqlite3.connect(f"file:{Path(path).as_posix()}?mode=ro", uri=True) if readonly else sqlite3.connect(path)
+    except sqlite3.OperationalError:
+        return
+    try:
+        has_table = con.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='quotes'").fetchone()
+        if has_table:
+            yield from _select(con, since, until, symbol, limit, chunk_size)
+    finally:
+        con.close()
+
+
+def iter_partition_rows(
+    directory: Path,
+    *,
+    since: str | None = None,
+    until: str | None = None,
+    symbol: str | None = None,
+    limit: int | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[tuple]:
+    """Quote rows (QUOTE_COLUMNS) of the partition files only, newest first.
+
+    Partitions are disjoint in time, so they are chained newest to oldest with one open
+    file at a time; rows stream in fetchmany() chunks.
+    """
+    parts = list_partitions(directory, since, until)
+    return itertools.chain.from_iterable(
+        _iter_db(p, since, until, symbol, limit, chunk_size, readonly=True) for p in parts
+    )
+
+
+def merge_newest_first(*sources: Iterator[tuple]) -> Iterator[tuple]:
+    """Merge row streams that are each sorted by timestamp (column 0) descending."""
+    return heapq.merge(*sources, key=lambda r: r[0], reverse=True)
+
+
+def iter_quote_rows(
+    db_path: str,
+    *,
+    since: str | None = None,
+    until: str | None = None,
+    symbol: str | None = None,
+    limit: int | None = None,
+    chunk_size: int = 1000,
+    directory: Path | None = None,
+) -> Iterator[tuple]:
+    """Quote rows (QUOTE_COLUMNS) newest first across the partitions and the legacy table.
+
+    since/until are ISO strings as stored; nothing is materialized.
+    """
+    directory = partition_dir(db_path) if directory is None else directory
+    legacy = _iter_db(db_path, since, until, symbol, limit, chunk_size, readonly=False)
+    if list_partitions(directory, since, until):
+        parted = iter_partition_rows(
+            directory, since=since, until=until, symbol=symbol, limit=limit, chunk_size=chunk_size
+        )
+        rows = merge_newest_first(parted, legacy)
+    else:
+        rows = legacy
+    return itertools.islice(rows, int(limit)) if limit else rows
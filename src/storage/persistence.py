@@ -5,18 +5,32 @@ Notes:
   - Comments in English (per project guidelines).
   - Backward compatible with existing 'signals' table used by tests/selector.
   - Adds 'quotes' and 'meta' tables + retention sweeper.
+  - Quotes can live in daily/weekly partition files (QUOTES_PARTITION, see src/storage/partitions.py):
+    save_quote() appends to the hot partition, get_quotes() spans partitions + the legacy table,
+    retention drops whole partition files.
 """
 
 from __future__ import annotations
 
 import os
 import sqlite3
+import threading
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Any
 
 # Keep import path consistent with current repo layout
 from src.infra.config import load_settings
+from src.storage.partitions import (
+    QUOTE_COLUMNS,
+    QUOTES_SCHEMA,
+    drop_partitions,
+    iter_quote_rows,
+    partition_dir,
+    partition_mode,
+    partition_name,
+)
 
 # -----------------------------
 # Schema (idempotent)
@@ -35,19 +49,9 @@ CREATE TABLE IF NOT EXISTS signals (
 );
 CREATE INDEX IF NOT EXISTS idx_signals_ts ON signals(timestamp);
 CREATE INDEX IF NOT EXISTS idx_signals_symbol_ts ON signals(symbol, timestamp);
-
-CREATE TABLE IF NOT EXISTS quotes (
-    symbol TEXT NOT NULL,
-    timestamp DATETIME NOT NULL,
-    spot_price REAL,
-    futures_price REAL,
-    basis_pct REAL,
-    volume_24h_usd REAL,
-    PRIMARY KEY (symbol, timestamp)
-);
-CREATE INDEX IF NOT EXISTS idx_quotes_ts ON quotes(timestamp);
-CREATE INDEX IF NOT EXISTS idx_quotes_symbol_ts ON quotes(symbol, timestamp);
-
+"""
+SCHEMA += QUOTES_SCHEMA  # shared with the partition files
+SCHEMA += """
 CREATE TABLE IF NOT EXISTS meta (
     key TEXT PRIMARY KEY,
     value TEXT
@@ -61,29 +65,43 @@ META_SCHEMA_KEY = "schema_version"
 # -----------------------------
 # Connection utils
 # -----------------------------
+def resolve_db_path(db_path: str | None = None) -> str:
+    """Main DB path: explicit arg, env DB_PATH (for tests), settings().db_path, 'data/signals.db'."""
+    if db_path:
+        return db_path
+    env_db = os.getenv("DB_PATH")
+    if env_db:
+        return env_db
+    try:
+        return load_settings().db_path  # fallback to config
+    except Exception:
+        return "data/signals.db"
+
+
 @contextmanager
 def conn_ctx(db_path: str | None = None):
-    """Yield a SQLite connection. The path is resolved as:
-    1) explicit arg
-    2) env var DB_PATH (for tests)
-    3) settings().db_path
-    4) default 'data/signals.db'
+    """Yield a SQLite connection for resolve_db_path(db_path).
     Also ensures parent directory exists.
     """
-    if db_path is None:
-        env_db = os.getenv("DB_PATH")
-        if env_db:
-            db_path = env_db
-        else:
-            try:
-                db_path = load_settings().db_path  # fallback to config
-            except Exception:
-                db_path = "data/signals.db"
-
+    db_path = resolve_db_path(db_path)
     parent = os.path.dirname(db_path)
     if parent and not os.path.isdir(parent):
         os.makedirs(parent, exist_ok=True)
 
+    if _kept is not None:
+        key = (threading.get_ident(), db_path)
+        con = _kept.get(key)
+        if con is None:
+            con = sqlite3.connect(db_path, check_same_thread=False)
+            with _kept_lock:
+                _kept[key] = con
+        try:
+            yield con
+        except BaseException:
+            con.rollback()  # do not leak a half-done transaction into the next caller
+            raise
+        return
+
     con = sqlite3.connect(db_path)
     try:
         yield con
@@ -91,6 +109,41 @@ def conn_ctx(db_path: str | None = None):
         con.close()
 
 
+# Long-running processes (scheduler:run) keep one connection per (thread, db path)
+_kept: dict[tuple[int, str], sqlite3.Connection] | None = None
+_kept_lock = threading.Lock()
+
+
+def keep_connections(enabled: bool = True) -> None:
+    """Reuse connections in conn_ctx() instead of connect/close per call; disabling closes them."""
+    global _kept
+    with _kept_lock:
+        if enabled:
+            if _kept is None:
+                _kept = {}
+            return
+        kept, _kept = _kept, None
+    for con in (kept or {}).values():
+        try:
+            con.close()
+        except sqlite3.Error:
+            pass
+
+
+def _close_kept(db_path: str) -> None:
+    """Close kept connections to one file (all threads) before it is unlinked."""
+    if _kept is None:
+        return
+    with _kept_lock:
+        keys = [k for k in _kept if k[1] == db_path]
+        cons = [_kept.pop(k) for k in keys]
+    for con in cons:
+        try:
+            con.close()
+        except sqlite3.Error:
+            pass
+
+
 def _ts_to_db_value(ts: datetime | None = None) -> str:
     """Return ISO timestamp string (microseconds, UTC) for SQLite."""
     if ts is None:
@@ -209,8 +262,9 @@ def save_quote(
     vol_usd: float | None,
     ts: datetime | None = None,
 ) -> None:
-    """Upsert a quote snapshot for (symbol, ts)."""
-    with conn_ctx() as con:
+    """Upsert a quote snapshot for (symbol, ts); into the ts partition when QUOTES_PARTITION is set."""
+    ts_value = _ts_to_db_value(ts)
+    with conn_ctx(_quote_db_path(ts_value)) as con:
         con.execute(
             """
             INSERT INTO quotes(symbol, timestamp, spot_price, futures_price, basis_pct, volume_24h_usd)
@@ -223,7 +277,7 @@ def save_quote(
             """.strip(),
             (
                 symbol,
-                _ts_to_db_value(ts),
+                ts_value,
                 None if spot is None else float(spot),
                 None if fut is None else float(fut),
                 None if basis_pct is None else float(basis_pct),
@@ -233,15 +287,58 @@ def save_quote(
         con.commit()
 
 
+# Partition files whose schema was already ensured by this process
+_partitions_ready: set[str] = set()
+_partitions_lock = threading.Lock()
+
+
+def _quote_db_path(ts_value: str) -> str | None:
+    """Partition file for a quote timestamp (None = legacy `quotes` table in the main DB)."""
+    mode = partition_mode()
+    if mode == "none":
+        return None
+    path = str(partition_dir(resolve_db_path()) / partition_name(datetime.fromisoformat(ts_value), mode))
+    if path not in _partitions_ready:
+        with _partitions_lock, conn_ctx(path) as con:
+            con.executescript("PRAGMA journal_mode=WAL;" + QUOTES_SCHEMA)
+            _partitions_ready.add(path)
+    return path
+
+
+def get_quotes(last_hours: int = 24, symbol: str | None = None, limit: int | None = None) -> list[dict[str, Any]]:
+    """Return quotes for the last N hours (optionally one symbol), newest first.
+
+    Spans the partition files overlapping the window and the legacy `quotes` table.
+    """
+    since = datetime.now(timezone.utc) - timedelta(hours=int(last_hours))
+    rows = iter_quote_rows(resolve_db_path(), since=_ts_to_db_value(since), symbol=symbol, limit=limit)
+    return [dict(zip(QUOTE_COLUMNS, row)) for row in rows]
+
+
+def drop_quote_partitions(before: datetime) -> int:
+    """Unlink quote partitions that end at or before `before`; return the number of rows dropped."""
+
+    def forget(path: Path) -> None:
+        _close_kept(str(path))
+        _partitions_ready.discard(str(path))
+
+    dropped = drop_partitions(partition_dir(resolve_db_path()), before, on_drop=forget)
+    return sum(rows for _, rows in dropped)
+
+
 # -----------------------------
 # Retention API
 # -----------------------------
 def retention_sweep(days: int = 30) -> tuple[int, int]:
-    """Delete old rows from signals/quotes older than `days`. Return (signals_deleted, quotes_deleted)."""
+    """Delete old rows from signals/quotes older than `days`. Return (signals_deleted, quotes_deleted).
+
+    Expired quote partitions are dropped as whole files (their rows count as deleted).
+    """
     cutoff = datetime.now(timezone.utc) - timedelta(days=int(days))
     cutoff_iso = _ts_to_db_value(cutoff)
     with conn_ctx() as con:
         cur1 = con.execute("DELETE FROM signals WHERE timestamp < ?", (cutoff_iso,))
         cur2 = con.execute("DELETE FROM quotes  WHERE timestamp < ?", (cutoff_iso,))
         con.commit()
-        return cur1.rowcount or 0, cur2.rowcount or 0
+        signals_deleted, quotes_deleted = cur1.rowcount or 0, cur2.rowcount or 0
+    return signals_deleted, quotes_deleted + drop_quote_partitions(cutoff)
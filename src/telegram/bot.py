@@ -26,7 +26,8 @@ try:
 except Exception as e:  # noqa: BLE001
     raise RuntimeError("aiogram not available or incompatible. Ensure aiogram v3 is installed.") from e
 
-from ..ws.health import MetricsRegistry
+from ..ws.health import MetricsRegistry, format_status
+from ..ws.health_export import live_snapshot
 
 
 def _get_token() -> str:
@@ -47,17 +48,9 @@ def _allowed_chat_id() -> int | None:
 
 
 def _format_status() -> str:
-    m = MetricsRegistry.get().snapshot()
-    # Compact human-readable format
-    lines = [
-        "🔎 *WS Status*",
-        f"• Uptime: `{m['uptime_ms']} ms`",
-        f"• Counters: `spot={m['counters']['spot']}`, `linear={m['counters']['linear']}`",
-        f"• Last Event (UTC): `{m['last_event_at_utc'] or 'n/a'}`",
-        f"• Last Spot (UTC): `{m['last_spot_at_utc'] or 'n/a'}`",
-        f"• Last Linear (UTC): `{m['last_linear_at_utc'] or 'n/a'}`",
-    ]
-    return "\n".join(lines)
+    # Standalone bot: show the running WS process's numbers (WS_HEALTH_FILE export)
+    snap, _ = live_snapshot(MetricsRegistry.get())
+    return format_status(snap)
 
 
 async def main() -> None:
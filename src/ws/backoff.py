@@ -10,6 +10,7 @@ import random
 
 __all__ = [
     "BackoffPolicy",
+    "ExponentialBackoff",
     "exp_backoff_with_jitter_compat",
 ]
 
@@ -126,6 +127,10 @@ class BackoffPolicy:
         return float(value if value <= cap else cap)
 
 
+# Name used by scripts/ws_bot_supervisor.py (same constructor: base/factor/cap).
+ExponentialBackoff = BackoffPolicy
+
+
 def exp_backoff_with_jitter_compat(
     attempt: int,
     *,
@@ -0,0 +1,247 @@
+# src/ws/decode_pool.py
+# English-only comments per project rules.
+"""
+Optional off-loop decode stage: raw WS text frames -> (json dict, normalized event)
+in worker processes.
+
+    event loop                         worker i (spawned process)
+    submit(raw) -> Future  --batch-->  json.loads + normalize
+    Future.result() <- reader thread <--batch-- [(msg, normalized), ...]
+
+Every worker has two one-way pipes (single producer / single consumer each).
+Frames are batched per loop iteration (up to `batch`) to amortize the pipe and
+pickle overhead. Results arrive as DecodedMessage (a dict carrying the
+precomputed `normalized` event), which normalize() returns without redoing
+the work, so existing on_message handlers stay unchanged.
+
+Futures complete out of order across workers; BybitPublicWS awaits them in
+submission order, so per-socket ordering is preserved.
+
+Worth it only when decode cost exceeds IPC cost (large full-market frames on a
+saturated loop); measure with `python -m bench.bench_decode_pool`.
+
+Env:
+    WS_DECODE_WORKERS   - worker processes (0 = decode on the loop, default)
+    WS_DECODE_BATCH     - max frames per pipe message (default 64)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import itertools
+import json
+import multiprocessing as mp
+import os
+import threading
+from typing import Any
+
+from loguru import logger
+
+__all__ = ["DecodePool", "DecodedMessage", "decode_frame"]
+
+DEFAULT_BATCH = 64
+
+
+class DecodedMessage(dict):
+    """Decoded WS payload with its normalized event precomputed by a worker."""
+
+    __slots__ = ("normalized",)
+
+    def __init__(self, msg: dict[str, Any], normalized: dict[str, Any] | None) -> None:
+        super().__init__(msg)
+        self.normalized = normalized
+
+
+def decode_frame(raw: str) -> tuple[Any, dict[str, Any] | None]:
+    """json.loads + normalize for data frames; raises ValueError on bad JSON."""
+    from src.ws.normalizers.bybit_v5 import normalize
+
+    msg = json.loads(raw)
+    norm = normalize(msg) if isinstance(msg, dict) and msg.get("topic") else None
+    return msg, norm
+
+
+def _worker_main(req: Any, res: Any) -> None:
+    while True:
+        try:
+            item = req.recv()
+        except (EOFError, OSError):
+            return
+        if item is None:
+            return
+        batch_id, frames = item
+        out: list[tuple[Any, Any]] = []
+        for raw in frames:
+            try:
+                out.append(decode_frame(raw))
+            except Exception:  # noqa: BLE001
+                out.append((None, None))  # bad frame: reported to the caller as None
+        res.send((batch_id, out))
+
+
+def _wrap(msg: Any, norm: dict[str, Any] | None) -> Any:
+    return DecodedMessage(msg, norm) if isinstance(msg, dict) else msg
+
+
+def _decode_into(frames: list[str], futs: list[asyncio.Future[Any]]) -> None:
+    """Decode on the calling (loop) thread; a bad frame resolves to None like in a worker."""
+    for raw, fut in zip(frames, futs):
+        if fut.done():
+            continue
+        try:
+            fut.set_result(_wrap(*decode_frame(raw)))
+        except Exception:  # noqa: BLE001
+            fut.set_result(None)
+
+
+class DecodePool:
+    def __init__(self, workers: int = 2, *, batch: int = DEFAULT_BATCH) -> None:
+        self.workers = max(1, int(workers))
+        self.batch = max(1, int(batch))
+        self._procs: list[Any] = []
+        self._req: list[Any] = []
+        self._threads: list[threading.Thread] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._buf: list[str] = []
+        self._buf_futs: list[asyncio.Future[Any]] = []
+        self._flush_scheduled = False
+        # batch_id -> (worker, raw frames, futures); frames are kept to re-decode if the worker dies
+        self._inflight: dict[int, tuple[int, list[str], list[asyncio.Future[Any]]]] = {}
+        self._ids = itertools.count()
+        self._rr = itertools.cycle(range(self.workers))
+        self._broken = False
+        self._closed = False
+        self._started = False
+
+    _shared: DecodePool | None = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> DecodePool | None:
+        try:
+            workers = int(os.getenv("WS_DECODE_WORKERS", "0"))
+            batch = int(os.getenv("WS_DECODE_BATCH", str(DEFAULT_BATCH)))
+        except ValueError:
+            return None
+        return cls(workers, batch=batch) if workers > 0 else None
+
+    @classmethod
+    def shared(cls) -> DecodePool | None:
+        """Process-wide pool from env (None when disabled); closed at interpreter exit."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls.from_env()
+            return cls._shared
+
+    # --- lifecycle
+    def start(self) -> DecodePool:
+        if self._started:
+            return self
+        self._started = True
+        ctx = mp.get_context("spawn")  # no fork of a threaded, running event loop
+        for i in range(self.workers):
+            req_r, req_w = ctx.Pipe(duplex=False)
+            res_r, res_w = ctx.Pipe(duplex=False)
+            p = ctx.Process(target=_worker_main, args=(req_r, res_w), name=f"ws-decode-{i}", daemon=True)
+            p.start()
+            req_r.close()
+            res_w.close()
+            t = threading.Thread(target=self._reader, args=(i, res_r), name=f"ws-decode-rx-{i}", daemon=True)
+            t.start()
+            self._procs.append(p)
+            self._req.append(req_w)
+            self._threads.append(t)
+        atexit.register(self.close)
+        return self
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for conn in self._req:
+            try:
+                conn.send(None)
+                conn.close()
+            except OSError:
+                pass
+        for p in self._procs:
+            p.join(timeout=2)
+            if p.is_alive():
+                p.terminate()
+        for t in self._threads:
+            t.join(timeout=2)
+
+    # --- event loop side
+    def submit(self, raw: str) -> asyncio.Future[Any]:
+        """Queue one frame; the future resolves to the decoded payload (None for bad JSON)."""
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future[Any] = loop.create_future()
+        if self._broken or self._closed:
+            _decode_into([raw], [fut])
+            return fut
+        if not self._started:
+            self.start()
+        self._loop = loop
+        self._buf.append(raw)
+        self._buf_futs.append(fut)
+        if len(self._buf) >= self.batch:
+            self._flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        return fut
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        if not self._buf:
+            return
+        frames, futs = self._buf, self._buf_futs
+        self._buf, self._buf_futs = [], []
+        if self._broken or self._closed:  # a worker died after these frames were queued
+            _decode_into(frames, futs)
+            return
+        batch_id = next(self._ids)
+        worker = next(self._rr)
+        self._inflight[batch_id] = (worker, frames, futs)
+        try:
+            self._req[worker].send((batch_id, frames))
+        except (OSError, ValueError) as e:
+            self._fail_over(f"send to worker {worker} failed: {e!r}", worker)
+
+    def _deliver(self, batch_id: int, results: list[tuple[Any, Any]]) -> None:
+        _, _, futs = self._inflight.pop(batch_id, (None, [], []))
+        for fut, (msg, norm) in zip(futs, results):
+            if not fut.done():
+                fut.set_result(_wrap(msg, norm))
+
+    def _fail_over(self, reason: str, worker: int | None = None) -> None:
+        """A worker died: decode on the loop from now on, including its in-flight frames."""
+        if not self._broken and not self._closed:
+            logger.bind(tag="WSDEC").warning("decode pool disabled, decoding on the loop: {}", reason)
+        self._broken = True
+        for batch_id, (w, frames, futs) in list(self._inflight.items()):
+            if worker is None or w == worker:
+                self._inflight.pop(batch_id, None)
+                _decode_into(frames, futs)
+
+    # --- reader threads
+    def _reader(self, worker: int, conn: Any) -> None:
+        while True:
+            try:
+                batch_id, results = conn.recv()
+            except (EOFError, OSError):
+                break
+            loop = self._loop
+            if loop is None or loop.is_closed():
+                continue
+            try:
+                loop.call_soon_threadsafe(self._deliver, batch_id, results)
+            except RuntimeError:
+                break
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._fail_over, f"worker {worker} exited", worker)
+            except RuntimeError:
+                pass
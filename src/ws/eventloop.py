@@ -0,0 +1,66 @@
+# src/ws/eventloop.py
+# English-only comments per project rules.
+"""
+Event loop implementation switch for the WS processes (ws:run, ws:replay,
+scripts/ws_bot_runner.py, scripts/ws_bot_supervisor.py).
+
+    WS_EVENT_LOOP=asyncio   - stdlib loop (default)
+    WS_EVENT_LOOP=uvloop    - uvloop; warns and falls back when it is not installed
+    WS_EVENT_LOOP=auto      - uvloop when installed (not on Windows), else asyncio
+
+uvloop is an optional dependency (`pip install uvloop`). Measure the gain for
+our workload with `python -m bench.bench_event_loop`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
+
+from loguru import logger
+
+__all__ = ["LOOP_CHOICES", "loop_factory", "resolve_loop", "run"]
+
+LOOP_CHOICES = ("asyncio", "uvloop", "auto")
+
+T = TypeVar("T")
+
+
+def _uvloop() -> Any | None:
+    try:
+        import uvloop  # type: ignore
+    except Exception:  # noqa: BLE001 (not installed / unsupported platform)
+        return None
+    return uvloop
+
+
+def resolve_loop(kind: str | None = None) -> str:
+    """Effective loop name ("asyncio" | "uvloop") for a requested kind (default: WS_EVENT_LOOP)."""
+    kind = (kind or os.getenv("WS_EVENT_LOOP") or "asyncio").strip().lower()
+    if kind not in LOOP_CHOICES:
+        logger.bind(tag="LOOP").warning("unknown WS_EVENT_LOOP={!r}; using asyncio", kind)
+        return "asyncio"
+    if kind == "asyncio":
+        return "asyncio"
+    if _uvloop() is not None:
+        return "uvloop"
+    if kind == "uvloop":
+        logger.bind(tag="LOOP").warning("uvloop requested but not installed; using asyncio")
+    return "asyncio"
+
+
+def loop_factory(kind: str | None = None) -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """asyncio.Runner loop_factory for the effective loop (None = stdlib default)."""
+    if resolve_loop(kind) == "uvloop":
+        return _uvloop().new_event_loop  # type: ignore[union-attr]
+    return None
+
+
+def run(main: Coroutine[Any, Any, T], *, kind: str | None = None) -> T:
+    """asyncio.run() on the selected loop implementation."""
+    name = resolve_loop(kind)
+    logger.bind(tag="LOOP").info("event loop: {}", name)
+    with asyncio.Runner(loop_factory=loop_factory(name)) as runner:
+        return runner.run(main)
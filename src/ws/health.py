@@ -4,10 +4,24 @@ from __future__ import annotations
 
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 
+from .histogram import SUMMARY_QUANTILES, LatencyHistogram, lag_ms_since
+
+# Latency kinds tracked per (source, channel):
+#   exchange_to_recv — Bybit message ts -> local receive (network + exchange queueing)
+#   handler          — whole on_message handler (normalize, publish, cache update)
+#   publish          — WSMultiplexer.publish fan-out
+#   e2e              — Bybit message ts -> alert decision in AlertsSubscriber
+LATENCY_KINDS: tuple[str, ...] = ("exchange_to_recv", "handler", "publish", "e2e")
+
+_HistKey = tuple[str, str, str]
+
+SLOW_CALLBACK_SAMPLES = 5  # most recent slow-callback stack samples kept in memory
+
 
 def _fmt_utc(ts: float | None) -> str | None:
     if not ts:
@@ -45,56 +59,377 @@ class WSHealth:
         }
 
 
+class _Shard:
+    """Per-thread counters: written only by the owning thread, read by snapshot()."""
+
+    __slots__ = ("spot", "linear", "reconnects")
+
+    def __init__(self) -> None:
+        self.spot = 0
+        self.linear = 0
+        self.reconnects = 0
+
+
+class ConnStats:
+    """Per-connection counters of one WS socket (e.g. "LINEAR#2" of a BybitWSPool).
+
+    Written only by the event loop that owns the socket; read by snapshot().
+    """
+
+    __slots__ = ("label", "topics", "connected", "connects", "reconnects", "messages", "last_msg_ts")
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.topics = 0
+        self.connected = False
+        self.connects = 0
+        self.reconnects = 0
+        self.messages = 0
+        self.last_msg_ts = 0.0
+
+
 class MetricsRegistry:
-    """Thread-safe singleton registry of WS health metrics."""
+    """
+    Thread-safe singleton registry of WS health metrics.
+
+    Hot-path increments are lock-free: every thread writes its own _Shard
+    (threading.local) and snapshot() sums the shards. reset() does not touch
+    the shards; it stores a baseline that snapshot() subtracts, so writers never
+    race with a reset. Cache the handle from get() outside per-message code.
+
+    Increments do not read the clock: last_*_ts are stamped by _stamp_activity()
+    when the totals have moved since the previous stamp. It runs on every
+    loop-lag tick (LoopMonitor, every LOOP_LAG_INTERVAL_MS) and in snapshot(),
+    so the timestamps are accurate to one tick.
+    """
 
     _instance: MetricsRegistry | None = None
     _lock = threading.Lock()
 
     def __init__(self) -> None:
         self._lock_local = threading.Lock()
-        self._state = WSHealth(started_ts=time.time())
+        self._tls = threading.local()
+        self._shards: list[_Shard] = []
+        self._started_ts = time.time()
+        self._reset_ts = 0.0
+        self._base = (0, 0, 0)  # (spot, linear, reconnects) at last reset
+        self._seen = (0, 0)  # (spot, linear) totals at the last _stamp_activity()
+        self._last_spot_ts = 0.0
+        self._last_linear_ts = 0.0
+        self._hists: dict[_HistKey, LatencyHistogram] = {}
+        self._loop_lag = LatencyHistogram()
+        self._slow_total = 0
+        self._slow: deque[dict[str, Any]] = deque(maxlen=SLOW_CALLBACK_SAMPLES)
+        self._conns: dict[str, ConnStats] = {}
+        self._conn_base: dict[str, tuple[int, int]] = {}  # label -> (messages, reconnects) at last reset
 
     @classmethod
     def get(cls) -> MetricsRegistry:
+        inst = cls._instance
+        if inst is not None:
+            return inst
         with cls._lock:
             if cls._instance is None:
                 cls._instance = MetricsRegistry()
             return cls._instance
 
-    # --- mutations
-    def inc_spot(self, n: int = 1) -> None:
+    def _new_shard(self) -> _Shard:
+        sh = _Shard()
+        self._tls.shard = sh
         with self._lock_local:
-            self._state.spot_events += int(n)
-            now = time.time()
-            self._state.last_spot_ts = now
-            self._state.last_event_ts = now
+            self._shards.append(sh)
+        return sh
+
+    # --- mutations (lock-free after the first call in each thread)
+    def inc_spot(self, n: int = 1) -> None:
+        try:
+            sh = self._tls.shard
+        except AttributeError:
+            sh = self._new_shard()
+        sh.spot += n
 
     def inc_linear(self, n: int = 1) -> None:
-        with self._lock_local:
-            self._state.linear_events += int(n)
-            now = time.time()
-            self._state.last_linear_ts = now
-            self._state.last_event_ts = now
+        try:
+            sh = self._tls.shard
+        except AttributeError:
+            sh = self._new_shard()
+        sh.linear += n
 
     def inc_reconnects(self, n: int = 1) -> None:
+        try:
+            sh = self._tls.shard
+        except AttributeError:
+            sh = self._new_shard()
+        sh.reconnects += n
+
+    def _totals_locked(self) -> tuple[int, int, int]:
+        spot = linear = reconnects = 0
+        for sh in self._shards:
+            spot += sh.spot
+            linear += sh.linear
+            reconnects += sh.reconnects
+        return spot, linear, reconnects
+
+    def _stamp_activity(self) -> tuple[int, int, int]:
+        """Stamp last_*_ts for the sources whose totals moved since the last call; returns the totals."""
+        now = time.time()
         with self._lock_local:
-            self._state.reconnects_total += int(n)
+            totals = self._totals_locked()
+            spot, linear, _ = totals
+            seen_spot, seen_linear = self._seen
+            if spot != seen_spot:
+                self._last_spot_ts = now
+            if linear != seen_linear:
+                self._last_linear_ts = now
+            self._seen = (spot, linear)
+        return totals
 
     def reset(self) -> None:
+        now = time.time()
         with self._lock_local:
-            self._state = WSHealth(started_ts=time.time())
+            spot, linear, reconnects = self._totals_locked()
+            self._base = (spot, linear, reconnects)
+            self._seen = (spot, linear)
+            self._last_spot_ts = 0.0
+            self._last_linear_ts = 0.0
+            self._started_ts = now
+            self._reset_ts = now
+            self._hists = {}
+            self._loop_lag = LatencyHistogram()
+            self._slow_total = 0
+            self._slow.clear()
+            self._conn_base = {k: (c.messages, c.reconnects) for k, c in self._conns.items()}
+
+    # --- per-connection stats (sharded WS pools)
+    def conn_stats(self, label: str) -> ConnStats:
+        """Get-or-create the stats of one WS connection; the client keeps the handle."""
+        c = self._conns.get(label)
+        if c is None:
+            with self._lock_local:
+                c = self._conns.setdefault(label, ConnStats(label))
+        return c
+
+    def conn_snapshot(self) -> dict[str, dict[str, Any]]:
+        now = time.time()
+        with self._lock_local:
+            items = sorted(self._conns.items())
+            base = dict(self._conn_base)
+        out: dict[str, dict[str, Any]] = {}
+        for label, c in items:
+            b_msgs, b_rec = base.get(label, (0, 0))
+            last = c.last_msg_ts if c.last_msg_ts >= self._reset_ts else 0.0
+            out[label] = {
+                "connected": c.connected,
+                "topics": c.topics,
+                "messages": c.messages - b_msgs,
+                "reconnects": c.reconnects - b_rec,
+                "last_msg_age_ms": int((now - last) * 1000) if last else None,
+            }
+        return out
+
+    # --- event loop health (fed by src.ws.loop_monitor.LoopMonitor)
+    def observe_loop_lag(self, lag_ms: float) -> None:
+        self._loop_lag.record(lag_ms)
+        self._stamp_activity()
+
+    def record_slow_callback(self, blocked_ms: float, stack: list[str]) -> None:
+        sample = {
+            "ts": time.time(),
+            "at_utc": _fmt_utc(time.time()),
+            "blocked_ms": round(float(blocked_ms), 1),
+            "stack": list(stack),
+        }
+        with self._lock_local:
+            self._slow_total += 1
+            self._slow.append(sample)
+
+    def loop_snapshot(self) -> dict[str, Any]:
+        with self._lock_local:
+            lag = self._loop_lag
+            slow_total = self._slow_total
+            recent = [dict(x) for x in self._slow]
+        return {
+            "lag_ms": lag.summary() if lag.count else None,
+            "slow_callbacks_total": slow_total,
+            "slow_callbacks": recent,
+        }
+
+    # --- latency histograms
+    def histogram(self, kind: str, source: str = "", channel: str = "") -> LatencyHistogram:
+        """Get-or-create the histogram for (kind, source, channel); cache it on hot paths."""
+        key = (kind, source, channel)
+        h = self._hists.get(key)
+        if h is None:
+            with self._lock_local:
+                h = self._hists.setdefault(key, LatencyHistogram())
+        return h
+
+    def observe_latency(self, kind: str, value_ms: float, *, source: str = "", channel: str = "") -> None:
+        self.histogram(kind, source, channel).record(value_ms)
+
+    def observe_ws(
+        self,
+        source: str,
+        channel: str,
+        *,
+        exchange_ts: float | None = None,
+        handler_ms: float | None = None,
+        publish_ms: float | None = None,
+    ) -> None:
+        """Record the per-message latencies of one WS frame in a single call."""
+        lag = lag_ms_since(exchange_ts)
+        if lag is not None:
+            self.observe_latency("exchange_to_recv", lag, source=source, channel=channel)
+        if handler_ms is not None:
+            self.observe_latency("handler", handler_ms, source=source, channel=channel)
+        if publish_ms is not None:
+            self.observe_latency("publish", publish_ms, source=source, channel=channel)
+
+    def latency_snapshot(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """{kind: {"SOURCE/channel": summary}}; empty histograms are skipped."""
+        with self._lock_local:
+            items = list(self._hists.items())
+        out: dict[str, dict[str, dict[str, Any]]] = {}
+        for (kind, source, channel), h in sorted(items):
+            if h.count:
+                label = "/".join(x for x in (source, channel) if x) or "all"
+                out.setdefault(kind, {})[label] = h.summary()
+        return out
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition (format 0.0.4) of counters and latency summaries."""
+        snap = self.snapshot()
+        with self._lock_local:
+            items = sorted(self._hists.items())
+        lines = [
+            "# HELP ws_events_total WS events processed per source.",
+            "# TYPE ws_events_total counter",
+            f'ws_events_total{{source="spot"}} {snap["counters"]["spot"]}',
+            f'ws_events_total{{source="linear"}} {snap["counters"]["linear"]}',
+            "# HELP ws_reconnects_total WS reconnects.",
+            "# TYPE ws_reconnects_total counter",
+            f"ws_reconnects_total {snap['reconnects_total']}",
+            "# HELP ws_uptime_seconds Registry uptime.",
+            "# TYPE ws_uptime_seconds gauge",
+            f"ws_uptime_seconds {snap['uptime_ms'] / 1000.0}",
+        ]
+        if snap["last_msg_age_ms"] is not None:
+            lines += [
+                "# HELP ws_last_msg_age_seconds Seconds since the last WS event.",
+                "# TYPE ws_last_msg_age_seconds gauge",
+                f"ws_last_msg_age_seconds {snap['last_msg_age_ms'] / 1000.0}",
+            ]
+        lines += [
+            "# HELP ws_latency_ms WS latency distribution by kind/source/channel (milliseconds).",
+            "# TYPE ws_latency_ms summary",
+        ]
+        for (kind, source, channel), h in items:
+            if not h.count:
+                continue
+            labels = f'kind="{kind}",source="{source}",channel="{channel}"'
+            for q, v in h.percentiles(SUMMARY_QUANTILES).items():
+                lines.append(f'ws_latency_ms{{{labels},quantile="{q}"}} {v}')
+            lines.append(f"ws_latency_ms_sum{{{labels}}} {h.sum_us / 1000.0}")
+            lines.append(f"ws_latency_ms_count{{{labels}}} {h.count}")
+        conns = snap["connections"]
+        if conns:
+            lines += [
+                "# HELP ws_conn_up WS connection state per pool shard (1 = connected).",
+                "# TYPE ws_conn_up gauge",
+            ]
+            lines += [f'ws_conn_up{{conn="{k}"}} {int(v["connected"])}' for k, v in conns.items()]
+            lines += [
+                "# HELP ws_conn_messages_total WS messages received per pool shard.",
+                "# TYPE ws_conn_messages_total counter",
+            ]
+            lines += [f'ws_conn_messages_total{{conn="{k}"}} {v["messages"]}' for k, v in conns.items()]
+            lines += [
+                "# HELP ws_conn_reconnects_total WS reconnects per pool shard.",
+                "# TYPE ws_conn_reconnects_total counter",
+            ]
+            lines += [f'ws_conn_reconnects_total{{conn="{k}"}} {v["reconnects"]}' for k, v in conns.items()]
+        loop = snap["event_loop"]
+        lines += [
+            "# HELP ws_loop_slow_callbacks_total Event loop stalls longer than the slow-callback budget.",
+            "# TYPE ws_loop_slow_callbacks_total counter",
+            f"ws_loop_slow_callbacks_total {loop['slow_callbacks_total']}",
+        ]
+        lag = self._loop_lag
+        if lag.count:
+            lines += [
+                "# HELP ws_loop_lag_ms Event loop scheduling delay (milliseconds).",
+                "# TYPE ws_loop_lag_ms summary",
+            ]
+            for q, v in lag.percentiles(SUMMARY_QUANTILES).items():
+                lines.append(f'ws_loop_lag_ms{{quantile="{q}"}} {v}')
+            lines.append(f"ws_loop_lag_ms_sum {lag.sum_us / 1000.0}")
+            lines.append(f"ws_loop_lag_ms_count {lag.count}")
+        return "\n".join(lines) + "\n"
 
     # --- views
     def snapshot(self) -> dict[str, Any]:
+        spot, linear, reconnects = self._stamp_activity()
         with self._lock_local:
-            s = WSHealth(
-                started_ts=self._state.started_ts,
-                spot_events=self._state.spot_events,
-                linear_events=self._state.linear_events,
-                last_event_ts=self._state.last_event_ts,
-                last_spot_ts=self._state.last_spot_ts,
-                last_linear_ts=self._state.last_linear_ts,
-                reconnects_total=self._state.reconnects_total,
-            )
-        return s.to_dict()
+            base_spot, base_linear, base_reconnects = self._base
+            started_ts = self._started_ts
+            last_spot_ts = self._last_spot_ts or None
+            last_linear_ts = self._last_linear_ts or None
+        last_event_ts = max(last_spot_ts or 0.0, last_linear_ts or 0.0) or None
+        s = WSHealth(
+            started_ts=started_ts,
+            spot_events=spot - base_spot,
+            linear_events=linear - base_linear,
+            last_event_ts=last_event_ts,
+            last_spot_ts=last_spot_ts,
+            last_linear_ts=last_linear_ts,
+            reconnects_total=reconnects - base_reconnects,
+        )
+        out = s.to_dict()
+        out["latency_ms"] = self.latency_snapshot()
+        out["event_loop"] = self.loop_snapshot()
+        out["connections"] = self.conn_snapshot()
+        return out
+
+
+def format_latency_lines(snap: dict[str, Any], kinds: tuple[str, ...] = LATENCY_KINDS) -> list[str]:
+    """Human-readable p50/p99/p999 lines from snapshot()["latency_ms"]."""
+    lines: list[str] = []
+    lat = snap.get("latency_ms") or {}
+    for kind in kinds:
+        for label, h in (lat.get(kind) or {}).items():
+            lines.append(f"{kind} {label}: p50={h['p50']:g}ms p99={h['p99']:g}ms p999={h['p999']:g}ms (n={h['count']})")
+    return lines
+
+
+def format_status(snap: dict[str, Any]) -> str:
+    """Markdown text for the Telegram /status command."""
+    lines = [
+        "🔎 *WS Status*",
+        f"• Uptime: `{snap['uptime_ms']} ms`",
+        f"• Counters: `spot={snap['counters']['spot']}`, `linear={snap['counters']['linear']}`",
+        f"• Last Event (UTC): `{snap['last_event_at_utc'] or 'n/a'}`",
+        f"• Last Spot (UTC): `{snap['last_spot_at_utc'] or 'n/a'}`",
+        f"• Last Linear (UTC): `{snap['last_linear_at_utc'] or 'n/a'}`",
+    ]
+    conns = snap.get("connections") or {}
+    if len(conns) > 1:
+        up = sum(1 for c in conns.values() if c["connected"])
+        worst = max(conns.items(), key=lambda kv: kv[1]["reconnects"])
+        lines.append(f"• Connections: `{up}/{len(conns)} up`, most reconnects: `{worst[0]}={worst[1]['reconnects']}`")
+    lat = format_latency_lines(snap, kinds=("exchange_to_recv", "e2e"))
+    if lat:
+        lines.append("• Latency:")
+        lines.extend(f"  `{x}`" for x in lat)
+    loop = snap.get("event_loop") or {}
+    lag = loop.get("lag_ms")
+    if lag:
+        lines.append(
+            f"• Loop lag: `p50={lag['p50']:g}ms p99={lag['p99']:g}ms max={lag['max']:g}ms`, "
+            f"slow callbacks: `{loop.get('slow_callbacks_total', 0)}`"
+        )
+    recent = loop.get("slow_callbacks") or []
+    if recent:
+        last = recent[-1]
+        where = last["stack"][-1].strip().splitlines()[0] if last.get("stack") else "?"
+        lines.append(f"• Last stall: `{last['blocked_ms']:g}ms` at `{last['at_utc']}` in `{where}`")
+    return "\n".join(lines)
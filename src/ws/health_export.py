@@ -0,0 +1,261 @@
+# src/ws/health_export.py
+# English-only comments per project rules.
+"""
+Cross-process view of the running WS process's MetricsRegistry.
+
+The producer (ws:run, ws_bot_runner, ws_bot_supervisor) starts a HealthExporter:
+a daemon thread that every WS_HEALTH_EXPORT_SEC writes
+
+    {"pid", "exported_ts", "interval_sec", "snapshot": snapshot(), "prometheus": to_prometheus()}
+
+to a temp file and os.replace()s it over WS_HEALTH_FILE, so readers never see a
+partial document. The WS hot path is untouched (counters stay per-thread
+shards); the only producer cost is one snapshot per interval off the loop.
+
+Readers (ws:health, scripts/ws_health_cli.py, Telegram /status in a separate
+process) call live_snapshot(): the exported snapshot when the file is fresh and
+its pid is alive, otherwise this process's own registry.
+
+`ws:health --reset` in another process drops a "<file>.reset" marker; the
+exporter resets the registry on its next tick and wait_for_reset() waits for the
+first export written after it, so the command prints post-reset numbers.
+
+Env:
+    WS_HEALTH_FILE          - export path (default run/ws_health.json; "off" disables)
+    WS_HEALTH_EXPORT_SEC    - export interval in seconds (default 1.0; 0 disables)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from .health import MetricsRegistry
+
+__all__ = [
+    "HealthExporter",
+    "health_file",
+    "live_prometheus",
+    "live_snapshot",
+    "read_exported",
+    "request_reset",
+    "wait_for_reset",
+    "start_health_export_from_env",
+]
+
+DEFAULT_HEALTH_FILE = "run/ws_health.json"
+DEFAULT_INTERVAL_SEC = 1.0
+STALE_INTERVALS = 5  # an export older than this many intervals is considered dead
+MIN_STALE_SEC = 5.0
+
+_active: HealthExporter | None = None
+
+
+def health_file() -> Path | None:
+    raw = os.getenv("WS_HEALTH_FILE", DEFAULT_HEALTH_FILE).strip()
+    if not raw or raw.lower() in ("0", "off", "false", "no"):
+        return None
+    return Path(raw)
+
+
+def _reset_marker(path: Path) -> Path:
+    return path.with_name(path.name + ".reset")
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    except OSError:
+        return False
+    return True
+
+
+class HealthExporter:
+    def __init__(
+        self,
+        path: str | Path,
+        registry: MetricsRegistry | None = None,
+        *,
+        interval: float = DEFAULT_INTERVAL_SEC,
+    ) -> None:
+        self.path = Path(path)
+        self.registry = registry or MetricsRegistry.get()
+        self.interval = max(0.05, float(interval))
+        self.writes = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def from_env(cls, registry: MetricsRegistry | None = None) -> HealthExporter | None:
+        path = health_file()
+        try:
+            interval = float(os.getenv("WS_HEALTH_EXPORT_SEC", str(DEFAULT_INTERVAL_SEC)))
+        except ValueError:
+            interval = DEFAULT_INTERVAL_SEC
+        if path is None or interval <= 0:
+            return None
+        return cls(path, registry, interval=interval)
+
+    def write_once(self) -> None:
+        marker = _reset_marker(self.path)
+        if marker.exists():
+            self.registry.reset()
+            with contextlib.suppress(OSError):
+                marker.unlink()
+        doc = {
+            "pid": os.getpid(),
+            "exported_ts": time.time(),
+            "interval_sec": self.interval,
+            "snapshot": self.registry.snapshot(),
+            "prometheus": self.registry.to_prometheus(),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(doc, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self.writes += 1
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.write_once()
+            except Exception as e:  # noqa: BLE001 (disk full / permissions: keep the bot running)
+                logger.bind(tag="HEALTH").warning("health export to {} failed: {!r}", self.path, e)
+            self._stop.wait(self.interval)
+
+    def start(self) -> HealthExporter:
+        global _active
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="ws-health-export", daemon=True)
+            self._thread.start()
+            _active = self
+            logger.bind(tag="HEALTH").info("WS health exported to {} every {:.1f}s", self.path, self.interval)
+        return self
+
+    def stop(self) -> None:
+        global _active
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(2.0, self.interval * 2))
+            self._thread = None
+        if _active is self:
+            _active = None
+        with contextlib.suppress(OSError):
+            self.path.unlink()  # readers fall back instead of showing a frozen snapshot
+
+
+def start_health_export_from_env(registry: MetricsRegistry | None = None) -> HealthExporter | None:
+    """Start the exporter unless disabled by env; failures are logged, never fatal."""
+    exporter = HealthExporter.from_env(registry)
+    if exporter is None:
+        return None
+    try:
+        return exporter.start()
+    except Exception as e:  # noqa: BLE001
+        logger.bind(tag="HEALTH").warning("WS health export disabled: {!r}", e)
+        return None
+
+
+def read_exported(path: str | Path | None = None) -> dict[str, Any] | None:
+    """The exported document if it is fresh and its producer is alive, else None."""
+    p = Path(path) if path is not None else health_file()
+    if p is None:
+        return None
+    try:
+        doc = json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(doc, dict) or not isinstance(doc.get("snapshot"), dict):
+        return None
+    try:
+        age = time.time() - float(doc.get("exported_ts") or 0.0)
+        max_age = max(MIN_STALE_SEC, STALE_INTERVALS * float(doc.get("interval_sec") or DEFAULT_INTERVAL_SEC))
+        pid = int(doc.get("pid") or 0)
+    except (TypeError, ValueError):
+        return None
+    if age > max_age or not _pid_alive(pid):
+        return None
+    doc["age_ms"] = int(age * 1000)
+    return doc
+
+
+def live_snapshot(registry: MetricsRegistry | None = None) -> tuple[dict[str, Any], str]:
+    """
+    (snapshot, source): this process's registry when it exports itself, else the
+    running WS process's export ("pid <N>"), else the local (empty) registry.
+    """
+    reg = registry or MetricsRegistry.get()
+    if _active is None:
+        doc = read_exported()
+        if doc is not None:
+            snap = dict(doc["snapshot"])
+            started = snap.get("started_ts")
+            if started:
+                snap["uptime_ms"] = int((time.time() - float(started)) * 1000)
+            snap["export_age_ms"] = doc["age_ms"]
+            return snap, f"pid {doc['pid']}"
+    return reg.snapshot(), "local"
+
+
+def live_prometheus(registry: MetricsRegistry | None = None) -> str:
+    if _active is None:
+        doc = read_exported()
+        if doc is not None and isinstance(doc.get("prometheus"), str):
+            return doc["prometheus"]
+    return (registry or MetricsRegistry.get()).to_prometheus()
+
+
+def request_reset(path: str | Path | None = None) -> bool:
+    """Ask a running exporter to reset its registry on the next tick; False when none is running."""
+    p = Path(path) if path is not None else health_file()
+    if p is None or _active is not None or read_exported(p) is None:
+        return False
+    _reset_marker(p).touch()
+    return True
+
+
+def wait_for_reset(
+    path: str | Path | None = None,
+    *,
+    requested_ts: float | None = None,
+    timeout: float | None = None,
+    poll: float = 0.05,
+) -> bool:
+    """
+    Block until the exporter has consumed the reset marker and written an export
+    after `requested_ts`; False on timeout (default: 3 export intervals, >= 2 s).
+    """
+    p = Path(path) if path is not None else health_file()
+    if p is None:
+        return False
+    since = time.time() if requested_ts is None else requested_ts
+    marker = _reset_marker(p)
+    deadline = None
+    while True:
+        doc = read_exported(p)
+        if doc is None:
+            return False
+        if not marker.exists() and float(doc.get("exported_ts") or 0.0) >= since:
+            return True
+        if deadline is None:
+            if timeout is None:
+                timeout = max(2.0, 3 * float(doc.get("interval_sec") or DEFAULT_INTERVAL_SEC))
+            deadline = time.monotonic() + timeout
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll)
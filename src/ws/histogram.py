@@ -0,0 +1,142 @@
+# src/ws/histogram.py
+# English-only comments per project rules.
+"""
+Low-overhead HDR-style latency histogram.
+
+Values are recorded in microseconds into log-linear buckets: each power-of-two
+range is split into 2**SUB_BITS equal sub-buckets, so any reported percentile
+is within ~1/2**SUB_BITS (≈3% for SUB_BITS=5) of the true value while the
+memory footprint stays fixed (~2k counters for the full 1µs..1h range).
+
+record() is a handful of integer ops plus one list increment and takes no lock;
+the histogram is meant to have a single writer (the event loop). Readers get
+consistent-enough percentiles without stopping the writer.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+__all__ = ["LatencyHistogram", "lag_ms_since", "SUMMARY_QUANTILES"]
+
+SUB_BITS = 5
+_SUB_COUNT = 1 << SUB_BITS
+_MAX_US = 3_600 * 1_000_000  # values above 1h are clamped
+_N_BUCKETS = (_MAX_US.bit_length() + 1) * _SUB_COUNT
+
+SUMMARY_QUANTILES: tuple[float, ...] = (0.5, 0.9, 0.99, 0.999)
+
+
+def _bucket_index(us: int) -> int:
+    if us < _SUB_COUNT:
+        return us  # exact for tiny values
+    shift = us.bit_length() - SUB_BITS - 1
+    return ((shift + 1) << SUB_BITS) + ((us >> shift) - _SUB_COUNT)
+
+
+def _bucket_upper_us(idx: int) -> int:
+    """Highest value (µs) that maps to bucket `idx`."""
+    if idx < _SUB_COUNT:
+        return idx
+    shift = (idx >> SUB_BITS) - 1
+    sub = (idx & (_SUB_COUNT - 1)) + _SUB_COUNT
+    return ((sub + 1) << shift) - 1
+
+
+def lag_ms_since(ts: float | int | None, now: float | None = None) -> float | None:
+    """
+    Milliseconds between an exchange timestamp and the local clock.
+    Accepts epoch seconds or epoch milliseconds (Bybit `ts`); returns None for empty input.
+    """
+    if not ts:
+        return None
+    try:
+        t = float(ts)
+    except (TypeError, ValueError):
+        return None
+    t_ms = t if t > 1e11 else t * 1000.0
+    now_ms = (time.time() if now is None else now) * 1000.0
+    return now_ms - t_ms
+
+
+class LatencyHistogram:
+    """Fixed-size log-linear histogram of latencies (recorded in ms, stored in µs)."""
+
+    __slots__ = ("_counts", "count", "sum_us", "min_us", "max_us", "negative")
+
+    def __init__(self) -> None:
+        self._counts = [0] * _N_BUCKETS
+        self.count = 0
+        self.sum_us = 0
+        self.min_us = 0
+        self.max_us = 0
+        self.negative = 0  # clock-skew samples (exchange ts ahead of local clock), recorded as 0
+
+    def record(self, value_ms: float) -> None:
+        us = int(value_ms * 1000.0)
+        if us < 0:
+            self.negative += 1
+            us = 0
+        elif us > _MAX_US:
+            us = _MAX_US
+        self._counts[_bucket_index(us)] += 1
+        if self.count == 0 or us < self.min_us:
+            self.min_us = us
+        if us > self.max_us:
+            self.max_us = us
+        self.count += 1
+        self.sum_us += us
+
+    def merge(self, other: LatencyHistogram) -> None:
+        if other.count == 0:
+            return
+        counts = self._counts
+        for i, c in enumerate(other._counts):
+            if c:
+                counts[i] += c
+        if self.count == 0 or other.min_us < self.min_us:
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+        self.count += other.count
+        self.sum_us += other.sum_us
+        self.negative += other.negative
+
+    def percentiles(self, qs: tuple[float, ...] = SUMMARY_QUANTILES) -> dict[float, float]:
+        """{q: value_ms} for quantiles in [0, 1]; one pass over the buckets."""
+        out: dict[float, float] = {}
+        total = self.count
+        if total == 0:
+            return {q: 0.0 for q in qs}
+        targets = sorted((max(1, int(q * total + 0.999999)), q) for q in qs)
+        seen = 0
+        ti = 0
+        for idx, c in enumerate(self._counts):
+            if not c:
+                continue
+            seen += c
+            while ti < len(targets) and seen >= targets[ti][0]:
+                out[targets[ti][1]] = min(_bucket_upper_us(idx), self.max_us) / 1000.0
+                ti += 1
+            if ti == len(targets):
+                break
+        for _, q in targets[ti:]:
+            out[q] = self.max_us / 1000.0
+        return out
+
+    def percentile(self, q: float) -> float:
+        return self.percentiles((q,))[q]
+
+    def summary(self) -> dict[str, Any]:
+        """Compact JSON-friendly view (ms)."""
+        p = self.percentiles()
+        return {
+            "count": self.count,
+            "p50": round(p[0.5], 3),
+            "p90": round(p[0.9], 3),
+            "p99": round(p[0.99], 3),
+            "p999": round(p[0.999], 3),
+            "min": round(self.min_us / 1000.0, 3),
+            "max": round(self.max_us / 1000.0, 3),
+            "mean": round(self.sum_us / self.count / 1000.0, 3) if self.count else 0.0,
+        }
@@ -0,0 +1,131 @@
+# src/ws/loop_monitor.py
+# English-only comments per project rules.
+"""
+Event loop lag probe + slow-callback detector.
+
+Two cooperating parts:
+  - a probe coroutine on the monitored loop sleeps `interval` and records how
+    late it woke up (scheduling delay) into MetricsRegistry;
+  - a watchdog thread checks the probe heartbeat; when the loop has not run the
+    probe for longer than the budget, it samples the loop thread's stack via
+    sys._current_frames(), so the blocking call itself (e.g. sync REST, disk I/O)
+    shows up in snapshot()["event_loop"]["slow_callbacks"] and in /status.
+
+Env:
+    LOOP_MONITOR_ENABLED    - 1/0 (default 1)
+    LOOP_LAG_INTERVAL_MS    - probe period (default 100)
+    LOOP_SLOW_CALLBACK_MS   - stall budget that triggers a stack sample (default 250)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import sys
+import threading
+import time
+import traceback
+
+from loguru import logger
+
+from .health import MetricsRegistry
+
+__all__ = ["LoopMonitor"]
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+class LoopMonitor:
+    """Measure scheduling delay of the running loop and sample stacks of long stalls."""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry | None = None,
+        *,
+        interval_ms: float = 100.0,
+        slow_callback_ms: float = 250.0,
+        stack_depth: int = 12,
+    ) -> None:
+        self.registry = registry or MetricsRegistry.get()
+        self.interval = max(0.001, interval_ms / 1000.0)
+        self.slow_callback_ms = max(1.0, float(slow_callback_ms))
+        self.stack_depth = max(1, int(stack_depth))
+        self._beat = time.monotonic()
+        self._reported_beat: float | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    @classmethod
+    def from_env(cls, registry: MetricsRegistry | None = None) -> LoopMonitor | None:
+        """Configured monitor, or None when LOOP_MONITOR_ENABLED=0."""
+        if os.getenv("LOOP_MONITOR_ENABLED", "1").strip().lower() in {"0", "false", "no", "off"}:
+            return None
+        return cls(
+            registry,
+            interval_ms=_env_float("LOOP_LAG_INTERVAL_MS", 100.0),
+            slow_callback_ms=_env_float("LOOP_SLOW_CALLBACK_MS", 250.0),
+        )
+
+    # --- lifecycle
+    def start(self) -> None:
+        """Start on the running loop (call from a coroutine)."""
+        if self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = loop.create_task(self._probe(), name="loop_lag_probe")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+
+    # --- probe (runs on the monitored loop)
+    async def _probe(self) -> None:
+        interval = self.interval
+        while True:
+            expected = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            self._beat = now
+            lag_ms = max(0.0, (now - expected) * 1000.0)
+            self.registry.observe_loop_lag(lag_ms)
+            if lag_ms >= self.slow_callback_ms:
+                logger.bind(tag="LOOP").warning("Event loop stalled for {:.0f} ms", lag_ms)
+
+    # --- watchdog (separate thread)
+    def _watch(self) -> None:
+        poll = min(self.interval, self.slow_callback_ms / 1000.0 / 2.0)
+        while not self._stop.wait(poll):
+            beat = self._beat
+            blocked_ms = (time.monotonic() - beat - self.interval) * 1000.0
+            if blocked_ms < self.slow_callback_ms or self._reported_beat == beat:
+                continue
+            self._reported_beat = beat  # one sample per stall
+            self.registry.record_slow_callback(blocked_ms, self._sample_stack())
+
+    def _sample_stack(self) -> list[str]:
+        if self._loop_thread_id is None:
+            return []
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return []
+        return traceback.format_stack(frame)[-self.stack_depth :]
@@ -0,0 +1,93 @@
+# src/ws/metrics_http.py
+# English-only comments per project rules.
+"""
+In-process Prometheus endpoint for MetricsRegistry.
+
+A stdlib ThreadingHTTPServer on a daemon thread, so it never touches the
+asyncio loop that runs the WebSockets:
+    GET /metrics -> Prometheus text exposition
+    GET /health  -> MetricsRegistry.snapshot() as JSON
+    GET /quotes  -> live quote snapshot as JSON, when the owner passes `quotes`
+                    (ws:run serves its QuoteCache; see src/core/quotes.py)
+
+Env:
+    WS_METRICS_PORT  - port to listen on (unset/0 disables)
+    WS_METRICS_HOST  - bind address (default 127.0.0.1)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from loguru import logger
+
+from .health import MetricsRegistry
+
+__all__ = ["start_metrics_server", "start_metrics_server_from_env"]
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _make_handler(registry: MetricsRegistry, quotes: Callable[[], dict] | None = None) -> type[BaseHTTPRequestHandler]:
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 (stdlib naming)
+            path = self.path.split("?", 1)[0]
+            if path == "/metrics":
+                body = registry.to_prometheus().encode("utf-8")
+                ctype = PROMETHEUS_CONTENT_TYPE
+            elif path == "/health":
+                body = json.dumps(registry.snapshot(), ensure_ascii=False).encode("utf-8")
+                ctype = "application/json"
+            elif path == "/quotes" and quotes is not None:
+                body = json.dumps(quotes(), ensure_ascii=False).encode("utf-8")
+                ctype = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            return  # scrapes every few seconds would flood stderr
+
+    return _Handler
+
+
+def start_metrics_server(
+    port: int,
+    host: str = "127.0.0.1",
+    registry: MetricsRegistry | None = None,
+    quotes: Callable[[], dict] | None = None,
+) -> ThreadingHTTPServer:
+    """Start serving on a daemon thread; call .shutdown() to stop. Port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, int(port)), _make_handler(registry or MetricsRegistry.get(), quotes))
+    server.daemon_threads = True
+    t = threading.Thread(target=server.serve_forever, name="ws-metrics-http", daemon=True)
+    t.start()
+    logger.bind(tag="METRICS").info("Prometheus metrics on http://{}:{}/metrics", host, server.server_address[1])
+    return server
+
+
+def start_metrics_server_from_env(
+    registry: MetricsRegistry | None = None, quotes: Callable[[], dict] | None = None
+) -> ThreadingHTTPServer | None:
+    """Start the endpoint if WS_METRICS_PORT is set; failures are logged, never fatal."""
+    try:
+        port = int(os.getenv("WS_METRICS_PORT", "0") or 0)
+    except ValueError:
+        port = 0
+    if port <= 0:
+        return None
+    host = os.getenv("WS_METRICS_HOST", "127.0.0.1") or "127.0.0.1"
+    try:
+        return start_metrics_server(port, host, registry, quotes)
+    except OSError as e:
+        logger.bind(tag="METRICS").warning("Metrics endpoint disabled: cannot bind {}:{}: {!r}", host, port, e)
+        return None
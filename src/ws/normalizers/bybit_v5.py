@@ -105,6 +105,9 @@ def normalize(raw: dict[str, Any]) -> dict[str, Any]:
     """
     if not isinstance(raw, dict):
         raise TypeError("raw must be a dict")
+    pre = getattr(raw, "normalized", None)  # DecodedMessage: already normalized by a decode worker
+    if pre is not None:
+        return pre
 
     topic = str(raw.get("topic", ""))
     channel, symbol = _parse_topic(topic)
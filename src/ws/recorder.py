@@ -0,0 +1,218 @@
+# src/ws/recorder.py
+# English-only comments per project rules.
+"""
+Raw WS frame recorder with compressed, rotating files.
+
+Each line is a JSON object {"t": <receive epoch sec>, "s": <source>, "raw": <text frame>}.
+record() only enqueues; a writer thread serializes, compresses and rotates, so
+the event loop never blocks on disk or compression.
+
+Files: <dir>/ws-<source>-<YYYYmmdd-HHMMSS>-<seq>.jsonl.gz (or .jsonl.zst / .jsonl)
+Rotation when the uncompressed size of the current file exceeds `max_bytes`;
+only the newest `max_files` files per source are kept.
+
+Env (see FrameRecorder.from_env):
+    WS_RECORD_DIR           - enable recording into this directory (unset disables)
+    WS_RECORD_MAX_MB        - rotate after N MB of raw frames (default 64)
+    WS_RECORD_MAX_FILES     - files kept per source (default 50)
+    WS_RECORD_COMPRESSION   - gzip | zstd | none (default gzip; zstd needs `zstandard`)
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import heapq
+import io
+import json
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from loguru import logger
+
+try:
+    import zstandard  # type: ignore
+except Exception:  # noqa: BLE001
+    zstandard = None  # optional dependency; gzip is used when it is missing
+
+__all__ = ["FrameRecorder", "iter_frames", "recorded_files"]
+
+_SUFFIX = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst", "none": ".jsonl"}
+_STOP = object()
+
+
+def _open_write(path: Path, compression: str) -> IO[bytes]:
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=5)
+    if compression == "zstd":
+        raw = open(path, "wb")  # noqa: SIM115 (closed via the zstd writer)
+        return zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)  # type: ignore[union-attr]
+    return open(path, "wb")  # noqa: SIM115
+
+
+def _open_read(path: Path) -> IO[bytes]:
+    name = path.name
+    if name.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path}: reading .zst requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)  # noqa: SIM115
+    return open(path, "rb")  # noqa: SIM115
+
+
+class FrameRecorder:
+    """Per-stream recorder; create one per WS connection (source = "SPOT" | "LINEAR" | ...)."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        source: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_files: int = 50,
+        compression: str = "gzip",
+    ) -> None:
+        compression = (compression or "gzip").lower()
+        if compression == "zstd" and zstandard is None:
+            logger.bind(tag="WSREC").warning("zstandard is not installed; recording with gzip")
+            compression = "gzip"
+        if compression not in _SUFFIX:
+            raise ValueError(f"unsupported compression: {compression!r}")
+        self.directory = Path(directory)
+        self.source = str(source).upper()
+        self.max_bytes = max(1024, int(max_bytes))
+        self.max_files = max(1, int(max_files))
+        self.compression = compression
+        self.frames = 0
+        self.dropped = 0
+        self._q: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._seq = 0
+
+    @classmethod
+    def from_env(cls, source: str) -> FrameRecorder | None:
+        directory = os.getenv("WS_RECORD_DIR", "").strip()
+        if not directory:
+            return None
+        try:
+            max_mb = float(os.getenv("WS_RECORD_MAX_MB", "64"))
+            max_files = int(os.getenv("WS_RECORD_MAX_FILES", "50"))
+        except ValueError:
+            max_mb, max_files = 64.0, 50
+        return cls(
+            directory,
+            source=source,
+            max_bytes=int(max_mb * 1024 * 1024),
+            max_files=max_files,
+            compression=os.getenv("WS_RECORD_COMPRESSION", "gzip"),
+        )
+
+    # --- producer side (event loop)
+    def record(self, raw: str, recv_ts: float | None = None) -> None:
+        """Enqueue one raw text frame; never blocks and never raises."""
+        if self._thread is None:
+            self._start()
+        self._q.put((time.time() if recv_ts is None else recv_ts, raw))
+        self.frames += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending frames and close the current file."""
+        t = self._thread
+        if t is None:
+            return
+        self._q.put(_STOP)
+        t.join(timeout)
+        self._thread = None
+
+    # --- writer thread
+    def _start(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._writer, name=f"ws-recorder-{self.source}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)  # flush the compressed tail on interpreter exit
+
+    def _new_path(self) -> Path:
+        self._seq += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+        return self.directory / f"ws-{self.source}-{stamp}-{self._seq:04d}{_SUFFIX[self.compression]}"
+
+    def _writer(self) -> None:
+        fh: IO[bytes] | None = None
+        written = 0
+        src = self.source
+        try:
+            while True:
+                item = self._q.get()
+                if item is _STOP:
+                    break
+                t, raw = item
+                line = (json.dumps({"t": t, "s": src, "raw": raw}, ensure_ascii=False) + "\n").encode("utf-8")
+                try:
+                    if fh is None or written >= self.max_bytes:
+                        if fh is not None:
+                            fh.close()
+                        fh = _open_write(self._new_path(), self.compression)
+                        written = 0
+                        self._prune()
+                    fh.write(line)
+                    written += len(line)
+                except OSError as e:
+                    self.dropped += 1
+                    logger.bind(tag="WSREC").warning("WS recorder write failed: {!r}", e)
+        finally:
+            if fh is not None:
+                fh.close()
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob(f"ws-{self.source}-*.jsonl*"))
+        for old in files[: max(0, len(files) - self.max_files)]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def recorded_files(paths: Iterable[str | os.PathLike[str]]) -> list[Path]:
+    """Expand directories into their ws-*.jsonl* files; keep explicit files as given."""
+    out: list[Path] = []
+    for p in paths:
+        path = Path(p)
+        if path.is_dir():
+            out.extend(sorted(path.glob("ws-*.jsonl*")))
+        else:
+            out.append(path)
+    return out
+
+
+def _iter_file(path: Path) -> Iterator[tuple[float, str, str]]:
+    with _open_read(path) as fh:
+        lines = io.TextIOWrapper(fh, encoding="utf-8")
+        while True:
+            try:
+                line = lines.readline()
+            except (EOFError, OSError) as e:
+                # file of a process that died mid-write: keep what was readable
+                logger.bind(tag="WSREC").warning("{}: truncated recording ({!r})", path, e)
+                return
+            if not line:
+                return
+            try:
+                rec = json.loads(line)
+                yield float(rec["t"]), str(rec.get("s") or ""), str(rec["raw"])
+            except (ValueError, KeyError, TypeError):
+                continue  # partial last line
+
+
+def iter_frames(paths: Iterable[str | os.PathLike[str]]) -> Iterator[tuple[float, str, str]]:
+    """
+    Yield (recv_ts, source, raw) from recorded files, merged across files and
+    sources in receive-time order (each file is already time-ordered).
+    """
+    files = recorded_files(paths)
+    yield from heapq.merge(*(_iter_file(f) for f in files), key=lambda r: r[0])
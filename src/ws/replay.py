@@ -0,0 +1,160 @@
+# src/ws/replay.py
+# English-only comments per project rules.
+"""
+Deterministic replay of recorded WS frames (see src/ws/recorder.py) through the
+same ingest path as `ws:run`:
+
+    raw frame -> normalize -> WSMultiplexer -> QuoteCache / AlertsSubscriber
+
+Speed:
+    speed=None/0 -> as fast as possible (throughput benchmark)
+    speed=1      -> original pacing (receive timestamps)
+    speed=N      -> N times faster than recorded
+
+QuoteCache updates use the recorded receive time, so cache state after a replay
+is reproducible. Alerts are captured in memory instead of being sent.
+
+CLI:
+    python -m src.main ws:replay data/ws_rec --speed 10 --alerts
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from src.core.cache import QuoteCache
+from src.exchanges.bybit.ws import iter_ticker_entries
+from src.ws.bridge import publish_bybit_ticker
+from src.ws.multiplexer import WsEvent, WSMultiplexer
+from src.ws.normalizers.bybit_v5 import normalize
+
+__all__ = ["ReplayPipeline", "ReplayStats", "replay"]
+
+
+@dataclass
+class ReplayStats:
+    frames: int = 0
+    data_frames: int = 0  # frames with a topic (acks/pongs excluded)
+    bad_frames: int = 0
+    elapsed_sec: float = 0.0
+    recorded_span_sec: float = 0.0
+    alerts: int = 0
+    symbols: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        fps = self.frames / self.elapsed_sec if self.elapsed_sec > 0 else 0.0
+        return {
+            "frames": self.frames,
+            "data_frames": self.data_frames,
+            "bad_frames": self.bad_frames,
+            "elapsed_sec": round(self.elapsed_sec, 6),
+            "recorded_span_sec": round(self.recorded_span_sec, 3),
+            "frames_per_sec": round(fps, 1),
+            "alerts": self.alerts,
+            "symbols": self.symbols,
+        }
+
+
+class ReplayPipeline:
+    """The ws:run ingest path without sockets: feed() one raw frame at a time."""
+
+    def __init__(
+        self,
+        *,
+        mux: WSMultiplexer | None = None,
+        cache: QuoteCache | None = None,
+        alerts: bool = False,
+        settings: Any = None,
+    ) -> None:
+        self.mux = mux or WSMultiplexer(name="replay")
+        self.cache = cache or QuoteCache()
+        self.alerts_sent: list[str] = []
+        self.alerts_subscriber = None
+        if alerts:
+            from src.ws.subscribers.alerts_subscriber import AlertsSubscriber
+
+            async def _capture(text: str) -> None:
+                self.alerts_sent.append(text)
+
+            self.alerts_subscriber = AlertsSubscriber(self.mux, settings, send_async=_capture)
+            self.alerts_subscriber.start()
+        self.stats = ReplayStats()
+
+    async def feed(self, source: str, raw: str, recv_ts: float) -> None:
+        self.stats.frames += 1
+        try:
+            msg = json.loads(raw)
+        except ValueError:
+            self.stats.bad_frames += 1
+            return
+        if not isinstance(msg, dict) or not msg.get("topic"):
+            return  # subscribe acks, pongs
+        self.stats.data_frames += 1
+
+        evt_norm = normalize(msg)
+        ts_ms = evt_norm.get("ts_ms") or 0
+        self.mux.publish(
+            WsEvent(
+                source=source,
+                channel=str(evt_norm.get("channel") or "other"),
+                symbol=str(evt_norm.get("symbol") or ""),
+                payload=evt_norm.get("data") or {},
+                ts=ts_ms,
+            )
+        )
+
+        for item in iter_ticker_entries(msg):
+            sym = item.get("symbol")
+            if not sym:
+                continue
+            if source == "SPOT" and item.get("last") is not None:
+                await self.cache.update(sym, spot=item["last"], ts=recv_ts)
+            elif source == "LINEAR" and item.get("mark") is not None:
+                await self.cache.update(sym, linear_mark=item["mark"], ts=recv_ts)
+            else:
+                continue
+            publish_bybit_ticker(self.mux, source, item, ts=ts_ms / 1000.0 if ts_ms else None)
+
+    def close(self) -> None:
+        if self.alerts_subscriber is not None:
+            self.alerts_subscriber.stop()
+
+
+async def replay(
+    frames: Iterable[tuple[float, str, str]],
+    pipeline: ReplayPipeline | None = None,
+    *,
+    speed: float | None = None,
+    limit: int | None = None,
+) -> ReplayStats:
+    """Feed (recv_ts, source, raw) frames into the pipeline; returns stats."""
+    pipe = pipeline or ReplayPipeline()
+    paced = bool(speed and speed > 0)
+    first_ts: float | None = None
+    last_ts = 0.0
+    t0 = time.perf_counter()
+    n = 0
+    for recv_ts, source, raw in frames:
+        if limit is not None and n >= limit:
+            break
+        n += 1
+        if first_ts is None:
+            first_ts = recv_ts
+        last_ts = recv_ts
+        if paced:
+            due = (recv_ts - first_ts) / float(speed) - (time.perf_counter() - t0)  # type: ignore[arg-type]
+            if due > 0:
+                await asyncio.sleep(due)
+        await pipe.feed(source, raw, recv_ts)
+    await asyncio.sleep(0)  # let alert send tasks run
+    stats = pipe.stats
+    stats.elapsed_sec = time.perf_counter() - t0
+    stats.recorded_span_sec = (last_ts - first_ts) if first_ts is not None else 0.0
+    stats.alerts = len(pipe.alerts_sent)
+    stats.symbols = len(await pipe.cache.snapshot())
+    return stats
@@ -9,8 +9,13 @@ from typing import Any, Callable
 
 from loguru import logger
 
+from src.core.exec_basis import LONG_SPOT, SHORT_SPOT, ExecBasis, executable_basis
+from src.core.filters.depth import has_enough_depth
+from src.core.orderbook import OrderBookStore
 from src.infra.config import AppSettings, load_settings
 from src.telegram.sender import TelegramSender
+from src.ws.health import MetricsRegistry
+from src.ws.histogram import lag_ms_since
 from src.ws.multiplexer import WsEvent, WSMultiplexer
 
 
@@ -46,9 +51,12 @@ class AlertsSubscriber:
         settings: AppSettings | None = None,
         *,
         send_async: Callable[[str], Awaitable[None]] | None = None,
+        books: OrderBookStore | None = None,
     ) -> None:
         self._mux = mux
         self._s = settings or load_settings()
+        # Локальні L2-книги з WS: depth-фільтр без REST (як у selector, вмикається параметрами depth_*)
+        self._books = books
 
         # Runtime state
         self._last_spot: dict[str, float] = {}
@@ -62,6 +70,16 @@ class AlertsSubscriber:
         self._min_price: float = float(self._s.min_price)
         self._allow: set[str] = _upper_set(getattr(self._s, "allow_symbols_list", []))
         self._deny: set[str] = _upper_set(getattr(self._s, "deny_symbols_list", []))
+        depth = (
+            getattr(self._s, "min_depth_usd", None),
+            getattr(self._s, "depth_window_pct", None),
+            getattr(self._s, "min_depth_levels", None),
+        )
+        self._depth: tuple[float, float, int] | None = (
+            (float(depth[0]), float(depth[1]), int(depth[2])) if None not in depth else None  # type: ignore[arg-type]
+        )
+        # Виконуваний basis на розмір угоди (exec_basis_size_usd > 0 і є локальні книги)
+        self._exec_size: float = max(0.0, float(getattr(self._s, "exec_basis_size_usd", 0.0) or 0.0))
 
         # Async sender (тип чітко фіксований як Awaitable[None])
         self._send_async: Callable[[str], Awaitable[None]]
@@ -86,6 +104,7 @@ class AlertsSubscriber:
 
         # Unsubscribe callbacks
         self._unsubs: list[Callable[[], None]] = []
+        self._metrics = MetricsRegistry.get()
 
     # --------------------------- Public API ---------------------------
 
@@ -98,6 +117,10 @@ class AlertsSubscriber:
                 self._handle_evt(evt)
             except Exception as e:  # noqa: BLE001
                 logger.exception("AlertsSubscriber handler failed: {}", e)
+            # e2e: Bybit message ts -> alert decision (send / skip)
+            lag = lag_ms_since(evt.ts)
+            if lag is not None:
+                self._metrics.observe_latency("e2e", lag, source=evt.source, channel=evt.channel)
 
         self._unsubs.append(self._mux.subscribe(handler=_on_evt, source="SPOT", channel="tickers", symbol="*"))
         self._unsubs.append(self._mux.subscribe(handler=_on_evt, source="LINEAR", channel="tickers", symbol="*"))
@@ -168,6 +191,13 @@ class AlertsSubscriber:
         if math.isnan(basis_pct) or abs(basis_pct) < self._threshold:
             return
 
+        if not self._depth_ok(sym, sp, mk):
+            return
+
+        exec_b = self._exec_basis(sym, basis_pct)
+        if exec_b is not None and (not exec_b.complete or exec_b.edge_pct < self._threshold):
+            return  # розмір не заповнюється або прослизання з'їдає basis
+
         # cooldown
         now = time.time()
         last_ts = self._last_sent_ts.get(sym, 0.0)
@@ -179,18 +209,47 @@ class AlertsSubscriber:
         # Надсилання: якщо є активний loop — створюємо таску; інакше — тимчасовий run
         try:
             loop = asyncio.get_running_loop()
-            loop.create_task(self._send(sym, basis_pct))
+            loop.create_task(self._send(sym, basis_pct, exec_b))
         except RuntimeError:
-            asyncio.run(self._send(sym, basis_pct))
+            asyncio.run(self._send(sym, basis_pct, exec_b))
+
+    def _depth_ok(self, sym: str, spot: float, mark: float) -> bool:
+        """Depth-фільтр по локальних книгах; немає книги (ще не готова) — не блокуємо алерт."""
+        if self._books is None or self._depth is None:
+            return True
+        min_usd, window_pct, min_levels = self._depth
+        for category, mid in (("spot", spot), ("linear", mark)):
+            book = self._books.get(category, sym)
+            if book is not None and not has_enough_depth(
+                book, mid, min_depth_usd=min_usd, window_pct=window_pct, min_levels=min_levels
+            ):
+                return False
+        return True
+
+    def _exec_basis(self, sym: str, basis_pct: float) -> ExecBasis | None:
+        """VWAP-basis по локальних книгах у напрямку mark-basis; None — вимкнено або книги ще не готові."""
+        if self._books is None or self._exec_size <= 0:
+            return None
+        spot_book = self._books.get("spot", sym)
+        linear_book = self._books.get("linear", sym)
+        if spot_book is None or linear_book is None:
+            return None
+        direction = LONG_SPOT if basis_pct >= 0 else SHORT_SPOT
+        return executable_basis(spot_book, linear_book, self._exec_size, direction=direction, symbol=sym)
 
-    async def _send(self, sym: str, basis_pct: float) -> None:
+    async def _send(self, sym: str, basis_pct: float, exec_b: ExecBasis | None = None) -> None:
         sign = "+" if basis_pct >= 0 else ""
-        text = "\n".join(
-            [
-                "*RT Arbitrage Alert*",
-                f"{sym}: basis={sign}{basis_pct:.2f}%",
-            ]
-        )
+        lines = [
+            "*RT Arbitrage Alert*",
+            f"{sym}: basis={sign}{basis_pct:.2f}%",
+        ]
+        if exec_b is not None:
+            esign = "+" if exec_b.basis_pct >= 0 else ""
+            lines.append(
+                f"exec ${exec_b.size_usd:,.0f}: basis={esign}{exec_b.basis_pct:.2f}% "
+                f"slippage={exec_b.slippage_pct:.2f}%"
+            )
+        text = "\n".join(lines)
         try:
             await self._send_async(text)
             logger.success("AlertsSubscriber: alert sent for {}", sym)
@@ -0,0 +1,110 @@
+# tests/bybit/test_http_coalesce.py
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from exchanges.bybit._http import HTTPClient
+
+
+class _Resp:
+    status_code = 200
+
+    def __init__(self, payload: dict[str, Any]):
+        self._payload = payload
+
+    def json(self) -> dict[str, Any]:
+        return self._payload
+
+
+class _SlowClient:
+    """Рахує реальні запити; кожен "летить" доти, доки тест не відпустить gate."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict[str, Any] | None]] = []
+        self.gate = asyncio.Event()
+
+    async def request(self, method: str, path: str, params=None, json=None, headers=None) -> _Resp:
+        self.calls.append((path, params))
+        await self.gate.wait()
+        return _Resp({"retCode": 0, "result": {"n": len(self.calls)}})
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_gets_share_one_request():
+    fake = _SlowClient()
+    http = HTTPClient("http://fake", client=fake)
+
+    waiters = [asyncio.create_task(http.get("/v5/market/tickers", params={"category": "spot"})) for _ in range(5)]
+    other = asyncio.create_task(http.get("/v5/market/tickers", params={"category": "linear"}))
+    await asyncio.sleep(0)
+    fake.gate.set()
+    results = await asyncio.gather(*waiters, other)
+
+    assert len(fake.calls) == 2
+    assert all(r == results[0] for r in results[:5])
+
+
+@pytest.mark.asyncio
+async def test_shared_and_cached_responses_are_per_caller_copies():
+    fake = _SlowClient()
+    http = HTTPClient("http://fake", client=fake, cache_ttl=5.0, clock=_Clock())
+
+    a = asyncio.create_task(http.get("/v5/market/tickers", params={"category": "spot"}))
+    b = asyncio.create_task(http.get("/v5/market/tickers", params={"category": "spot"}))
+    await asyncio.sleep(0)
+    fake.gate.set()
+    ra, rb = await asyncio.gather(a, b)
+    ra["result"]["n"] = 99  # один викликач мутує свою відповідь
+
+    rc = await http.get("/v5/market/tickers", params={"category": "spot"})  # з кешу
+    assert len(fake.calls) == 1
+    assert rb["result"]["n"] == 1 and rc["result"]["n"] == 1
+    rc["result"].clear()
+    assert (await http.get("/v5/market/tickers", params={"category": "spot"}))["result"] == {"n": 1}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_request():
+    fake = _SlowClient()
+    http = HTTPClient("http://fake", client=fake)
+
+    first = asyncio.create_task(http.get("/v5/market/orderbook", params={"symbol": "BTCUSDT"}))
+    second = asyncio.create_task(http.get("/v5/market/orderbook", params={"symbol": "BTCUSDT"}))
+    await asyncio.sleep(0)
+    first.cancel()
+    fake.gate.set()
+
+    data = await second
+    assert data["result"]["n"] == 1
+    assert len(fake.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_micro_ttl_cache_and_signed_bypass():
+    fake = _SlowClient()
+    fake.gate.set()
+    clock = _Clock()
+    http = HTTPClient("http://fake", client=fake, cache_ttl=0.5, clock=clock)
+
+    await http.get("/v5/market/tickers", params={"category": "spot"})
+    await http.get("/v5/market/tickers", params={"category": "spot"})
+    assert len(fake.calls) == 1
+
+    # Власні headers (підписані GET) — завжди окремий запит
+    await http.get("/v5/market/tickers", params={"category": "spot"}, headers={"X": "1"})
+    assert len(fake.calls) == 2
+
+    clock.now += 1.0
+    await http.get("/v5/market/tickers", params={"category": "spot"})
+    assert len(fake.calls) == 3
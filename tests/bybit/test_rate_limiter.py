@@ -0,0 +1,126 @@
+# tests/bybit/test_rate_limiter.py
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from exchanges.bybit._http import HTTPClient
+from exchanges.bybit.rate_limiter import (
+    AsyncTokenBucket,
+    LimiterRegistry,
+    group_for_path,
+    parse_limit_headers,
+)
+
+
+class _Clock:
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_reserve_does_not_serialize_waiters():
+    clock = _Clock()
+    bucket = AsyncTokenBucket(rate_per_sec=10, burst=2, clock=clock)
+
+    # Два токени з burst — без очікування, далі кожен наступний у своїй черзі в часі
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve(2) == pytest.approx(0.3)  # зважений запит
+
+
+@pytest.mark.asyncio
+async def test_concurrent_acquire_waits_in_parallel():
+    bucket = AsyncTokenBucket(rate_per_sec=20, burst=1)
+    t0 = time.monotonic()
+    await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+    # 4 очікування по 50 мс: паралельно ~0.2 с; під локом зі sleep було б довше
+    assert time.monotonic() - t0 < 0.35
+
+
+def test_reserve_is_atomic_across_threads():
+    clock = _Clock()
+    bucket = AsyncTokenBucket(rate_per_sec=1, burst=0, clock=clock)  # frozen clock: no refill
+    waits: list[float] = []
+
+    def worker() -> None:
+        waits.extend(bucket.reserve() for _ in range(500))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible to expose races
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    # each reservation got its own slot in time: no lost updates of the balance
+    assert sorted(waits) == [float(i) for i in range(1, 4001)]
+
+
+def test_server_headers_clamp_and_pause():
+    clock = _Clock(100.0)
+    wall = _Clock(1_000.0)
+    bucket = AsyncTokenBucket(rate_per_sec=10, burst=10, clock=clock, wall_clock=wall)
+
+    bucket.sync_remaining(3)
+    assert bucket.reserve(3) == 0.0
+    assert bucket.reserve() > 0.0
+
+    bucket.sync_remaining(0, reset_at=1_002.0)
+    assert bucket.reserve() >= 2.0
+
+
+def test_parse_headers_and_groups():
+    hdrs = {"X-Bapi-Limit-Status": "7", "X-Bapi-Limit-Reset-Timestamp": "1700000000123"}
+    assert parse_limit_headers(hdrs) == (7.0, 1_700_000_000.123)
+    assert parse_limit_headers({}) is None
+
+    assert group_for_path("/v5/market/tickers") == "market"
+    assert group_for_path("/v5/order/create") == "order"
+    assert group_for_path("/v5/account/wallet-balance") == "account"
+
+
+class _Resp:
+    status_code = 200
+
+    def __init__(self, headers: dict[str, str]):
+        self.headers = headers
+
+    def json(self) -> dict[str, Any]:
+        return {"retCode": 0, "result": {}}
+
+
+class _HeaderClient:
+    async def request(self, method: str, path: str, params=None, json=None, headers=None) -> _Resp:
+        return _Resp({"X-Bapi-Limit-Status": "0", "X-Bapi-Limit-Reset-Timestamp": str(int(time.time() * 1000) + 5000)})
+
+
+@pytest.mark.asyncio
+async def test_http_client_uses_group_bucket_and_weights():
+    reg = LimiterRegistry({"market": (10.0, 10), "order": (10.0, 20)}, costs={"/v5/order/create-batch": 5})
+    http = HTTPClient("http://fake", client=_HeaderClient(), limiter=reg, coalesce=False)
+
+    await http.post("/v5/order/create-batch", json={})
+    # вага 5 списана з "order", а сервер повідомив remaining=0 -> пауза до reset
+    assert reg.bucket("order").reserve() >= 4.0
+    assert reg.bucket("market").reserve() == 0.0
+
+
+def test_registry_from_env(monkeypatch):
+    monkeypatch.setenv("BYBIT_RATE_LIMIT_MARKET_RPS", "80")
+    reg = LimiterRegistry.from_env()
+    assert reg.bucket("market").rate == 80.0
+    with pytest.raises(KeyError):
+        reg.bucket("nope")
@@ -0,0 +1,53 @@
+import json
+
+from bench.bench_pipeline import main, run, synthetic_frames
+from bench.compare import compare
+from src.ws.recorder import FrameRecorder
+
+
+def test_run_covers_all_stages_on_synthetic_payloads():
+    res = run(events=300, symbols=20, repeat=1, db_writes=5)
+    stages = res["results"]
+    for name in (
+        "iter_ticker_entries",
+        "normalize",
+        "mux_publish_s1",
+        "mux_publish_s32",
+        "cache_update",
+        "cache_candidates",
+        "alert_gate_should_send",
+        "persistence_save_quote",
+    ):
+        assert stages[name]["ops_per_sec"] > 0, name
+    assert res["meta"]["payloads"] == "synthetic"
+    assert stages["cache_candidates"]["symbols"] == 20
+
+
+def test_recorded_payloads(tmp_path):
+    rec = FrameRecorder(tmp_path, source="SPOT")
+    for source, msg in synthetic_frames(5):
+        if source == "SPOT":
+            rec.record(json.dumps(msg), recv_ts=1.0)
+    rec.close()
+    res = run(events=50, repeat=1, recorded=[str(tmp_path)], db_writes=0)
+    assert res["meta"]["payloads"] == "recorded"
+    assert res["meta"]["symbols"] == 5
+    assert "persistence_save_quote" not in res["results"]
+
+
+def test_compare_flags_drops_beyond_tolerance():
+    base = {"results": {"a": {"ops_per_sec": 1000.0}, "b": {"ops_per_sec": 1000.0}, "gone": {"ops_per_sec": 1.0}}}
+    cur = {"results": {"a": {"ops_per_sec": 850.0}, "b": {"ops_per_sec": 700.0}, "new": {"ops_per_sec": 1.0}}}
+    status = {r["name"]: r["status"] for r in compare(base, cur, tolerance=0.2)}
+    assert status == {"a": "ok", "b": "regression", "gone": "missing", "new": "new"}
+
+
+def test_cli_exit_code_against_baseline(tmp_path, capsys):
+    baseline = tmp_path / "base.json"
+    args = ["--events", "100", "--symbols", "5", "--repeat", "1", "--db-writes", "0"]
+    assert main([*args, "--out", str(baseline)]) == 0
+    doc = json.loads(baseline.read_text(encoding="utf-8"))
+    doc["results"]["normalize"]["ops_per_sec"] *= 1000  # pretend the baseline was much faster
+    baseline.write_text(json.dumps(doc), encoding="utf-8")
+    assert main([*args, "--baseline", str(baseline)]) == 1
+    assert "regression" in capsys.readouterr().err
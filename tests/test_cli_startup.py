@@ -0,0 +1,80 @@
+import os
+import sys
+
+import pytest
+
+import src.main as m
+from bench.bench_cli_startup import imported_modules, parse_importtime
+
+HEAVY = {"requests", "loguru", "pydantic", "pydantic_settings", "sqlite3", "httpx", "numpy", "asyncio"}
+
+
+@pytest.mark.parametrize("cmd", [["version"], ["env"], ["basis:alert", "--help"]])
+def test_light_commands_skip_heavy_imports(cmd):
+    env = {k: v for k, v in os.environ.items() if not k.startswith("COV_CORE_")}  # pytest-cov imports sqlite3
+    mods = imported_modules(["-m", "src.main", *cmd], env=env)
+    assert "argparse" in mods  # the run itself worked
+    assert not (mods & HEAVY), sorted(mods & HEAVY)
+    assert not {n for n in mods if n.startswith(("src.exchanges", "src.storage", "src.ws", "src.core"))}
+
+
+def test_parse_importtime_keeps_top_level_only():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   _json\n"
+        "import time:       200 |        300 | json\n"
+        "import time:        50 |         50 | argparse\n"
+        "noise\n"
+    )
+    assert parse_importtime(stderr) == {"json": 300, "argparse": 50}
+
+
+def _run_main(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["bybit-arb-bot", *argv])
+    with pytest.raises(SystemExit) as exc:
+        m.main()
+    return exc.value.code
+
+
+def test_db_init_only_for_db_commands(monkeypatch, tmp_path, capsys):
+    calls: list[str] = []
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "signals.db"))
+    monkeypatch.setattr(m, "init_db", lambda: calls.append("init_db"))
+    monkeypatch.setattr(m, "setup_logging", lambda *a, **k: calls.append("logging"))
+
+    assert _run_main(monkeypatch, "version") == 0
+    assert capsys.readouterr().out.strip() == m.APP_VERSION
+    assert calls == []  # no logging setup, no SQLite
+
+    monkeypatch.setattr(m, "get_top_signals", lambda **kw: [])
+    monkeypatch.setattr(m, "format_report", lambda items: "empty report")
+    assert _run_main(monkeypatch, "report:print", "--limit", "1") == 0
+    assert calls == ["logging", "init_db"] and "empty report" in capsys.readouterr().out
+
+
+def test_dotenv_loaded_before_logging_and_dispatch(monkeypatch, tmp_path, capsys):
+    health = tmp_path / "ws_health.json"
+    env_file = tmp_path / ".env"
+    env_file.write_text(f"LOG_LEVEL=WARNING\nWS_HEALTH_FILE={health}\n", encoding="utf-8")
+    monkeypatch.setenv("ENV_FILE", str(env_file))
+    for key in ("LOG_LEVEL", "WS_HEALTH_FILE"):
+        monkeypatch.setenv(key, "")  # restored (removed) after the test ...
+        monkeypatch.delenv(key)  # ... but only .env provides it during the run
+    levels: list[str] = []
+    monkeypatch.setattr(m, "setup_logging", lambda *a, level=None, **k: levels.append(level))
+
+    assert _run_main(monkeypatch, "ws:health") == 0  # no-DB command, no settings load
+    assert levels == ["WARNING"]
+    assert os.environ["WS_HEALTH_FILE"] == str(health)
+    assert '"source": "local"' in capsys.readouterr().out
+
+
+def test_lazy_attributes():
+    from src.ws.eventloop import LOOP_CHOICES
+    from src.ws.health import MetricsRegistry
+
+    assert m.LOOP_CHOICES == LOOP_CHOICES
+    assert m.METRICS is MetricsRegistry.get()
+    assert m._lazy("_tg_formatters") is not None
+    with pytest.raises(AttributeError):
+        m.no_such_attribute  # noqa: B018
@@ -75,3 +75,59 @@ def test_handles_alt_format_keys():
     ob = {"bids": [[99.9, 100]], "asks": [[100.1, 200]]}
     bid_usd, ask_usd, levels = calc_window_depth_usd(ob, 100.0, 0.5)
     assert bid_usd > 0 and ask_usd > 0 and levels == 2
+
+
+def test_depth_profile_matches_python_for_several_windows():
+    """
+    Векторизований DepthProfile дає ті самі (bid_usd, ask_usd, levels), що й calc_window_depth_usd,
+    зокрема на межах вікна та для неупорядкованих рівнів.
+    """
+    import random
+
+    from src.core.filters.depth import window_depths_usd
+
+    rnd = random.Random(3)
+    windows = [0.05, 0.5, 1.0, 2.5]
+    for _ in range(50):
+        mp = rnd.uniform(0.5, 500)
+        tick = mp * 0.001
+        bids = [(round(mp - tick * k, 8), rnd.uniform(0, 20)) for k in range(rnd.randint(0, 40))]
+        asks = [(round(mp + tick * k, 8), rnd.uniform(0, 20)) for k in range(rnd.randint(0, 40))]
+        rnd.shuffle(bids)
+        ob = _mk_book(bids, asks)
+        for w, (b, a, n) in zip(windows, window_depths_usd(ob, mp, windows)):
+            rb, ra, rn = calc_window_depth_usd(ob, mp, w)
+            assert n == rn
+            assert abs(b - rb) <= 1e-9 * max(1.0, rb) and abs(a - ra) <= 1e-9 * max(1.0, ra)
+
+
+def test_depth_profile_formats_and_has_enough_depth():
+    from src.core.filters.depth import DepthProfile, depth_table
+
+    ob = {"retCode": 0, "result": {"b": [["9.96", "1000"], ["bad"], ["9.9", "x"]], "a": [["10.01", "1000"]]}}
+    prof = DepthProfile.from_orderbook(ob)
+    assert list(prof.bid_px) == [9.96, 9.9] and list(prof.bid_cum_qty) == [0.0, 1000.0, 1000.0]
+    assert prof.has_enough_depth(10.0, min_depth_usd=1_000, window_pct=0.5, min_levels=2) is True
+    assert prof.has_enough_depth(10.0, min_depth_usd=1_000, window_pct=0.5, min_levels=3) is False
+    assert prof.window_depth_usd(0.0, [1.0]).tolist() == [[0.0, 0.0, 0.0]]
+
+    empty = DepthProfile.from_orderbook({"b": [], "a": []})
+    assert empty.window_depth_usd(10.0, [1.0, 5.0]).tolist() == [[0.0, 0.0, 0.0]] * 2
+
+    table = depth_table({"A": ob, "B": prof, "C": ob}, {"A": 10.0, "B": 10.0}, [0.5])
+    assert set(table) == {"A", "B"} and table["A"].tolist() == table["B"].tolist()
+
+
+def test_profile_for_l2book_is_cached_until_book_changes():
+    from src.core.filters.depth import profile_for_book, window_depths_usd
+    from src.core.orderbook import L2Book
+
+    book = L2Book("spot", "AAAUSDT", 50)
+    book.load_snapshot([["99.8", "10"], ["99.4", "10"]], [["100.1", "5"]], u=1)
+    prof = profile_for_book(book)
+    assert profile_for_book(book) is prof
+    assert window_depths_usd(book, 100.0, [0.5]) == [calc_window_depth_usd(book, 100.0, 0.5)]
+
+    book.apply_delta([["99.8", "0"]], [], u=2)
+    assert profile_for_book(book) is not prof
+    assert window_depths_usd(book, 100.0, [0.5])[0][2] == 1
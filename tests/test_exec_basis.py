@@ -0,0 +1,117 @@
+"""
+Виконуваний basis (src/core/exec_basis.py): прохід по книгах, часткове заповнення, інтеграції.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src import main as m
+from src.core.exec_basis import LONG_SPOT, SHORT_SPOT, executable_basis, executable_basis_many
+from src.core.orderbook import OrderBookStore
+from src.ws.multiplexer import WsEvent, WSMultiplexer
+from src.ws.subscribers.alerts_subscriber import AlertsSubscriber
+
+SPOT = {"b": [["99", "3"], ["98", "10"]], "a": [["100", "1"], ["101", "2"], ["102", "10"]]}
+LINEAR = {"b": [["103", "1.5"], ["102", "5"]], "a": [["104", "2"], ["105", "10"]]}
+
+
+def test_long_spot_walks_spot_asks_and_linear_bids():
+    res = executable_basis(SPOT, {"retCode": 0, "result": LINEAR}, 250.0, symbol="X")
+    assert res is not None and res.direction == LONG_SPOT and res.complete
+    qty = 1 + 150 / 101  # 100$ on the first ask, the rest at 101
+    assert res.qty == pytest.approx(qty)
+    assert res.spot_usd == pytest.approx(250.0)
+    assert res.linear_usd == pytest.approx(1.5 * 103 + (qty - 1.5) * 102)
+    assert res.spot_vwap == pytest.approx(250.0 / qty)
+    assert res.basis_pct == pytest.approx((res.linear_vwap - res.spot_vwap) / res.spot_vwap * 100)
+    assert res.mid_basis_pct == pytest.approx((103.5 - 99.5) / 99.5 * 100)
+    assert res.slippage_pct == pytest.approx(res.mid_basis_pct - res.basis_pct) and res.slippage_pct > 0
+    assert res.edge_pct == res.basis_pct
+
+
+def test_short_spot_and_partial_fill():
+    res = executable_basis(SPOT, LINEAR, 99.0 * 3 + 98.0 * 2, direction=SHORT_SPOT)
+    assert res is not None and res.complete
+    assert res.qty == pytest.approx(5.0)
+    assert res.spot_vwap == pytest.approx((99 * 3 + 98 * 2) / 5)
+    assert res.linear_vwap == pytest.approx((104 * 2 + 105 * 3) / 5)  # buys linear asks
+    assert res.edge_pct == -res.basis_pct
+
+    # linear bids hold 6.5 in total: the hedge caps the fill below the requested size
+    big = executable_basis(SPOT, LINEAR, 1_000_000.0, direction=LONG_SPOT)
+    assert big is not None and not big.complete
+    assert big.qty == pytest.approx(6.5) and 0 < big.fill_ratio < 1
+
+    assert executable_basis({"b": [], "a": []}, LINEAR, 100.0) is None
+    assert executable_basis({"b": [["99", "1"]], "a": []}, LINEAR, 100.0, direction=LONG_SPOT) is None
+    with pytest.raises(ValueError):
+        executable_basis(SPOT, LINEAR, 100.0, direction="sideways")
+
+
+def _snap(sym, ob, u=1):
+    return {"topic": f"orderbook.50.{sym}", "type": "snapshot", "ts": 0, "data": {"s": sym, "u": u, **ob}}
+
+
+def test_many_from_store_and_mapping():
+    store = OrderBookStore()
+    for sym in ("AUSDT", "BUSDT"):
+        store.apply(_snap(sym, SPOT), "spot")
+        store.apply(_snap(sym, LINEAR), "linear")
+    store.apply(_snap("CUSDT", SPOT), "spot")  # no linear book -> skipped
+
+    res = executable_basis_many(store, ["AUSDT", "BUSDT", "CUSDT"], 250.0)
+    assert sorted(res) == ["AUSDT", "BUSDT"]
+    single = executable_basis(SPOT, LINEAR, 250.0)
+    assert res["AUSDT"].basis_pct == pytest.approx(single.basis_pct)
+
+    res2 = executable_basis_many({"AUSDT": (SPOT, LINEAR)}, None, 250.0, directions={"AUSDT": SHORT_SPOT})
+    assert res2["AUSDT"].direction == SHORT_SPOT
+
+
+def test_alerts_subscriber_uses_executable_basis():
+    store = OrderBookStore()
+    thin_linear = {"b": [["100.6", "0.1"], ["99", "100"]], "a": [["101", "100"]]}
+    for sym, linear in (("THINUSDT", thin_linear), ("DEEPUSDT", LINEAR)):
+        store.apply(_snap(sym, SPOT), "spot")
+        store.apply(_snap(sym, linear), "linear")
+    out: list[str] = []
+
+    async def fake_send(text: str) -> None:
+        out.append(text)
+
+    s = SimpleNamespace(
+        enable_alerts=True, alert_threshold_pct=0.5, alert_cooldown_sec=0, min_price=0.0001, exec_basis_size_usd=250.0
+    )
+    mux = WSMultiplexer()
+    sub = AlertsSubscriber(mux, s, send_async=fake_send, books=store)
+    sub.start()
+    for sym in ("THINUSDT", "DEEPUSDT"):  # both look like +1% on last/mark
+        mux.publish(WsEvent(source="SPOT", channel="tickers", symbol=sym, payload={"last": 100.0}, ts=0))
+        mux.publish(WsEvent(source="LINEAR", channel="tickers", symbol=sym, payload={"mark": 101.0}, ts=0))
+    asyncio.run(asyncio.sleep(0.05))
+    sub.stop()
+    assert len(out) == 1 and "DEEPUSDT" in out[0] and "exec $250" in out[0]
+
+
+def test_basis_scan_size_usd(monkeypatch, capsys):
+    class FakeRest:
+        def get_spot_map(self):
+            return {"ETHUSDT": {"price": 100.0, "turnover_usd": 20_000_000.0}}
+
+        def get_linear_map(self):
+            return {"ETHUSDT": {"price": 103.0, "turnover_usd": 25_000_000.0}}
+
+        def get_orderbook_spot(self, symbol, limit=None):
+            return {"retCode": 0, "result": SPOT}
+
+        def get_orderbook_linear(self, symbol, limit=None):
+            return {"retCode": 0, "result": LINEAR}
+
+    monkeypatch.setattr(m, "BybitRest", FakeRest)
+    monkeypatch.setattr(m, "load_settings", lambda: SimpleNamespace(min_vol_24h_usd=1.0, alert_threshold_pct=1.0))
+    assert m.cmd_basis_scan(SimpleNamespace(limit=5, threshold=None, min_vol=None, size_usd=250.0)) == 0
+    out = capsys.readouterr().out
+    expected = executable_basis(SPOT, LINEAR, 250.0)
+    assert "Executable basis for $250" in out and f"exec=+{expected.basis_pct:.2f}%" in out
@@ -6,6 +6,8 @@ from datetime import datetime, timedelta, timezone
 from importlib import reload
 from pathlib import Path
 
+import pytest
+
 from scripts import export_signals
 from src.storage import persistence as _persistence
 
@@ -118,3 +120,105 @@ def test_export_last_24h(tmp_path, monkeypatch):
     syms = {r[1] for r in rows[1:]}
 
     assert syms == {"ETHUSDT", "BTCUSDT"}
+
+
+def _seed_quotes(db_path: Path, n: int, now: datetime) -> None:
+    con = sqlite3.connect(str(db_path))
+
+    con.executemany(
+        "INSERT INTO quotes(symbol, timestamp, spot_price, futures_price, basis_pct, volume_24h_usd)"
+        " VALUES(?, ?, ?, ?, ?, ?)",
+        (
+            (f"S{i % 50}USDT", (now - timedelta(seconds=i)).isoformat(), 100.0 + i, None if i == 0 else 101.0, 1.0, 2e7)
+            for i in range(n)
+        ),
+    )
+
+    con.commit()
+
+    con.close()
+
+
+def test_export_quotes_gzip_streams_in_chunks(tmp_path, monkeypatch):
+    import gzip
+
+    db = tmp_path / "q.db"
+
+    monkeypatch.setenv("DB_PATH", str(db))
+
+    reload(_persistence).init_db()
+
+    now = datetime.now(timezone.utc)
+
+    _seed_quotes(db, 20_000, now)
+
+    out = tmp_path / "quotes_test.csv.gz"
+
+    fetches: list[int] = []
+
+    real_iter = export_signals._iter_rows
+
+    def spy(con, sql, params, chunk_size):
+        for chunk in real_iter(con, sql, params, chunk_size):
+            fetches.append(len(chunk))
+
+            yield chunk
+
+    monkeypatch.setattr(export_signals, "_iter_rows", spy)
+
+    export_signals.export_signals(out_path=out, last_hours=24, table="quotes", chunk_size=500, tz="+03:00")
+
+    assert fetches == [500] * 40  # 40 fetchmany() chunks of chunk_size rows, never one fetchall()
+
+    with gzip.open(out, "rt", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+
+    assert rows[0] == list(export_signals.SELECT_COLUMNS) and len(rows) == 1 + 20_000
+
+    assert rows[1][0].endswith("+03:00") and rows[1][3] == ""  # newest first; NULL futures_price
+
+    with pytest.raises(ValueError):
+        export_signals.export_signals(out_path=out, table="orders")
+
+
+def test_export_zstd_and_parquet(tmp_path, monkeypatch):
+    db = tmp_path / "z.db"
+
+    monkeypatch.setenv("DB_PATH", str(db))
+
+    reload(_persistence).init_db()
+
+    _seed_quotes(db, 1_000, datetime.now(timezone.utc))
+
+    if export_signals.zstandard is not None:
+        out = export_signals.export_signals(out_path=tmp_path / "q.csv.zst", table="quotes", chunk_size=64)
+
+        text = export_signals.zstandard.ZstdDecompressor().decompressobj().decompress(out.read_bytes())
+
+        assert text.decode("utf-8").count("\n") == 1 + 1_000
+
+    else:
+        with pytest.raises(RuntimeError, match="zstandard"):
+            export_signals.export_signals(out_path=tmp_path / "q.csv.zst", table="quotes")
+
+    pa = export_signals.pyarrow
+
+    if pa is None:
+        with pytest.raises(RuntimeError, match="pyarrow"):
+            export_signals.export_signals(out_path=tmp_path / "q.parquet", table="quotes")
+
+        assert not (tmp_path / "q.parquet").exists()
+
+        return
+
+    pq_path = export_signals.export_signals(out_path=tmp_path / "q.parquet", table="quotes", chunk_size=300)
+
+    meta = pa.parquet.ParquetFile(str(pq_path)).metadata
+
+    assert meta.num_rows == 1_000 and meta.num_row_groups == 4
+
+    arrow_path = export_signals.export_signals(out_path=tmp_path / "q.arrow", table="quotes", chunk_size=300)
+
+    table = pa.ipc.open_file(str(arrow_path)).read_all()
+
+    assert table.column_names == list(export_signals.SELECT_COLUMNS) and table.num_rows == 1_000
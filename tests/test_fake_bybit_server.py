@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+import aiohttp
+import pytest
+
+from exchanges.bybit.ws_public import BybitWsPublic
+from scripts.fake_bybit_server import FakeBybitServer
+from src.exchanges.bybit.rest import BybitRest
+from src.exchanges.bybit.rest_async import AsyncBybitRest
+from src.exchanges.bybit.ws import BybitPublicWS
+
+
+@pytest.mark.asyncio
+async def test_rest_endpoints_through_bybit_rest(tmp_path, monkeypatch):
+    monkeypatch.setenv("BYBIT_INSTRUMENTS_CACHE_PATH", str(tmp_path / "instruments.json"))
+    async with FakeBybitServer(symbols=25, page_limit=10) as srv:
+        monkeypatch.setenv("BYBIT_REST_BASE_URL", srv.base_url)
+        rest = BybitRest()
+        assert rest.base_url == srv.base_url
+
+        spot_map = await asyncio.to_thread(rest.get_spot_map, refresh=True)
+        assert len(spot_map) == 25  # three pages of instruments-info
+        assert spot_map["BTCUSDT"] == {"base": "BTC", "quote": "USDT"}
+
+        rows = await asyncio.to_thread(rest.get_tickers, "linear", ["ETHUSDT", "BTCUSDT"])
+        assert [r["symbol"] for r in rows] == ["ETHUSDT", "BTCUSDT"]
+        assert float(rows[0]["markPrice"]) > 0
+
+        ob = await asyncio.to_thread(rest.get_orderbook_spot, "BTCUSDT", limit=5)
+        assert len(ob["result"]["b"]) == 5
+        funding = await asyncio.to_thread(rest.get_prev_funding, "BTCUSDT")
+        assert funding is not None and "fundingRate" in funding
+        assert (await asyncio.to_thread(rest.get_server_time))["timeSecond"] > 0
+
+        async with AsyncBybitRest() as arest:
+            assert len(await arest.get_tickers("spot")) == 25
+        assert srv.stats["rest_requests"] >= 8
+
+
+@pytest.mark.asyncio
+async def test_bybit_public_ws_streams_snapshot_then_deltas():
+    async with FakeBybitServer(symbols=5, rate_hz=50) as srv:
+        client = BybitPublicWS(srv.ws_url("linear"), ["tickers.BTCUSDT", "orderbook.50.ETHUSDT"])
+        got: list[dict] = []
+
+        async def on_message(msg: dict) -> None:
+            got.append(msg)
+            if len(got) >= 12:
+                await client.stop()
+
+        await asyncio.wait_for(client.run(on_message), timeout=5)
+
+    assert got[0]["op"] == "subscribe" and got[0]["success"] is True
+    tickers = [m for m in got if m.get("topic") == "tickers.BTCUSDT"]
+    assert tickers[0]["type"] == "snapshot" and "fundingRate" in tickers[0]["data"]
+    assert any(m["type"] == "delta" for m in tickers[1:])
+    books = [m for m in got if m.get("topic") == "orderbook.50.ETHUSDT"]
+    assert len(books[0]["data"]["b"]) == 50
+    assert [b["data"]["u"] for b in books] == sorted(b["data"]["u"] for b in books)
+
+
+@pytest.mark.asyncio
+async def test_ws_protocol_limits_ping_and_drop():
+    async with FakeBybitServer(symbols=20, spot_max_args=10) as srv:
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(srv.ws_url("spot")) as ws:
+                too_many = [f"tickers.{s}" for s in list(srv.market.prices)[:11]]
+                await ws.send_str(json.dumps({"op": "subscribe", "args": too_many, "req_id": "a"}))
+                ack = json.loads((await ws.receive()).data)
+                assert ack["success"] is False and ack["req_id"] == "a"
+
+                await ws.send_str(json.dumps({"op": "subscribe", "args": ["tickers.NOPEUSDT"]}))
+                assert json.loads((await ws.receive()).data)["success"] is False
+
+                await ws.send_str(json.dumps({"op": "ping"}))
+                assert json.loads((await ws.receive()).data)["ret_msg"] == "pong"
+
+                assert await srv.drop_connections() == 1
+                assert (await ws.receive()).type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED)
+        assert srv.stats["ws_subscribe_errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_ws_public_client_runs_against_fake_server(monkeypatch):
+    async with FakeBybitServer(symbols=3, rate_hz=50) as srv:
+        monkeypatch.setenv("BYBIT_WS_PUBLIC_URL", f"ws://{srv.host}:{srv.port}")
+        seen = []
+        client = BybitWsPublic("BTCUSDT", on_ticker=seen.append, category="spot", retry_backoff_s=0.01)
+        assert client._url == srv.ws_url("spot")
+        task = asyncio.create_task(client.run())
+        for _ in range(100):
+            if len(seen) >= 3:
+                break
+            await asyncio.sleep(0.02)
+        await client.stop()
+        await asyncio.wait_for(task, timeout=5)
+
+    assert len(seen) >= 3
+    assert {t.symbol for t in seen} == {"BTC/USDT"}
+    assert all(t.bid > 0 and t.ask > t.bid for t in seen)
@@ -0,0 +1,279 @@
+"""
+Локальна L2-книга (src/core/orderbook.py): snapshot/delta, gap + resync, depth-читання без HTTP.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.fake_bybit_server import FakeBybitServer
+from src.core import selector
+from src.core.filters.depth import calc_window_depth_usd, has_enough_depth
+from src.core.orderbook import L2Book, OrderBookStore
+from src.exchanges.bybit.rest_async import AsyncBybitRest
+from src.exchanges.bybit.ws import BybitPublicWS
+from src.ws.multiplexer import WsEvent, WSMultiplexer
+from src.ws.subscribers.alerts_subscriber import AlertsSubscriber
+
+
+def _msg(kind, u, b=(), a=(), *, sym="BTCUSDT", seq=None, depth=50):
+    data = {"s": sym, "b": [list(x) for x in b], "a": [list(x) for x in a], "u": u, "seq": seq or u * 10}
+    return {"topic": f"orderbook.{depth}.{sym}", "type": kind, "ts": 1_700_000_000_000 + u, "data": data}
+
+
+SNAP = _msg("snapshot", 100, b=[("99", "1"), ("98", "2"), ("97", "3")], a=[("101", "1"), ("102", "2")])
+
+
+def test_snapshot_delta_and_removal():
+    store = OrderBookStore()
+    assert store.apply(_msg("delta", 5, b=[("99", "1")]), "linear") == "stale"
+    assert store.get("linear", "BTCUSDT") is None
+
+    assert store.apply(SNAP, "linear") == "snapshot"
+    assert store.apply(_msg("delta", 101, b=[("99.5", "4"), ("98", "0")], a=[("101", "0")]), "linear") == "delta"
+    book = store.get("LINEAR", "btcusdt")
+    assert book is not None
+    assert book.bids() == [(99.5, 4.0), (99.0, 1.0), (97.0, 3.0)]
+    assert book.asks() == [(102.0, 2.0)]
+    assert book.best_bid() == (99.5, 4.0) and book.mid() == pytest.approx(100.75)
+    assert book.u == 101 and book.seq == 1010
+
+    assert store.apply(_msg("delta", 101, b=[("50", "1")]), "linear") == "ignored"  # duplicate
+    assert store.apply(_msg("delta", 102, b=[("50", "1")], seq=5), "linear") == "ignored"  # seq went back
+    assert store.apply({"topic": "tickers.BTCUSDT", "data": {}}, "linear") == "ignored"
+    assert store.stats["snapshots"] == 1 and store.stats["deltas"] == 1
+
+
+def test_depth_trim_and_restart_snapshot():
+    book_store = OrderBookStore()
+    book_store.apply(_msg("snapshot", 7, b=[("10", "1"), ("9", "1")], a=[("11", "1")], depth=2), "spot")
+    book_store.apply(_msg("delta", 8, b=[("10.5", "1")], depth=2), "spot")
+    book = book_store.get("spot", "BTCUSDT")
+    assert book.bids() == [(10.5, 1.0), (10.0, 1.0)]  # worst level dropped beyond depth 2
+    # u == 1: Bybit service restart -> the message replaces the book
+    assert book_store.apply(_msg("delta", 1, b=[("5", "1")], a=[("6", "1")], depth=2), "spot") == "snapshot"
+    assert book.bids() == [(5.0, 1.0)] and book.u == 1
+
+
+def test_gap_without_resync_waits_for_snapshot():
+    store = OrderBookStore()
+    store.apply(SNAP, "spot")
+    assert store.apply(_msg("delta", 103, b=[("99", "9")]), "spot") == "gap"
+    assert store.get("spot", "BTCUSDT") is None
+    assert store.apply(_msg("delta", 104, b=[("99", "9")]), "spot") == "stale"
+    assert store.apply(_msg("snapshot", 200, b=[("90", "1")], a=[("91", "1")]), "spot") == "snapshot"
+    assert store.get("spot", "BTCUSDT").u == 200
+    assert store.stats["gaps"] == 1 and store.stats["stale_dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_gap_triggers_resync_and_replays_buffered_deltas():
+    release = asyncio.Event()
+    calls = []
+
+    async def resync(category, symbol, depth):
+        calls.append((category, symbol, depth))
+        await release.wait()
+        return {"retCode": 0, "result": {"s": symbol, "b": [["99", "5"]], "a": [["101", "5"]], "u": 104, "seq": 1}}
+
+    store = OrderBookStore(resync=resync)
+    store.apply({**SNAP, "topic": "orderbook.500.BTCUSDT"}, "linear")  # REST shares u with the 500-level stream
+    assert store.apply(_msg("delta", 103, b=[("99", "9")], depth=500), "linear") == "gap"
+    assert store.apply(_msg("delta", 105, b=[("98", "7")], depth=500), "linear") == "buffered"
+    assert store.apply(_msg("delta", 106, a=[("101", "0"), ("102", "3")], depth=500), "linear") == "buffered"
+    assert store.get("linear", "BTCUSDT") is None
+
+    release.set()
+    for _ in range(50):
+        if store.get("linear", "BTCUSDT") is not None:
+            break
+        await asyncio.sleep(0)
+    book = store.get("linear", "BTCUSDT")
+    assert calls == [("linear", "BTCUSDT", 500)]
+    assert book.u == 106
+    assert book.bids() == [(99.0, 5.0), (98.0, 7.0)]  # delta 103 is older than the REST snapshot (u=104)
+    assert book.asks() == [(102.0, 3.0)]
+    assert store.stats["resyncs"] == 1
+    await store.aclose()
+
+
+async def _settle(store):
+    for _ in range(50):
+        await asyncio.sleep(0)
+    await asyncio.gather(*store._tasks)
+
+
+@pytest.mark.asyncio
+async def test_rest_u_from_other_sequence_recovers_via_resubscribe():
+    rest_calls, resubs = [], []
+
+    async def resync(category, symbol, depth):
+        rest_calls.append(depth)
+        u = 900_000 if depth == 50 else 5_000  # REST u: another sequence than the WS stream (u ~ 100)
+        return {"s": symbol, "b": [["99", "5"]], "a": [["101", "5"]], "u": u, "ts": 1_700_000_000_000}
+
+    async def resubscribe(category, symbol, depth):
+        resubs.append((category, symbol, depth))
+        return True
+
+    store = OrderBookStore(resync=resync, resubscribe=resubscribe, resync_min_interval=0)
+
+    # orderbook.50: not the REST depth -> no REST call, fresh WS snapshot via resubscribe
+    store.apply(SNAP, "linear")
+    assert store.apply(_msg("delta", 103), "linear") == "gap"
+    await _settle(store)
+    assert rest_calls == [] and resubs == [("linear", "BTCUSDT", 50)]
+    assert store.apply(_msg("snapshot", 300, b=[("99", "1")], a=[("101", "1")]), "linear") == "snapshot"
+    assert store.apply(_msg("delta", 301), "linear") == "delta"
+
+    # orderbook.500 whose u still does not match REST: the REST book is dropped at the first
+    # live delta and later gaps go straight to resubscribe (no GAP <-> REST flip-flop)
+    resubs.clear()
+    store.apply(_msg("snapshot", 100, sym="ETHUSDT", depth=500), "linear")
+    assert store.apply(_msg("delta", 103, sym="ETHUSDT", depth=500), "linear") == "gap"
+    await _settle(store)
+    assert rest_calls == [500] and store.get("linear", "ETHUSDT").u == 5_000
+    assert store.apply(_msg("delta", 104, sym="ETHUSDT", depth=500), "linear") == "gap"  # newer than REST, lower u
+    await _settle(store)
+    assert resubs == [("linear", "ETHUSDT", 500)] and store.get("linear", "ETHUSDT") is None
+    store.apply(_msg("snapshot", 400, sym="ETHUSDT", depth=500), "linear")
+    assert store.apply(_msg("delta", 402, sym="ETHUSDT", depth=500), "linear") == "gap"
+    await _settle(store)
+    assert rest_calls == [500] and len(resubs) == 2
+    assert store.stats["resubscribes"] == 3 and store.stats["resyncs"] == 1
+    await store.aclose()
+
+
+@pytest.mark.asyncio
+async def test_ws_resubscribe_sends_fresh_snapshot():
+    async with FakeBybitServer(symbols=1, rate_hz=20) as srv:
+        topic = f"orderbook.50.{next(iter(srv.market.prices))}"
+        ws = BybitPublicWS(srv.ws_url("linear"), [topic])
+        kinds: list[str] = []
+
+        async def on_message(msg: dict) -> None:
+            if msg.get("topic") == topic:
+                kinds.append(msg["type"])
+
+        task = asyncio.create_task(ws.run(on_message))
+        for _ in range(300):
+            if kinds:
+                break
+            await asyncio.sleep(0.01)
+        assert await ws.resubscribe("orderbook.50.NOPE") is False
+        assert await ws.resubscribe(topic) is True
+        for _ in range(300):
+            if kinds.count("snapshot") >= 2:
+                break
+            await asyncio.sleep(0.01)
+        await ws.stop()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    assert kinds[0] == "snapshot" and kinds.count("snapshot") == 2
+
+
+def test_window_depth_matches_dict_path():
+    store = OrderBookStore()
+    store.apply(SNAP, "spot")
+    book = store.get("spot", "BTCUSDT")
+    for window in (0.5, 1.5, 3.0, 10.0):
+        assert calc_window_depth_usd(book, 100.0, window) == calc_window_depth_usd(book.to_dict(), 100.0, window)
+    assert calc_window_depth_usd(book, 100.0, 1.5) == (99.0, 101.0, 2)
+    assert calc_window_depth_usd(book, 100.0, 2.5) == (99.0 * 1 + 98.0 * 2, 101.0 * 1 + 102.0 * 2, 4)
+    assert has_enough_depth(book, 100.0, min_depth_usd=250, window_pct=2.5, min_levels=4)
+    assert not has_enough_depth(L2Book("spot", "X"), 100.0, min_depth_usd=1, window_pct=1, min_levels=1)
+    # raw REST response (result-wrapped) is understood too
+    assert calc_window_depth_usd({"retCode": 0, "result": book.to_dict()}, 100.0, 2.5)[2] == 4
+
+
+def test_selector_reads_local_books_without_rest(monkeypatch):
+    fake_settings = SimpleNamespace(
+        min_vol_24h_usd=1,
+        min_price=0.001,
+        alert_threshold_pct=0.5,
+        alert_cooldown_sec=0,
+        allow_symbols=[],
+        deny_symbols=[],
+        min_depth_usd=90,
+        depth_window_pct=2.5,
+        min_depth_levels=2,
+    )
+    monkeypatch.setattr(selector, "load_settings", lambda: fake_settings)
+    monkeypatch.setattr(selector.persistence, "init_db", lambda: None)
+    monkeypatch.setattr(selector.persistence, "recent_signal_exists", lambda symbol, cooldown_sec: False)
+    monkeypatch.setattr(selector.persistence, "save_signal", lambda *a, **k: None)
+
+    class Client:
+        def get_spot_map(self):
+            return {s: {"price": 100.0, "turnover_usd": 1e9} for s in ("BTCUSDT", "ETHUSDT")}
+
+        def get_linear_map(self):
+            return {s: {"price": 101.0, "turnover_usd": 1e9} for s in ("BTCUSDT", "ETHUSDT")}
+
+    store = OrderBookStore()
+    for cat in ("spot", "linear"):
+        store.apply(SNAP, cat)
+        store.apply(_msg("snapshot", 1, b=[("99", "0.1")], a=[("101", "0.1")], sym="ETHUSDT"), cat)
+
+    res = selector.run_selection(limit=5, client=Client(), books=store)
+    assert [r["symbol"] for r in res] == ["BTCUSDT"]  # ETHUSDT fails depth on local books
+
+
+def test_alerts_subscriber_depth_gate():
+    store = OrderBookStore()
+    for cat in ("spot", "linear"):
+        store.apply(_msg("snapshot", 1, b=[("99", "0.1")], a=[("101", "0.1")], sym="ETHUSDT"), cat)
+    out: list[str] = []
+
+    async def fake_send(text: str) -> None:
+        out.append(text)
+
+    s = SimpleNamespace(
+        enable_alerts=True,
+        alert_threshold_pct=0.5,
+        alert_cooldown_sec=0,
+        min_price=0.0001,
+        min_depth_usd=1_000,
+        depth_window_pct=2.0,
+        min_depth_levels=1,
+    )
+    mux = WSMultiplexer()
+    sub = AlertsSubscriber(mux, s, send_async=fake_send, books=store)
+    sub.start()
+    for sym in ("ETHUSDT", "SOLUSDT"):  # SOLUSDT has no local book yet -> not blocked
+        mux.publish(WsEvent(source="SPOT", channel="tickers", symbol=sym, payload={"last": 100.0}, ts=0))
+        mux.publish(WsEvent(source="LINEAR", channel="tickers", symbol=sym, payload={"mark": 101.0}, ts=0))
+    asyncio.run(asyncio.sleep(0.05))
+    sub.stop()
+    assert len(out) == 1 and "SOLUSDT" in out[0]
+
+
+@pytest.mark.asyncio
+async def test_books_follow_stand_in_stream():
+    async with FakeBybitServer(symbols=3, rate_hz=50) as srv:
+        syms = list(srv.market.prices)
+        ws = BybitPublicWS(srv.ws_url("linear"), [f"orderbook.50.{s}" for s in syms])
+        store = OrderBookStore()
+        results: list[str] = []
+
+        async def on_message(msg: dict) -> None:
+            if msg.get("topic"):
+                results.append(store.apply(msg, "linear"))
+
+        task = asyncio.create_task(ws.run(on_message))
+        for _ in range(300):
+            if results.count("delta") >= 30:
+                break
+            await asyncio.sleep(0.01)
+        await ws.stop()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        async with AsyncBybitRest(srv.base_url) as rest:  # resync source
+            snap = await rest.get_orderbook("linear", syms[0], limit=50)
+
+    assert results.count("snapshot") == 3
+    assert results.count("delta") >= 30 and "gap" not in results
+    assert all(store.get("linear", s) is not None for s in syms)
+    assert len(snap["b"]) == len(snap["a"]) == 50 and snap["u"] >= store.get("linear", syms[0]).u
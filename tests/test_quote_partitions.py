@@ -0,0 +1,93 @@
+"""
+Time-partitioned quotes (src/storage/partitions.py): hot-partition writes, cross-partition reads, file-drop retention.
+"""
+
+import csv
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scripts import export_signals
+from scripts import sqlite_maint as maint
+from src.storage import partitions, persistence
+
+
+@pytest.fixture
+def daily(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "signals.db"))
+    monkeypatch.delenv("QUOTES_PARTITION_DIR", raising=False)
+    persistence.init_db()
+    now = datetime.now(timezone.utc)
+    monkeypatch.setenv("QUOTES_PARTITION", "none")
+    persistence.save_quote("LEGACY", 1, 1, 0.5, 1, ts=now - timedelta(hours=2))  # pre-partitioning row
+    monkeypatch.setenv("QUOTES_PARTITION", "daily")
+    for days, sym in ((0, "HOT"), (1, "D1"), (3, "D3"), (40, "OLD")):
+        persistence.save_quote(sym, 1, 1, 1.0, 1, ts=now - timedelta(days=days, minutes=1))
+    return tmp_path, now
+
+
+def test_names_and_bounds(tmp_path):
+    ts = datetime(2025, 1, 1, 23, 30, tzinfo=timezone.utc)  # ISO week 2025-W01 starts 2024-12-30
+    assert partitions.partition_name(ts, "daily") == "quotes-2025-01-01.db"
+    assert partitions.partition_name(ts, "weekly") == "quotes-2025-W01.db"
+    start, end = partitions.partition_bounds("quotes-2025-W01.db")
+    assert (start.date().isoformat(), (end - start).days) == ("2024-12-30", 7)
+    assert partitions.partition_bounds("quotes-backup.db") is None
+
+    for name in ("quotes-2025-01-01.db", "quotes-2025-01-03.db", "notes.db", "quotes-x.db"):
+        (tmp_path / name).touch()
+    assert [p.name for p in partitions.list_partitions(tmp_path)] == ["quotes-2025-01-03.db", "quotes-2025-01-01.db"]
+    assert [p.name for p in partitions.list_partitions(tmp_path, since="2025-01-02T00:00:00")] == [
+        "quotes-2025-01-03.db"
+    ]
+    with pytest.raises(ValueError):
+        partitions.partition_name(ts, "none")
+
+
+def test_writes_go_to_hot_partition_and_reads_span_all(daily, monkeypatch):
+    tmp_path, now = daily
+    files = sorted(p.name for p in (tmp_path / "quotes").glob("quotes-*.db"))
+    assert len(files) == 4 and files[-1] == partitions.partition_name(now - timedelta(minutes=1), "daily")
+    assert persistence.get_quotes(last_hours=24 * 365, symbol="HOT")[0]["basis_pct"] == 1.0
+
+    rows = persistence.get_quotes(last_hours=24 * 5)
+    assert [r["symbol"] for r in rows] == ["HOT", "LEGACY", "D1", "D3"]  # newest first across files + table
+    assert [r["symbol"] for r in persistence.get_quotes(last_hours=24 * 5, limit=2)] == ["HOT", "LEGACY"]
+
+    monkeypatch.setenv("QUOTES_PARTITION", "none")  # reads do not depend on the current mode
+    assert len(persistence.get_quotes(last_hours=24 * 365)) == 5
+    monkeypatch.setenv("QUOTES_PARTITION", "hourly")
+    with pytest.raises(ValueError):
+        persistence.save_quote("X", 1, 1, 1, 1)
+
+
+def test_retention_drops_partition_files(daily):
+    tmp_path, now = daily
+    parts = tmp_path / "quotes"
+    persistence.keep_connections(True)
+    try:
+        persistence.save_quote("OLD", 2, 2, 2.0, 2, ts=now - timedelta(days=40))  # kept connection to the old file
+        assert persistence.retention_sweep(30) == (0, 2)  # the whole file, no DELETE
+    finally:
+        persistence.keep_connections(False)
+    assert len(list(parts.glob("quotes-*.db"))) == 3
+    assert [r["symbol"] for r in persistence.get_quotes(last_hours=24 * 365)] == ["HOT", "LEGACY", "D1", "D3"]
+
+    persistence.save_quote("D10", 1, 1, 1.0, 1, ts=now - timedelta(days=10))
+    db = str(tmp_path / "signals.db")
+    dry = maint.run_maintenance(db, True, False, True, sleep_ms=0)
+    assert dry.deleted["quotes"] == 1 and len(list(parts.glob("quotes-*.db"))) == 4
+    m = maint.run_maintenance(db, True, False, False, sleep_ms=0)
+    assert m.retention["quotes"]["partitions_dropped"] == dry.retention["quotes"]["partitions_dropped"]
+    assert not any(p.name.startswith(m.retention["quotes"]["partitions_dropped"][0]) for p in parts.iterdir())
+
+
+def test_export_spans_partitions(daily):
+    tmp_path, _ = daily
+    out = export_signals.export_signals(out_path=tmp_path / "q.csv", last_hours=24 * 5, table="quotes", chunk_size=2)
+    with out.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["symbol"] for r in rows] == ["HOT", "LEGACY", "D1", "D3"]
+    out = export_signals.export_signals(out_path=tmp_path / "q2.csv", table="quotes", limit=3)
+    with out.open(newline="", encoding="utf-8") as f:
+        assert len(list(csv.DictReader(f))) == 3
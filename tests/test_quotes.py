@@ -0,0 +1,256 @@
+"""
+Джерела котирувань (src/core/quotes.py): REST tickers, QuoteCache, живий /quotes ws:run, auto-фолбек.
+"""
+
+import asyncio
+import socket
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import src.main as m
+from src.core import selector
+from src.core.cache import QuoteCache
+from src.core.quotes import (
+    AutoQuoteSource,
+    CacheQuoteSource,
+    HttpQuoteSource,
+    RestQuoteSource,
+    quote_source_from_env,
+    quotes_payload,
+)
+from src.storage import persistence
+from src.ws.health import MetricsRegistry
+from src.ws.metrics_http import start_metrics_server
+
+
+class TickersRest:
+    """REST-двійник: tickers + orderbook, рахує HTTP-виклики."""
+
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def get_tickers(self, category="linear", symbols=None):
+        self.calls.append(category)
+        if category == "spot":
+            return [{"symbol": "ETHUSDT", "lastPrice": "100", "turnover24h": "2e7"}, {"symbol": ""}]
+        return [{"symbol": "ETHUSDT", "lastPrice": "101", "markPrice": "102", "turnover24h": "3e7"}]
+
+    def get_orderbook_spot(self, symbol, limit=None):
+        return {"b": [], "a": []}
+
+
+def _cache(now: float) -> QuoteCache:
+    cache = QuoteCache()
+
+    async def fill():
+        await cache.update("ETHUSDT", spot=100.0, linear_mark=103.0, ts=now)
+        await cache.update("OLDUSDT", spot=1.0, linear_mark=1.1, ts=now - 60)
+        await cache.update("HALFUSDT", spot=5.0, ts=now)  # no mark yet
+        await cache.update_vol24h_bulk({"ETHUSDT": 2e7, "OLDUSDT": 2e7})
+
+    asyncio.run(fill())
+    return cache
+
+
+def _closed_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_rest_source_reads_tickers_and_delegates():
+    rest = TickersRest()
+    src = RestQuoteSource(rest)
+    assert src.get_spot_map() == {"ETHUSDT": {"price": 100.0, "turnover_usd": 2e7}}
+    assert src.get_linear_map()["ETHUSDT"]["price"] == 102.0  # mark, as on the WS side
+    assert src.get_orderbook_spot("ETHUSDT") == {"b": [], "a": []}
+    assert not hasattr(src, "get_prev_funding") and rest.calls == ["spot", "linear"]
+
+    class MapsOnly:
+        def get_spot_map(self):
+            return {"X": {"price": 1.0}}
+
+        def get_linear_map(self):
+            return {}
+
+    assert RestQuoteSource(MapsOnly()).get_spot_map() == {"X": {"price": 1.0}}
+
+
+def test_cache_source_freshness_and_selection(monkeypatch, tmp_path):
+    now = 1_000_000.0
+    cache = _cache(now)
+    src = CacheQuoteSource(cache, max_age_sec=10, client=TickersRest(), clock=lambda: now)
+    assert set(src.get_spot_map()) == {"ETHUSDT", "HALFUSDT"}
+    assert src.get_linear_map() == {"ETHUSDT": {"price": 103.0, "turnover_usd": 2e7, "ts": now}}
+    assert set(CacheQuoteSource(cache, max_age_sec=0).get_linear_map()) == {"ETHUSDT", "OLDUSDT"}
+
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "signals.db"))
+    s = SimpleNamespace(min_vol_24h_usd=1e6, min_price=0.001, alert_threshold_pct=1.0, alert_cooldown_sec=0)
+    monkeypatch.setattr(selector, "load_settings", lambda: s)
+    saved = selector.run_selection(limit=5, quotes=src)
+    assert [(r["symbol"], r["futures_price"]) for r in saved] == [("ETHUSDT", 103.0)]
+    assert persistence.get_signals(1)[0]["symbol"] == "ETHUSDT"
+
+
+def test_live_endpoint_and_auto_fallback(monkeypatch):
+    now = 1_000_000.0
+    cache = _cache(now)
+    server = start_metrics_server(0, registry=MetricsRegistry(), quotes=lambda: quotes_payload(cache))
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/quotes"
+        live = HttpQuoteSource(url, max_age_sec=10, clock=lambda: now)
+        assert set(live.get_spot_map()) == {"ETHUSDT", "HALFUSDT"}
+        assert set(live.get_linear_map()) == {"ETHUSDT"}
+
+        rest = RestQuoteSource(TickersRest())
+        auto = AutoQuoteSource(live, rest)
+        assert "ETHUSDT" in auto.get_spot_map() and auto.active == "live"
+        assert rest.client.calls == ["spot", "linear"]  # first scan learns the REST universe
+        assert auto.get_linear_map()["ETHUSDT"]["price"] == 103.0 and len(rest.client.calls) == 2
+
+        stale = AutoQuoteSource(HttpQuoteSource(url, max_age_sec=10, clock=lambda: now + 3600), rest)
+        assert stale.get_spot_map()["ETHUSDT"]["price"] == 100.0 and stale.active == "rest"
+        assert stale.get_linear_map()["ETHUSDT"]["price"] == 102.0
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    down = AutoQuoteSource(HttpQuoteSource(f"http://127.0.0.1:{_closed_port()}/quotes"), rest)
+    assert down.get_spot_map() and down.active == "rest"
+
+    monkeypatch.delenv("QUOTES_URL", raising=False)
+    monkeypatch.delenv("WS_METRICS_PORT", raising=False)
+    assert isinstance(quote_source_from_env("rest", client=rest.client), RestQuoteSource)
+    assert isinstance(quote_source_from_env(None, client=rest.client), RestQuoteSource)  # default: rest
+    assert quote_source_from_env("auto", client=rest.client).active == "rest"
+    with pytest.raises(ValueError):
+        quote_source_from_env("live")
+    with pytest.raises(ValueError):
+        quote_source_from_env("carrier-pigeon")
+    monkeypatch.setenv("WS_METRICS_PORT", "9123")
+    assert quote_source_from_env("live").url == "http://127.0.0.1:9123/quotes"
+
+
+def test_basis_scan_from_live_cache(monkeypatch, capsys):
+    now = time.time()
+    cache = _cache(now)
+    server = start_metrics_server(0, registry=MetricsRegistry(), quotes=lambda: quotes_payload(cache))
+    rest = TickersRest()
+    monkeypatch.setattr(m, "BybitRest", lambda: rest)
+    monkeypatch.setattr(m, "load_settings", lambda: SimpleNamespace(min_vol_24h_usd=1e6, alert_threshold_pct=1.0))
+    monkeypatch.setenv("QUOTES_URL", f"http://127.0.0.1:{server.server_address[1]}/quotes")
+    try:
+        args = SimpleNamespace(limit=5, threshold=None, min_vol=None, size_usd=0, source="live")
+        assert m.cmd_basis_scan(args) == 0
+    finally:
+        server.shutdown()
+        server.server_close()
+    out = capsys.readouterr().out
+    assert "ETHUSDT" in out and "3.00%" in out and "OLDUSDT" not in out
+    assert rest.calls == []  # no exchange requests
+    assert m.cmd_basis_scan(args) == 2  # --source live, endpoint gone
+    assert "Quotes unavailable (live)" in capsys.readouterr().out
+
+    monkeypatch.setenv("QUOTES_SOURCE", "bogus")
+    assert m.cmd_basis_scan(SimpleNamespace(limit=5, threshold=None, min_vol=None, size_usd=0, source=None)) == 2
+
+
+class _Live:
+    name = "live"
+
+    def __init__(self, spot, linear):
+        self.maps = (spot, linear)
+
+    def get_maps(self):
+        return self.maps
+
+
+def test_auto_uses_rest_when_live_covers_part_of_the_universe():
+    class UniverseRest(TickersRest):
+        def get_tickers(self, category="linear", symbols=None):
+            self.calls.append(category)
+            rows = ("BTCUSDT", "ETHUSDT", "SOLUSDT")
+            return [{"symbol": s, "lastPrice": "1", "markPrice": "1.1", "turnover24h": "2e7"} for s in rows]
+
+    rest_client = UniverseRest()
+    now = [1_000.0]
+    row = {"price": 2.0, "turnover_usd": 2e7}
+    live = _Live({"ETHUSDT": row}, {"ETHUSDT": row})  # ws:run subscribed to ETHUSDT only
+    auto = AutoQuoteSource(live, RestQuoteSource(rest_client), universe_ttl_sec=60, clock=lambda: now[0])  # type: ignore[arg-type]
+
+    spot, linear = auto.get_maps()
+    assert set(spot) == set(linear) == {"BTCUSDT", "ETHUSDT", "SOLUSDT"} and auto.active == "rest"
+    assert spot["ETHUSDT"]["price"] == 1.0 and rest_client.calls == ["spot", "linear"]
+
+    full = {s: row for s in ("BTCUSDT", "ETHUSDT", "SOLUSDT", "NEWUSDT")}
+    live.maps = (full, full)
+    assert auto.get_maps()[0]["BTCUSDT"]["price"] == 2.0 and auto.active == "live"
+    assert len(rest_client.calls) == 2  # universe still fresh: no REST call
+
+    live.maps = ({"ETHUSDT": row}, {"ETHUSDT": row})
+    now[0] += 61
+    assert len(auto.get_maps()[0]) == 3 and auto.active == "rest" and len(rest_client.calls) == 4
+
+
+def test_shared_source_is_consistent_across_threads(monkeypatch):
+    """scheduler:run ділить одне джерело між паралельними задачами: spot і linear — з одного знімка."""
+    import itertools
+    import threading
+
+    class VersionedCache:
+        def __init__(self):
+            self._n = itertools.count()
+
+        def quote_maps(self):
+            q = {"X": {"price": float(next(self._n) + 1), "turnover_usd": 1.0, "ts": 0.0}}
+            time.sleep(0.0005)  # widen the race window
+            return q, {"X": dict(q["X"])}
+
+    live = HttpQuoteSource("http://unused/quotes", max_age_sec=0)
+    versions = itertools.count()
+
+    def fetch():
+        v = next(versions)
+        time.sleep(0.0005)
+        if v % 3 == 0:
+            raise OSError("live endpoint flapping")
+        q = {"price": float(v + 1), "turnover_usd": 1.0}
+        return {"spot": {"X": q}, "linear": {"X": dict(q)}}
+
+    monkeypatch.setattr(live, "fetch", fetch)
+
+    class TaggedRest:
+        def get_spot_map(self):
+            return {"X": {"price": 0.5, "turnover_usd": 1.0}}
+
+        def get_linear_map(self):
+            return {"X": {"price": 0.5, "turnover_usd": 1.0}}
+
+    sources = [CacheQuoteSource(VersionedCache(), max_age_sec=0), AutoQuoteSource(live, RestQuoteSource(TaggedRest()))]
+    mismatches: list[tuple[float, float]] = []
+    errors: list[Exception] = []
+
+    def worker(src):
+        try:
+            scan(src)
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+
+    def scan(src):
+        for _ in range(200):
+            spot, linear = src.get_maps()
+            if spot["X"]["price"] != linear["X"]["price"]:
+                mismatches.append((spot["X"]["price"], linear["X"]["price"]))
+            rows_pass, rows_all = m._basis_rows(min_vol=0.0, threshold=0.0, client=src)
+            if rows_all and rows_all[0][3] != 0.0:  # basis from two different snapshots
+                mismatches.append((rows_all[0][1], rows_all[0][2]))
+
+    for src in sources:
+        threads = [threading.Thread(target=worker, args=(src,)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(30)
+    assert errors == [] and mismatches == []
@@ -0,0 +1,84 @@
+# tests/test_rest_async.py
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+from typing import Any
+
+import pytest
+
+from src.exchanges.bybit.rest_async import AsyncBybitRest
+
+
+class _BarrierHTTP:
+    """
+    Фейковий HTTPClient: кожен запит чекає, поки одночасно "в польоті" буде
+    `expect` запитів. Якщо виклики йдуть послідовно — тест впаде по таймауту.
+    """
+
+    def __init__(self, expect: int) -> None:
+        self.expect = expect
+        self.in_flight = 0
+        self.calls: list[dict[str, Any]] = []
+        self._all_started = asyncio.Event()
+        self.closed = False
+
+    async def get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        p = dict(params or {})
+        self.calls.append(p)
+        self.in_flight += 1
+        if self.in_flight >= self.expect:
+            self._all_started.set()
+        await asyncio.wait_for(self._all_started.wait(), timeout=1.0)
+        sym = p.get("symbol") or f"{p['category'].upper()}USDT"
+        return {"retCode": 0, "result": {"list": [{"symbol": sym, "turnover24h": "1"}]}}
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_get_tickers_many_fetches_categories_concurrently():
+    http = _BarrierHTTP(expect=2)
+    async with AsyncBybitRest(http=http) as client:  # type: ignore[arg-type]
+        rows = await client.get_tickers_many(("spot", "linear"))
+
+    assert set(rows) == {"spot", "linear"}
+    assert rows["spot"][0]["symbol"] == "SPOTUSDT"
+    assert rows["linear"][0]["symbol"] == "LINEARUSDT"
+    assert http.closed is True
+
+
+@pytest.mark.asyncio
+async def test_get_tickers_symbols_concurrent():
+    http = _BarrierHTTP(expect=3)
+    client = AsyncBybitRest(http=http)  # type: ignore[arg-type]
+    rows = await client.get_tickers("linear", ["AUSDT", "BUSDT", "CUSDT"])
+    assert [r["symbol"] for r in rows] == ["AUSDT", "BUSDT", "CUSDT"]
+
+
+_NO_EXCHANGES = """
+import asyncio, sys
+
+class _Block:  # top-level package exchanges/ is not on sys.path
+    def find_spec(self, name, path=None, target=None):
+        if name == "exchanges" or name.startswith("exchanges."):
+            raise ImportError(name)
+
+sys.meta_path.insert(0, _Block())
+from src.exchanges.bybit.rest import BybitRest
+from src.exchanges.bybit.rest_async import AsyncBybitRest
+
+assert BybitRest().limiter is None
+client = AsyncBybitRest("http://127.0.0.1:9")
+assert type(client.http).__name__ == "_PlainHTTP"
+asyncio.run(client.close())
+print("ok")
+"""
+
+
+def test_src_clients_import_without_top_level_exchanges():
+    out = subprocess.run([sys.executable, "-c", _NO_EXCHANGES], capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "ok"
@@ -0,0 +1,146 @@
+# tests/test_rest_instruments_cache.py
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+import requests
+
+from src.exchanges.bybit.instruments_cache import InstrumentsCache, snapshot_path_for
+from src.exchanges.bybit.rest import BybitRest
+
+
+class _Resp:
+    def __init__(self, payload: dict[str, Any]):
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self) -> dict[str, Any]:
+        return self._payload
+
+
+class _FakeSession:
+    """Повертає instruments-info у дві сторінки (через nextPageCursor)."""
+
+    def __init__(self) -> None:
+        self.headers: dict[str, str] = {}
+        self.calls: list[dict[str, Any]] = []
+        self.fail = False
+
+    def get(self, url: str, params: dict[str, Any] | None = None, timeout: float | None = None) -> _Resp:
+        params = dict(params or {})
+        self.calls.append(params)
+        if self.fail:
+            raise requests.ConnectionError("offline")
+        if params.get("cursor") == "p2":
+            rows = [{"symbol": "ETHUSDT", "baseCoin": "ETH", "quoteCoin": "USDT"}]
+            cursor = ""
+        else:
+            rows = [{"symbol": "BTCUSDT", "baseCoin": "BTC", "quoteCoin": "USDT"}]
+            cursor = "p2"
+        return _Resp({"retCode": 0, "result": {"list": rows, "nextPageCursor": cursor}})
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _client(tmp_path, clock: _Clock, session: _FakeSession | None = None) -> tuple[BybitRest, _FakeSession]:
+    sess = session or _FakeSession()
+    cache = InstrumentsCache(tmp_path / "instruments.json", ttl_sec=60, clock=clock)
+    return BybitRest(session=sess, instruments_cache=cache), sess  # type: ignore[arg-type]
+
+
+def test_spot_map_follows_cursor_and_uses_cache(tmp_path):
+    clock = _Clock()
+    client, sess = _client(tmp_path, clock)
+
+    m = client.get_spot_map()
+    assert set(m) == {"BTCUSDT", "ETHUSDT"}
+    assert m["ETHUSDT"] == {"base": "ETH", "quote": "USDT"}
+    assert len(sess.calls) == 2  # дві сторінки
+
+    # Повторний виклик у межах TTL — без HTTP
+    client.get_spot_map()
+    assert len(sess.calls) == 2
+
+    # Після TTL — повторний fetch
+    clock.now += 61
+    client.get_spot_map()
+    assert len(sess.calls) == 4
+
+
+def test_snapshot_survives_new_process(tmp_path):
+    clock = _Clock()
+    first, _ = _client(tmp_path, clock)
+    first.get_linear_map()
+
+    # "Холодний" клієнт із тим самим файлом: жодних запитів
+    second, sess2 = _client(tmp_path, clock)
+    m = second.get_linear_map()
+    assert set(m) == {"BTCUSDT", "ETHUSDT"}
+    assert sess2.calls == []
+
+
+def test_stale_snapshot_used_when_api_fails(tmp_path):
+    clock = _Clock()
+    client, sess = _client(tmp_path, clock)
+    client.get_spot_map()
+
+    clock.now += 3600
+    sess.fail = True
+    m = client.get_spot_map()
+    assert "BTCUSDT" in m
+
+    client.instruments_cache.invalidate()
+    with pytest.raises(requests.ConnectionError):
+        client.get_spot_map()
+
+
+def test_refresh_instruments_is_conditional(tmp_path):
+    clock = _Clock()
+    client, sess = _client(tmp_path, clock)
+
+    assert client.refresh_instruments(["spot"]) == {"spot": True}
+    assert client.refresh_instruments(["spot"]) == {"spot": False}
+
+    clock.now += 10
+    assert client.refresh_instruments(["spot"], if_older_than=5) == {"spot": True}
+    assert len(sess.calls) == 4
+
+
+def test_ttl_zero_disables_cache(tmp_path):
+    sess = _FakeSession()
+    cache = InstrumentsCache(tmp_path / "i.json", ttl_sec=0)
+    client = BybitRest(session=sess, instruments_cache=cache)  # type: ignore[arg-type]
+    client.get_spot_map()
+    client.get_spot_map()
+    assert len(sess.calls) == 4
+    assert not (tmp_path / "i.json").exists()
+
+
+def test_snapshot_is_keyed_by_base_url(tmp_path, monkeypatch):
+    clock = _Clock()
+    path = tmp_path / "shared.json"
+    fake = InstrumentsCache(path, source="http://127.0.0.1:8900", ttl_sec=60, clock=clock)
+    fake.put("spot", {"FK0000USDT": {"base": "FK0000", "quote": "USDT"}})
+
+    # same file, other source (e.g. an explicit BYBIT_INSTRUMENTS_CACHE_PATH): the snapshot is ignored
+    sess = _FakeSession()
+    mainnet = InstrumentsCache(path, source="https://api.bybit.com/", ttl_sec=60, clock=clock)
+    client = BybitRest(session=sess, instruments_cache=mainnet)  # type: ignore[arg-type]
+    assert set(client.get_spot_map()) == {"BTCUSDT", "ETHUSDT"} and len(sess.calls) == 2
+
+    # default location: one file per host
+    monkeypatch.delenv("BYBIT_INSTRUMENTS_CACHE_PATH", raising=False)
+    assert snapshot_path_for("https://api-testnet.bybit.com").name == "bybit_instruments.api-testnet.bybit.com.json"
+    assert snapshot_path_for("http://127.0.0.1:8900").name == "bybit_instruments.127.0.0.1_8900.json"
+    assert InstrumentsCache.from_env("https://api.bybit.com").path == snapshot_path_for("https://api.bybit.com")
+    monkeypatch.setenv("BYBIT_INSTRUMENTS_CACHE_PATH", "")
+    assert InstrumentsCache.from_env("https://api.bybit.com").path is None
@@ -0,0 +1,89 @@
+# tests/test_rest_tickers_parallel.py
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from src.exchanges.bybit.rest import BybitRest
+
+
+class _Resp:
+    def __init__(self, payload: dict[str, Any]):
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self) -> dict[str, Any]:
+        return self._payload
+
+
+class _BarrierSession:
+    """
+    Фейкова requests.Session: запит по символу чекає, поки в польоті буде
+    `expect` запитів одночасно — послідовна реалізація впаде по таймауту.
+    """
+
+    def __init__(self, expect: int = 1) -> None:
+        self.headers: dict[str, str] = {}
+        self.calls: list[dict[str, Any]] = []
+        self._barrier = threading.Barrier(expect, timeout=2.0)
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: dict[str, Any] | None = None, timeout: float | None = None) -> _Resp:
+        p = dict(params or {})
+        with self._lock:
+            self.calls.append(p)
+        sym = p.get("symbol")
+        if sym:
+            self._barrier.wait()
+            rows = [{"symbol": sym, "lastPrice": "1"}]
+        else:
+            rows = [{"symbol": f"S{i}USDT", "lastPrice": str(i)} for i in range(50)]
+        return _Resp({"retCode": 0, "result": {"list": rows}})
+
+
+class _CountingLimiter:
+    def __init__(self) -> None:
+        self.n = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1) -> None:
+        with self._lock:
+            self.n += tokens
+
+
+def _client(sess: _BarrierSession, **kw: Any) -> BybitRest:
+    return BybitRest(session=sess, **kw)  # type: ignore[arg-type]
+
+
+def test_symbols_fetched_concurrently_in_input_order():
+    sess = _BarrierSession(expect=3)
+    limiter = _CountingLimiter()
+    client = _client(sess, limiter=limiter, max_workers=4, full_scan_threshold=10)  # type: ignore[arg-type]
+
+    rows = client.get_tickers("linear", ["CUSDT", "AUSDT", "BUSDT", "AUSDT"])
+
+    assert [r["symbol"] for r in rows] == ["CUSDT", "AUSDT", "BUSDT"]
+    assert len(sess.calls) == 3
+    assert limiter.n == 3  # усі потоки пулу йдуть через один бакет
+
+
+def test_large_symbol_list_falls_back_to_full_category():
+    sess = _BarrierSession()
+    client = _client(sess, full_scan_threshold=2)
+
+    rows = client.get_tickers("spot", ["S7USDT", "S3USDT", "NOPEUSDT"])
+
+    assert [r["symbol"] for r in rows] == ["S7USDT", "S3USDT"]
+    assert sess.calls == [{"category": "spot"}]
+
+
+def test_env_configures_pool(monkeypatch):
+    monkeypatch.setenv("BYBIT_TICKERS_MAX_WORKERS", "3")
+    monkeypatch.setenv("BYBIT_TICKERS_FULL_SCAN_THRESHOLD", "5")
+    monkeypatch.setenv("BYBIT_REST_RATE_PER_SEC", "0")
+    client = _client(_BarrierSession())
+    assert client.max_workers == 3
+    assert client.full_scan_threshold == 5
+    assert client.limiter is None
@@ -0,0 +1,137 @@
+"""
+scheduler:run — планувальник задач (src/core/scheduler.py) і CLI-режим у src/main.py.
+"""
+
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import src.main as m
+from src.core import selector
+from src.core.scheduler import Job, Scheduler
+from src.storage import persistence
+from src.ws.health import MetricsRegistry
+
+
+@pytest.fixture
+def reg():
+    r = MetricsRegistry.get()
+    r.reset()
+    yield r
+    r.reset()
+
+
+def test_overlap_protection_failures_and_metrics(reg):
+    calls = {"fast": 0, "slow": 0}
+
+    def fast():
+        calls["fast"] += 1
+
+    def slow():
+        calls["slow"] += 1
+        time.sleep(0.15)
+
+    def broken():
+        raise ValueError("boom")
+
+    jobs = [
+        Job("fast", 0.02, fast),
+        Job("slow", 0.02, slow),
+        Job("broken", 0.02, broken),
+        Job("off", 0, fast),
+        Job("daily", 86_400, fast, delay_first=True),
+    ]
+    sched = Scheduler(jobs, jitter_pct=0, metrics=reg)
+    assert [j.name for j in sched.jobs] == ["fast", "slow", "broken", "daily"]  # interval 0 = disabled
+    t = threading.Thread(target=sched.run_forever)
+    t.start()
+    time.sleep(0.4)
+    sched.stop()
+    t.join(5)
+    assert not t.is_alive()
+
+    stats = sched.stats()
+    assert stats["fast"]["runs"] >= 5 and stats["fast"]["failures"] == 0
+    assert 2 <= stats["slow"]["runs"] <= 4 and stats["slow"]["skipped_overlap"] >= 3
+    assert stats["broken"]["failures"] == stats["broken"]["runs"] >= 5
+    assert stats["broken"]["last_error"] == "ValueError('boom')"
+    assert stats["daily"]["runs"] == 0  # delay_first: not on every restart
+    job_lat = reg.snapshot()["latency_ms"]["job"]
+    assert job_lat["slow"]["count"] == stats["slow"]["runs"] and job_lat["slow"]["p50"] >= 140
+
+
+def test_jitter_bounds():
+    job = Job("j", 10.0, lambda: None)
+    sched = Scheduler([job], jitter_pct=20, rng=random.Random(1))
+    nexts = []
+    for _ in range(200):
+        sched._schedule_next(job, 100.0)
+        nexts.append(job.next_run)
+    assert min(nexts) >= 110.0 and max(nexts) <= 112.0 and len(set(nexts)) > 100
+
+
+def test_kept_connections(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "k.db"))
+    persistence.keep_connections(True)
+    try:
+        with persistence.conn_ctx() as a, persistence.conn_ctx() as b:
+            assert a is b
+        with pytest.raises(RuntimeError), persistence.conn_ctx() as con:
+            con.execute("CREATE TABLE t (x INTEGER)")
+            con.execute("INSERT INTO t VALUES (1)")
+            raise RuntimeError("abort")
+        with persistence.conn_ctx() as con:
+            assert con.execute("SELECT COUNT(*) FROM t").fetchone() == (0,)  # rolled back
+    finally:
+        persistence.keep_connections(False)
+    with persistence.conn_ctx() as c:
+        assert c is not a
+
+
+def test_scheduler_run_once_shares_one_client(monkeypatch, tmp_path, capsys, reg):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "signals.db"))
+    persistence.init_db()
+    created = []
+    sent = []
+
+    class FakeRest:
+        def __init__(self):
+            created.append(self)
+
+        def get_spot_map(self):
+            return {"ETHUSDT": {"price": 2000.0, "turnover_usd": 2e7}, "BTCUSDT": {"price": 1.0, "turnover_usd": 1}}
+
+        def get_linear_map(self):
+            return {"ETHUSDT": {"price": 2040.0, "turnover_usd": 3e7}, "BTCUSDT": {"price": 1.0, "turnover_usd": 1}}
+
+        def get_prev_funding(self, symbol):
+            return {"funding_rate": 0.0001, "next_funding_time": None}
+
+    s = SimpleNamespace(
+        min_vol_24h_usd=1e6,
+        alert_threshold_pct=1.0,
+        alert_cooldown_sec=0,
+        min_price=0.001,
+        enable_alerts=True,
+        telegram=SimpleNamespace(token="t", chat_id="c"),
+    )
+    monkeypatch.setattr(m, "BybitRest", FakeRest)
+    monkeypatch.setattr(m, "load_settings", lambda: s)
+    monkeypatch.setattr(m, "send_telegram_message", lambda token, chat_id, text: sent.append(text) or {"ok": True})
+    monkeypatch.setattr(selector, "load_settings", lambda: s)
+
+    rc = m.cmd_scheduler_run(SimpleNamespace(jobs="scan,alert,select", once=True))
+    out = capsys.readouterr().out
+    stats = json.loads(out[out.index("{\n") :])
+    assert rc == 0 and len(created) == 1
+    assert {k: v["runs"] for k, v in stats.items()} == {"scan": 1, "alert": 1, "select": 1}
+    assert len(sent) == 1 and "ETHUSDT" in sent[0]
+    assert [r["symbol"] for r in persistence.get_signals(1)] == ["ETHUSDT"]
+    assert persistence._kept is None  # kept connections closed on exit
+    assert set(reg.snapshot()["latency_ms"]["job"]) == {"scan", "alert", "select"}
+
+    assert m.cmd_scheduler_run(SimpleNamespace(jobs="scan,nope", once=True)) == 2
@@ -0,0 +1,119 @@
+"""
+scripts/sqlite_backup.py: online backup of the real signals/alerts DBs while a WAL writer is running.
+"""
+
+import gzip
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from scripts import sqlite_backup as backup
+from src.infra.alerts_repo import SqliteAlertGateRepo
+from src.storage import persistence
+
+
+def _signals_db(tmp_path, monkeypatch, rows=3_000):
+    db = tmp_path / "signals.db"
+    monkeypatch.setenv("DB_PATH", str(db))
+    persistence.init_db()
+    with sqlite3.connect(db) as con:
+        con.executemany(
+            "INSERT INTO signals(symbol, spot_price, futures_price, basis_pct, volume_24h_usd, timestamp)"
+            " VALUES(?, 1, 1, 1, 1, ?)",
+            [(f"S{i}", datetime.now(timezone.utc).isoformat()) for i in range(rows)],
+        )
+    return db
+
+
+def _count(path) -> int:
+    with sqlite3.connect(path) as con:
+        return con.execute("SELECT COUNT(*) FROM signals").fetchone()[0]
+
+
+def test_incremental_backup_with_live_writer(tmp_path, monkeypatch):
+    db = _signals_db(tmp_path, monkeypatch)
+    errors: list[Exception] = []
+    written: list[int] = []
+    stop = threading.Event()
+
+    def writer():
+        con = sqlite3.connect(db, timeout=1.0)
+        try:
+            while not stop.is_set():
+                con.execute(
+                    "INSERT INTO signals(symbol, spot_price, futures_price, basis_pct, volume_24h_usd, timestamp)"
+                    " VALUES('LIVE', 1, 1, 1, 1, ?)",
+                    (datetime.now(timezone.utc).isoformat(),),
+                )
+                con.commit()
+                written.append(1)
+                time.sleep(0.002)
+        except sqlite3.OperationalError as e:
+            errors.append(e)
+        finally:
+            con.close()
+
+    seen: list[int] = []
+    t = threading.Thread(target=writer)
+    t.start()
+    try:
+        r = backup.backup_db(
+            db, tmp_path / "bk", pages=4, sleep_ms=2, max_restarts=2, progress=lambda res: seen.append(res.pages_done)
+        )
+    finally:
+        stop.set()
+        t.join(10)
+
+    assert not errors and written
+    assert r.steps > 1 and r.pages_done == r.pages_total and seen  # copied step by step
+    assert r.one_step_finish == (r.restarts == 3)  # restarted by the writer more than max_restarts times
+    snap = Path(r.dest)
+    assert snap.exists() and not list((tmp_path / "bk").glob("*.part"))
+    assert not (tmp_path / "bk" / (snap.name + "-wal")).exists()
+    with sqlite3.connect(snap) as con:
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert 3_000 <= _count(snap) <= _count(db)
+
+
+def test_compression_and_rotation(tmp_path, monkeypatch):
+    db = _signals_db(tmp_path, monkeypatch, rows=100)
+    out = tmp_path / "bk"
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    results = [backup.backup_db(db, out, compression="gzip", keep=2, now=t0 + timedelta(seconds=i)) for i in range(3)]
+    assert sorted(p.name for p in out.iterdir()) == ["signals-20260101-000001.db.gz", "signals-20260101-000002.db.gz"]
+    assert results[-1].rotated == ["signals-20260101-000000.db.gz"]
+
+    restored = tmp_path / "restored.db"
+    with gzip.open(out / "signals-20260101-000002.db.gz", "rb") as f:
+        restored.write_bytes(f.read())
+    assert _count(restored) == 100
+
+    with pytest.raises(ValueError):
+        backup.backup_db(db, out, compression="lz4")
+    with pytest.raises(FileNotFoundError):
+        backup.backup_db(tmp_path / "missing.db", out)
+    assert not (tmp_path / "missing.db").exists()
+    if backup.zstandard is None:
+        with pytest.raises(RuntimeError):
+            backup.backup_db(db, out, compression="zstd")
+
+
+def test_cli_covers_signals_and_alerts(tmp_path, monkeypatch, capsys):
+    db = _signals_db(tmp_path, monkeypatch, rows=10)
+    alerts = tmp_path / "alerts.db"
+    repo = SqliteAlertGateRepo(str(alerts))
+    repo.set_last("BTCUSDT", basis_pct=1.5, ts_epoch=time.time())  # repo connection stays open
+
+    rc = backup.main(
+        ["--db", str(db), "--db", str(alerts), "--db", str(tmp_path / "nope.db"), "--out-dir", str(tmp_path / "bk")]
+    )
+    payload = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert rc == 0 and [b.get("skipped") for b in payload["backups"]] == [None, None, "not found"]
+    snap = next((tmp_path / "bk").glob("alerts-*.db"))
+    with sqlite3.connect(snap) as con:
+        assert con.execute("SELECT symbol FROM alerts").fetchall() == [("BTCUSDT",)]
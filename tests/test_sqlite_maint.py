@@ -0,0 +1,135 @@
+"""
+scripts/sqlite_maint.py: chunked retention on the real signals/quotes/alerts_log schemas.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scripts import sqlite_maint as maint
+from src.infra.alerts_repo import SqliteAlertGateRepo
+from src.storage import persistence
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat(timespec="microseconds")
+
+
+def _make_db(path, monkeypatch, *, old_quotes=6_000) -> None:
+    monkeypatch.setenv("DB_PATH", str(path))
+    persistence.init_db()
+    SqliteAlertGateRepo(str(path))  # alerts + alerts_log in the same file
+    now = datetime.now(timezone.utc)
+    con = sqlite3.connect(path)
+    con.executemany(
+        "INSERT INTO quotes(symbol, timestamp, spot_price, futures_price, basis_pct, volume_24h_usd)"
+        " VALUES(?, ?, 1, 1, 0, 1)",
+        [(f"S{i % 20}", _iso(now - timedelta(days=30, seconds=i))) for i in range(old_quotes)]
+        + [(f"S{i}", _iso(now - timedelta(hours=i))) for i in range(10)],
+    )
+    con.executemany(
+        "INSERT INTO signals(symbol, spot_price, futures_price, basis_pct, volume_24h_usd, timestamp)"
+        " VALUES(?, 1, 1, 1, 1, ?)",
+        [("OLD", _iso(now - timedelta(days=40))), ("NEW", _iso(now))],
+    )
+    con.executemany(
+        "INSERT INTO alerts_log(ts, symbol, basis) VALUES(?, ?, 1.0)",
+        [(time.time() - 60 * 86400, "OLD"), (time.time(), "NEW")],
+    )
+    con.commit()
+    con.close()
+
+
+def _count(path, table: str) -> int:
+    with sqlite3.connect(path) as con:
+        return con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_chunked_retention_real_schema(tmp_path, monkeypatch):
+    db = tmp_path / "signals.db"
+    _make_db(db, monkeypatch)
+    seen: list[int] = []
+
+    dry = maint.run_maintenance(str(db), True, False, True, chunk_rows=500, sleep_ms=0)
+    assert dry.deleted == {"signals": 1, "alerts_log": 1, "quotes": 6_000}
+    assert _count(db, "quotes") == 6_010
+
+    m = maint.run_maintenance(
+        str(db), True, False, False, chunk_rows=500, sleep_ms=0, progress=lambda st: seen.append(st.deleted)
+    )
+    assert m.deleted == {"signals": 1, "alerts_log": 1, "quotes": 6_000}
+    assert m.retention["quotes"]["chunks"] > 1 and m.retention["quotes"]["complete"]
+    assert seen == sorted(seen) and seen[-1] == 6_000  # progress callback after every chunk
+    assert (_count(db, "quotes"), _count(db, "signals"), _count(db, "alerts_log")) == (10, 1, 1)
+
+    with sqlite3.connect(db) as con:  # existing idx_*_ts indexes reused, no duplicates
+        names = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert "idx_signals_timestamp" not in names and "idx_quotes_timestamp" not in names
+
+
+def test_deadline_and_interrupted_run_resume(tmp_path, monkeypatch):
+    db = tmp_path / "signals.db"
+    _make_db(db, monkeypatch)
+    con = maint.busy_connection(str(db))
+    try:
+        stats = maint.retention_delete(
+            con, "quotes", "timestamp", 7, False, chunk_rows=100, sleep_ms=0, deadline=time.monotonic() - 1
+        )
+        assert stats.deleted == 0 and not stats.complete
+
+        def killed_after_two_chunks(st):
+            if st.chunks == 2:
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            maint.retention_delete(
+                con, "quotes", "timestamp", 7, False, chunk_rows=100, budget_ms=1e9, progress=killed_after_two_chunks
+            )
+        assert _count(db, "quotes") == 6_010 - 300  # 100 + 200 rows: each chunk is already committed
+
+        rest = maint.retention_delete(con, "quotes", "timestamp", 7, False, chunk_rows=100, sleep_ms=0)
+        assert rest.complete and rest.deleted == 6_000 - 300 and _count(db, "quotes") == 10
+    finally:
+        con.close()
+
+
+def test_chunk_size_follows_lock_budget():
+    assert maint.next_chunk_rows(1_000, 100.0, 50.0) == 500
+    assert maint.next_chunk_rows(1_000, 10.0, 50.0) == 2_000  # at most x2 per step
+    assert maint.next_chunk_rows(1_000, 40.0, 50.0) == 1_250
+    assert maint.next_chunk_rows(60, 1_000.0, 50.0) == maint.MIN_CHUNK_ROWS
+    assert maint.next_chunk_rows(90_000, 0.0, 50.0) == maint.MAX_CHUNK_ROWS
+
+
+def test_live_writer_not_blocked(tmp_path, monkeypatch):
+    db = tmp_path / "signals.db"
+    _make_db(db, monkeypatch, old_quotes=30_000)
+    errors: list[Exception] = []
+    written = []
+
+    def writer():
+        con = sqlite3.connect(db, timeout=1.0)
+        try:
+            for i in range(40):
+                con.execute(
+                    "INSERT INTO signals(symbol, spot_price, futures_price, basis_pct, volume_24h_usd, timestamp)"
+                    " VALUES('LIVE', 1, 1, 1, 1, ?)",
+                    (_iso(datetime.now(timezone.utc) + timedelta(microseconds=i)),),
+                )
+                con.commit()
+                written.append(i)
+                time.sleep(0.002)
+        except sqlite3.OperationalError as e:
+            errors.append(e)
+        finally:
+            con.close()
+
+    t = threading.Thread(target=writer)
+    t.start()
+    m = maint.run_maintenance(str(db), True, False, False, budget_ms=20, chunk_rows=500, sleep_ms=2)
+    t.join(10)
+    assert not errors and len(written) == 40
+    assert m.deleted["quotes"] == 30_000 and m.retention["quotes"]["complete"]
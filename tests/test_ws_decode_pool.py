@@ -0,0 +1,143 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.fake_bybit_server import FakeBybitServer
+from src.exchanges.bybit.ws_pool import BybitWSPool
+from src.ws.decode_pool import DecodedMessage, DecodePool
+from src.ws.normalizers.bybit_v5 import normalize
+
+
+def _frame(i: int) -> str:
+    return json.dumps({"topic": "tickers.BTCUSDT", "ts": 1_700_000_000_000 + i, "data": {"lastPrice": str(i)}})
+
+
+@pytest.fixture
+def pool():
+    p = DecodePool(2, batch=8).start()
+    yield p
+    p.close()
+
+
+@pytest.mark.asyncio
+async def test_results_keep_submission_order_and_carry_normalized(pool):
+    raws = [_frame(i) for i in range(50)]
+    raws[10] = "not json"
+    raws[20] = json.dumps({"op": "subscribe", "success": True})
+    out = await asyncio.gather(*(pool.submit(r) for r in raws))
+
+    assert out[10] is None
+    assert isinstance(out[20], DecodedMessage) and out[20].normalized is None
+    for i in (0, 1, 49):
+        msg = out[i]
+        assert isinstance(msg, DecodedMessage) and msg["ts"] == 1_700_000_000_000 + i
+        assert normalize(msg) is msg.normalized  # no second normalization on the loop
+        assert msg.normalized["data"]["last_price"] == float(i)
+
+
+@pytest.mark.asyncio
+async def test_dead_worker_falls_back_to_loop_decoding(pool):
+    assert (await pool.submit(_frame(1)))["ts"] == 1_700_000_000_001
+    for p in pool._procs:
+        p.kill()
+    for _ in range(100):
+        if pool._broken:
+            break
+        await asyncio.sleep(0.01)
+    assert pool._broken
+    msg = await pool.submit(_frame(2))
+    assert msg["ts"] == 1_700_000_000_002 and normalize(msg)["symbol"] == "BTCUSDT"
+
+
+@pytest.mark.asyncio
+async def test_worker_killed_with_batch_in_flight_decodes_it_on_the_loop():
+    pool = DecodePool(1, batch=4).start()
+    try:
+        sent = []
+        real_req, pool._req[0] = pool._req[0], SimpleNamespace(send=sent.append)  # the worker never sees it
+        raws = [_frame(1), "not json", _frame(3), _frame(4)]
+        futs = [pool.submit(r) for r in raws]  # a full batch is flushed right away
+        assert len(sent) == 1 and len(pool._inflight) == 1
+        pool._procs[0].kill()
+        out = await asyncio.wait_for(asyncio.gather(*futs), timeout=10)
+    finally:
+        pool._req[0] = real_req
+        pool.close()
+
+    assert pool._broken and not pool._inflight
+    assert out[1] is None
+    assert [m["ts"] for m in (out[0], out[2], out[3])] == [1_700_000_000_001, 1_700_000_000_003, 1_700_000_000_004]
+    assert isinstance(out[0], DecodedMessage) and out[0].normalized["symbol"] == "BTCUSDT"
+
+
+@pytest.mark.asyncio
+async def test_ws_client_with_decoder_delivers_in_order(pool):
+    async with FakeBybitServer(symbols=3, rate_hz=100) as srv:
+        ws = BybitWSPool(srv.ws_url("linear"), ["orderbook.50.BTCUSDT"], source="LINEAR", decoder=pool)
+        books: list[int] = []
+
+        async def on_message(msg: dict) -> None:
+            if msg.get("topic"):
+                assert normalize(msg)["channel"] == "orderbook"
+                books.append(msg["data"]["u"])
+            if len(books) >= 20:
+                await ws.stop()
+
+        await asyncio.wait_for(ws.run(on_message), timeout=10)
+    assert books == sorted(books) and len(set(books)) == len(books)
+
+
+class _FlakyDecoder:
+    """submit(): frame 3 fails, frame 4 is cancelled (pool shutdown), the rest decode on the loop.
+
+    Frames 1-2 are the subscribe ack and the first snapshot.
+    """
+
+    def __init__(self) -> None:
+        self.n = 0
+
+    def submit(self, raw: str) -> asyncio.Future:
+        self.n += 1
+        fut = asyncio.get_running_loop().create_future()
+        if self.n == 3:
+            fut.set_exception(RuntimeError("decode crashed"))
+        elif self.n == 4:
+            fut.cancel()
+        else:
+            fut.set_result(json.loads(raw))
+        return fut
+
+
+@pytest.mark.asyncio
+async def test_drain_survives_failed_futures_and_reconnects_on_handler_error(monkeypatch):
+    from src.ws import reconnect
+
+    monkeypatch.setattr(reconnect.ReconnectPolicy, "next_delay", lambda self: 0.01)
+    async with FakeBybitServer(symbols=1, rate_hz=100) as srv:
+        ws = BybitWSPool(srv.ws_url("linear"), ["orderbook.50.BTCUSDT"], source="LINEAR", decoder=_FlakyDecoder())
+        seen: list[str] = []
+
+        async def on_message(msg: dict) -> None:
+            if not msg.get("topic"):
+                return
+            seen.append(msg["type"])
+            if len(seen) == 5:
+                raise RuntimeError("handler bug")  # inline mode reconnects on this; so must the drainer
+            if seen.count("snapshot") >= 2 and len(seen) >= 10:
+                await ws.stop()
+
+        await asyncio.wait_for(ws.run(on_message), timeout=10)
+        assert srv.stats["ws_connections"] >= 2
+    assert seen[0] == "snapshot" and seen.count("snapshot") >= 2  # fresh snapshot after the reconnect
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.delenv("WS_DECODE_WORKERS", raising=False)
+    assert DecodePool.from_env() is None
+    monkeypatch.setenv("WS_DECODE_WORKERS", "3")
+    monkeypatch.setenv("WS_DECODE_BATCH", "16")
+    p = DecodePool.from_env()
+    assert p is not None and (p.workers, p.batch) == (3, 16)
+    p.close()
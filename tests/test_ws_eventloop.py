@@ -0,0 +1,60 @@
+import asyncio
+import types
+
+import pytest
+
+from src.ws import eventloop
+
+
+@pytest.fixture
+def no_uvloop(monkeypatch):
+    monkeypatch.setattr(eventloop, "_uvloop", lambda: None)
+
+
+@pytest.fixture
+def fake_uvloop(monkeypatch):
+    made = []
+
+    def new_event_loop():
+        loop = asyncio.new_event_loop()
+        made.append(loop)
+        return loop
+
+    mod = types.SimpleNamespace(new_event_loop=new_event_loop)
+    monkeypatch.setattr(eventloop, "_uvloop", lambda: mod)
+    return made
+
+
+def test_default_is_asyncio(monkeypatch, fake_uvloop):
+    monkeypatch.delenv("WS_EVENT_LOOP", raising=False)
+    assert eventloop.resolve_loop() == "asyncio"
+    assert eventloop.loop_factory() is None
+
+
+def test_env_and_explicit_kind(monkeypatch, fake_uvloop):
+    monkeypatch.setenv("WS_EVENT_LOOP", "uvloop")
+    assert eventloop.resolve_loop() == "uvloop"
+    assert eventloop.resolve_loop("asyncio") == "asyncio"  # explicit kind wins over env
+    assert eventloop.resolve_loop("AUTO") == "uvloop"
+
+
+def test_unknown_kind_falls_back(monkeypatch):
+    monkeypatch.setenv("WS_EVENT_LOOP", "trio")
+    assert eventloop.resolve_loop() == "asyncio"
+
+
+def test_uvloop_missing_falls_back(no_uvloop):
+    assert eventloop.resolve_loop("uvloop") == "asyncio"
+    assert eventloop.resolve_loop("auto") == "asyncio"
+    assert eventloop.loop_factory("uvloop") is None
+
+
+def test_run_uses_selected_loop(fake_uvloop):
+    async def main():
+        await asyncio.sleep(0)
+        return asyncio.get_running_loop()
+
+    loop = eventloop.run(main(), kind="uvloop")
+    assert fake_uvloop == [loop]
+    assert eventloop.run(main(), kind="asyncio") is not loop
+    assert len(fake_uvloop) == 1
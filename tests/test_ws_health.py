@@ -41,3 +41,62 @@ def test_reset_clears_counters_and_timestamps():
     assert snap["last_event_ts"] is None
     assert snap["last_spot_ts"] is None
     assert snap["last_linear_ts"] is None
+
+
+def test_sharded_counters_from_many_threads():
+    import threading
+
+    reg = MetricsRegistry.get()
+    reg.reset()
+
+    def work():
+        for _ in range(1000):
+            reg.inc_spot()
+            reg.inc_linear(2)
+        reg.inc_reconnects()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    snap = reg.snapshot()
+    assert snap["counters"] == {"spot": 4000, "linear": 8000}
+    assert snap["reconnects_total"] == 4
+
+    # reset works via baseline, even for shards of finished threads
+    reg.reset()
+    reg.inc_spot()
+    snap = reg.snapshot()
+    assert snap["counters"] == {"spot": 1, "linear": 0}
+    assert snap["reconnects_total"] == 0
+    assert snap["last_linear_ts"] is None
+
+
+def test_last_ts_stamped_by_loop_tick_not_by_increments(monkeypatch):
+    from types import SimpleNamespace
+
+    from src.ws import health
+
+    reg = MetricsRegistry.get()
+    reg.reset()
+    clock = SimpleNamespace(now=1000.0, calls=0)
+
+    def fake_time():
+        clock.calls += 1
+        return clock.now
+
+    monkeypatch.setattr(health, "time", SimpleNamespace(time=fake_time))
+
+    for _ in range(1000):
+        reg.inc_spot()
+    assert clock.calls == 0  # increments never read the clock
+    reg.observe_loop_lag(0.5)  # tick at 1000.0 sees spot moved
+    clock.now = 1001.0
+    reg.inc_linear()
+    snap = reg.snapshot()  # snapshot at 1001.0 sees linear moved, spot unchanged
+    assert snap["last_spot_ts"] == 1000.0
+    assert snap["last_linear_ts"] == 1001.0
+    assert snap["last_event_ts"] == 1001.0
+    reg.reset()
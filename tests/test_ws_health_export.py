@@ -0,0 +1,146 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.ws import health_export
+from src.ws.health import MetricsRegistry
+from src.ws.health_export import HealthExporter, live_snapshot, read_exported, request_reset
+
+
+@pytest.fixture
+def reg():
+    r = MetricsRegistry.get()
+    r.reset()
+    yield r
+    r.reset()
+
+
+@pytest.fixture
+def path(tmp_path, monkeypatch):
+    p = tmp_path / "ws_health.json"
+    monkeypatch.setenv("WS_HEALTH_FILE", str(p))
+    return p
+
+
+def test_export_is_read_by_another_process(reg, path):
+    reg.inc_spot(7)
+    reg.inc_linear(3)
+    HealthExporter(path, reg).write_once()
+    assert not list(path.parent.glob(".*.tmp"))  # temp file replaced atomically
+
+    env = dict(os.environ, WS_HEALTH_FILE=str(path))
+    out = subprocess.run(
+        [sys.executable, "-m", "scripts.ws_health_cli"], capture_output=True, text=True, env=env, check=True
+    ).stdout
+    data = json.loads(out)
+    assert data["source"] == f"pid {os.getpid()}"
+    assert data["counters"] == {"spot": 7, "linear": 3}
+
+
+def test_stale_or_dead_exports_are_ignored(reg, path):
+    exp = HealthExporter(path, reg, interval=0.1)
+    exp.write_once()
+    assert read_exported()["pid"] == os.getpid()
+
+    doc = json.loads(path.read_text())
+    doc["exported_ts"] -= 60
+    path.write_text(json.dumps(doc))
+    assert read_exported() is None
+
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    exp.write_once()
+    doc = json.loads(path.read_text())
+    doc["pid"] = dead.pid
+    path.write_text(json.dumps(doc))
+    assert read_exported() is None
+    assert live_snapshot(reg)[1] == "local"
+
+    path.write_text("{not json")
+    assert read_exported() is None
+
+
+def test_exporter_thread_lifecycle(reg, path, monkeypatch):
+    monkeypatch.setenv("WS_HEALTH_EXPORT_SEC", "0.05")
+    exp = health_export.start_health_export_from_env(reg)
+    assert exp is not None and health_export._active is exp
+    for _ in range(100):
+        if path.exists():
+            break
+        time.sleep(0.01)
+    assert path.exists()
+    assert live_snapshot(reg)[1] == "local"  # the producer reads its own registry
+    exp.stop()
+    assert health_export._active is None and not path.exists()
+
+    monkeypatch.setenv("WS_HEALTH_EXPORT_SEC", "0")
+    assert health_export.start_health_export_from_env(reg) is None
+    monkeypatch.setenv("WS_HEALTH_FILE", "off")
+    assert HealthExporter.from_env(reg) is None
+
+
+def test_remote_reset_and_prometheus(reg, path):
+    reg.inc_spot(5)
+    exp = HealthExporter(path, reg)
+    exp.write_once()
+    reg.inc_spot(100)  # not exported yet: readers see the last export
+    assert 'ws_events_total{source="spot"} 5' in health_export.live_prometheus(reg)
+
+    assert request_reset() is True
+    exp.write_once()  # producer tick picks up the marker
+    snap, source = live_snapshot(reg)
+    assert source == f"pid {os.getpid()}"
+    assert snap["counters"] == {"spot": 0, "linear": 0}
+    assert not (path.parent / (path.name + ".reset")).exists()
+
+    path.unlink()
+    assert request_reset() is False  # nothing running: caller resets locally
+
+
+def test_ws_health_command_uses_export(reg, path, capsys):
+    import argparse
+
+    from src import main
+
+    reg.inc_linear(4)
+    HealthExporter(path, reg).write_once()
+    reg.reset()  # this process now looks empty; ws:health must show the exported numbers
+    assert main.cmd_ws_health(argparse.Namespace(reset=False, prometheus=False)) == 0
+    data = json.loads(capsys.readouterr().out)
+    assert data["source"] == f"pid {os.getpid()}" and data["counters"]["linear"] == 4
+
+
+def test_ws_health_reset_prints_post_reset_export(reg, path, capsys, monkeypatch):
+    import argparse
+    import functools
+    import threading
+
+    from src import main
+
+    reg.inc_linear(4)
+    exp = HealthExporter(path, reg)
+    exp.write_once()
+    args = argparse.Namespace(reset=True, prometheus=False)
+
+    # producer never ticks: output is labelled as the pre-reset snapshot
+    wait = health_export.wait_for_reset
+    monkeypatch.setattr(health_export, "wait_for_reset", functools.partial(wait, timeout=0.1))
+    assert main.cmd_ws_health(args) == 0
+    data = json.loads(capsys.readouterr().out)
+    assert data["counters"]["linear"] == 4 and data["reset"].startswith("pending")
+
+    # producer ticks while the command waits: output is the post-reset export
+    monkeypatch.setattr(health_export, "wait_for_reset", wait)
+    tick = threading.Timer(0.2, exp.write_once)
+    tick.start()
+    try:
+        assert main.cmd_ws_health(args) == 0
+    finally:
+        tick.join()
+    data = json.loads(capsys.readouterr().out)
+    assert data["source"] == f"pid {os.getpid()}"
+    assert data["counters"]["linear"] == 0 and "reset" not in data
@@ -0,0 +1,81 @@
+import json
+import time
+import urllib.request
+
+import pytest
+
+from src.ws.health import MetricsRegistry, format_latency_lines, format_status
+from src.ws.histogram import LatencyHistogram, lag_ms_since
+from src.ws.metrics_http import start_metrics_server
+
+
+def test_percentiles_within_relative_error():
+    h = LatencyHistogram()
+    for i in range(1, 10_001):
+        h.record(i / 10.0)  # 0.1ms .. 1000ms uniform
+    p = h.percentiles((0.5, 0.99, 0.999))
+    assert p[0.5] == pytest.approx(500.0, rel=0.035)
+    assert p[0.99] == pytest.approx(990.0, rel=0.035)
+    assert p[0.999] == pytest.approx(999.0, rel=0.035)
+    assert h.count == 10_000
+    assert h.summary()["max"] == pytest.approx(1000.0)
+
+
+def test_merge_and_negative_samples():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    a.record(1.0)
+    b.record(-5.0)  # clock skew -> counted as 0
+    b.record(100.0)
+    a.merge(b)
+    assert a.count == 3
+    assert a.negative == 1
+    assert a.percentile(1.0) == pytest.approx(100.0, rel=0.035)
+
+
+def test_lag_accepts_seconds_and_millis():
+    now = 1_700_000_000.0
+    assert lag_ms_since(now - 0.25, now=now) == pytest.approx(250.0)
+    assert lag_ms_since((now - 0.25) * 1000.0, now=now) == pytest.approx(250.0)
+    assert lag_ms_since(0) is None
+
+
+def test_registry_latency_snapshot_and_status():
+    reg = MetricsRegistry.get()
+    reg.reset()
+    for i in range(100):
+        reg.observe_ws("SPOT", "ticker", exchange_ts=time.time() * 1000 - 20, handler_ms=0.1 * i, publish_ms=0.01)
+    snap = reg.snapshot()
+    lat = snap["latency_ms"]
+    assert set(lat) == {"exchange_to_recv", "handler", "publish"}
+    assert lat["handler"]["SPOT/ticker"]["count"] == 100
+    assert {"p50", "p99", "p999"} <= set(lat["handler"]["SPOT/ticker"])
+    assert any("p999=" in line for line in format_latency_lines(snap))
+    assert "Latency" in format_status(snap)
+
+    reg.reset()
+    assert reg.snapshot()["latency_ms"] == {}
+
+
+def test_prometheus_endpoint_serves_summaries():
+    reg = MetricsRegistry.get()
+    reg.reset()
+    reg.inc_spot()
+    reg.observe_latency("e2e", 12.5, source="SPOT", channel="tickers")
+
+    server = start_metrics_server(0, registry=reg)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=2) as resp:
+            text = resp.read().decode("utf-8")
+            assert resp.headers["Content-Type"].startswith("text/plain")
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=2) as resp:
+            health = json.loads(resp.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert 'ws_events_total{source="spot"} 1' in text
+    assert 'ws_latency_ms{kind="e2e",source="SPOT",channel="tickers",quantile="0.99"}' in text
+    assert 'ws_latency_ms_count{kind="e2e",source="SPOT",channel="tickers"} 1' in text
+    assert health["counters"]["spot"] == 1
+    reg.reset()
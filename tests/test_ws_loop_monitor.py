@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+import pytest
+
+from src.ws.health import MetricsRegistry, format_status
+from src.ws.loop_monitor import LoopMonitor
+
+
+def _blocking_rest_call(sec: float) -> None:
+    time.sleep(sec)  # stands in for a sync REST call on the event loop
+
+
+@pytest.mark.asyncio
+async def test_stall_is_measured_and_stack_sampled():
+    reg = MetricsRegistry.get()
+    reg.reset()
+    mon = LoopMonitor(reg, interval_ms=10, slow_callback_ms=50)
+    mon.start()
+    try:
+        await asyncio.sleep(0.05)
+        _blocking_rest_call(0.2)
+        await asyncio.sleep(0.05)
+    finally:
+        await mon.stop()
+
+    loop = reg.snapshot()["event_loop"]
+    assert loop["lag_ms"]["count"] > 0
+    assert loop["lag_ms"]["max"] >= 150
+    assert loop["slow_callbacks_total"] == 1
+    sample = loop["slow_callbacks"][0]
+    assert sample["blocked_ms"] >= 50
+    assert any("_blocking_rest_call" in line for line in sample["stack"])
+
+    text = format_status(reg.snapshot())
+    assert "Loop lag" in text
+    assert "Last stall" in text
+    assert "ws_loop_slow_callbacks_total 1" in reg.to_prometheus()
+    reg.reset()
+
+
+def test_from_env_can_disable(monkeypatch):
+    monkeypatch.setenv("LOOP_MONITOR_ENABLED", "0")
+    assert LoopMonitor.from_env() is None
+    monkeypatch.setenv("LOOP_MONITOR_ENABLED", "1")
+    monkeypatch.setenv("LOOP_SLOW_CALLBACK_MS", "500")
+    mon = LoopMonitor.from_env()
+    assert mon is not None and mon.slow_callback_ms == 500
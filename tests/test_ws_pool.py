@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from scripts.fake_bybit_server import FakeBybitServer
+from src.exchanges.bybit.ws_pool import BybitWSPool, shard_topics
+from src.ws.health import MetricsRegistry, format_status
+
+
+def test_shard_topics_round_robin():
+    topics = [f"tickers.S{i}" for i in range(25)] + ["tickers.S0"]
+    parts = shard_topics(topics, max_per_conn=10)
+    assert [len(p) for p in parts] == [9, 8, 8]
+    assert sorted(t for p in parts for t in p) == sorted(set(topics))
+    assert shard_topics(topics, shards=4)[3] == [
+        "tickers.S3",
+        "tickers.S7",
+        "tickers.S11",
+        "tickers.S15",
+        "tickers.S19",
+        "tickers.S23",
+    ]
+    assert shard_topics(["tickers"], shards=8) == [["tickers"]]
+    assert shard_topics([]) == []
+
+
+@pytest.mark.asyncio
+async def test_pool_shards_subscribe_in_batches_and_reconnect_independently():
+    reg = MetricsRegistry.get()
+    reg.reset()
+    async with FakeBybitServer(symbols=25, rate_hz=20, spot_max_args=10) as srv:
+        topics = [f"tickers.{s}" for s in srv.market.prices]
+        pool = BybitWSPool(srv.ws_url("spot"), topics, source="SPOT", max_topics_per_conn=10, subscribe_batch=10)
+        assert len(pool.clients) == 3
+        seen: set[str] = set()
+        acks: list[bool] = []
+
+        async def on_message(msg: dict) -> None:
+            if msg.get("op") == "subscribe":
+                acks.append(msg["success"])
+            elif msg.get("topic"):
+                seen.add(msg["topic"])
+
+        task = asyncio.create_task(pool.run(on_message))
+        for _ in range(200):
+            if len(seen) == 25:
+                break
+            await asyncio.sleep(0.01)
+        assert seen == set(topics)
+        assert acks and all(acks)  # 9/8/8 topics per socket fit into one request each
+
+        assert await srv.drop_connections() == 3
+        for _ in range(200):
+            conns = reg.snapshot()["connections"]
+            if all(c["reconnects"] >= 1 and c["connected"] for c in conns.values()):
+                break
+            await asyncio.sleep(0.01)
+        assert srv.stats["ws_connections"] == 6
+
+        await pool.stop()
+        await asyncio.wait_for(task, timeout=5)
+
+    conns = reg.snapshot()["connections"]
+    assert set(conns) >= {"SPOT#0", "SPOT#1", "SPOT#2"}
+    assert conns["SPOT#0"]["topics"] == 9
+    assert all(conns[k]["messages"] > 0 and conns[k]["reconnects"] >= 1 for k in ("SPOT#0", "SPOT#1", "SPOT#2"))
+    assert 'ws_conn_messages_total{conn="SPOT#1"}' in reg.to_prometheus()
+    assert "Connections:" in format_status(reg.snapshot())
+    reg.reset()
+
+
+@pytest.mark.asyncio
+async def test_single_socket_batches_spot_subscribe():
+    async with FakeBybitServer(symbols=25, rate_hz=20, spot_max_args=10) as srv:
+        topics = [f"tickers.{s}" for s in srv.market.prices]
+        pool = BybitWSPool(srv.ws_url("spot"), topics, source="SPOT", shards=1, subscribe_batch=10)
+        acks: list[dict] = []
+        seen: set[str] = set()
+
+        async def on_message(msg: dict) -> None:
+            if msg.get("op") == "subscribe":
+                acks.append(msg)
+            elif msg.get("topic"):
+                seen.add(msg["topic"])
+            if len(seen) == 25:
+                await pool.stop()
+
+        await asyncio.wait_for(pool.run(on_message), timeout=5)
+    assert [a["req_id"] for a in acks] == ["sub-0", "sub-1", "sub-2"]
+    assert all(a["success"] for a in acks)
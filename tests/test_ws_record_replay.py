@@ -0,0 +1,80 @@
+import gzip
+import json
+import time
+
+import pytest
+
+from src.ws.recorder import FrameRecorder, iter_frames, recorded_files
+from src.ws.replay import ReplayPipeline, replay
+
+
+def _ticker(topic_sym: str, ts_ms: int, **data) -> str:
+    return json.dumps({"topic": f"tickers.{topic_sym}", "ts": ts_ms, "type": "snapshot", "data": data})
+
+
+def _record_session(tmp_path):
+    t0 = 1_700_000_000.0
+    spot = FrameRecorder(tmp_path, source="SPOT", max_bytes=1024, max_files=50)
+    lin = FrameRecorder(tmp_path, source="LINEAR")
+    spot.record(json.dumps({"op": "subscribe", "success": True}), recv_ts=t0)
+    for i in range(20):
+        spot.record(_ticker("BTCUSDT", int((t0 + i) * 1000), symbol="BTCUSDT", lastPrice=str(100 + i)), t0 + i)
+        lin.record(_ticker("BTCUSDT", int((t0 + i) * 1000), symbol="BTCUSDT", markPrice=str(103 + i)), t0 + i + 0.5)
+    spot.close()
+    lin.close()
+    return t0
+
+
+def test_recorder_rotates_and_merges_in_time_order(tmp_path):
+    _record_session(tmp_path)
+
+    files = recorded_files([tmp_path])
+    assert len([f for f in files if "-SPOT-" in f.name]) > 1  # rotated at 1 KiB
+    assert all(f.name.endswith(".jsonl.gz") for f in files)
+
+    frames = list(iter_frames([tmp_path]))
+    assert len(frames) == 41
+    assert [t for t, _, _ in frames] == sorted(t for t, _, _ in frames)
+    assert {src for _, src, _ in frames} == {"SPOT", "LINEAR"}
+
+
+def test_truncated_file_is_read_up_to_the_damage(tmp_path):
+    path = tmp_path / "ws-SPOT-20240101-000000-0001.jsonl.gz"
+    data = gzip.compress(b"".join(json.dumps({"t": i, "s": "SPOT", "raw": "{}"}).encode() + b"\n" for i in range(50)))
+    path.write_bytes(data[: len(data) // 2])
+    frames = list(iter_frames([path]))
+    assert 0 < len(frames) < 50
+
+
+@pytest.mark.asyncio
+async def test_replay_max_speed_rebuilds_cache(tmp_path):
+    t0 = _record_session(tmp_path)
+    pipe = ReplayPipeline()
+    seen: list[str] = []
+    pipe.mux.subscribe(lambda e: seen.append(e.channel), source="SPOT")
+
+    stats = await replay(iter_frames([tmp_path]), pipe)
+    out = stats.to_dict()
+
+    assert out["frames"] == 41
+    assert out["data_frames"] == 40
+    assert out["symbols"] == 1
+    assert out["recorded_span_sec"] == pytest.approx(19.5)
+    row = await pipe.cache.get_row("BTCUSDT")
+    assert row["spot"] == 119.0
+    assert row["linear_mark"] == 122.0
+    assert row["ts_linear"] == pytest.approx(t0 + 19.5)  # recorded receive time, not wall clock
+    assert "ticker" in seen and "tickers" in seen
+
+
+@pytest.mark.asyncio
+async def test_replay_paced_speed(tmp_path):
+    rec = FrameRecorder(tmp_path, source="SPOT")
+    for i in range(3):
+        rec.record(_ticker("ETHUSDT", 0, symbol="ETHUSDT", lastPrice="1"), recv_ts=1000.0 + i * 0.1)
+    rec.close()
+
+    t = time.perf_counter()
+    stats = await replay(iter_frames([tmp_path]), speed=2.0)  # 0.2s recorded -> ~0.1s
+    assert stats.frames == 3
+    assert 0.08 <= time.perf_counter() - t < 1.0